@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Reporter Benchmark
+Console vs JSON-lines vs headless (null) output for the same simulations
+
+Console output goes to os.devnull so the numbers show formatting and
+write cost rather than terminal speed.
+
+Usage:
+    python benchmark_reporters.py [--repeat=N]
+"""
+
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+
+from reporter import ConsoleReporter, JsonLinesReporter, NullReporter
+
+
+def best_time(function, repeat):
+    """Fastest of `repeat` runs, in seconds"""
+    times = []
+    for _ in range(repeat):
+        random.seed(42)
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def make_reporters(sink, debug=False):
+    return [
+        ("console", ConsoleReporter(stream=sink, debug=debug)),
+        ("jsonl", JsonLinesReporter(sink)),
+        ("null", NullReporter()),
+    ]
+
+
+def bench_league_seasons(simulator, repeat, sink):
+    """simulate_league_season() for every loaded league"""
+    def run():
+        for league_id in simulator.leagues:
+            simulator.simulate_league_season(league_id)
+
+    timings = {}
+    for name, reporter in make_reporters(sink):
+        simulator.reporter = reporter
+        timings[name] = best_time(run, repeat)
+    return timings
+
+
+def bench_final_ucl(repeat, sink):
+    """final_ucl_swiss_model league phase + knockouts, console with the old DEBUG trace"""
+    import final_ucl_swiss_model as ucl
+
+    def run():
+        with redirect_stdout(sink):
+            ucl.run_final_ucl_simulation()
+
+    timings = {}
+    for name, reporter in make_reporters(sink, debug=True):
+        ucl.set_reporter(reporter)
+        timings[name] = best_time(run, repeat)
+    ucl.set_reporter(ConsoleReporter())
+    return timings
+
+
+def print_timings(title, timings):
+    headless = timings["null"]
+    print(f"\n📊 {title}")
+    print("-" * 60)
+    for name, seconds in timings.items():
+        speedup = seconds / headless if headless else float('inf')
+        print(f"  {name:<8} {seconds * 1000:9.1f} ms   {speedup:5.2f}x null")
+
+
+def main():
+    from multi_league_simulator import MultiLeagueSimulator
+
+    repeat = 5
+    for arg in sys.argv[1:]:
+        if arg.startswith("--repeat="):
+            repeat = int(arg.split("=", 1)[1])
+
+    print("⏱️  Reporter benchmark (best of {} runs)".format(repeat))
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        with redirect_stdout(io.StringIO()):
+            simulator = MultiLeagueSimulator(reporter=NullReporter())
+
+        print_timings(f"All {len(simulator.leagues)} league seasons, match by match",
+                      bench_league_seasons(simulator, repeat, sink))
+
+        simulator.batch_engine = True
+        print_timings(f"All {len(simulator.leagues)} league seasons, batch engine",
+                      bench_league_seasons(simulator, repeat, sink))
+
+        print_timings("Final UCL simulation (incl. data setup)", bench_final_ucl(repeat, sink))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Named, seeded scenarios for the data load, season, tournament and lineup hot paths
+
+Every scenario runs the same seeded work a fixed number of times and
+reports throughput (runs per second), p50/p95 latency and the peak
+memory of one extra run under tracemalloc. Output is muted (NullReporter,
+stdout to devnull) and the simulators' CSV exports go to a temporary
+directory, so nothing in the working tree changes. Standard library
+only; nothing is fetched.
+
+Usage:
+    python benchmark_suite.py                         # every scenario
+    python benchmark_suite.py --only=final_ucl,uel    # some scenarios
+    python benchmark_suite.py --list
+    python benchmark_suite.py --repeat=20 --json=bench.json
+    python benchmark_suite.py --compare=bench.json [--tolerance=0.10]
+
+--compare checks p50 latency and peak memory against a stored --json
+file. It flags every scenario that got more than --tolerance slower or
+bigger, and exits with status 1 if any did.
+"""
+
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from reporter import NullReporter
+
+# Seed of every seeded scenario
+BENCH_SEED = 42
+
+# Timed runs per scenario (after one untimed warm-up run)
+DEFAULT_REPEAT = 10
+
+# Relative slowdown / growth that --compare reports as a regression
+DEFAULT_TOLERANCE = 0.10
+
+SCENARIOS = {}
+
+
+def scenario(name, description):
+    """Register a scenario: the decorated function does the setup and returns the callable to time"""
+    def register(setup):
+        SCENARIOS[name] = (description, setup)
+        return setup
+    return register
+
+
+def _reset_data_caches(snapshot=True):
+    """Forget the process-wide repository (and the mapped snapshot, for a cold load)"""
+    import data_repository
+    import data_snapshot
+    data_repository._repositories.clear()
+    if snapshot:
+        data_snapshot._snapshots.clear()
+
+
+def _load_everything():
+    from data_repository import get_repository
+    repository = get_repository()
+    repository.clubs.complete()
+    repository.club_players.complete()
+    dict(repository.managers)
+    return repository
+
+
+@scenario('load_cold', "Data load in a fresh process: snapshot opened, every club, squad and manager decoded")
+def setup_load_cold():
+    def run():
+        _reset_data_caches(snapshot=True)
+        _load_everything()
+    return run
+
+
+@scenario('load_warm', "Data load with the snapshot already mapped: new repository, everything decoded")
+def setup_load_warm():
+    _load_everything()
+
+    def run():
+        _reset_data_caches(snapshot=False)
+        _load_everything()
+    return run
+
+
+@scenario('epl_season', "One EPL season with EPLSeasonSimulator (match by match)")
+def setup_epl_season():
+    from epl_season_simulator import EPLSeasonSimulator
+    from rng_context import make_rng
+
+    simulator = EPLSeasonSimulator(reporter=NullReporter(), seed=BENCH_SEED)
+    return lambda: simulator.simulate_season(make_rng(BENCH_SEED))
+
+
+@scenario('all_leagues', "MultiLeagueSimulator.run_all_leagues() over every league (serial)")
+def setup_all_leagues():
+    from multi_league_simulator import MultiLeagueSimulator
+
+    simulator = MultiLeagueSimulator(reporter=NullReporter())
+    return lambda: simulator.run_all_leagues(seed=BENCH_SEED)
+
+
+def _tournament(module_name, function_name):
+    module = __import__(module_name)
+    module.set_reporter(NullReporter())
+    function = getattr(module, function_name)
+    return lambda: function(BENCH_SEED)
+
+
+@scenario('final_ucl', "run_final_ucl_simulation(): data setup, league phase and knockouts")
+def setup_final_ucl():
+    return _tournament('final_ucl_swiss_model', 'run_final_ucl_simulation')
+
+
+@scenario('simple_ucl', "run_ucl_simulation() from simple_ucl_swiss_model_simulation")
+def setup_simple_ucl():
+    return _tournament('simple_ucl_swiss_model_simulation', 'run_ucl_simulation')
+
+
+@scenario('uel', "run_uel_simulation() from enhanced_uel_swiss_model_simulation")
+def setup_uel():
+    return _tournament('enhanced_uel_swiss_model_simulation', 'run_uel_simulation')
+
+
+@scenario('starting_xi', "select_starting_11 for every club in every formation (matrices built per run)")
+def setup_starting_xi():
+    from starting_XI_Selection import EffectivenessMatrix, benchmark_lineups
+
+    club_players = _load_everything().club_players
+    squads = [club_players[club_id] for club_id in club_players]
+    return lambda: benchmark_lineups(squads, matrices=[EffectivenessMatrix(squad) for squad in squads])
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile of an ascending list (fraction 0-1)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def measure(run, repeat, memory=True):
+    """Time `repeat` runs (after one warm-up) and trace one more for peak memory"""
+    with open(os.devnull, 'w', encoding='utf-8') as sink, redirect_stdout(sink):
+        run()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+        peak = None
+        if memory:
+            tracemalloc.start()
+            try:
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'runs': repeat,
+        'ops_per_sec': repeat / total if total else float('inf'),
+        'mean_ms': total / repeat * 1000,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'min_ms': timings[0] * 1000,
+        'peak_kib': peak / 1024 if peak is not None else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.realpath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(names, repeat=DEFAULT_REPEAT, memory=True):
+    """Run scenarios by name -> results dict (what --json writes)"""
+    results = {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': BENCH_SEED,
+            'repeat': repeat,
+        },
+        'scenarios': {},
+    }
+    # Simulators write their CSV exports to the working directory
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='football_sim_bench_') as scratch:
+        os.chdir(scratch)
+        try:
+            for name in names:
+                description, setup = SCENARIOS[name]
+                with redirect_stdout(io.StringIO()):
+                    run = setup()
+                result = measure(run, repeat, memory)
+                result['description'] = description
+                results['scenarios'][name] = result
+                print_result(name, result)
+        finally:
+            os.chdir(previous_dir)
+    return results
+
+
+def print_result(name, result):
+    peak = f"{result['peak_kib'] / 1024:8.1f} MiB" if result['peak_kib'] is not None else f"{'-':>12}"
+    print(f"  {name:<12} {result['ops_per_sec']:9.1f} ops/s  p50 {result['p50_ms']:9.2f} ms  "
+          f"p95 {result['p95_ms']:9.2f} ms  peak {peak}")
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Print p50 and peak-memory changes against a baseline; returns the regressed scenario names"""
+    regressions = []
+    meta = baseline.get('meta', {})
+    label = ' '.join(str(part) for part in (meta.get('commit'), meta.get('created')) if part) or 'baseline'
+    print(f"\n📈 Against {label}, tolerance {tolerance:.0%}")
+    for name, result in results['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            print(f"  {name:<12} (not in baseline)")
+            continue
+        notes = []
+        time_change = result['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+        if time_change > tolerance:
+            notes.append("SLOWER")
+        elif time_change < -tolerance:
+            notes.append("faster")
+        memory_change = None
+        if result['peak_kib'] is not None and before.get('peak_kib'):
+            memory_change = result['peak_kib'] / before['peak_kib'] - 1
+            if memory_change > tolerance:
+                notes.append("MORE MEMORY")
+        if "SLOWER" in notes or "MORE MEMORY" in notes:
+            regressions.append(name)
+        memory_text = f"{memory_change:+7.1%}" if memory_change is not None else f"{'-':>7}"
+        print(f"  {name:<12} p50 {before['p50_ms']:9.2f} -> {result['p50_ms']:9.2f} ms ({time_change:+7.1%})  "
+              f"peak {memory_text}  {' '.join(notes)}")
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+    else:
+        print("✅ No regressions")
+    return regressions
+
+
+def main():
+    repeat = DEFAULT_REPEAT
+    tolerance = DEFAULT_TOLERANCE
+    names = list(SCENARIOS)
+    json_path = baseline_path = None
+    memory = True
+    for arg in sys.argv[1:]:
+        if arg.startswith('--repeat='):
+            repeat = max(1, int(arg.split('=', 1)[1]))
+        elif arg.startswith('--only='):
+            names = [name for name in arg.split('=', 1)[1].split(',') if name]
+        elif arg.startswith('--json='):
+            json_path = arg.split('=', 1)[1]
+        elif arg.startswith('--compare='):
+            baseline_path = arg.split('=', 1)[1]
+        elif arg.startswith('--tolerance='):
+            tolerance = float(arg.split('=', 1)[1])
+        elif arg == '--no-memory':
+            memory = False
+        elif arg == '--list':
+            for name, (description, _) in SCENARIOS.items():
+                print(f"{name:<12} {description}")
+            return 0
+
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"❌ Unknown scenario(s): {', '.join(unknown)} (see --list)")
+        return 2
+
+    # Read the baseline first: --json may overwrite the same file
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"⏱️  Benchmark suite ({len(names)} scenarios, {repeat} runs each, seed {BENCH_SEED})")
+    results = run_suite(names, repeat, memory)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {json_path}")
+    if baseline is not None:
+        return 1 if compare(results, baseline, tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
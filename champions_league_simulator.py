@@ -4,46 +4,36 @@ Champions League Simulator
 A working simulation of the UEFA Champions League
 """
 
-import json
 import random
-import os
+
+from data_repository import get_repository
+from reporter import ConsoleReporter, create_reporter
+from rng_context import make_rng, substream
+from profiler import phase, profiling
+
+# --- Output ---
+# Everything this module prints goes through the reporter (console by
+# default); set_reporter(NullReporter()) runs it headless
+reporter = ConsoleReporter()
+
+
+def set_reporter(new_reporter):
+    """Send this module's output to another Reporter"""
+    global reporter
+    reporter = new_reporter
 
 def load_leagues():
     """Load league data"""
-    with open('data/leagues.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return list(get_repository().leagues.values())
 
 def load_all_clubs():
-    """Load all clubs from all leagues"""
-    clubs = {}
-    clubs_by_league = {}
-    
-    clubs_dir = 'data/leagues_clubs'
-    for filename in os.listdir(clubs_dir):
-        if not filename.endswith('.json'):
-            continue
-            
-        filepath = os.path.join(clubs_dir, filename)
-        with open(filepath, 'r', encoding='utf-8') as f:
-            club_data = json.load(f)
-        
-        # Handle different file formats
-        if isinstance(club_data, list):
-            club_list = club_data
-        else:
-            club_list = club_data.get('clubs', [])
-        
-        for club in club_list:
-            club_id = club.get('id', club.get('club_id'))
-            league_id = club.get('league_id')
-            
-            if club_id and league_id:
-                clubs[club_id] = club
-                if league_id not in clubs_by_league:
-                    clubs_by_league[league_id] = []
-                clubs_by_league[league_id].append(club)
-    
-    return clubs, clubs_by_league
+    """Lazy views over all clubs and clubs by league
+
+    Nothing is decoded up front; each league's clubs are loaded the first
+    time that league is looked up (legacy 'league_epl' style ids work too).
+    """
+    repository = get_repository()
+    return repository.clubs, repository.clubs_by_league
 
 def calculate_club_rating(club):
     """Calculate a club's overall rating"""
@@ -111,7 +101,7 @@ def get_ucl_qualifiers(clubs_by_league):
     
     return qualified[:36]  # UEFA allows 36 teams maximum
 
-def simulate_match(team1, team2):
+def simulate_match(team1, team2, rng=random):
     """Simulate a match between two teams"""
     # Strength difference affects goal probability
     strength_diff = team1['rating'] - team2['rating']
@@ -121,24 +111,25 @@ def simulate_match(team1, team2):
     team2_goals_expected = 1.5 - (strength_diff / 100)
     
     # Add randomness and ensure minimum
-    team1_goals_expected = max(0.2, team1_goals_expected + random.uniform(-0.5, 0.5))
-    team2_goals_expected = max(0.2, team2_goals_expected + random.uniform(-0.5, 0.5))
+    team1_goals_expected = max(0.2, team1_goals_expected + rng.uniform(-0.5, 0.5))
+    team2_goals_expected = max(0.2, team2_goals_expected + rng.uniform(-0.5, 0.5))
     
     # Generate goals (simplified Poisson)
-    team1_goals = max(0, int(random.normalvariate(team1_goals_expected, 1.0)))
-    team2_goals = max(0, int(random.normalvariate(team2_goals_expected, 1.0)))
+    team1_goals = max(0, int(rng.normalvariate(team1_goals_expected, 1.0)))
+    team2_goals = max(0, int(rng.normalvariate(team2_goals_expected, 1.0)))
     
     return team1_goals, team2_goals
 
-def simulate_group_stage(teams):
+@phase('simulate_group_stage', 'match')
+def simulate_group_stage(teams, rng=random):
     """Simulate the Champions League group stage"""
-    print("🏆 UEFA CHAMPIONS LEAGUE - GROUP STAGE")
-    print("=" * 50)
+    reporter.message("🏆 UEFA CHAMPIONS LEAGUE - GROUP STAGE")
+    reporter.message("=" * 50)
     
     # Create 9 groups of 4 teams each (simplified from new 36-team format)
     groups = []
     team_list = teams.copy()
-    random.shuffle(team_list)
+    substream(rng, 'group_draw').shuffle(team_list)
     
     for group_num in range(9):
         group_teams = team_list[group_num*4:(group_num+1)*4]
@@ -148,7 +139,7 @@ def simulate_group_stage(teams):
     qualified_teams = []
     
     for group_idx, group in enumerate(groups):
-        print(f"\nGroup {chr(65 + group_idx)}:")
+        reporter.message(f"\nGroup {chr(65 + group_idx)}:")
         
         # Initialize records
         records = {}
@@ -167,7 +158,7 @@ def simulate_group_stage(teams):
                 team1, team2 = group[i], group[j]
                 
                 # First match
-                goals1, goals2 = simulate_match(team1, team2)
+                goals1, goals2 = simulate_match(team1, team2, substream(rng, 'match', team1['id'], team2['id']))
                 
                 # Update records
                 records[team1['id']]['goals_for'] += goals1
@@ -186,7 +177,7 @@ def simulate_group_stage(teams):
                     records[team2['id']]['points'] += 1
                 
                 # Second match (home/away reversed)
-                goals2_return, goals1_return = simulate_match(team2, team1)
+                goals2_return, goals1_return = simulate_match(team2, team1, substream(rng, 'match', team2['id'], team1['id']))
                 
                 records[team1['id']]['goals_for'] += goals1_return
                 records[team1['id']]['goals_against'] += goals2_return
@@ -211,66 +202,67 @@ def simulate_group_stage(teams):
         # Display group table
         for pos, record in enumerate(group_table, 1):
             gd = record['goals_for'] - record['goals_against']
-            print(f"  {pos}. {record['team']['name'][:20]:20} {record['points']:2}pts {gd:+3}gd")
+            reporter.message(f"  {pos}. {record['team']['name'][:20]:20} {record['points']:2}pts {gd:+3}gd")
         
         # Top 2 advance
         qualified_teams.extend([record['team'] for record in group_table[:2]])
     
-    print(f"\n✅ {len(qualified_teams)} teams advance to Round of 16")
+    reporter.message(f"\n✅ {len(qualified_teams)} teams advance to Round of 16")
     return qualified_teams
 
-def simulate_knockout_round(teams, round_name):
+@phase('simulate_knockout_round', 'match')
+def simulate_knockout_round(teams, round_name, rng=random):
     """Simulate a knockout round"""
-    print(f"\n{round_name.upper()}:")
-    print("-" * 30)
+    reporter.message(f"\n{round_name.upper()}:")
+    reporter.message("-" * 30)
     
-    random.shuffle(teams)
+    substream(rng, 'draw', round_name).shuffle(teams)
     winners = []
     
     for i in range(0, len(teams), 2):
         if i + 1 < len(teams):
             team1, team2 = teams[i], teams[i + 1]
+            tie_rng = substream(rng, 'match', team1['id'], team2['id'])
             
             # First leg
-            goals1_home, goals2_away = simulate_match(team1, team2)
+            goals1_home, goals2_away = simulate_match(team1, team2, tie_rng)
             
             # Second leg
-            goals2_home, goals1_away = simulate_match(team2, team1)
+            goals2_home, goals1_away = simulate_match(team2, team1, tie_rng)
             
             # Calculate aggregate
             team1_total = goals1_home + goals1_away
             team2_total = goals2_away + goals2_home
             
-            print(f"  {team1['name']} vs {team2['name']}")
-            print(f"    First leg:  {team1['name']} {goals1_home}-{goals2_away} {team2['name']}")
-            print(f"    Second leg: {team2['name']} {goals2_home}-{goals1_away} {team1['name']}")
-            print(f"    Aggregate:  {team1['name']} {team1_total}-{team2_total} {team2['name']}")
+            reporter.message(f"  {team1['name']} vs {team2['name']}")
+            reporter.message(f"    First leg:  {team1['name']} {goals1_home}-{goals2_away} {team2['name']}")
+            reporter.message(f"    Second leg: {team2['name']} {goals2_home}-{goals1_away} {team1['name']}")
+            reporter.message(f"    Aggregate:  {team1['name']} {team1_total}-{team2_total} {team2['name']}")
             
             if team1_total > team2_total:
                 winner = team1
-                print(f"    Winner: {team1['name']} ✓")
+                reporter.message(f"    Winner: {team1['name']} ✓")
             elif team2_total > team1_total:
                 winner = team2
-                print(f"    Winner: {team2['name']} ✓")
+                reporter.message(f"    Winner: {team2['name']} ✓")
             else:
                 # Away goals or penalties (simplified to random)
-                winner = random.choice([team1, team2])
-                print(f"    Winner: {winner['name']} (penalties) ✓")
+                winner = tie_rng.choice([team1, team2])
+                reporter.message(f"    Winner: {winner['name']} (penalties) ✓")
             
             winners.append(winner)
-            print()
+            reporter.message()
     
     return winners
 
-def main():
-    """Main Champions League simulation"""
+def main(seed=None):
+    """Main Champions League simulation (reproducible when seeded)"""
     print("🏆 UEFA CHAMPIONS LEAGUE SIMULATOR 🏆")
     print("=" * 50)
     
     try:
         # Load data
         print("Loading data...")
-        leagues = load_leagues()
         clubs, clubs_by_league = load_all_clubs()
         
         print(f"✅ Loaded {len(clubs)} clubs from {len(clubs_by_league)} leagues")
@@ -285,27 +277,31 @@ def main():
         for team in sorted(qualified_teams, key=lambda x: x['league']):
             if team['league'] != current_league:
                 current_league = team['league']
-                league_name = next((l['name'] for l in leagues if l['id'] == current_league), current_league)
+                league = get_repository().get_league(current_league)
+                league_name = league['name'] if league else current_league
                 print(f"\n{league_name}:")
             print(f"  {team['position']}. {team['name']} (Rating: {team['rating']:.1f})")
         
         # Run tournament
         print(f"\n🚀 Starting Champions League simulation...")
+        rng = substream(make_rng(seed), 'competition', 'UCL')
         
         # Group stage
-        round_of_16_teams = simulate_group_stage(qualified_teams)
+        round_of_16_teams = simulate_group_stage(qualified_teams, substream(rng, 'group_stage'))
         
         # Knockout rounds
-        quarter_finalists = simulate_knockout_round(round_of_16_teams, "Round of 16")
-        semi_finalists = simulate_knockout_round(quarter_finalists, "Quarter-Finals")
-        finalists = simulate_knockout_round(semi_finalists, "Semi-Finals")
+        knockout_rng = substream(rng, 'knockout')
+        quarter_finalists = simulate_knockout_round(round_of_16_teams, "Round of 16", knockout_rng)
+        semi_finalists = simulate_knockout_round(quarter_finalists, "Quarter-Finals", knockout_rng)
+        finalists = simulate_knockout_round(semi_finalists, "Semi-Finals", knockout_rng)
         
         # Final
         if len(finalists) >= 2:
             print(f"\nFINAL:")
             print("=" * 20)
             team1, team2 = finalists[0], finalists[1]
-            goals1, goals2 = simulate_match(team1, team2)
+            final_rng = substream(rng, 'match', team1['id'], team2['id'], 'Final')
+            goals1, goals2 = simulate_match(team1, team2, final_rng)
             
             print(f"{team1['name']} {goals1}-{goals2} {team2['name']}")
             
@@ -315,7 +311,7 @@ def main():
                 champion = team2
             else:
                 # Extra time/penalties
-                champion = random.choice([team1, team2])
+                champion = final_rng.choice([team1, team2])
                 print("(After extra time and penalties)")
             
             print(f"\n🎉 CHAMPIONS LEAGUE WINNER: {champion['name']} 🎉")
@@ -327,4 +323,13 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main()
+    import sys
+    # --quiet / --jsonl[=path] run headless
+    set_reporter(create_reporter(sys.argv[1:]))
+    seed = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--seed='):
+            seed = int(arg.split('=', 1)[1])
+    # --profile[=NAME] prints the hot spots and writes a Chrome trace (profiler.py)
+    with profiling(sys.argv[1:]):
+        main(seed)
@@ -3,79 +3,88 @@ Complete European Competition System
 Integrates Champions League and Europa League simulations
 """
 
-import json
-import random
-import os
 from collections import defaultdict
 
+from data_repository import get_repository
+from standings import StandingsTable, tie_breakers_for, points_for
+from match_engine import simulate_matches_batch, default_rng, EUROPEAN_MATCH_MODEL
+from poisson_model import expected_league_table
+from reporter import ConsoleReporter, create_reporter
+from rng_context import make_rng, substream
+from profiler import phase, profiling
+
+# leagues.json entries holding each competition's rules (tie-breakers, points,
+# qualification); legacy ids, resolved by the repository
+COMPETITION_LEAGUE_IDS = {
+    'Champions League': 'competition_ucl',
+    'Europa League': 'competition_uel',
+}
+
 class CompleteEuropeanSystem:
-    def __init__(self):
-        """Initialize the complete European competition system"""
+    def __init__(self, batch_engine=False, reporter=None, seed=None):
+        """Initialize the complete European competition system
+
+        batch_engine: simulate each league phase in one batch (match_engine)
+        reporter: where output goes (console by default)
+        seed: seeds an RNGContext with per-competition/per-match substreams
+              (None keeps the global random module)
+        """
+        self.reporter = reporter or ConsoleReporter()
+        self.rng = make_rng(seed)
+        self.batch_engine = batch_engine
         self.load_data()
         
+    @phase('load_data', 'load')
     def load_data(self):
         """Load leagues, clubs, and manager data"""
-        # Load leagues configuration
-        with open('data/leagues.json', 'r', encoding='utf-8') as f:
-            leagues_data = json.load(f)
-        
-        self.leagues = {league['id']: league for league in leagues_data}
-        self.clubs_by_league = {}
-        self.all_clubs = {}
-        
-        # Load all clubs data
-        leagues_clubs_dir = 'data/leagues_clubs'
-        for filename in os.listdir(leagues_clubs_dir):
-            if filename.endswith('_clubs.json'):
-                league_name = filename.replace('_clubs.json', '').replace('league_', '')
-                file_path = os.path.join(leagues_clubs_dir, filename)
-                
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    clubs = json.load(f)
-                
-                # Handle different file structures
-                if isinstance(clubs, list):
-                    club_list = clubs
-                else:
-                    club_list = clubs.get('clubs', [])
-                
-                for club in club_list:
-                    club_id = club.get('id') or club.get('club_id')
-                    league_id = club.get('league_id', f'league_{league_name}')
-                    
-                    if club_id:
-                        self.all_clubs[club_id] = club
-                        if league_id not in self.clubs_by_league:
-                            self.clubs_by_league[league_id] = []
-                        self.clubs_by_league[league_id].append(club)
+        # Everything comes from the shared, process-wide repository. Both club
+        # indexes are lazy: a league's clubs are decoded the first time it is
+        # looked up, so only the leagues that send teams to Europe get loaded
+        repository = get_repository()
+
+        self.leagues = dict(repository.leagues)
+        self.clubs_by_league = repository.clubs_by_league
+        self.all_clubs = repository.clubs
+        # Expected final tables per league (project_league_table)
+        self.projected_tables = {}
+
+    def get_competition_config(self, competition_name):
+        """The leagues.json entry of 'Champions League' / 'Europa League' (None if missing)"""
+        return get_repository().get_league(COMPETITION_LEAGUE_IDS.get(competition_name, ''))
+
+    def qualification_spots(self, config):
+        """{league_id: spots} from a competition's automatic_spots
+
+        leagues.json keys them by legacy league ids ('league_epl'); leagues the
+        repository cannot resolve are skipped.
+        """
+        repository = get_repository()
+        spots = {}
+        for legacy_league_id, count in config['qualification_criteria'].get('automatic_spots', {}).items():
+            league_id = repository.resolve_league_id(legacy_league_id)
+            if league_id and league_id in self.clubs_by_league:
+                spots[league_id] = count
+        return spots
+
+    def ranked_league_clubs(self, league_id, season_results=None):
+        """A league's clubs in finishing order: the season's results if given, else its expected table"""
+        if season_results and league_id in season_results:
+            return season_results[league_id]
+        return self.project_league_table(league_id)
 
     def get_ucl_qualified_teams(self, season_results=None):
         """Get teams qualified for Champions League"""
-        ucl_config = self.leagues.get('competition_ucl')
+        ucl_config = self.get_competition_config('Champions League')
         if not ucl_config:
             return []
         
         qualified_teams = []
+        total_teams = ucl_config['qualification_criteria']['total_teams']
+        spots_by_league = self.qualification_spots(ucl_config)
         
         # Get teams from domestic leagues based on qualification criteria
-        for league_id, criteria in ucl_config['qualification_criteria']['domestic_leagues'].items():
-            if league_id not in self.clubs_by_league:
-                continue
-                
-            league_clubs = self.clubs_by_league[league_id]
-            spots = criteria['spots']
-            
-            if season_results and league_id in season_results:
-                # Use actual season results
-                top_clubs = season_results[league_id][:spots]
-            else:
-                # Simulate based on club reputation
-                sorted_clubs = sorted(league_clubs, 
-                                    key=lambda x: self.get_club_strength(x), 
-                                    reverse=True)
-                top_clubs = sorted_clubs[:spots]
-            
-            for club in top_clubs:
+        for league_id, spots in spots_by_league.items():
+            for club in self.ranked_league_clubs(league_id, season_results)[:spots]:
                 qualified_teams.append({
                     'club_id': club.get('id') or club.get('club_id'),
                     'club_name': club['name'],
@@ -84,11 +93,28 @@ class CompleteEuropeanSystem:
                     'strength': self.get_club_strength(club)
                 })
         
-        return qualified_teams[:ucl_config['qualification_criteria']['total_teams']]
+        # Qualifying rounds (champions/league path) fill the league phase up to
+        # total_teams: first each league's next-placed club, strongest first
+        if len(qualified_teams) < total_teams:
+            contenders = []
+            for league_id, spots in spots_by_league.items():
+                for places_below, club in enumerate(self.ranked_league_clubs(league_id, season_results)[spots:]):
+                    contenders.append((places_below, self.get_club_strength(club), league_id, club))
+            contenders.sort(key=lambda contender: (contender[0], -contender[1]))
+            for _, strength, league_id, club in contenders[:total_teams - len(qualified_teams)]:
+                qualified_teams.append({
+                    'club_id': club.get('id') or club.get('club_id'),
+                    'club_name': club['name'],
+                    'league_id': league_id,
+                    'qualification_type': 'qualifying_rounds',
+                    'strength': strength
+                })
+        
+        return qualified_teams[:total_teams]
 
     def get_uel_qualified_teams(self, season_results=None, ucl_teams=None):
         """Get teams qualified for Europa League"""
-        uel_config = self.leagues.get('competition_uel')
+        uel_config = self.get_competition_config('Europa League')
         if not uel_config:
             return []
         
@@ -99,27 +125,11 @@ class CompleteEuropeanSystem:
         if ucl_teams:
             ucl_club_ids = {team['club_id'] for team in ucl_teams}
         
-        # Get teams from domestic leagues
-        for league_id, criteria in uel_config['qualification_criteria']['domestic_leagues'].items():
-            if league_id not in self.clubs_by_league:
-                continue
-                
-            league_clubs = self.clubs_by_league[league_id]
-            spots = criteria['spots']
-            
-            if season_results and league_id in season_results:
-                # Use actual season results, skip UCL qualified teams
-                available_clubs = [club for club in season_results[league_id] 
-                                 if club.get('id', club.get('club_id')) not in ucl_club_ids]
-                top_clubs = available_clubs[:spots]
-            else:
-                # Simulate based on club reputation, skip UCL teams
-                available_clubs = [club for club in league_clubs 
-                                 if club.get('id', club.get('club_id')) not in ucl_club_ids]
-                sorted_clubs = sorted(available_clubs, 
-                                    key=lambda x: self.get_club_strength(x), 
-                                    reverse=True)
-                top_clubs = sorted_clubs[:spots]
+        # Get teams from domestic leagues, skipping UCL qualified teams
+        for league_id, spots in self.qualification_spots(uel_config).items():
+            available_clubs = [club for club in self.ranked_league_clubs(league_id, season_results)
+                             if club.get('id', club.get('club_id')) not in ucl_club_ids]
+            top_clubs = available_clubs[:spots]
             
             for club in top_clubs:
                 qualified_teams.append({
@@ -132,7 +142,7 @@ class CompleteEuropeanSystem:
         
         # Add UCL dropouts (simulated)
         if ucl_teams and len(ucl_teams) >= 8:
-            ucl_dropouts = random.sample(ucl_teams, 8)
+            ucl_dropouts = substream(self.rng, 'competition', 'UEL', 'ucl_dropouts').sample(ucl_teams, 8)
             for team in ucl_dropouts:
                 qualified_teams.append({
                     'club_id': team['club_id'],
@@ -144,6 +154,23 @@ class CompleteEuropeanSystem:
         
         return qualified_teams[:uel_config['qualification_criteria']['total_teams']]
 
+    def project_league_table(self, league_id):
+        """A league's clubs ordered by expected points over a double round-robin
+        (closed-form Poisson / Dixon-Coles odds, no sampling); cached per league
+
+        get_club_strength() is on the 30-100 European scale, so the goal rates
+        come from EUROPEAN_MATCH_MODEL, the model simulate_match() plays.
+        """
+        projections = self.projected_tables
+        if league_id not in projections:
+            league_clubs = list(self.clubs_by_league[league_id])
+            strengths = [self.get_club_strength(club) for club in league_clubs]
+            table = expected_league_table(strengths, model=EUROPEAN_MATCH_MODEL,
+                                          points=points_for(self.leagues.get(league_id)))
+            order = sorted(range(len(league_clubs)), key=lambda i: (-table[i]['points'], -strengths[i], i))
+            projections[league_id] = [league_clubs[i] for i in order]
+        return projections[league_id]
+
     def get_club_strength(self, club):
         """Calculate club strength based on a more comprehensive model."""
         
@@ -222,8 +249,10 @@ class CompleteEuropeanSystem:
         # Ensure strength is within a reasonable range (e.g., 30-100)
         return max(30, min(100, total_strength))
 
-    def simulate_match(self, home_team, away_team):
-        """Simulate a single match between two teams"""
+    def simulate_match(self, home_team, away_team, rng=None):
+        """Simulate a single match between two teams (rng: stream for this match)"""
+        if rng is None:
+            rng = self.rng
         home_strength = home_team['strength']
         away_strength = away_team['strength']
         
@@ -242,8 +271,8 @@ class CompleteEuropeanSystem:
         away_goals_expected = max(0.3, away_goals_expected)
         
         # Generate goals using Poisson-like distribution
-        home_goals = max(0, int(random.gauss(home_goals_expected, 1.2)))
-        away_goals = max(0, int(random.gauss(away_goals_expected, 1.2)))
+        home_goals = max(0, int(rng.gauss(home_goals_expected, 1.2)))
+        away_goals = max(0, int(rng.gauss(away_goals_expected, 1.2)))
         
         return {
             'home_goals': home_goals,
@@ -252,69 +281,57 @@ class CompleteEuropeanSystem:
             'away_team_name': away_team['club_name']
         }
 
-    def update_team_record(self, record, match_result, home_away):
-        """Update team record based on match result"""
-        record['matches'] += 1
-        
-        if home_away == 'home':
-            goals_for = match_result['home_goals']
-            goals_against = match_result['away_goals']
-        else:
-            goals_for = match_result['away_goals']
-            goals_against = match_result['home_goals']
-        
-        record['goals_for'] += goals_for
-        record['goals_against'] += goals_against
-        record['goal_difference'] = record['goals_for'] - record['goals_against']
-        
-        if goals_for > goals_against:
-            record['wins'] += 1
-            record['points'] += 3
-        elif goals_for == goals_against:
-            record['draws'] += 1
-            record['points'] += 1
-        else:
-            record['losses'] += 1
+    def simulate_matches(self, fixtures, rng=None):
+        """Simulate (home_team, away_team) pairs in one batch with the simulate_match model"""
+        if rng is None:
+            rng = self.rng
+        home_goals, away_goals = simulate_matches_batch(
+            [home['strength'] for home, _ in fixtures], [away['strength'] for _, away in fixtures],
+            default_rng(rng.getrandbits(32)), EUROPEAN_MATCH_MODEL)
+        
+        return [{
+            'home_goals': int(home_score),
+            'away_goals': int(away_score),
+            'home_team_name': home_team['club_name'],
+            'away_team_name': away_team['club_name']
+        } for (home_team, away_team), home_score, away_score in zip(fixtures, home_goals, away_goals)]
 
-    def simulate_league_phase(self, teams, competition_name):
-        """Simulate the league phase (Swiss system) for UCL or UEL"""
-        print(f"\n🏆 {competition_name.upper()} - LEAGUE PHASE")
-        print("=" * 60)
-        print(f"📊 {len(teams)} teams competing in league phase")
-        
-        # Initialize team records
-        team_records = {}
-        for team in teams:
-            team_records[team['club_id']] = {
-                'name': team['club_name'],
-                'league_id': team['league_id'],
-                'strength': team['strength'],
-                'matches': 0,
-                'wins': 0,
-                'draws': 0,
-                'losses': 0,
-                'goals_for': 0,
-                'goals_against': 0,
-                'goal_difference': 0,
-                'points': 0
-            }
+    def simulate_league_phase(self, teams, competition_name, rng=None):
+        """Simulate the league phase (Swiss system) for UCL or UEL
+        
+        rng: competition stream; the draw and every match use their own substreams
+        """
+        if rng is None:
+            rng = substream(self.rng, 'competition', competition_name)
+        draw_rng = substream(rng, 'league_phase_draw')
+        self.reporter.message(f"\n🏆 {competition_name.upper()} - LEAGUE PHASE")
+        self.reporter.message("=" * 60)
+        self.reporter.message(f"📊 {len(teams)} teams competing in league phase")
+        
+        # League phase table (tie-breakers from the competition's leagues.json entry)
+        competition = self.get_competition_config(competition_name)
+        standings = StandingsTable([team['club_id'] for team in teams], [team['club_name'] for team in teams],
+                                   tie_breakers_for(competition), points_for(competition))
         
         # Generate and simulate matches (each team plays 8 matches)
         all_matches = []
         matches_per_team = 8
         
-        # Simple fixture generation
+        # Simple fixture generation (scheduled counts match the records' played
+        # counts when matches are simulated as they are drawn)
+        scheduled = {team['club_id']: 0 for team in teams}
+        batch = []
         for team in teams:
             team_id = team['club_id']
-            current_matches = team_records[team_id]['matches']
+            current_matches = scheduled[team_id]
             needed_matches = matches_per_team - current_matches
             
             if needed_matches > 0:
                 available_opponents = [t for t in teams if t['club_id'] != team_id and 
-                                     team_records[t['club_id']]['matches'] < matches_per_team]
+                                     scheduled[t['club_id']] < matches_per_team]
                 
                 if len(available_opponents) >= needed_matches:
-                    opponents = random.sample(available_opponents, needed_matches)
+                    opponents = draw_rng.sample(available_opponents, needed_matches)
                 else:
                     opponents = available_opponents
                 
@@ -325,67 +342,96 @@ class CompleteEuropeanSystem:
                         'matchday': len(all_matches) // (len(teams) // 2) + 1
                     }
                     all_matches.append(match)
+                    scheduled[team_id] += 1
+                    scheduled[opponent['club_id']] += 1
+                    
+                    if self.batch_engine:
+                        batch.append(match)
+                        continue
                     
-                    # Simulate the match
-                    match_result = self.simulate_match(team, opponent)
+                    # Simulate the match (its substream is keyed by fixture
+                    # number, so a pairing drawn twice gets two scorelines)
+                    match_result = self.simulate_match(
+                        team, opponent, substream(rng, 'match', len(all_matches) - 1))
                     match.update(match_result)
                     
-                    # Update records
-                    self.update_team_record(team_records[team['club_id']], match_result, 'home')
-                    self.update_team_record(team_records[opponent['club_id']], match_result, 'away')
-        
-        # Sort teams by points, goal difference, goals scored
-        sorted_teams = sorted(team_records.values(), 
-                            key=lambda x: (x['points'], x['goal_difference'], x['goals_for']), 
-                            reverse=True)
+                    # Update table
+                    standings.record_result(team_id, opponent['club_id'],
+                                            match_result['home_goals'], match_result['away_goals'])
+        
+        if batch:
+            results = self.simulate_matches([(match['home_team'], match['away_team']) for match in batch],
+                                            substream(rng, 'league_phase_batch'))
+            for match, match_result in zip(batch, results):
+                match.update(match_result)
+                standings.record_result(match['home_team']['club_id'], match['away_team']['club_id'],
+                                        match_result['home_goals'], match_result['away_goals'])
+        
+        # Ranked table rows, with the team details the knockout phase needs
+        teams_by_id = {team['club_id']: team for team in teams}
+        sorted_teams = standings.rows()
+        for record in sorted_teams:
+            team = teams_by_id[record['club_id']]
+            record['name'] = team['club_name']
+            record['league_id'] = team['league_id']
+            record['strength'] = team['strength']
+        
+        # Display league phase table (rendered only by text reporters)
+        self.reporter.league_table(competition_name, f"{competition_name} League Phase", sorted_teams,
+                                   self.display_league_phase_table)
         
-        # Display league phase table
-        print(f"\nFinal League Phase Table:")
-        print("=" * 80)
-        print(f"{'Pos':<4} {'Team':<25} {'P':<3} {'W':<3} {'D':<3} {'L':<3} {'GF':<4} {'GA':<4} {'GD':<5} {'Pts':<4}")
-        print("-" * 80)
+        # Determine knockout phase qualifiers
+        knockout_qualifiers = sorted_teams[:16]  # Top 16 advance
+        return knockout_qualifiers, all_matches
+
+    def display_league_phase_table(self, sorted_teams, competition_name, title):
+        """Display the league phase table and the knockout qualifiers"""
+        self.reporter.message(f"\nFinal League Phase Table:")
+        self.reporter.message("=" * 80)
+        self.reporter.message(f"{'Pos':<4} {'Team':<25} {'P':<3} {'W':<3} {'D':<3} {'L':<3} {'GF':<4} {'GA':<4} {'GD':<5} {'Pts':<4}")
+        self.reporter.message("-" * 80)
         
         for i, team in enumerate(sorted_teams, 1):
-            print(f"{i:<4} {team['name'][:24]:<25} {team['matches']:<3} {team['wins']:<3} "
+            self.reporter.message(f"{i:<4} {team['name'][:24]:<25} {team['matches']:<3} {team['wins']:<3} "
                   f"{team['draws']:<3} {team['losses']:<3} {team['goals_for']:<4} "
                   f"{team['goals_against']:<4} {team['goal_difference']:+5} {team['points']:<4}")
         
-        # Determine knockout phase qualifiers
-        knockout_qualifiers = sorted_teams[:16]  # Top 16 advance
-        print(f"\n🏆 TOP 16 ADVANCE TO KNOCKOUT PHASE")
-        
-        print("\nKnockout Phase Qualifiers:")
-        for i, team in enumerate(knockout_qualifiers, 1):
-            print(f"{i:2}. {team['name']} ({team['points']} pts)")
+        self.reporter.message(f"\n🏆 TOP 16 ADVANCE TO KNOCKOUT PHASE")
         
-        return knockout_qualifiers, all_matches
+        self.reporter.message("\nKnockout Phase Qualifiers:")
+        for i, team in enumerate(sorted_teams[:16], 1):
+            self.reporter.message(f"{i:2}. {team['name']} ({team['points']} pts)")
 
-    def simulate_knockout_phase(self, qualified_teams, competition_name):
-        """Simulate knockout phase from Round of 16 to Final"""
-        print(f"\n🏆 {competition_name.upper()} - KNOCKOUT PHASE")
-        print("=" * 60)
+    def simulate_knockout_phase(self, qualified_teams, competition_name, rng=None):
+        """Simulate knockout phase from Round of 16 to Final (rng: competition stream)"""
+        if rng is None:
+            rng = substream(self.rng, 'competition', competition_name)
+        self.reporter.message(f"\n🏆 {competition_name.upper()} - KNOCKOUT PHASE")
+        self.reporter.message("=" * 60)
         
         current_teams = qualified_teams.copy()
         rounds = ['Round of 16', 'Quarter-finals', 'Semi-finals', 'Final']
         
         for round_name in rounds:
-            print(f"\n--- {round_name} ---")
+            self.reporter.message(f"\n--- {round_name} ---")
             
             if round_name == 'Final':
                 # Single match final
                 if len(current_teams) == 2:
                     final_result = self.simulate_knockout_match(
-                        current_teams[0], current_teams[1], single_leg=True
+                        current_teams[0], current_teams[1], single_leg=True,
+                        rng=substream(rng, 'match', current_teams[0]['club_id'], current_teams[1]['club_id'], round_name)
                     )
                     winner = final_result['winner']
                     
-                    print(f"\n🏆 {competition_name.upper()} FINAL")
-                    print(f"⚽ {final_result['home_team_name']} {final_result['home_goals']}-{final_result['away_goals']} {final_result['away_team_name']}")
+                    self.reporter.message(f"\n🏆 {competition_name.upper()} FINAL")
+                    self.reporter.message(f"⚽ {final_result['home_team_name']} {final_result['home_goals']}-{final_result['away_goals']} {final_result['away_team_name']}")
                     
                     if final_result.get('penalties'):
-                        print(f"🥅 Penalties: {final_result['home_penalties']}-{final_result['away_penalties']}")
+                        self.reporter.message(f"🥅 Penalties: {final_result['home_penalties']}-{final_result['away_penalties']}")
                     
-                    print(f"\n🎉 {competition_name.upper()} WINNER: {winner['name']}!")
+                    self.reporter.message(f"\n🎉 {competition_name.upper()} WINNER: {winner['name']}!")
+                    self.reporter.event('competition_winner', competition=competition_name, winner=winner['name'])
                     
                     return {
                         'winner': winner,
@@ -397,24 +443,26 @@ class CompleteEuropeanSystem:
                 next_round_teams = []
                 
                 # Pair teams for matches
-                random.shuffle(current_teams)
+                substream(rng, 'draw', round_name).shuffle(current_teams)
                 for i in range(0, len(current_teams), 2):
                     if i + 1 < len(current_teams):
                         team1 = current_teams[i]
                         team2 = current_teams[i + 1]
                         
-                        tie_result = self.simulate_two_legged_tie(team1, team2)
+                        tie_result = self.simulate_two_legged_tie(
+                            team1, team2, substream(rng, 'match', team1['club_id'], team2['club_id'], round_name))
                         winner = tie_result['winner']
                         
-                        print(f"⚽ {team1['name']} vs {team2['name']}")
-                        print(f"   Leg 1: {tie_result['leg1']['home_team_name']} {tie_result['leg1']['home_goals']}-{tie_result['leg1']['away_goals']} {tie_result['leg1']['away_team_name']}")
-                        print(f"   Leg 2: {tie_result['leg2']['home_team_name']} {tie_result['leg2']['home_goals']}-{tie_result['leg2']['away_goals']} {tie_result['leg2']['away_team_name']}")
-                        print(f"   Aggregate: {tie_result['aggregate_score']} → {winner['name']} advances")
-                        
-                        if tie_result.get('away_goals_rule'):
-                            print(f"   (Away goals rule)")
-                        elif tie_result.get('penalties'):
-                            print(f"   (Penalties: {tie_result['penalties']})")
+                        if self.reporter.wants_text:
+                            self.reporter.message(f"⚽ {team1['name']} vs {team2['name']}")
+                            self.reporter.message(f"   Leg 1: {tie_result['leg1']['home_team_name']} {tie_result['leg1']['home_goals']}-{tie_result['leg1']['away_goals']} {tie_result['leg1']['away_team_name']}")
+                            self.reporter.message(f"   Leg 2: {tie_result['leg2']['home_team_name']} {tie_result['leg2']['home_goals']}-{tie_result['leg2']['away_goals']} {tie_result['leg2']['away_team_name']}")
+                            self.reporter.message(f"   Aggregate: {tie_result['aggregate_score']} → {winner['name']} advances")
+                            
+                            if tie_result.get('away_goals_rule'):
+                                self.reporter.message(f"   (Away goals rule)")
+                            elif tie_result.get('penalties'):
+                                self.reporter.message(f"   (Penalties: {tie_result['penalties']})")
                         
                         next_round_teams.append(winner)
                 
@@ -422,13 +470,16 @@ class CompleteEuropeanSystem:
         
         return None
 
-    def simulate_two_legged_tie(self, team1, team2):
-        """Simulate a two-legged knockout tie"""
+    def simulate_two_legged_tie(self, team1, team2, rng=None):
+        """Simulate a two-legged knockout tie (rng: stream for this tie)"""
+        if rng is None:
+            rng = self.rng
+        
         # First leg (team1 at home)
-        leg1 = self.simulate_knockout_match(team1, team2)
+        leg1 = self.simulate_knockout_match(team1, team2, rng=rng)
         
         # Second leg (team2 at home)
-        leg2 = self.simulate_knockout_match(team2, team1)
+        leg2 = self.simulate_knockout_match(team2, team1, rng=rng)
         
         # Calculate aggregate score
         team1_aggregate = leg1['home_goals'] + leg2['away_goals']
@@ -466,7 +517,7 @@ class CompleteEuropeanSystem:
                 }
             else:
                 # Penalty shootout
-                penalties = self.simulate_penalty_shootout()
+                penalties = self.simulate_penalty_shootout(rng)
                 winner = team1 if penalties[0] > penalties[1] else team2
                 
                 return {
@@ -484,21 +535,23 @@ class CompleteEuropeanSystem:
             'aggregate_score': aggregate_score
         }
 
-    def simulate_knockout_match(self, home_team, away_team, single_leg=False):
+    def simulate_knockout_match(self, home_team, away_team, single_leg=False, rng=None):
         """Simulate a knockout match (can go to extra time/penalties)"""
-        match_result = self.simulate_match(home_team, away_team)
+        if rng is None:
+            rng = self.rng
+        match_result = self.simulate_match(home_team, away_team, rng)
         
         if single_leg and match_result['home_goals'] == match_result['away_goals']:
             # Extra time
-            extra_time_home = 1 if random.random() < 0.3 else 0
-            extra_time_away = 1 if random.random() < 0.3 else 0
+            extra_time_home = 1 if rng.random() < 0.3 else 0
+            extra_time_away = 1 if rng.random() < 0.3 else 0
             
             match_result['home_goals'] += extra_time_home
             match_result['away_goals'] += extra_time_away
             
             if match_result['home_goals'] == match_result['away_goals']:
                 # Penalty shootout
-                penalties = self.simulate_penalty_shootout()
+                penalties = self.simulate_penalty_shootout(rng)
                 match_result['home_penalties'] = penalties[0]
                 match_result['away_penalties'] = penalties[1]
                 match_result['penalties'] = True
@@ -512,44 +565,53 @@ class CompleteEuropeanSystem:
                     match_result['winner'] = home_team
                 else:
                     match_result['winner'] = away_team
+        elif single_leg:
+            # Decided in normal time
+            if match_result['home_goals'] > match_result['away_goals']:
+                match_result['winner'] = home_team
+            else:
+                match_result['winner'] = away_team
         
         return match_result
 
-    def simulate_penalty_shootout(self):
+    def simulate_penalty_shootout(self, rng=None):
         """Simulate a penalty shootout"""
+        if rng is None:
+            rng = self.rng
         home_score = 0
         away_score = 0
         
         # Regular 5 penalties each
         for i in range(5):
-            if random.random() < 0.75:  # 75% conversion rate
+            if rng.random() < 0.75:  # 75% conversion rate
                 home_score += 1
-            if random.random() < 0.75:
+            if rng.random() < 0.75:
                 away_score += 1
         
         # Sudden death if tied
         while home_score == away_score:
-            if random.random() < 0.75:
+            if rng.random() < 0.75:
                 home_score += 1
-            if random.random() < 0.75:
+            if rng.random() < 0.75:
                 away_score += 1
         
         return (home_score, away_score)
 
+    @phase('run_champions_league', 'competition')
     def run_champions_league(self, season_results=None):
         """Run the complete Champions League competition"""
-        print("\n" + "="*80)
-        print("🏆 UEFA CHAMPIONS LEAGUE SIMULATION")
-        print("="*80)
+        self.reporter.message("\n" + "="*80)
+        self.reporter.message("🏆 UEFA CHAMPIONS LEAGUE SIMULATION")
+        self.reporter.message("="*80)
         
         # Get qualified teams
         qualified_teams = self.get_ucl_qualified_teams(season_results)
         
         if len(qualified_teams) < 32:
-            print(f"❌ Not enough qualified teams ({len(qualified_teams)}). Need at least 32.")
+            self.reporter.message(f"❌ Not enough qualified teams ({len(qualified_teams)}). Need at least 32.")
             return None
         
-        print(f"\n✅ {len(qualified_teams)} teams qualified for Champions League")
+        self.reporter.message(f"\n✅ {len(qualified_teams)} teams qualified for Champions League")
         
         # Simulate league phase
         league_phase_results, league_matches = self.simulate_league_phase(qualified_teams, "Champions League")
@@ -570,20 +632,21 @@ class CompleteEuropeanSystem:
         
         return None
 
+    @phase('run_europa_league', 'competition')
     def run_europa_league(self, season_results=None, ucl_teams=None):
         """Run the complete Europa League competition"""
-        print("\n" + "="*80)
-        print("🏆 UEFA EUROPA LEAGUE SIMULATION")
-        print("="*80)
+        self.reporter.message("\n" + "="*80)
+        self.reporter.message("🏆 UEFA EUROPA LEAGUE SIMULATION")
+        self.reporter.message("="*80)
         
         # Get qualified teams
         qualified_teams = self.get_uel_qualified_teams(season_results, ucl_teams)
         
         if len(qualified_teams) < 32:
-            print(f"❌ Not enough qualified teams ({len(qualified_teams)}). Need at least 32.")
+            self.reporter.message(f"❌ Not enough qualified teams ({len(qualified_teams)}). Need at least 32.")
             return None
         
-        print(f"\n✅ {len(qualified_teams)} teams qualified for Europa League")
+        self.reporter.message(f"\n✅ {len(qualified_teams)} teams qualified for Europa League")
         
         # Simulate league phase
         league_phase_results, league_matches = self.simulate_league_phase(qualified_teams, "Europa League")
@@ -606,9 +669,9 @@ class CompleteEuropeanSystem:
 
     def run_full_european_season(self, season_results=None):
         """Run both UCL and UEL competitions for a complete European season"""
-        print("\n" + "="*100)
-        print("🌍 COMPLETE EUROPEAN COMPETITIONS SEASON")
-        print("="*100)
+        self.reporter.message("\n" + "="*100)
+        self.reporter.message("🌍 COMPLETE EUROPEAN COMPETITIONS SEASON")
+        self.reporter.message("="*100)
         
         results = {
             'ucl': None,
@@ -637,59 +700,74 @@ class CompleteEuropeanSystem:
 
     def display_season_summary(self, results):
         """Display summary of European competition results"""
-        print("\n" + "="*100)
-        print("🏆 EUROPEAN COMPETITIONS SEASON SUMMARY")
-        print("="*100)
+        self.reporter.message("\n" + "="*100)
+        self.reporter.message("🏆 EUROPEAN COMPETITIONS SEASON SUMMARY")
+        self.reporter.message("="*100)
         
         if results['ucl']:
             ucl = results['ucl']
-            print(f"\n🏆 UEFA CHAMPIONS LEAGUE:")
-            print(f"   🥇 Winner: {ucl['winner']['name']}")
-            print(f"   🥈 Runner-up: {ucl['runner_up']['name']}")
-            print(f"   ⚽ Final: {ucl['final_result']['home_team_name']} {ucl['final_result']['home_goals']}-{ucl['final_result']['away_goals']} {ucl['final_result']['away_team_name']}")
+            self.reporter.message(f"\n🏆 UEFA CHAMPIONS LEAGUE:")
+            self.reporter.message(f"   🥇 Winner: {ucl['winner']['name']}")
+            self.reporter.message(f"   🥈 Runner-up: {ucl['runner_up']['name']}")
+            self.reporter.message(f"   ⚽ Final: {ucl['final_result']['home_team_name']} {ucl['final_result']['home_goals']}-{ucl['final_result']['away_goals']} {ucl['final_result']['away_team_name']}")
         else:
-            print(f"\n❌ Champions League: Not completed")
+            self.reporter.message(f"\n❌ Champions League: Not completed")
         
         if results['uel']:
             uel = results['uel']
-            print(f"\n🏆 UEFA EUROPA LEAGUE:")
-            print(f"   🥇 Winner: {uel['winner']['name']}")
-            print(f"   🥈 Runner-up: {uel['runner_up']['name']}")
-            print(f"   ⚽ Final: {uel['final_result']['home_team_name']} {uel['final_result']['home_goals']}-{uel['final_result']['away_goals']} {uel['final_result']['away_team_name']}")
+            self.reporter.message(f"\n🏆 UEFA EUROPA LEAGUE:")
+            self.reporter.message(f"   🥇 Winner: {uel['winner']['name']}")
+            self.reporter.message(f"   🥈 Runner-up: {uel['runner_up']['name']}")
+            self.reporter.message(f"   ⚽ Final: {uel['final_result']['home_team_name']} {uel['final_result']['home_goals']}-{uel['final_result']['away_goals']} {uel['final_result']['away_team_name']}")
         else:
-            print(f"\n❌ Europa League: Not completed")
+            self.reporter.message(f"\n❌ Europa League: Not completed")
         
-        print(f"\n✅ Season Status: {'Successfully Completed' if results['success'] else 'Incomplete'}")
-        print("="*100)
+        self.reporter.message(f"\n✅ Season Status: {'Successfully Completed' if results['success'] else 'Incomplete'}")
+        self.reporter.message("="*100)
 
 
 def main():
     """Main function to demonstrate the complete European system"""
-    print("🌍 Complete European Competition System")
-    print("="*60)
+    import sys
+    # --batch simulates each league phase in one batch through match_engine
+    batch_engine = "--batch" in sys.argv[1:]
+    # --quiet / --jsonl[=path] / --debug choose the reporter, --seed=N makes the season reproducible
+    reporter = create_reporter(sys.argv[1:])
+    seed = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--seed="):
+            seed = int(arg.split("=", 1)[1])
+    
+    reporter.message("🌍 Complete European Competition System")
+    reporter.message("="*60)
     
     # Initialize system
-    euro_system = CompleteEuropeanSystem()
+    euro_system = CompleteEuropeanSystem(batch_engine=batch_engine, reporter=reporter, seed=seed)
     
     # Display system info
-    print(f"\n📊 System Information:")
-    print(f"   Total Leagues: {len(euro_system.clubs_by_league)}")
-    print(f"   Total Clubs: {len(euro_system.all_clubs)}")
-    print(f"   UCL Configuration: {'✅' if 'competition_ucl' in euro_system.leagues else '❌'}")
-    print(f"   UEL Configuration: {'✅' if 'competition_uel' in euro_system.leagues else '❌'}")
+    reporter.message(f"\n📊 System Information:")
+    reporter.message(f"   Total Leagues: {len(euro_system.clubs_by_league)}")
+    reporter.message(f"   Total Clubs: {len(euro_system.all_clubs)}")
+    ucl_config = euro_system.get_competition_config('Champions League')
+    uel_config = euro_system.get_competition_config('Europa League')
+    reporter.message(f"   UCL Configuration: {'✅' if ucl_config else '❌'}")
+    reporter.message(f"   UEL Configuration: {'✅' if uel_config else '❌'}")
     
     # Run complete European season
-    if 'competition_ucl' in euro_system.leagues and 'competition_uel' in euro_system.leagues:
-        print(f"\n🚀 Running complete European season...")
+    if ucl_config and uel_config:
+        reporter.message(f"\n🚀 Running complete European season...")
         results = euro_system.run_full_european_season()
         
         if results['success']:
-            print(f"\n🎉 European season completed successfully!")
+            reporter.message(f"\n🎉 European season completed successfully!")
         else:
-            print(f"\n❌ European season incomplete")
+            reporter.message(f"\n❌ European season incomplete")
     else:
-        print(f"\n❌ Missing competition configurations")
+        reporter.message(f"\n❌ Missing competition configurations")
 
 
 if __name__ == "__main__":
-    main()
+    import sys
+    # --profile[=NAME] prints the hot spots and writes a Chrome trace (profiler.py)
+    with profiling(sys.argv[1:]):
+        main()
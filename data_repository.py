@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Data Repository
+Shared in-memory indexes over leagues, clubs, players and managers
+
+Every simulator used to discover data its own way (probing lists of file
+paths per team, reading 36 manager sources, ...). The repository reads the
+dataset once per process (through the binary snapshot) and exposes
+dictionary indexes instead:
+
+    league -> clubs, club -> players, club -> manager, player -> club
+
+Club lookups accept the canonical id ("01_65"), the player-file key
+("club_chelsea") or a display name ("Chelsea", "Manchester City"), since
+the different data files and simulators refer to clubs all three ways.
+
+The indexes are lazy: club ids, names and leagues come from the snapshot
+header, and a club (or a league's squads) is only decoded the first time
+it is looked up. A run that only simulates the EPL never decodes the other
+35 leagues. Iterating a whole index (or len() on an open-ended one) loads
+everything behind it.
+
+The indexed objects are shared between callers - copy before mutating.
+"""
+
+import os
+import re
+import unicodedata
+from collections.abc import Mapping
+
+from data_snapshot import BASE_DATA_PATH, get_snapshot, read_json_file
+
+# Characters NFKD does not decompose into ASCII
+NAME_FOLDING = str.maketrans({
+    'ø': 'o', 'Ø': 'O', 'æ': 'ae', 'Æ': 'AE', 'ı': 'i', 'ß': 'ss',
+    'đ': 'd', 'Đ': 'D', 'ł': 'l', 'Ł': 'L', 'œ': 'oe', 'Œ': 'OE',
+})
+
+# Tokens that carry no identity when matching club names
+NAME_STOPWORDS = {'club', 'fc', 'cf', 'sc', 'ac', 'afc', 'cd', 'fk', 'sk', 'if', 'bk', 'the', 'de'}
+
+LEAGUE_FILE_PATTERN = re.compile(r'^(00_\d+)_clubs\.json$')
+
+# Older scripts (and the UCL qualification table) still use the pre-00_N league ids
+LEGACY_LEAGUE_IDS = {
+    'league_epl': '00_1',
+    'league_laliga': '00_2',
+    'league_ger_bundesliga': '00_3',
+    'league_ita_seriea': '00_4',
+    'league_fra_ligue1': '00_5',
+    'league_eredivisie': '00_11',
+    'league_primeira': '00_12',
+    'league_turkish': '00_13',
+    'league_belgian': '00_14',
+    'league_swiss': '00_15',
+    'league_russian': '00_16',
+    'league_ukrainian': '00_17',
+    'league_scottish': '00_18',
+    'league_austrian': '00_19',
+    'league_greek': '00_20',
+    'competition_ucl': '00_25',
+    'competition_uel': '00_26',
+}
+
+_repositories = {}
+
+
+def name_tokens(name):
+    """Lower-case ASCII tokens of a club name or file key"""
+    folded = unicodedata.normalize('NFKD', name.translate(NAME_FOLDING))
+    folded = folded.encode('ascii', 'ignore').decode('ascii').lower()
+    return re.findall(r'[a-z0-9]+', folded)
+
+
+def club_key(name):
+    """The 'club_<name>' style key used by player files and the UCL/UEL scripts"""
+    return "club_" + name.lower().replace(" ", "_").replace("-", "_")
+
+
+def _match_score(key_tokens, club_tokens):
+    """Number of unmatched club-name tokens, or None if the key does not fit the name
+
+    A key token matches a name token it is a prefix of ('alanya' ->
+    'alanyaspor'), one that is a prefix of it ('grasshoppers' ->
+    'grasshopper') or the initials of a run of name tokens ('rb' -> 'red bull').
+    """
+    used = set()
+    for token in key_tokens:
+        for i, candidate in enumerate(club_tokens):
+            if i in used:
+                continue
+            if candidate.startswith(token) or (len(candidate) >= 4 and token.startswith(candidate)):
+                used.add(i)
+                break
+            span = range(i, i + len(token))
+            if (len(token) > 1 and span.stop <= len(club_tokens) and not used.intersection(span)
+                    and ''.join(club_tokens[j][0] for j in span) == token):
+                used.update(span)
+                break
+        else:
+            return None
+    return len(club_tokens) - len(used)
+
+
+class LazyIndex(Mapping):
+    """Read-only dict whose values are materialized on first access
+
+    load_key(key) loads the part of the dataset holding key (it may fill
+    other entries on the way), load_all() fills the whole index. With a
+    known key collection, membership, len() and key iteration are free;
+    otherwise they load everything first. resolve optionally maps aliases
+    (e.g. legacy league ids) onto real keys.
+    """
+
+    def __init__(self, load_key, load_all, keys=None, resolve=None):
+        self._data = {}
+        self._load_key = load_key
+        self._load_all = load_all
+        self._keys = keys
+        self._resolve = resolve
+        self._complete = False
+
+    def _key(self, key):
+        if self._resolve is not None:
+            return self._resolve(key) or key
+        return key
+
+    def __getitem__(self, key):
+        key = self._key(key)
+        if key not in self._data and not self._complete:
+            if self._keys is None or key in self._keys:
+                self._load_key(key)
+        return self._data[key]
+
+    def __contains__(self, key):
+        if self._keys is not None:
+            return self._key(key) in self._keys
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        if self._keys is not None:
+            return iter(list(self._keys))
+        self.complete()
+        return iter(self._data)
+
+    def __len__(self):
+        if self._keys is not None:
+            return len(self._keys)
+        self.complete()
+        return len(self._data)
+
+    def complete(self):
+        """Load every entry"""
+        if not self._complete:
+            self._complete = True
+            self._load_all()
+
+    def loaded_count(self):
+        """Number of entries materialized so far"""
+        return len(self._data)
+
+
+class DataRepository:
+    """Process-wide indexes over the dataset (use get_repository())"""
+
+    def __init__(self, data_dir=BASE_DATA_PATH):
+        self.data_dir = os.path.abspath(data_dir)
+        self.leagues = {}         # league_id -> league
+        self.league_clubs = {}    # league_id -> [club_id]
+        self.club_league = {}     # club_id -> league_id
+        self.club_aliases = {}    # alias -> club_id
+        self._club_ids = {}       # every known club id, in data-file order
+        self._club_records = {}   # club_id -> (rel_path, record index) in the snapshot
+        self._club_tokens = {}    # club_id -> name tokens (for fuzzy lookups)
+        self._club_player_files = {}  # club_id -> [player file]
+        self._resolved = {}       # memoized resolve_club_id results
+        self._managers_loaded = False
+
+        # club_id -> club
+        self.clubs = LazyIndex(self._load_club, self._load_all_clubs, keys=self._club_ids)
+        # league_id -> [club] (legacy league ids accepted)
+        self.clubs_by_league = LazyIndex(self._load_league_club_list, self._load_all_league_club_lists,
+                                         keys=self.league_clubs, resolve=self.resolve_league_id)
+        # club_id -> [player]
+        self.club_players = LazyIndex(self._load_club_players, self._load_all_players,
+                                      keys=self._club_player_files)
+        # player_id -> player, player_id -> club_id
+        self.players = LazyIndex(lambda key: self.club_players.complete(), self._load_all_players)
+        self.player_club = LazyIndex(lambda key: self.club_players.complete(), self._load_all_players)
+        # club_id -> manager, manager_id -> manager
+        self.club_managers = LazyIndex(lambda key: self._load_managers(), self._load_managers)
+        self.managers = LazyIndex(lambda key: self._load_managers(), self._load_managers)
+
+        self._snapshot = get_snapshot(self.data_dir)
+        self._load_leagues()
+        self._load_club_catalogue()
+        self._index_player_files()
+
+    # --- Loading ---------------------------------------------------------
+
+    def _read(self, rel_path):
+        if rel_path in self._snapshot:
+            return self._snapshot.load(rel_path)
+        return read_json_file(os.path.join(self.data_dir, rel_path))
+
+    def _load_leagues(self):
+        try:
+            leagues_data = self._read('leagues.json')
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load leagues.json: {e}")
+            return
+        for league in leagues_data:
+            league_id = league.get('id') or league.get('league_id')
+            if league_id:
+                self.leagues[league_id] = league
+
+    def _load_club_catalogue(self):
+        """Register every club from the snapshot header, without decoding the clubs"""
+        # 00_N files are authoritative; supplementary files (primeira_clubs.json)
+        # only fill leagues that have no 00_N file of their own
+        filenames = self._snapshot.list_dir('leagues_clubs')
+        filenames.sort(key=lambda name: (LEAGUE_FILE_PATTERN.match(name) is None, name))
+        league_files = {match.group(1) for match in map(LEAGUE_FILE_PATTERN.match, filenames) if match}
+
+        for filename in filenames:
+            if not filename.endswith('clubs.json'):
+                continue
+            rel_path = f'leagues_clubs/{filename}'
+            match = LEAGUE_FILE_PATTERN.match(filename)
+
+            if match and self._snapshot.entries[rel_path][5] is not None:
+                for index, (club_id, name) in enumerate(self._snapshot.records(rel_path)):
+                    if club_id not in self._club_ids:
+                        self._club_records[club_id] = (rel_path, index)
+                        self._register_club(club_id, name, match.group(1))
+                continue
+
+            # Odd layouts and supplementary files are small; decode them up front
+            try:
+                clubs = self._read(rel_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Could not load clubs from {filename}: {e}")
+                continue
+            club_list = clubs if isinstance(clubs, list) else clubs.get('clubs', [])
+            for club in club_list:
+                club_id = club.get('id') or club.get('club_id')
+                if not club_id or club_id in self._club_ids:
+                    continue
+                league_id = match.group(1) if match else club.get('league_id')
+                if not match and league_id in league_files:
+                    continue
+                self.add_club(club, league_id)
+
+    def _register_club(self, club_id, name, league_id):
+        self._club_ids[club_id] = None
+        self.club_league[club_id] = league_id
+        self.league_clubs.setdefault(league_id, []).append(club_id)
+
+        self._club_tokens[club_id] = name_tokens(name)
+        self.club_aliases.setdefault(club_id, club_id)
+        if name:
+            self.club_aliases.setdefault(club_key(name), club_id)
+            self.club_aliases.setdefault('_'.join(name_tokens(name)), club_id)
+
+    def add_club(self, club, league_id):
+        """Register a club under league_id and index its aliases"""
+        club_id = club.get('id') or club.get('club_id')
+        self.clubs._data[club_id] = club
+        self._register_club(club_id, club.get('name', ''), league_id)
+
+    def _load_club(self, club_id):
+        location = self._club_records.get(club_id)
+        if location:
+            self.clubs._data[club_id] = self._snapshot.load_record(*location)
+
+    def _load_all_clubs(self):
+        for club_id in self._club_ids:
+            if club_id not in self.clubs._data:
+                self._load_club(club_id)
+
+    def _load_league_club_list(self, league_id):
+        self.clubs_by_league._data[league_id] = [self.clubs[club_id] for club_id in self.league_clubs[league_id]]
+
+    def _load_all_league_club_lists(self):
+        for league_id in self.league_clubs:
+            if league_id not in self.clubs_by_league._data:
+                self._load_league_club_list(league_id)
+
+    def _index_player_files(self):
+        """Assign every player file to a club from the snapshot header alone"""
+        for dirname in sorted(d for d in self._snapshot_dirs() if d.endswith('_clubs_players')):
+            league_id = dirname[:-len('_clubs_players')]
+            for rel_path in self._player_files(dirname):
+                file_key = self._player_file_key(rel_path)
+                club_id = self._club_for_player_file(self._snapshot.club_refs(rel_path), file_key, league_id)
+                self.club_aliases.setdefault(file_key, club_id)
+                self.club_league.setdefault(club_id, league_id)
+                self._club_player_files.setdefault(club_id, []).append(rel_path)
+
+    def _load_club_players(self, club_id):
+        """Decode one club's squad"""
+        squad = []
+        for rel_path in self._club_player_files[club_id]:
+            try:
+                data = self._read(rel_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Could not load players from {rel_path}: {e}")
+                continue
+
+            if isinstance(data, dict):
+                data = data.get('players')
+            if not isinstance(data, list):
+                continue
+
+            squad.extend(data)
+            for player in data:
+                player_id = player.get('id') or player.get('player_id')
+                if player_id:
+                    self.players._data[player_id] = player
+                    self.player_club._data[player_id] = club_id
+        self.club_players._data[club_id] = squad
+
+    def _load_all_players(self):
+        for club_id in self._club_player_files:
+            if club_id not in self.club_players._data:
+                self._load_club_players(club_id)
+        for index in (self.club_players, self.players, self.player_club):
+            index._complete = True
+
+    def _snapshot_dirs(self):
+        return {path.split('/', 1)[0] for path in self._snapshot.entries if '/' in path}
+
+    def _player_files(self, dirname):
+        prefix = dirname + '/'
+        return sorted(path for path in self._snapshot.entries
+                      if path.startswith(prefix) and path.endswith('.json')
+                      and not path.endswith('league_summary.json'))
+
+    @staticmethod
+    def _player_file_key(rel_path):
+        parts = rel_path.split('/')
+        # dir/club_folder/players.json layout
+        if len(parts) == 3:
+            return parts[1]
+        filename = parts[-1][:-len('.json')]
+        if filename.endswith('_players'):
+            filename = filename[:-len('_players')]
+        return filename
+
+    def _club_for_player_file(self, club_refs, file_key, league_id):
+        """Work out which club a player file belongs to from the club ids its rows claim"""
+        if len(club_refs) == 1 and club_refs[0] in self._club_ids:
+            return club_refs[0]
+
+        if file_key in self._club_ids:
+            return file_key
+        alias = self.club_aliases.get(file_key)
+        if alias:
+            return alias
+        match = self._fuzzy_match(file_key, self.league_clubs.get(league_id, []))
+        return match or file_key
+
+    def _load_managers(self):
+        """Read every manager source at once (they are small and not split by league)"""
+        if self._managers_loaded:
+            return
+        self._managers_loaded = True
+        self.club_managers._complete = True
+        self.managers._complete = True
+
+        # Consolidated file first; the per-league files carry canonical club ids and win
+        sources = []
+        if 'managers.json' in self._snapshot:
+            sources.append('managers.json')
+        league_files = self._snapshot.list_dir('managers')
+        league_files.sort(key=lambda name: (not name[:-len('.json')].isdigit(), len(name), name))
+        sources.extend(f'managers/{name}' for name in league_files if name.endswith('.json'))
+
+        for source in sources:
+            try:
+                data = self._read(source)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Could not load managers from {source}: {e}")
+                continue
+            manager_list = data.get('managers', []) if isinstance(data, dict) else data
+            if not isinstance(manager_list, list):
+                continue
+
+            for manager in manager_list:
+                manager_id = manager.get('manager_id') or manager.get('id')
+                if manager_id:
+                    self.managers._data[manager_id] = manager
+                raw_club_id = manager.get('current_club_id') or manager.get('current_club') or manager.get('club_id')
+                if raw_club_id:
+                    club_id = self.resolve_club_id(raw_club_id) or raw_club_id
+                    self.club_managers._data[club_id] = manager
+
+    # --- Lookups ---------------------------------------------------------
+
+    def _fuzzy_match(self, key, club_ids):
+        """Best unique name match for key among club_ids (None if absent/ambiguous)"""
+        all_tokens = name_tokens(key)
+        key_tokens = [token for token in all_tokens if token not in NAME_STOPWORDS]
+        if not key_tokens:
+            return None
+        key_stopwords = set(all_tokens) & NAME_STOPWORDS
+
+        best_score = None
+        best = []
+        for club_id in club_ids:
+            club_tokens = [token for token in self._club_tokens.get(club_id, []) if token not in NAME_STOPWORDS]
+            score = _match_score(key_tokens, club_tokens)
+            if score is None:
+                continue
+            # Ties go to the name sharing the key's 'Club'/'FC'/... words
+            score = (score, -len(key_stopwords.intersection(self._club_tokens[club_id])))
+            if best_score is None or score < best_score:
+                best_score = score
+                best = [club_id]
+            elif score == best_score:
+                best.append(club_id)
+        return best[0] if len(best) == 1 else None
+
+    def resolve_club_id(self, key):
+        """Canonical club id for an id, 'club_<name>' key or display name"""
+        if not key:
+            return None
+        if key in self._resolved:
+            return self._resolved[key]
+
+        club_id = self.club_aliases.get(key)
+        if club_id is None:
+            club_id = self.club_aliases.get(club_key(key))
+        if club_id is None:
+            club_id = self.club_aliases.get('_'.join(name_tokens(key)))
+        if club_id is None:
+            club_id = self._fuzzy_match(key, self._club_ids)
+
+        self._resolved[key] = club_id
+        return club_id
+
+    def resolve_league_id(self, key):
+        """Current league id for a current or legacy ('league_epl') id"""
+        if key in self.leagues:
+            return key
+        return LEGACY_LEAGUE_IDS.get(key)
+
+    def get_league(self, league_id):
+        return self.leagues.get(self.resolve_league_id(league_id))
+
+    def domestic_leagues(self):
+        """League entries that are not continental competitions (UCL/UEL)"""
+        return {league_id: league for league_id, league in self.leagues.items()
+                if not league_id.startswith('competition_') and 'qualification_criteria' not in league}
+
+    def get_clubs(self, league_id):
+        """Club dicts of a league, in data-file order"""
+        return list(self.clubs_by_league.get(league_id, []))
+
+    def get_club(self, key):
+        club_id = self.resolve_club_id(key)
+        return self.clubs.get(club_id) if club_id else None
+
+    def get_players(self, club):
+        """Player dicts for a club id/key/name (empty list if the club has no player file)"""
+        club_id = self.resolve_club_id(club)
+        return self.club_players.get(club_id, []) if club_id else []
+
+    def get_manager(self, club):
+        club_id = self.resolve_club_id(club)
+        manager = self.club_managers.get(club_id) if club_id else None
+        # Managers whose club could not be resolved are indexed under their raw key
+        return manager or self.club_managers.get(club)
+
+    def get_player(self, player_id):
+        return self.players.get(player_id)
+
+    def get_player_club(self, player_id):
+        return self.player_club.get(player_id)
+
+
+def get_repository(data_dir=BASE_DATA_PATH):
+    """Process-wide DataRepository (built on first use)"""
+    data_dir = os.path.abspath(data_dir)
+    repository = _repositories.get(data_dir)
+    if repository is None:
+        repository = DataRepository(data_dir)
+        _repositories[data_dir] = repository
+    return repository
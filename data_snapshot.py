@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Dataset Snapshot
+Compile the JSON data files into one versioned binary snapshot for fast startup
+
+Parsing ~570 JSON files on every run costs more than most of the simulations
+themselves. The snapshot stores every source file pre-parsed (marshal blobs)
+together with an index of (size, mtime, sha1, offset, length) per file. On
+open the index is checked against the files on disk: touched-but-identical
+files are accepted by hash, edited/added/removed files trigger an incremental
+rebuild, so loaders never see stale data.
+
+The file is a packed random-access container: the header index holds the
+byte offset of every blob, club files are split into one blob per club
+(with the club's id and name in the header), player files list the club
+ids their rows claim, and the blob area is memory mapped. Opening the snapshot decodes nothing but the header; a caller that
+only touches one league only pages in and decodes that league's blobs.
+
+Usage:
+    from data_snapshot import load_json
+    leagues = load_json('data/leagues.json')   # same result as json.load
+
+    python data_snapshot.py            # build/refresh the snapshot and time a full load
+    python data_snapshot.py --rebuild  # force a full rebuild
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import marshal
+import hashlib
+
+# Bump whenever the on-disk layout or the parsing rules change
+SNAPSHOT_VERSION = 2
+SNAPSHOT_MAGIC = b'FSIMSNAP'
+HEADER_FORMAT = '<8sII'  # magic, version, index length
+
+BASE_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SNAPSHOT_DIR_NAME = '.snapshot'
+SNAPSHOT_FILE_NAME = 'dataset.snap'
+
+# Club list files are stored one blob per club so single clubs can be decoded
+RECORD_DIRS = ('leagues_clubs',)
+
+# Set FOOTBALL_SIM_SNAPSHOT=0 to always read the raw JSON files
+SNAPSHOT_ENABLED = os.environ.get('FOOTBALL_SIM_SNAPSHOT', '1') != '0'
+
+_snapshots = {}
+
+
+def parse_json_bytes(raw):
+    """Parse JSON bytes exactly as json.load(open(path, encoding='utf-8')) would"""
+    return json.loads(raw.decode('utf-8'))
+
+
+def read_json_file(path):
+    """Read and parse a single JSON file straight from disk"""
+    with open(path, 'rb') as f:
+        return parse_json_bytes(f.read())
+
+
+def discover_sources(data_dir=BASE_DATA_PATH):
+    """List every data file that goes into the snapshot (posix paths relative to data_dir)
+
+    Covers the top-level JSON files (leagues.json, managers.json, ...),
+    leagues_clubs/*, managers/* and every *_clubs_players directory
+    (including the club_folder/players.json layout).
+    """
+    sources = []
+    if not os.path.isdir(data_dir):
+        return sources
+
+    for entry in os.scandir(data_dir):
+        if entry.is_file() and entry.name.endswith('.json'):
+            sources.append(entry.name)
+        elif entry.is_dir() and (entry.name in ('leagues_clubs', 'managers') or entry.name.endswith('_clubs_players')):
+            for root, dirs, files in os.walk(entry.path):
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                for filename in files:
+                    if filename.endswith('.json'):
+                        rel_path = os.path.relpath(os.path.join(root, filename), data_dir)
+                        sources.append(rel_path.replace(os.sep, '/'))
+
+    sources.sort()
+    return sources
+
+
+def _file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _is_record_file(rel_path, data):
+    """Club list files get split into per-club records"""
+    return (rel_path.split('/', 1)[0] in RECORD_DIRS and isinstance(data, list)
+            and all(isinstance(item, dict) and (item.get('id') or item.get('club_id')) for item in data))
+
+
+def _club_refs(data):
+    """Distinct club ids claimed by the rows of a player file"""
+    rows = data.get('players') if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        return ()
+    return tuple(sorted({row['club_id'] for row in rows if isinstance(row, dict) and row.get('club_id')}))
+
+
+def _encode(rel_path, data):
+    """Return (blob, records, club_refs) for a parsed file
+
+    records is None for plain files, otherwise a tuple of
+    (key, name, offset_in_blob, length) per club.
+    """
+    if not _is_record_file(rel_path, data):
+        return marshal.dumps(data), None, _club_refs(data)
+
+    parts = []
+    records = []
+    offset = 0
+    for item in data:
+        part = marshal.dumps(item)
+        records.append((item.get('id') or item.get('club_id'), item.get('name', ''), offset, len(part)))
+        parts.append(part)
+        offset += len(part)
+    return b''.join(parts), tuple(records), ()
+
+
+class DatasetSnapshot:
+    """Read-only view over a snapshot; every load returns a fresh object
+
+    entries: rel_path -> (size, mtime_ns, sha1, offset, length, records, club_refs)
+    """
+
+    def __init__(self, data_dir, entries, blobs, mapping=None):
+        self.data_dir = data_dir
+        self.entries = entries
+        self._blobs = memoryview(blobs)
+        self._mapping = mapping
+        self._catalogue = None
+        # Decode counters, handy for checking what a run actually touched
+        self.decoded_blobs = 0
+        self.decoded_bytes = 0
+
+    def __contains__(self, rel_path):
+        return rel_path in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _decode(self, offset, length):
+        self.decoded_blobs += 1
+        self.decoded_bytes += length
+        return marshal.loads(self._blobs[offset:offset + length])
+
+    def _entry(self, rel_path):
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            raise FileNotFoundError(f"{rel_path} is not part of the dataset snapshot")
+        return entry
+
+    def load(self, rel_path):
+        """Decode a single file from the snapshot"""
+        entry = self._entry(rel_path)
+        offset, length, records = entry[3], entry[4], entry[5]
+        if records is None:
+            return self._decode(offset, length)
+        return [self._decode(offset + record[2], record[3]) for record in records]
+
+    def records(self, rel_path):
+        """(key, name) of every record in a club list file, without decoding it"""
+        records = self._entry(rel_path)[5] or ()
+        return [(record[0], record[1]) for record in records]
+
+    def club_refs(self, rel_path):
+        """Club ids referenced by a player file's rows, without decoding it"""
+        return self._entry(rel_path)[6]
+
+    def load_record(self, rel_path, index):
+        """Decode one club from a club list file"""
+        entry = self._entry(rel_path)
+        record = entry[5][index]
+        return self._decode(entry[3] + record[2], record[3])
+
+    def club_catalogue(self):
+        """club_id -> (rel_path, record index, name) for every club file, from the header alone"""
+        if self._catalogue is None:
+            catalogue = {}
+            for rel_path in sorted(self.entries):
+                for index, (club_id, name) in enumerate(self.records(rel_path)):
+                    catalogue.setdefault(club_id, (rel_path, index, name))
+            self._catalogue = catalogue
+        return self._catalogue
+
+    def list_dir(self, rel_dir):
+        """File names directly inside rel_dir, like os.listdir restricted to snapshot files"""
+        prefix = rel_dir.rstrip('/') + '/'
+        return sorted(path[len(prefix):] for path in self.entries
+                      if path.startswith(prefix) and '/' not in path[len(prefix):])
+
+    def load_all(self):
+        """Decode every file in the snapshot"""
+        return {rel_path: self.load(rel_path) for rel_path in self.entries}
+
+    def close(self):
+        """Release the memory map (the snapshot must not be used afterwards)"""
+        self._blobs.release()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+
+def snapshot_path(data_dir=BASE_DATA_PATH):
+    return os.path.join(data_dir, SNAPSHOT_DIR_NAME, SNAPSHOT_FILE_NAME)
+
+
+def _open_snapshot_file(path, data_dir):
+    """Memory-map a snapshot file; None if missing/incompatible"""
+    try:
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    header_size = struct.calcsize(HEADER_FORMAT)
+    index = None
+    if len(mapping) >= header_size:
+        magic, version, index_length = struct.unpack_from(HEADER_FORMAT, mapping)
+        if magic == SNAPSHOT_MAGIC and version == SNAPSHOT_VERSION:
+            try:
+                index = marshal.loads(mapping[header_size:header_size + index_length])
+            except (EOFError, ValueError, TypeError):
+                index = None
+    # marshal output is only guaranteed to round-trip on the same interpreter
+    if (index is None or index.get('python') != tuple(sys.version_info[:2])
+            or index.get('marshal') != marshal.version):
+        mapping.close()
+        return None
+
+    blobs = memoryview(mapping)[header_size + index_length:]
+    return DatasetSnapshot(data_dir, index['files'], blobs, mapping)
+
+
+def _write_snapshot_file(path, entries, blob_parts):
+    """Write entries + blobs atomically; returns False if the data dir is read-only"""
+    index = {
+        'python': tuple(sys.version_info[:2]),
+        'marshal': marshal.version,
+        'created': time.time(),
+        'files': entries,
+    }
+    index_bytes = marshal.dumps(index)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(struct.pack(HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(index_bytes)))
+            f.write(index_bytes)
+            for part in blob_parts:
+                f.write(part)
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def _is_current(data_dir, existing, sources):
+    """Fast path: same file set and every size/mtime unchanged"""
+    if existing is None or set(sources) != set(existing.entries):
+        return False
+    for rel_path in sources:
+        try:
+            stat = os.stat(os.path.join(data_dir, rel_path))
+        except OSError:
+            return False
+        entry = existing.entries[rel_path]
+        if entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            return False
+    return True
+
+
+def _refresh(data_dir, existing, sources, verbose=False):
+    """Rebuild (entries, blob parts) from the files on disk, reusing unchanged blobs
+
+    Files whose stat changed but whose sha1 did not are reused without
+    re-parsing. Reused blobs are copied out of the old mapping so it can be
+    closed before the new file replaces it.
+    """
+    old_entries = existing.entries if existing else {}
+    old_view = existing._blobs if existing else memoryview(b'')
+
+    entries = {}
+    blob_parts = []
+    offset = 0
+    reparsed = 0
+
+    for rel_path in sources:
+        full_path = os.path.join(data_dir, rel_path)
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            continue
+
+        old = old_entries.get(rel_path)
+        blob = None
+        records = None
+        club_refs = ()
+        sha1 = None
+        if old is not None:
+            if old[0] == stat.st_size and old[1] == stat.st_mtime_ns:
+                sha1 = old[2]
+            else:
+                sha1 = _file_sha1(full_path)
+            if sha1 == old[2]:
+                blob = bytes(old_view[old[3]:old[3] + old[4]])
+                records, club_refs = old[5], old[6]
+
+        if blob is None:
+            try:
+                with open(full_path, 'rb') as f:
+                    raw = f.read()
+                data = parse_json_bytes(raw)
+            except (OSError, ValueError) as e:
+                # Leave broken files out; callers fall back to reading them directly
+                if verbose:
+                    print(f"  ⚠️  Skipping {rel_path}: {e}")
+                continue
+            sha1 = hashlib.sha1(raw).hexdigest()
+            blob, records, club_refs = _encode(rel_path, data)
+            reparsed += 1
+
+        entries[rel_path] = (stat.st_size, stat.st_mtime_ns, sha1, offset, len(blob), records, club_refs)
+        blob_parts.append(blob)
+        offset += len(blob)
+
+    if verbose:
+        print(f"  🔄 Re-parsed {reparsed} of {len(entries)} data files")
+
+    return entries, blob_parts
+
+
+def build_snapshot(data_dir=BASE_DATA_PATH, force=False, verbose=False):
+    """Open the snapshot for data_dir, rebuilding whatever is stale
+
+    The refreshed snapshot is written back to data/.snapshot/ when possible;
+    if the data dir is read-only an in-memory copy is used instead.
+    """
+    data_dir = os.path.abspath(data_dir)
+    path = snapshot_path(data_dir)
+    sources = discover_sources(data_dir)
+
+    existing = None if force else _open_snapshot_file(path, data_dir)
+    if _is_current(data_dir, existing, sources):
+        snapshot = existing
+    else:
+        entries, blob_parts = _refresh(data_dir, existing, sources, verbose=verbose)
+        if existing is not None:
+            existing.close()
+
+        snapshot = None
+        if _write_snapshot_file(path, entries, blob_parts):
+            snapshot = _open_snapshot_file(path, data_dir)
+            if verbose:
+                size = sum(len(part) for part in blob_parts)
+                print(f"  💾 Snapshot written to {path} ({size / 1024 / 1024:.1f} MB)")
+        elif verbose:
+            print(f"  ⚠️  Could not write {path}; using in-memory snapshot")
+        if snapshot is None:
+            snapshot = DatasetSnapshot(data_dir, entries, b''.join(blob_parts))
+
+    _snapshots[data_dir] = snapshot
+    return snapshot
+
+
+def get_snapshot(data_dir=BASE_DATA_PATH):
+    """Process-wide snapshot for data_dir (validated once per process)"""
+    data_dir = os.path.abspath(data_dir)
+    snapshot = _snapshots.get(data_dir)
+    if snapshot is None:
+        snapshot = build_snapshot(data_dir)
+    return snapshot
+
+
+def _snapshot_key(path):
+    """Map a file path onto (data_dir, rel_path) if it lives under the data dir"""
+    full_path = os.path.abspath(path)
+    data_dir = BASE_DATA_PATH
+    if not full_path.startswith(data_dir + os.sep):
+        # Scripts run from the repo root use 'data/...' relative paths; honour
+        # a data dir next to the working directory as well
+        cwd_data_dir = os.path.abspath('data')
+        if not full_path.startswith(cwd_data_dir + os.sep):
+            return None, None
+        data_dir = cwd_data_dir
+    return data_dir, os.path.relpath(full_path, data_dir).replace(os.sep, '/')
+
+
+def load_json(path):
+    """Drop-in replacement for json.load(open(path)) backed by the snapshot
+
+    Raises FileNotFoundError / ValueError like reading the file directly would.
+    """
+    if SNAPSHOT_ENABLED:
+        data_dir, rel_path = _snapshot_key(path)
+        if rel_path is not None:
+            snapshot = get_snapshot(data_dir)
+            if rel_path in snapshot:
+                return snapshot.load(rel_path)
+    return read_json_file(path)
+
+
+def main():
+    """Build or refresh the snapshot and report load timings"""
+    force = '--rebuild' in sys.argv[1:]
+
+    print("📦 Dataset snapshot")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    for rel_path in discover_sources():
+        read_json_file(os.path.join(BASE_DATA_PATH, rel_path))
+    json_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    build_snapshot(force=force, verbose=True).close()
+    build_time = time.perf_counter() - start
+
+    _snapshots.clear()
+    start = time.perf_counter()
+    snapshot = get_snapshot()
+    open_time = time.perf_counter() - start
+    snapshot.load_all()
+    load_time = time.perf_counter() - start
+
+    print(f"  Files:              {len(snapshot)}")
+    print(f"  Raw JSON parse:     {json_time * 1000:.1f} ms")
+    print(f"  Build/validate:     {build_time * 1000:.1f} ms")
+    print(f"  Open (header only): {open_time * 1000:.1f} ms")
+    print(f"  Full snapshot load: {load_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
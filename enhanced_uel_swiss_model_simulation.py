@@ -4,10 +4,28 @@ Enhanced UEFA Europa League Simulation (New Swiss Model) with Real Player Data a
 Based on the successful UCL simulation framework with UEL-specific adaptations
 """
 import random
-import json
 from collections import defaultdict
-import uuid
-import os
+
+from data_repository import get_repository
+from reporter import ConsoleReporter, create_reporter
+from rng_context import make_rng, substream
+from swiss_draw import LeaguePhaseDraw, DrawError, assign_pots
+from stats_arena import StatsArena
+from lineup_cache import LineupCache
+from alias_table import AliasTable
+from sim_player import SimPlayer
+from profiler import phase, profiling
+
+# --- Output ---
+# Everything this module prints goes through the reporter (console by
+# default); set_reporter(NullReporter()) runs it headless
+reporter = ConsoleReporter()
+
+
+def set_reporter(new_reporter):
+    """Send this module's output to another Reporter"""
+    global reporter
+    reporter = new_reporter
 
 # --- Configuration ---
 # UEL teams are generally less prestigious than UCL teams, so different reputation ranges
@@ -85,42 +103,24 @@ FORMATIONS = {
     '4-4-2': {'GK': 1, 'DEF': 4, 'MID': 4, 'FWD': 2},
     '3-5-2': {'GK': 1, 'DEF': 3, 'MID': 5, 'FWD': 2},
     '4-2-3-1': {'GK': 1, 'DEF': 4, 'MID': 5, 'FWD': 1},
-    '5-3-2': {'GK': 1, 'DEF': 5, 'MID': 3, 'FWD': 2}
+    '5-3-2': {'GK': 1, 'DEF': 5, 'MID': 3, 'FWD': 2},
+    '3-4-3': {'GK': 1, 'DEF': 3, 'MID': 4, 'FWD': 3},
+    '4-1-4-1': {'GK': 1, 'DEF': 4, 'MID': 5, 'FWD': 1}
 }
 
 # --- Helper Functions ---
 def generate_club_id(name):
     return "club_" + name.lower().replace(" ", "_").replace("-", "_")
 
-def generate_player_id():
-    return f"player_{uuid.uuid4()}"
-
 def load_players_from_json(team_name, club_id):
-    """Load players for a given team from JSON file."""
-    # Try multiple possible file paths based on different league directories
-    possible_paths = [
-        f'data/00_1_clubs_players/{club_id}_players.json',
-        f'data/00_2_clubs_players/{club_id}_players.json',
-        f'data/00_3_clubs_players/{club_id}_players.json',
-        f'data/00_4_clubs_players/{club_id}_players.json',
-        f'data/00_5_clubs_players/{club_id}_players.json',
-        f'data/00_12_clubs_players/{club_id}_players.json',
-        f'data/00_11_clubs_players/{club_id}_players.json',
-        f'data/league_super_lig_clubs_players/{club_id}_players.json',
-        f'data/league_scottish_premiership_clubs_players/{club_id}_players.json',
-    ]
-    
-    for file_path in possible_paths:
-        try:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    players_data = json.load(f)
-                print(f"Successfully loaded {len(players_data)} players for {team_name} from {file_path}")
-                return convert_players_to_simulation_format(players_data, team_name, club_id)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            continue
-    
-    print(f"No player file found for {team_name} in any expected location")
+    """Load players for a given team from the shared data repository."""
+    repository = get_repository()
+    players_data = repository.get_players(club_id) or repository.get_players(team_name)
+    if players_data:
+        reporter.message(f"Successfully loaded {len(players_data)} players for {team_name}")
+        return convert_players_to_simulation_format(players_data, team_name, club_id)
+    
+    reporter.message(f"No player file found for {team_name} in any expected location")
     return []
 
 def convert_players_to_simulation_format(players_data, team_name, club_id):
@@ -145,60 +145,23 @@ def convert_players_to_simulation_format(players_data, team_name, club_id):
         else:
             sim_position = 'MID'  # Default fallback
         
-        converted_player = {
-            'id': player.get('id', f"player_{club_id}_{idx}"),
-            'name': player.get('known_as', player.get('name', f'Player_{idx}')),
-            'team_id': club_id,
-            'team_name': team_name,
-            'position': sim_position,
-            'skill': min(95, max(50, current_ability)),  # Clamp skill between 50-95
-            'goals': 0,
-            'assists': 0,
-            'matches_played': 0,
-            'total_rating_points': 0.0,
-            'clean_sheets': 0,
-            'avg_rating': 0.0,
-            'original_position': primary_position,
-            'real_data': True  # Mark as real player data
-        }
+        converted_player = SimPlayer(
+            player.get('known_as', player.get('name', f'Player_{idx}')),
+            club_id, team_name, sim_position,
+            min(95, max(50, current_ability)),  # Clamp skill between 50-95
+            source_id=player.get('id', f"player_{club_id}_{idx}"),
+            original_position=primary_position,
+            real_data=True  # Mark as real player data
+        )
         converted_players.append(converted_player)
     
     return converted_players
 
 def load_manager_for_team(club_id):
     """Load manager data for a team."""
-    # Try multiple manager files to find the team's manager
-    possible_manager_files = [
-        'data/managers/26.json',  # UEL managers
-        'data/managers/1.json',   # EPL managers
-        'data/managers/2.json',   # LaLiga managers
-        'data/managers/3.json',   # Bundesliga managers
-        'data/managers/4.json',   # Serie A managers
-        'data/managers/5.json',   # Ligue 1 managers
-        'data/managers/11.json',  # Primeira Liga managers
-        'data/managers/12.json'   # Eredivisie managers
-    ]
-    
-    for manager_file in possible_manager_files:
-        try:
-            if os.path.exists(manager_file):
-                with open(manager_file, 'r', encoding='utf-8') as f:
-                    manager_data = json.load(f)
-                # Check if this file contains managers for our club
-                if isinstance(manager_data, list):
-                    for manager in manager_data:
-                        if manager.get('current_club') == club_id or manager.get('current_club_id') == club_id:
-                            return manager
-                elif isinstance(manager_data, dict) and 'managers' in manager_data:
-                    for manager in manager_data['managers']:
-                        if manager.get('current_club') == club_id or manager.get('current_club_id') == club_id:
-                            return manager
-        except (FileNotFoundError, json.JSONDecodeError):
-            continue
-        pass
-    return None
+    return get_repository().get_manager(club_id)
 
-def generate_placeholder_players(team_name, club_id, country):
+def generate_placeholder_players(team_name, club_id, country, rng=random):
     """Generate placeholder players for teams without real data."""
     players = []
     
@@ -235,27 +198,18 @@ def generate_placeholder_players(team_name, club_id, country):
             else:  # FWD
                 skill_range = (base_skill - 2, base_skill + 20)
             
-            player = {
-                'id': generate_player_id(),
-                'name': f"{name_prefix}_{position}{i+1}_{country[:3].upper()}",
-                'team_id': club_id,
-                'team_name': team_name,
-                'position': position,
-                'skill': random.randint(skill_range[0], skill_range[1]),
-                'goals': 0,
-                'assists': 0,
-                'matches_played': 0,
-                'total_rating_points': 0.0,
-                'clean_sheets': 0,
-                'avg_rating': 0.0,
-                'real_data': False  # Mark as generated player
-            }
+            player = SimPlayer(
+                f"{name_prefix}_{position}{i+1}_{country[:3].upper()}",
+                club_id, team_name, position,
+                rng.randint(skill_range[0], skill_range[1]),
+                real_data=False  # Mark as generated player
+            )
             players.append(player)
     
     return players
 
-def simulate_match(team1, team2, all_players, is_neutral=False):
-    """Simulate a match between two teams with detailed player performance tracking."""
+def simulate_match(team1, team2, all_players, stats, is_neutral=False, rng=random):
+    """Simulate a match between two teams with detailed player performance tracking (in the StatsArena `stats`)."""
     # Get squad for both teams
     team1_players = get_best_starting_xi(team1, all_players)
     team2_players = get_best_starting_xi(team2, all_players)
@@ -280,29 +234,39 @@ def simulate_match(team1, team2, all_players, is_neutral=False):
     expected_goals_2 = 2.5 * (1 - team1_dominance)
     
     # Actual goals (Poisson distribution simulation)
-    goals_1 = max(0, random.randint(0, int(expected_goals_1 * 2)))
-    goals_2 = max(0, random.randint(0, int(expected_goals_2 * 2)))
+    goals_1 = max(0, rng.randint(0, int(expected_goals_1 * 2)))
+    goals_2 = max(0, rng.randint(0, int(expected_goals_2 * 2)))
     
     # Track player performances
-    track_player_performances(team1_players + team2_players, goals_1 + goals_2)
+    track_player_performances(team1_players + team2_players, goals_1 + goals_2, stats, rng)
     
-    # Assign goalscorers and assisters
-    assign_goals_and_assists(team1_players, goals_1)
-    assign_goals_and_assists(team2_players, goals_2)
+    # Assign goalscorers and assisters (scorer tables are cached alongside each lineup)
+    assign_goals_and_assists(team1_players, goals_1, stats, rng,
+                             LINEUPS.attached(team1_players, lambda: build_scoring_tables(team1_players)))
+    assign_goals_and_assists(team2_players, goals_2, stats, rng,
+                             LINEUPS.attached(team2_players, lambda: build_scoring_tables(team2_players)))
     
     return goals_1, goals_2
 
+# Starting XIs by (club, formation, ...): a club's XI only changes with its squad
+LINEUPS = LineupCache()
+
 def get_best_starting_xi(team, all_players):
-    """Get the best starting XI for a team based on formation."""
-    team_players = [p for p in all_players if p['team_id'] == team['id']]
+    """Get the best starting XI for a team based on formation (cached per club and formation)."""
     formation = team.get('manager', {}).get('preferred_formation', '4-3-3')
-    formation_requirements = FORMATIONS[formation]
+    return LINEUPS.lineup(all_players, team['id'], formation,
+                          lambda: _select_best_starting_xi(team, all_players, formation))
+
+def _select_best_starting_xi(team, all_players, formation):
+    team_players = [p for p in all_players if p.team_id == team['id']]
+    # Real manager data can prefer formations this model has no template for
+    formation_requirements = FORMATIONS.get(formation, FORMATIONS['4-3-3'])
     
     starting_xi = []
     for position, needed in formation_requirements.items():
         position_players = sorted(
-            [p for p in team_players if p['position'] == position],
-            key=lambda x: x['skill'], reverse=True
+            [p for p in team_players if p.position == position],
+            key=lambda x: x.skill, reverse=True
         )
         starting_xi.extend(position_players[:needed])
     
@@ -313,7 +277,7 @@ def calculate_team_strength(players, formation):
     if not players:
         return 50  # Default strength for teams without players
     
-    base_strength = sum(p['skill'] for p in players) / len(players)
+    base_strength = sum(p.skill for p in players) / len(players)
     
     # Formation bonuses for UEL (smaller than UCL as teams are less tactical)
     formation_bonus = {
@@ -326,118 +290,86 @@ def calculate_team_strength(players, formation):
     
     return base_strength * formation_bonus
 
-def track_player_performances(players, total_goals):
+def track_player_performances(players, total_goals, stats, rng=random):
     """Track player performances in the match."""
     for player in players:
-        player['matches_played'] += 1
+        slot = stats.slot(player.id)
+        stats.matches_played[slot] += 1
         
         # Generate match rating (6.0-9.5 scale)
         base_rating = 6.0
-        skill_factor = (player['skill'] - 50) / 45  # Normalize skill to 0-1
-        performance_variance = random.uniform(-0.5, 1.5)
+        skill_factor = (player.skill - 50) / 45  # Normalize skill to 0-1
+        performance_variance = rng.uniform(-0.5, 1.5)
         
         match_rating = min(9.5, max(6.0, base_rating + skill_factor + performance_variance))
-        player['total_rating_points'] += match_rating
+        stats.total_rating_points[slot] += match_rating
+
+def build_scoring_tables(team_players):
+    """Scorer and assister AliasTables of a lineup, both over its outfield players (by index)."""
+    all_outfield = [p for p in team_players if p.position != 'GK']
+    # Forwards and attacking midfielders more likely to score
+    attacking = [i for i, p in enumerate(all_outfield) if p.position in ['FWD', 'MID']]
+    if attacking:
+        # Forwards twice as likely, midfielders 1.3x
+        scorers = AliasTable(attacking, [all_outfield[i].skill * (2.0 if all_outfield[i].position == 'FWD' else 1.3)
+                                         for i in attacking])
+    else:
+        scorers = AliasTable(range(len(all_outfield)), [1] * len(all_outfield))
+    assisters = AliasTable(all_outfield, [p.skill * (1.5 if p.position == 'MID' else 1.0) for p in all_outfield])
+    return scorers, assisters
 
-def assign_goals_and_assists(team_players, goals):
-    """Assign goals and assists to players."""
+def assign_goals_and_assists(team_players, goals, stats, rng=random, tables=None):
+    """Assign goals and assists to players (tables: the lineup's build_scoring_tables())."""
     if goals == 0 or not team_players:
         return
     
-    # Forwards and attacking midfielders more likely to score
-    attacking_players = [p for p in team_players if p['position'] in ['FWD', 'MID']]
-    all_outfield = [p for p in team_players if p['position'] != 'GK']
+    if tables is None:
+        tables = build_scoring_tables(team_players)
+    scorers, assisters = tables
+    if not len(scorers): # No outfield players
+        return
     
     for _ in range(goals):
-        # Goal scorer
-        if attacking_players:
-            weights = []
-            for p in attacking_players:
-                weight = p['skill']
-                if p['position'] == 'FWD':
-                    weight *= 2.0  # Forwards twice as likely
-                elif p['position'] == 'MID':
-                    weight *= 1.3  # Midfielders more likely
-                weights.append(weight)
-            
-            scorer = random.choices(attacking_players, weights=weights)[0]
-        else:
-            scorer = random.choice(all_outfield)
-        
-        scorer['goals'] += 1
+        # Goal scorer (index into the outfield players)
+        scorer_index = scorers.sample(rng)
+        scorer = assisters.items[scorer_index]
+        stats.goals[stats.slot(scorer.id)] += 1
         
         # Assist (70% chance)
-        if random.random() < 0.7 and len(all_outfield) > 1:
-            potential_assisters = [p for p in all_outfield if p != scorer]
-            weights = [p['skill'] * (1.5 if p['position'] == 'MID' else 1.0) for p in potential_assisters]
-            assister = random.choices(potential_assisters, weights=weights)[0]
-            assister['assists'] += 1
+        if rng.random() < 0.7 and len(assisters) > 1:
+            assister = assisters.items[assisters.sample_excluding(rng, scorer_index)]
+            stats.assists[stats.slot(assister.id)] += 1
     
     # Clean sheets for goalkeepers
     if goals == 0:
         for player in team_players:
-            if player['position'] == 'GK':
-                player['clean_sheets'] += 1
+            if player.position == 'GK':
+                stats.clean_sheets[stats.slot(player.id)] += 1
 
-def create_fixtures_swiss_model(teams, rounds=8):
-    """Create fixtures for the Swiss model (each team plays 8 matches)."""
-    fixtures = []
-    team_opponents = {team['id']: set() for team in teams}
-    team_home_count = {team['id']: 0 for team in teams}
-    
-    for round_num in range(1, rounds + 1):
-        round_fixtures = []
-        available_teams = list(teams)
-        random.shuffle(available_teams)
-        
-        while len(available_teams) >= 2:
-            team1 = available_teams.pop(0)
-            
-            # Find suitable opponent
-            suitable_opponents = [
-                t for t in available_teams 
-                if t['id'] not in team_opponents[team1['id']]
-                and team1['id'] not in team_opponents[t['id']]
-            ]
-            
-            if not suitable_opponents:
-                # If no suitable opponent, pick randomly from remaining
-                suitable_opponents = available_teams
-            
-            if suitable_opponents:
-                team2 = suitable_opponents[0]
-                available_teams.remove(team2)
-                
-                # Determine home/away
-                if team_home_count[team1['id']] <= team_home_count[team2['id']]:
-                    home_team, away_team = team1, team2
-                    team_home_count[team1['id']] += 1
-                else:
-                    home_team, away_team = team2, team1
-                    team_home_count[team2['id']] += 1
-                
-                fixture = {
-                    'round': round_num,
-                    'home': home_team,
-                    'away': away_team
-                }
-                round_fixtures.append(fixture)
-                
-                # Track opponents
-                team_opponents[team1['id']].add(team2['id'])
-                team_opponents[team2['id']].add(team1['id'])
-        
-        fixtures.extend(round_fixtures)
-    
-    return fixtures
+@phase('create_fixtures_swiss_model', 'schedule')
+def create_fixtures_swiss_model(teams, rng=random):
+    """Create fixtures for the Swiss model (each team plays 8 different opponents, 4 home and 4 away).
 
-def simulate_league_phase(teams, all_players):
+    Teams are seeded into four pots by reputation; every team meets two teams
+    from each pot and none from its own country (swiss_draw).
+    """
+    pots = assign_pots(teams)
+    try:
+        draw = LeaguePhaseDraw(teams, pots).draw(rng)
+    except DrawError as e:
+        reporter.message(f"Warning: {e}. Drawing again without the same-country rule.")
+        draw = LeaguePhaseDraw(teams, pots, avoid_same_country=False).draw(rng)
+    draw.sort(key=lambda fixture: fixture[2])
+    return [{'round': round_num, 'home': teams[home], 'away': teams[away]} for home, away, round_num in draw]
+
+@phase('simulate_league_phase', 'match')
+def simulate_league_phase(teams, all_players, stats, rng=random):
     """Simulate the entire league phase of the Europa League."""
-    print("--- Simulating League Phase ---")
+    reporter.message("--- Simulating League Phase ---")
     
     # Create fixtures
-    fixtures = create_fixtures_swiss_model(teams, rounds=8)
-    print(f"--- League Phase Fixtures Generated: {len(fixtures)} ---")
+    fixtures = create_fixtures_swiss_model(teams, rng=substream(rng, 'league_phase_draw'))
+    reporter.message(f"--- League Phase Fixtures Generated: {len(fixtures)} ---")
     
     # Initialize team stats
     team_stats = {}
@@ -453,42 +385,43 @@ def simulate_league_phase(teams, all_players):
         home_team = fixture['home']
         away_team = fixture['away']
         
-        goals_home, goals_away = simulate_match(home_team, away_team, all_players)
+        goals_home, goals_away = simulate_match(home_team, away_team, all_players, stats,
+                                               rng=substream(rng, 'match', home_team['id'], away_team['id']))
         
         # Update stats
         for team_id, goals_for, goals_against in [
             (home_team['id'], goals_home, goals_away),
             (away_team['id'], goals_away, goals_home)
         ]:
-            stats = team_stats[team_id]
-            stats['played'] += 1
-            stats['goals_for'] += goals_for
-            stats['goals_against'] += goals_against
+            record = team_stats[team_id]
+            record['played'] += 1
+            record['goals_for'] += goals_for
+            record['goals_against'] += goals_against
             
             if goals_for > goals_against:
-                stats['won'] += 1
-                stats['points'] += 3
+                record['won'] += 1
+                record['points'] += 3
             elif goals_for == goals_against:
-                stats['drawn'] += 1
-                stats['points'] += 1
+                record['drawn'] += 1
+                record['points'] += 1
             else:
-                stats['lost'] += 1
+                record['lost'] += 1
     
     # Create final table
     final_table = []
-    for team_id, stats in team_stats.items():
-        goal_difference = stats['goals_for'] - stats['goals_against']
+    for team_id, record in team_stats.items():
+        goal_difference = record['goals_for'] - record['goals_against']
         final_table.append((team_id, {
-            'Team': stats['team']['name'],
-            'Country': stats['team']['country'],
-            'P': stats['played'],
-            'W': stats['won'],
-            'D': stats['drawn'],
-            'L': stats['lost'],
-            'GF': stats['goals_for'],
-            'GA': stats['goals_against'],
+            'Team': record['team']['name'],
+            'Country': record['team']['country'],
+            'P': record['played'],
+            'W': record['won'],
+            'D': record['drawn'],
+            'L': record['lost'],
+            'GF': record['goals_for'],
+            'GA': record['goals_against'],
             'GD': goal_difference,
-            'Pts': stats['points']
+            'Pts': record['points']
         }))
     
     # Sort by points, then goal difference, then goals for
@@ -498,39 +431,41 @@ def simulate_league_phase(teams, all_players):
 
 def display_league_table(final_table):
     """Display the league phase table."""
-    print("--- Final League Phase Table ---")
+    if not reporter.wants_text:  # nothing to format for headless reporters
+        return
+    reporter.message("--- Final League Phase Table ---")
     for i, (team_id, data) in enumerate(final_table):
-        print(f"{i+1:2d}. {data['Team']:<25} ({data['Country']})  "
+        reporter.message(f"{i+1:2d}. {data['Team']:<25} ({data['Country']})  "
               f"{data['P']:2d}  {data['W']:2d}  {data['D']:2d}  {data['L']:2d}  "
               f"{data['GF']:2d}-{data['GA']:<2d}  {data['GD']:+3d}  {data['Pts']:2d}")
 
 def determine_knockout_qualification(final_table):
     """Determine knockout stage qualification according to UEL rules."""
-    print("\\n--- Knockout Stage Qualifications ---")
+    reporter.message("\\n--- Knockout Stage Qualifications ---")
     
     # Top 8 go direct to Round of 16
     direct_r16 = [team_id for team_id, _ in final_table[:8]]
     direct_r16_teams = [(team_id, data) for team_id, data in final_table[:8]]
     
-    print("Direct to R16 (Top 8): " + ", ".join([data['Team'] for _, data in direct_r16_teams]))
+    reporter.message("Direct to R16 (Top 8): " + ", ".join([data['Team'] for _, data in direct_r16_teams]))
     
     # 9th-24th place go to Knockout Playoff Round
     playoff_teams = final_table[8:24]
     if playoff_teams:
-        print("Knockout Playoff Round (9th-24th):")
+        reporter.message("Knockout Playoff Round (9th-24th):")
         # Pair teams: 9th vs 24th, 10th vs 23rd, etc.
         playoff_pairs = []
         for i in range(len(playoff_teams) // 2):
             seeded_team = playoff_teams[i]
             unseeded_team = playoff_teams[-(i+1)]
             playoff_pairs.append((seeded_team, unseeded_team))
-            print(f"  - {seeded_team[1]['Team']} (S) vs {unseeded_team[1]['Team']} (U)")
+            reporter.message(f"  - {seeded_team[1]['Team']} (S) vs {unseeded_team[1]['Team']} (U)")
         
         return direct_r16, playoff_pairs
     else:
         return direct_r16, []
 
-def simulate_knockout_match(team1_data, team2_data, all_players, teams_dict, match_name=""):
+def simulate_knockout_match(team1_data, team2_data, all_players, stats, teams_dict, match_name="", rng=random):
     """Simulate a knockout match (two legs or single match)."""
     # team1_data and team2_data are tuples from final_table: (team_id, team_stats)
     team1_id = team1_data[0]
@@ -542,49 +477,51 @@ def simulate_knockout_match(team1_data, team2_data, all_players, teams_dict, mat
     
     if not team1 or not team2:
         return None, "0-0", "Team not found"
+    rng = substream(rng, 'match', team1_id, team2_id)
     
     # Simulate two legs
     # Leg 1 (team1 at home)
-    goals1_leg1, goals2_leg1 = simulate_match(team1, team2, all_players)
+    goals1_leg1, goals2_leg1 = simulate_match(team1, team2, all_players, stats, rng=rng)
     
     # Leg 2 (team2 at home)  
-    goals1_leg2, goals2_leg2 = simulate_match(team2, team1, all_players)
+    goals1_leg2, goals2_leg2 = simulate_match(team2, team1, all_players, stats, rng=rng)
     
     # Calculate aggregate
     aggregate1 = goals1_leg1 + goals1_leg2
     aggregate2 = goals2_leg1 + goals2_leg2
     
-    print(f"  Tie: {team1['name']} vs {team2['name']}")
-    print(f"    Leg 1: {team1['name']} {goals1_leg1} - {goals2_leg1} {team2['name']}")
-    print(f"    Leg 2: {team2['name']} {goals2_leg2} - {goals1_leg2} {team1['name']}")
-    print(f"    Aggregate: {team1['name']} {aggregate1} - {aggregate2} {team2['name']}")
+    reporter.message(f"  Tie: {team1['name']} vs {team2['name']}")
+    reporter.message(f"    Leg 1: {team1['name']} {goals1_leg1} - {goals2_leg1} {team2['name']}")
+    reporter.message(f"    Leg 2: {team2['name']} {goals2_leg2} - {goals1_leg2} {team1['name']}")
+    reporter.message(f"    Aggregate: {team1['name']} {aggregate1} - {aggregate2} {team2['name']}")
     
     # Determine winner
     if aggregate1 > aggregate2:
         winner = team1_data
-        print(f"    Winner: {team1['name']}")
+        reporter.message(f"    Winner: {team1['name']}")
     elif aggregate2 > aggregate1:
         winner = team2_data
-        print(f"    Winner: {team2['name']}")
+        reporter.message(f"    Winner: {team2['name']}")
     else:
         # Away goals rule or penalties
-        print(f"    Aggregate tied! Coin flip winner (simplified for no extra time/pens simulation)...")
-        winner = random.choice([team1_data, team2_data])
+        reporter.message(f"    Aggregate tied! Coin flip winner (simplified for no extra time/pens simulation)...")
+        winner = rng.choice([team1_data, team2_data])
         winner_team = team1 if winner == team1_data else team2
-        print(f"    Winner: {winner_team['name']}")
+        reporter.message(f"    Winner: {winner_team['name']}")
     
     return winner
 
-def simulate_knockout_phase(direct_r16, playoff_pairs, all_players, all_teams):
+@phase('simulate_knockout_phase', 'match')
+def simulate_knockout_phase(direct_r16, playoff_pairs, all_players, stats, all_teams, rng=random):
     """Simulate the knockout phase of the Europa League."""
-    print("\\n--- Simulating Knockout Playoff Round ---")
+    reporter.message("\\n--- Simulating Knockout Playoff Round ---")
       # Create teams dictionary for lookup
     teams_dict = {team['id']: team for team in all_teams}
     
     # Simulate playoff round
     playoff_winners = []
     for seeded, unseeded in playoff_pairs:
-        winner = simulate_knockout_match(seeded, unseeded, all_players, teams_dict, "Playoff")
+        winner = simulate_knockout_match(seeded, unseeded, all_players, stats, teams_dict, "Playoff", rng)
         if winner:
             playoff_winners.append(winner)    # Round of 16 participants
     r16_teams = []
@@ -595,34 +532,34 @@ def simulate_knockout_phase(direct_r16, playoff_pairs, all_players, all_teams):
                 break
     
     r16_teams.extend(playoff_winners)
-    random.shuffle(r16_teams)
+    substream(rng, 'draw', 'Round of 16').shuffle(r16_teams)
     
-    print("\\n--- Simulating Round of 16 ---")
+    reporter.message("\\n--- Simulating Round of 16 ---")
     qf_teams = []
     for i in range(0, len(r16_teams), 2):
         if i + 1 < len(r16_teams):
-            winner = simulate_knockout_match(r16_teams[i], r16_teams[i+1], all_players, teams_dict, "R16")
+            winner = simulate_knockout_match(r16_teams[i], r16_teams[i+1], all_players, stats, teams_dict, "R16", rng)
             if winner:
                 qf_teams.append(winner)
     
-    print("\\n--- Simulating Quarter-Finals ---")
+    reporter.message("\\n--- Simulating Quarter-Finals ---")
     sf_teams = []
     for i in range(0, len(qf_teams), 2):
         if i + 1 < len(qf_teams):
-            winner = simulate_knockout_match(qf_teams[i], qf_teams[i+1], all_players, teams_dict, "QF")
+            winner = simulate_knockout_match(qf_teams[i], qf_teams[i+1], all_players, stats, teams_dict, "QF", rng)
             if winner:
                 sf_teams.append(winner)
     
-    print("\\n--- Simulating Semi-Finals ---")
+    reporter.message("\\n--- Simulating Semi-Finals ---")
     final_teams = []
     for i in range(0, len(sf_teams), 2):
         if i + 1 < len(sf_teams):
-            winner = simulate_knockout_match(sf_teams[i], sf_teams[i+1], all_players, teams_dict, "SF")
+            winner = simulate_knockout_match(sf_teams[i], sf_teams[i+1], all_players, stats, teams_dict, "SF", rng)
             if winner:
                 final_teams.append(winner)
     
     if len(final_teams) >= 2:
-        print("\\n--- Simulating Final ---")
+        reporter.message("\\n--- Simulating Final ---")
           # Find team objects for final
         team1 = team2 = None
         for team in all_teams:
@@ -633,20 +570,21 @@ def simulate_knockout_phase(direct_r16, playoff_pairs, all_players, all_teams):
         
         if team1 and team2:
             # Single match final
-            goals1, goals2 = simulate_match(team1, team2, all_players, is_neutral=True)
-            print(f"  Final: {team1['name']} vs {team2['name']}")
+            rng = substream(rng, 'match', team1['id'], team2['id'], 'Final')
+            goals1, goals2 = simulate_match(team1, team2, all_players, stats, is_neutral=True, rng=rng)
+            reporter.message(f"  Final: {team1['name']} vs {team2['name']}")
             
             if goals1 == goals2:
-                print(f"    Score: {goals1}-{goals2}. Penalties...")
-                winner = random.choice([team1, team2])
-                print(f"    {winner['name']} wins on penalties!")
+                reporter.message(f"    Score: {goals1}-{goals2}. Penalties...")
+                winner = rng.choice([team1, team2])
+                reporter.message(f"    {winner['name']} wins on penalties!")
             else:
                 winner = team1 if goals1 > goals2 else team2
-                print(f"    Score: {goals1}-{goals2}")
-                print(f"    Winner: {winner['name']}")
+                reporter.message(f"    Score: {goals1}-{goals2}")
+                reporter.message(f"    Winner: {winner['name']}")
             
             runner_up = team2 if winner == team1 else team1
-            print(f"     Runner-up: {runner_up['name']} ({runner_up['country']})")
+            reporter.message(f"     Runner-up: {runner_up['name']} ({runner_up['country']})")
             
             return winner, runner_up
     
@@ -654,88 +592,90 @@ def simulate_knockout_phase(direct_r16, playoff_pairs, all_players, all_teams):
 
 def display_player_stats(all_players, min_matches_for_avg_rating=3):
     """Display comprehensive player statistics."""
-    print("\\n--- Overall Player Statistics ---")
+    if not reporter.wants_text:  # nothing to format for headless reporters
+        return
+    reporter.message("\\n--- Overall Player Statistics ---")
     
     # Filter out players who haven't played
-    players_list = [p for p in all_players if p['matches_played'] > 0]
+    players_list = [p for p in all_players if p.matches_played > 0]
     
     # Top Scorers
-    print("--- Top Scorers ---")
-    top_scorers = sorted(players_list, key=lambda x: (x['goals'], x['matches_played']), reverse=True)[:10]
+    reporter.message("--- Top Scorers ---")
+    top_scorers = sorted(players_list, key=lambda x: (x.goals, x.matches_played), reverse=True)[:10]
     for i, p in enumerate(top_scorers, 1):
-        real_tag = " *** Real Player Data" if p.get('real_data') else ""
-        print(f"{i}. {p['name']} ({p['team_name']}) - {p['goals']} goals ({p['matches_played']} matches){real_tag}")
+        real_tag = " *** Real Player Data" if p.real_data else ""
+        reporter.message(f"{i}. {p.name} ({p.team_name}) - {p.goals} goals ({p.matches_played} matches){real_tag}")
     
     # Top Assisters
-    print("--- Top Assisters ---")
-    top_assisters = sorted(players_list, key=lambda x: (x['assists'], x['matches_played']), reverse=True)[:10]
+    reporter.message("--- Top Assisters ---")
+    top_assisters = sorted(players_list, key=lambda x: (x.assists, x.matches_played), reverse=True)[:10]
     for i, p in enumerate(top_assisters, 1):
-        real_tag = " *** Real Player Data" if p.get('real_data') else ""
-        print(f"{i}. {p['name']} ({p['team_name']}) - {p['assists']} assists ({p['matches_played']} matches){real_tag}")
+        real_tag = " *** Real Player Data" if p.real_data else ""
+        reporter.message(f"{i}. {p.name} ({p.team_name}) - {p.assists} assists ({p.matches_played} matches){real_tag}")
     
     # Goals + Assists
-    print("--- Top Goals + Assists ---")
-    for p in players_list:
-        p['goals_assists'] = p['goals'] + p['assists']
-    
-    top_ga = sorted(players_list, key=lambda x: (x['goals_assists'], x['matches_played']), reverse=True)[:10]
+    reporter.message("--- Top Goals + Assists ---")
+    top_ga = sorted(players_list, key=lambda x: (x.goals + x.assists, x.matches_played), reverse=True)[:10]
     for i, p in enumerate(top_ga, 1):
-        real_tag = " *** Real Player Data" if p.get('real_data') else ""
-        print(f"{i}. {p['name']} ({p['team_name']}) - {p['goals_assists']} (G:{p['goals']}, A:{p['assists']}) [{p['matches_played']} matches]{real_tag}")
+        real_tag = " *** Real Player Data" if p.real_data else ""
+        reporter.message(f"{i}. {p.name} ({p.team_name}) - {p.goals + p.assists} (G:{p.goals}, A:{p.assists}) [{p.matches_played} matches]{real_tag}")
     
     # Clean Sheets (Goalkeepers)
-    print("--- Goalkeeper Clean Sheets ---")
-    gk_players = [p for p in players_list if p['position'] == 'GK' and p['matches_played'] >= 3]
-    top_cs = sorted(gk_players, key=lambda x: (x['clean_sheets'], x['matches_played']), reverse=True)[:5]
+    reporter.message("--- Goalkeeper Clean Sheets ---")
+    gk_players = [p for p in players_list if p.position == 'GK' and p.matches_played >= 3]
+    top_cs = sorted(gk_players, key=lambda x: (x.clean_sheets, x.matches_played), reverse=True)[:5]
     for i, p in enumerate(top_cs, 1):
-        real_tag = " *** Real Player Data" if p.get('real_data') else ""
-        print(f"{i}. {p['name']} ({p['team_name']}) - {p['clean_sheets']} clean sheets ({p['matches_played']} matches){real_tag}")
+        real_tag = " *** Real Player Data" if p.real_data else ""
+        reporter.message(f"{i}. {p.name} ({p.team_name}) - {p.clean_sheets} clean sheets ({p.matches_played} matches){real_tag}")
     
     # Average Match Rating
-    print("--- Highest Average Match Rating (Min 3 Matches) ---")
+    reporter.message("--- Highest Average Match Rating (Min 3 Matches) ---")
     for player in players_list:
-        if player['matches_played'] >= min_matches_for_avg_rating:
-            player['avg_rating'] = round(player['total_rating_points'] / player['matches_played'], 2)
+        if player.matches_played >= min_matches_for_avg_rating:
+            player.avg_rating = round(player.total_rating_points / player.matches_played, 2)
 
-    rated_players = sorted([p for p in players_list if p['matches_played'] >= min_matches_for_avg_rating], 
-                           key=lambda x: x['avg_rating'], reverse=True)
+    rated_players = sorted([p for p in players_list if p.matches_played >= min_matches_for_avg_rating], 
+                           key=lambda x: x.avg_rating, reverse=True)
     for i, p in enumerate(rated_players[:10]):
-        real_tag = " *** Real Player Data" if p.get('real_data') else ""
-        print(f"{i+1}. {p['name']} ({p['team_name']}) - {p['avg_rating']:.2f} avg rating ({p['matches_played']} matches){real_tag}")
+        real_tag = " *** Real Player Data" if p.real_data else ""
+        reporter.message(f"{i+1}. {p.name} ({p.team_name}) - {p.avg_rating:.2f} avg rating ({p.matches_played} matches){real_tag}")
 
     # Tournament Best Player (considering total rating points, goals+assists, and match participation)
-    print("\\n--- Tournament Best Player Analysis ---")
-    qualified_players = [p for p in players_list if p['matches_played'] >= min_matches_for_avg_rating]
+    reporter.message("\\n--- Tournament Best Player Analysis ---")
+    qualified_players = [p for p in players_list if p.matches_played >= min_matches_for_avg_rating]
     
     if qualified_players:
         # Calculate combined score: total_rating_points + bonus for goals/assists
+        tournament_scores = {}
         for player in qualified_players:
-            player['tournament_score'] = (
-                player['total_rating_points'] + 
-                (player['goals'] * 2.0) + 
-                (player['assists'] * 1.5) + 
-                (player['clean_sheets'] * 1.0 if player['position'] == 'GK' else 0)
+            tournament_scores[player.id] = (
+                player.total_rating_points + 
+                (player.goals * 2.0) + 
+                (player.assists * 1.5) + 
+                (player.clean_sheets * 1.0 if player.position == 'GK' else 0)
             )
         
-        best_player = max(qualified_players, key=lambda x: x['tournament_score'])
+        best_player = max(qualified_players, key=lambda x: tournament_scores[x.id])
         
-        print(f"*** TOURNAMENT BEST PLAYER: {best_player['name']} ({best_player['team_name']})")
-        print(f"   Position: {best_player['position']} | Skill: {best_player['skill']}")
-        print(f"   Matches: {best_player['matches_played']} | Avg Rating: {best_player['avg_rating']:.2f}")
-        print(f"   Goals: {best_player['goals']} | Assists: {best_player['assists']}")
-        if best_player['position'] == 'GK':
-            print(f"   Clean Sheets: {best_player['clean_sheets']}")
-        print(f"   Tournament Score: {best_player['tournament_score']:.2f}")
+        reporter.message(f"*** TOURNAMENT BEST PLAYER: {best_player.name} ({best_player.team_name})")
+        reporter.message(f"   Position: {best_player.position} | Skill: {best_player.skill}")
+        reporter.message(f"   Matches: {best_player.matches_played} | Avg Rating: {best_player.avg_rating:.2f}")
+        reporter.message(f"   Goals: {best_player.goals} | Assists: {best_player.assists}")
+        if best_player.position == 'GK':
+            reporter.message(f"   Clean Sheets: {best_player.clean_sheets}")
+        reporter.message(f"   Tournament Score: {tournament_scores[best_player.id]:.2f}")
         
-        if best_player.get('real_data'):
-            print("   *** Real Player Data")
+        if best_player.real_data:
+            reporter.message("   *** Real Player Data")
     else:
-        print("   No players qualified for best player award (minimum matches not met)")    # Tournament Best XI (4-3-3 Formation) - Rating-Based Selection
-    print("\\n--- Tournament Best XI (4-3-3 Formation) ---")
+        reporter.message("   No players qualified for best player award (minimum matches not met)")    # Tournament Best XI (4-3-3 Formation) - Rating-Based Selection
+    reporter.message("\\n--- Tournament Best XI (4-3-3 Formation) ---")
     display_best_xi(qualified_players)
 
 def display_best_xi(qualified_players):
     """Display the Tournament Best XI in a proper 4-3-3 formation using average ratings."""
+    if not reporter.wants_text:  # nothing to format for headless reporters
+        return
     
     # Position mapping for 4-3-3 formation with flexible assignments
     formation_positions = {
@@ -815,15 +755,15 @@ def display_best_xi(qualified_players):
         # Find all eligible players for this formation position
         for sim_position, eligibility in eligible_positions.items():
             position_players = [p for p in qualified_players 
-                             if p['position'] == sim_position and p['id'] not in used_player_ids]
+                             if p.position == sim_position and p.id not in used_player_ids]
             
             for player in position_players:
                 # Calculate adjusted rating with penalty
-                adjusted_rating = player['avg_rating'] * (1 - eligibility['penalty'])
+                adjusted_rating = player.avg_rating * (1 - eligibility['penalty'])
                 candidates.append({
                     'player': player,
                     'adjusted_rating': adjusted_rating,
-                    'original_rating': player['avg_rating'],
+                    'original_rating': player.avg_rating,
                     'penalty': eligibility['penalty'],
                     'is_primary': eligibility['primary']
                 })
@@ -834,13 +774,13 @@ def display_best_xi(qualified_players):
         if candidates:
             best_candidate = candidates[0]
             selected_best_xi[formation_pos] = best_candidate
-            used_player_ids.add(best_candidate['player']['id'])
+            used_player_ids.add(best_candidate['player'].id)
     
     # Display the Best XI
     if len(selected_best_xi) == 11:
-        print("   *** TOURNAMENT BEST XI (4-3-3 Formation) ***")
-        print("   Based on Average Match Rating with Positional Flexibility")
-        print()
+        reporter.message("   *** TOURNAMENT BEST XI (4-3-3 Formation) ***")
+        reporter.message("   Based on Average Match Rating with Positional Flexibility")
+        reporter.message()
         
         # Display in formation order
         for formation_pos in selection_order:
@@ -852,29 +792,29 @@ def display_best_xi(qualified_players):
                 # Position indicator
                 pos_indicator = ""
                 if not candidate['is_primary']:
-                    pos_indicator = f" (adapted from {player['position']})"
+                    pos_indicator = f" (adapted from {player.position})"
                 elif candidate['penalty'] > 0:
                     pos_indicator = f" (secondary role)"
                 
-                real_tag = " *** Real Player" if player.get('real_data') else ""
+                real_tag = " *** Real Player" if player.real_data else ""
                 
-                print(f"   {pos_name}: {player['name']} ({player['team_name']})")
-                print(f"      Rating: {player['avg_rating']:.2f} | Matches: {player['matches_played']} | "
-                      f"G+A: {player['goals'] + player['assists']}{pos_indicator}{real_tag}")
+                reporter.message(f"   {pos_name}: {player.name} ({player.team_name})")
+                reporter.message(f"      Rating: {player.avg_rating:.2f} | Matches: {player.matches_played} | "
+                      f"G+A: {player.goals + player.assists}{pos_indicator}{real_tag}")
         
         # Calculate team average rating
         total_rating = sum(candidate['original_rating'] for candidate in selected_best_xi.values())
         average_rating = total_rating / 11
-        print(f"\\n   Best XI Average Rating: {average_rating:.2f}")
+        reporter.message(f"\\n   Best XI Average Rating: {average_rating:.2f}")
         
         # Show formation flexibility stats
         adapted_players = sum(1 for c in selected_best_xi.values() if not c['is_primary'])
         if adapted_players > 0:
-            print(f"   Positional Adaptations: {adapted_players}/11 players in secondary roles")
+            reporter.message(f"   Positional Adaptations: {adapted_players}/11 players in secondary roles")
     
     else:
-        print("   Unable to form complete Best XI - insufficient qualified players")
-        print(f"   Selected: {len(selected_best_xi)}/11 positions")
+        reporter.message("   Unable to form complete Best XI - insufficient qualified players")
+        reporter.message(f"   Selected: {len(selected_best_xi)}/11 positions")
 
 
 def track_manager_performance(teams, final_table):
@@ -947,12 +887,14 @@ def calculate_manager_score(manager_data):
 
 def display_manager_awards(teams, final_table):
     """Display manager performance awards."""
-    print("\\n--- Manager Performance Awards ---")
+    if not reporter.wants_text:  # nothing to format for headless reporters
+        return
+    reporter.message("\\n--- Manager Performance Awards ---")
     
     manager_stats = track_manager_performance(teams, final_table)
     
     if not manager_stats:
-        print("   No manager data available")
+        reporter.message("   No manager data available")
         return
     
     # Calculate scores for all managers
@@ -966,30 +908,31 @@ def display_manager_awards(teams, final_table):
     
     if manager_scores:
         best_score, best_manager = manager_scores[0]
-        print(f"*** Manager of the Tournament: {best_manager['name']} ({best_manager['team_name']})")
-        print(f"   Formation: {best_manager['formation']}")
-        print(f"   Final Position: {best_manager['table_position']}")
-        print(f"   Record: {best_manager['wins']}W-{best_manager['draws']}D-{best_manager['losses']}L")
-        print(f"   Goals: {best_manager['goals_for']}-{best_manager['goals_against']} (GD: {best_manager['goal_difference']:+d})")
-        print(f"   Manager Score: {best_score:.0f}")
+        reporter.message(f"*** Manager of the Tournament: {best_manager['name']} ({best_manager['team_name']})")
+        reporter.message(f"   Formation: {best_manager['formation']}")
+        reporter.message(f"   Final Position: {best_manager['table_position']}")
+        reporter.message(f"   Record: {best_manager['wins']}W-{best_manager['draws']}D-{best_manager['losses']}L")
+        reporter.message(f"   Goals: {best_manager['goals_for']}-{best_manager['goals_against']} (GD: {best_manager['goal_difference']:+d})")
+        reporter.message(f"   Manager Score: {best_score:.0f}")
         
         if best_manager['qualified_ko']:
-            print(f"   QUALIFIED for Knockout Stage")
+            reporter.message(f"   QUALIFIED for Knockout Stage")
         if best_manager['direct_r16']:
-            print(f"   QUALIFIED for Direct Round of 16")
+            reporter.message(f"   QUALIFIED for Direct Round of 16")
     
     # Top 5 managers
-    print("   Top 5 Managers:")
+    reporter.message("   Top 5 Managers:")
     for i, (score, manager) in enumerate(manager_scores[:5], 1):
         ko_status = "Direct R16" if manager['direct_r16'] else ("Qualified" if manager['qualified_ko'] else "Eliminated")
-        print(f"   {i}. {manager['name']} ({manager['team_name']}) - Pos: {manager['table_position']}, Score: {score:.0f} ({ko_status})")
+        reporter.message(f"   {i}. {manager['name']} ({manager['team_name']}) - Pos: {manager['table_position']}, Score: {score:.0f} ({ko_status})")
 
-def setup_teams_with_data():
+@phase('setup_teams_with_data', 'load')
+def setup_teams_with_data(rng=random):
     """Set up all teams with real player data and managers where available."""
     all_teams = []
     all_players = []
     
-    print("*** Starting UEFA Europa League Simulation (Swiss Model with Player Stats) ***")
+    reporter.message("*** Starting UEFA Europa League Simulation (Swiss Model with Player Stats) ***")
     
     for team_info in UEL_TEAMS:
         team = {
@@ -1002,7 +945,7 @@ def setup_teams_with_data():
         # Load players
         players = load_players_from_json(team['name'], team['id'])
         if not players:
-            players = generate_placeholder_players(team['name'], team['id'], team['country'])
+            players = generate_placeholder_players(team['name'], team['id'], team['country'], rng)
         
         all_players.extend(players)
         
@@ -1010,36 +953,50 @@ def setup_teams_with_data():
         manager = load_manager_for_team(team['id'])
         if manager:
             team['manager'] = manager
-            print(f"Found manager {manager.get('name', 'Unknown')} for {team['name']}")
+            reporter.message(f"Found manager {manager.get('name', 'Unknown')} for {team['name']}")
         else:
-            print(f"Manager not found for {team['name']} (club_id: {team['id']})")
+            reporter.message(f"Manager not found for {team['name']} (club_id: {team['id']})")
         
         all_teams.append(team)
     
     return all_teams, all_players
 
-def run_uel_simulation():
-    """Run the complete Europa League simulation."""
+def run_uel_simulation(seed=None):
+    """Run the complete Europa League simulation (reproducible when seeded)."""
+    rng = substream(make_rng(seed), 'competition', 'UEL')
     # Setup teams and players
-    all_teams, all_players = setup_teams_with_data()
+    all_teams, all_players = setup_teams_with_data(substream(rng, 'setup'))
+    # Goals, assists and ratings of this run (the player dicts are only written at the end)
+    stats = StatsArena(player.id for player in all_players)
     
     # Simulate league phase
-    final_table = simulate_league_phase(all_teams, all_players)
+    final_table = simulate_league_phase(all_teams, all_players, stats, substream(rng, 'league_phase'))
     display_league_table(final_table)
     
     # Knockout qualification
     direct_r16, playoff_pairs = determine_knockout_qualification(final_table)
       # Simulate knockout phase
-    champion, runner_up = simulate_knockout_phase(direct_r16, playoff_pairs, all_players, all_teams)
+    champion, runner_up = simulate_knockout_phase(direct_r16, playoff_pairs, all_players, stats, all_teams,
+                                                  substream(rng, 'knockout'))
     
     if champion:
-        print(f"\\n*** EUROPA LEAGUE CHAMPION: {champion['name']} ({champion['country']}) ***")
+        reporter.message(f"\\n*** EUROPA LEAGUE CHAMPION: {champion['name']} ({champion['country']}) ***")
     if runner_up:
-        print(f"   Runner-up: {runner_up['name']} ({runner_up['country']})")
+        reporter.message(f"   Runner-up: {runner_up['name']} ({runner_up['country']})")
     
     # Display comprehensive statistics
+    stats.export(all_players)
     display_player_stats(all_players)
     display_manager_awards(all_teams, final_table)
 
 if __name__ == "__main__":
-    run_uel_simulation()
+    import sys
+    # --quiet / --jsonl[=path] run headless
+    set_reporter(create_reporter(sys.argv[1:]))
+    seed = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--seed='):
+            seed = int(arg.split('=', 1)[1])
+    # --profile[=NAME] prints the hot spots and writes a Chrome trace (profiler.py)
+    with profiling(sys.argv[1:]):
+        run_uel_simulation(seed)
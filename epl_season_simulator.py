@@ -4,83 +4,88 @@ English Premier League Season Simulation
 Focus on just EPL first to understand the data structures
 """
 
-import json
 import random
 import os
 import csv
 from datetime import datetime
 from collections import defaultdict
 
+from data_repository import get_repository
+from player_table import PlayerTable
+from strength_cache import StrengthCache
+from match_engine import play_fixtures, default_rng
+from fixture_scheduler import schedule_for, standings_after, tag_matchdays
+from standings import StandingsTable
+from reporter import ConsoleReporter, create_reporter
+from profiler import phase, count, profiling
+from rng_context import make_rng, substream
+
 
 class EPLSeasonSimulator:
-    def __init__(self):
-        """Initialize the EPL season simulator"""
-        self.league_id = "league_epl"
+    def __init__(self, batch_engine=False, reporter=None, seed=None):
+        """Initialize the EPL season simulator
+        
+        batch_engine: simulate the season in one batch; reporter: where output goes (console by default)
+        seed: seeds an RNGContext for reproducible seasons (None keeps the global random module)
+        """
+        self.reporter = reporter or ConsoleReporter(progress_every=50)
+        self.rng = make_rng(seed)
+        self.league_id = "00_1"
         self.league_name = "English Premier League"
         self.clubs = []
+        self.batch_engine = batch_engine
         self.players = {}
+        self.player_table = PlayerTable()
         self.managers = {}
         self.season_number = 1
+        # EPL strengths carry no per-match noise
+        self.strength_cache = StrengthCache(self.calculate_base_strength, noise=0)
         self.load_data()
         self.determine_season_number()
     
+    @phase('load_data', 'load')
     def load_data(self):
         """Load EPL specific data"""
-        print("📂 Loading EPL data...")
+        self.reporter.message("📂 Loading EPL data...")
+        repository = get_repository()
         
         # Load EPL clubs
-        print("  Loading clubs...")
-        try:
-            with open('data/leagues_clubs/00_1_clubs.json', 'r', encoding='utf-8') as f:
-                self.clubs = json.load(f)
-            print(f"  ✅ Loaded {len(self.clubs)} EPL clubs")
-        except Exception as e:
-            print(f"  ❌ Error loading clubs: {e}")
+        self.reporter.message("  Loading clubs...")
+        self.clubs = repository.get_clubs(self.league_id)
+        if not self.clubs:
+            self.reporter.message(f"  ❌ Error loading clubs: no clubs found for {self.league_id}")
             return
+        self.reporter.message(f"  ✅ Loaded {len(self.clubs)} EPL clubs")
         
         # Load EPL managers
-        print("  Loading managers...")
-        try:
-            with open('data/managers/1.json', 'r', encoding='utf-8') as f:
-                managers_data = json.load(f)
-                # Handle the wrapper structure
-                if isinstance(managers_data, dict) and 'managers' in managers_data:
-                    manager_list = managers_data['managers']
-                else:
-                    manager_list = managers_data
-                
-                # Create lookup by club_id
-                for manager in manager_list:
-                    club_id = manager.get('current_club_id')
-                    if club_id:
-                        self.managers[club_id] = manager
-            print(f"  ✅ Loaded {len(self.managers)} EPL managers")
-        except Exception as e:
-            print(f"  ❌ Error loading managers: {e}")
+        self.reporter.message("  Loading managers...")
+        for club in self.clubs:
+            club_id = club.get('id')
+            manager = repository.club_managers.get(club_id)
+            if manager:
+                self.managers[club_id] = manager
+        self.reporter.message(f"  ✅ Loaded {len(self.managers)} EPL managers")
         
         # Load EPL players
-        print("  Loading players...")
+        self.reporter.message("  Loading players...")
         players_loaded = 0
         for club in self.clubs:
             club_id = club.get('id')
-            if club_id:
-                players_file = f'data/00_1_clubs_players/{club_id}_players.json'
-                try:
-                    if os.path.exists(players_file):
-                        with open(players_file, 'r', encoding='utf-8') as f:
-                            club_players = json.load(f)
-                        
-                        for player in club_players:
-                            player_id = player.get('id')
-                            if player_id:
-                                player['club_id'] = club_id
-                                self.players[player_id] = player
-                                players_loaded += 1
-                except Exception as e:
-                    print(f"    ⚠️  Error loading players for {club.get('name', club_id)}: {e}")
-        
-        print(f"  ✅ Loaded {players_loaded} EPL players")
-        print(f"✅ EPL data loading complete!")
+            for player in repository.club_players.get(club_id, []):
+                player_id = player.get('id')
+                if player_id:
+                    self.players[player_id] = dict(player, club_id=club_id)
+                    players_loaded += 1
+        
+        self.reporter.message(f"  ✅ Loaded {players_loaded} EPL players")
+        
+        # Columnar copy grouped by club for squad-level aggregates
+        squads = defaultdict(list)
+        for player in self.players.values():
+            squads[player.get('club_id')].append(player)
+        self.player_table = PlayerTable.from_squads(squads)
+        self.strength_cache.on_squad_changed()
+        self.reporter.message(f"✅ EPL data loading complete!")
     
     def determine_season_number(self):
         """Determine current season number based on existing CSV files"""
@@ -103,41 +108,29 @@ class EPLSeasonSimulator:
         else:
             self.season_number = 1
         
-        print(f"🏆 Starting EPL Season {self.season_number}")
+        self.reporter.message(f"🏆 Starting EPL Season {self.season_number}")
     
-    def get_club_strength(self, club):
+    def get_club_strength(self, club, rng=random):
+        """Club strength for the current season (cached)"""
+        return self.strength_cache.match_strength(club, rng)
+    
+    def calculate_base_strength(self, club):
         """Calculate club strength based on available data"""
         # Base strength from club reputation
         strength = club.get('reputation', 70)
         
-        # Add player strength if available
-        club_id = club.get('id')
-        if club_id:
-            club_players = [p for p in self.players.values() if p.get('club_id') == club_id]
-            if club_players:
-                # Use overall ratings if available, otherwise calculate from attributes
-                overalls = []
-                for player in club_players:
-                    overall = player.get('overall')
-                    if overall:
-                        overalls.append(overall)
-                    else:
-                        # Calculate from technical attributes if available
-                        tech_attrs = player.get('technical_attributes', {})
-                        if tech_attrs:
-                            avg_tech = sum(tech_attrs.values()) / len(tech_attrs)
-                            overalls.append(avg_tech)
-                
-                if overalls:
-                    avg_overall = sum(overalls) / len(overalls)
-                    strength = (strength + avg_overall) / 2
+        # Add player strength if available (overall ratings, otherwise
+        # technical attribute averages)
+        avg_overall = self.player_table.mean_rating(club.get('id'))
+        if avg_overall is not None:
+            strength = (strength + avg_overall) / 2
         
         return min(max(strength, 50), 95)  # Clamp between 50-95
     
-    def simulate_match(self, home_club, away_club):
-        """Simulate a match between two clubs"""
-        home_strength = self.get_club_strength(home_club)
-        away_strength = self.get_club_strength(away_club)
+    def simulate_match(self, home_club, away_club, rng=random):
+        """Simulate a match between two clubs (rng: random stream to draw from)"""
+        home_strength = self.get_club_strength(home_club, rng)
+        away_strength = self.get_club_strength(away_club, rng)
         
         # Home advantage
         home_strength += 3
@@ -150,8 +143,8 @@ class EPLSeasonSimulator:
         away_base_goals = 1.5 - (strength_diff / 30)
         
         # Add randomness using normal distribution to avoid negative goals
-        home_goals = max(0, int(random.normalvariate(max(0.5, home_base_goals), 1.0)))
-        away_goals = max(0, int(random.normalvariate(max(0.5, away_base_goals), 1.0)))
+        home_goals = max(0, int(rng.normalvariate(max(0.5, home_base_goals), 1.0)))
+        away_goals = max(0, int(rng.normalvariate(max(0.5, away_base_goals), 1.0)))
         
         return {
             'home_team': home_club.get('name', 'Unknown'),
@@ -163,104 +156,69 @@ class EPLSeasonSimulator:
         }
     
     def generate_fixtures(self):
-        """Generate EPL season fixtures (each team plays each other twice - home and away)"""
-        fixtures = []
-        clubs = self.clubs.copy()
-        n = len(clubs)
-        
-        # Create fixtures where each team plays each other twice (home and away)
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    fixtures.append((clubs[i], clubs[j]))
-        
-        # Shuffle for randomness
-        random.shuffle(fixtures)
-        return fixtures
+        """Generate EPL season fixtures (each team plays each other twice - home and away)
+        
+        38 matchdays built by the circle method; see fixture_scheduler.
+        """
+        return list(schedule_for(self.clubs).fixtures)
+    
+    def standings_after_matchday(self, season_result, matchday):
+        """Table after `matchday` of a season returned by simulate_season()"""
+        return standings_after(season_result['matches'], matchday,
+                               get_repository().get_league(self.league_id), self.clubs)
     
-    def simulate_season(self):
-        """Simulate a full EPL season"""
-        print(f"\n🏟️  Simulating {self.league_name} Season {self.season_number}")
-        print("=" * 60)
+    @phase('simulate_season', 'season')
+    def simulate_season(self, rng=None):
+        """Simulate a full EPL season (rng: season stream, defaults to the league's substream)"""
+        if rng is None:
+            rng = substream(self.rng, 'league', self.league_id)
+        self.reporter.message(f"\n🏟️  Simulating {self.league_name} Season {self.season_number}")
+        self.reporter.message("=" * 60)
+        
+        self.strength_cache.start_season(self.season_number)
         
         if len(self.clubs) < 2:
-            print(f"⚠️  Not enough clubs found ({len(self.clubs)})")
+            self.reporter.message(f"⚠️  Not enough clubs found ({len(self.clubs)})")
             return None
         
-        # Generate fixtures
-        fixtures = self.generate_fixtures()
-        print(f"📅 Generated {len(fixtures)} fixtures")
+        # Generate fixtures (cached matchday calendar)
+        with phase('fixtures', 'schedule', league=self.league_id):
+            schedule = schedule_for(self.clubs)
+        fixtures = schedule.fixtures
+        self.reporter.message(f"📅 Generated {len(fixtures)} fixtures over {len(schedule)} matchdays")
         
-        # Initialize league table
-        table = {}
-        for club in self.clubs:
-            club_id = club.get('id')
-            table[club_id] = {
-                'club_name': club.get('name', 'Unknown'),
-                'matches': 0,
-                'wins': 0,
-                'draws': 0,
-                'losses': 0,
-                'goals_for': 0,
-                'goals_against': 0,
-                'goal_difference': 0,
-                'points': 0
-            }
+        # League table (integer columns, the league's tie-breakers from leagues.json)
+        standings = StandingsTable.for_league(get_repository().get_league(self.league_id), self.clubs)
         
         # Simulate all matches
-        print(f"⚽ Simulating {len(fixtures)} matches...")
-        match_results = []
-        for i, (home_club, away_club) in enumerate(fixtures):
-            if i % 50 == 0:  # Progress indicator
-                print(f"  Progress: {i}/{len(fixtures)} matches")
-            
-            result = self.simulate_match(home_club, away_club)
-            match_results.append(result)
-            
-            # Update table
-            home_id = result['home_club_id']
-            away_id = result['away_club_id']
-            
-            if home_id in table and away_id in table:
-                # Update matches played
-                table[home_id]['matches'] += 1
-                table[away_id]['matches'] += 1
-                
-                # Update goals
-                table[home_id]['goals_for'] += result['home_goals']
-                table[home_id]['goals_against'] += result['away_goals']
-                table[away_id]['goals_for'] += result['away_goals']
-                table[away_id]['goals_against'] += result['home_goals']
-                
-                # Determine winner and update points
-                if result['home_goals'] > result['away_goals']:
-                    table[home_id]['wins'] += 1
-                    table[home_id]['points'] += 3
-                    table[away_id]['losses'] += 1
-                elif result['home_goals'] < result['away_goals']:
-                    table[away_id]['wins'] += 1
-                    table[away_id]['points'] += 3
-                    table[home_id]['losses'] += 1
-                else:
-                    table[home_id]['draws'] += 1
-                    table[away_id]['draws'] += 1
-                    table[home_id]['points'] += 1
-                    table[away_id]['points'] += 1
-        
-        # Calculate goal difference
-        for club_id in table:
-            table[club_id]['goal_difference'] = table[club_id]['goals_for'] - table[club_id]['goals_against']
-        
-        # Sort table by points, then goal difference, then goals for
-        sorted_table = sorted(table.values(), 
-                            key=lambda x: (-x['points'], -x['goal_difference'], -x['goals_for']))
-        
-        # Add positions
-        for i, club in enumerate(sorted_table):
-            club['position'] = i + 1
-        
-        # Display results
-        self.display_table(sorted_table)
+        self.reporter.message(f"⚽ Simulating {len(fixtures)} matches...")
+        with phase('matches', 'match', league=self.league_id, matches=len(fixtures)):
+            if self.batch_engine:
+                # Whole season in one batch (same model, noise and clamp as simulate_match)
+                match_results = play_fixtures(
+                    fixtures, self.strength_cache.base_strength, default_rng(rng.getrandbits(32)),
+                    noise=self.strength_cache.noise, clamp=(self.strength_cache.low, self.strength_cache.high))
+            else:
+                match_results = []
+                for i, (home_club, away_club) in enumerate(fixtures):
+                    self.reporter.progress(i, len(fixtures))
+                    match_results.append(self.simulate_match(home_club, away_club, rng))
+        count('matches', len(fixtures))
+        tag_matchdays(match_results, schedule)
+        
+        # Update table, re-ranking after every matchday
+        matchday = 1
+        for result in match_results:
+            if result['matchday'] != matchday:
+                standings.end_matchday()
+                matchday = result['matchday']
+            standings.record_result(result['home_club_id'], result['away_club_id'],
+                                    result['home_goals'], result['away_goals'])
+        sorted_table = standings.rows()
+        
+        # Display results (rendered only by text reporters)
+        self.reporter.league_table(self.league_id, self.league_name, sorted_table,
+                                   lambda table, league_id, league_name: self.display_table(table))
         
         # Export to CSV
         self.export_to_csv(sorted_table, match_results)
@@ -273,10 +231,10 @@ class EPLSeasonSimulator:
     
     def display_table(self, table):
         """Display the final EPL table"""
-        print(f"\n📊 {self.league_name} Season {self.season_number} Final Table:")
-        print("=" * 80)
-        print(f"{'Pos':<3} {'Club':<25} {'P':<3} {'W':<3} {'D':<3} {'L':<3} {'GF':<3} {'GA':<3} {'GD':<4} {'Pts':<3}")
-        print("=" * 80)
+        self.reporter.message(f"\n📊 {self.league_name} Season {self.season_number} Final Table:")
+        self.reporter.message("=" * 80)
+        self.reporter.message(f"{'Pos':<3} {'Club':<25} {'P':<3} {'W':<3} {'D':<3} {'L':<3} {'GF':<3} {'GA':<3} {'GD':<4} {'Pts':<3}")
+        self.reporter.message("=" * 80)
         
         for club in table:
             # Add qualification info
@@ -290,28 +248,29 @@ class EPLSeasonSimulator:
             else:
                 qual = ""
             
-            print(f"{club['position']:<3} {club['club_name'][:25]:<25} "
+            self.reporter.message(f"{club['position']:<3} {club['club_name'][:25]:<25} "
                   f"{club['matches']:<3} {club['wins']:<3} {club['draws']:<3} {club['losses']:<3} "
                   f"{club['goals_for']:<3} {club['goals_against']:<3} {club['goal_difference']:>+4} {club['points']:<3} {qual}")
         
-        print("=" * 80)
-        print("🏆 UCL = Champions League, 🥉 UEL = Europa League, ⬇️ REL = Relegation")
+        self.reporter.message("=" * 80)
+        self.reporter.message("🏆 UCL = Champions League, 🥉 UEL = Europa League, ⬇️ REL = Relegation")
         
         # Show top performers
         winner = table[0]
-        print(f"\n🏆 EPL CHAMPION: {winner['club_name']} ({winner['points']} points)")
+        self.reporter.message(f"\n🏆 EPL CHAMPION: {winner['club_name']} ({winner['points']} points)")
         
         if len(table) >= 4:
             ucl_teams = [club['club_name'] for club in table[:4]]
-            print(f"🏆 Champions League: {', '.join(ucl_teams)}")
+            self.reporter.message(f"🏆 Champions League: {', '.join(ucl_teams)}")
         
         if len(table) >= 5:
-            print(f"🥉 Europa League: {table[4]['club_name']}")
+            self.reporter.message(f"🥉 Europa League: {table[4]['club_name']}")
         
         if len(table) >= 18:
             relegated = [club['club_name'] for club in table[-3:]]
-            print(f"⬇️ Relegated: {', '.join(relegated)}")
+            self.reporter.message(f"⬇️ Relegated: {', '.join(relegated)}")
     
+    @phase('export_to_csv', 'io')
     def export_to_csv(self, table, matches):
         """Export results to CSV files"""
         # Main results file
@@ -347,25 +306,26 @@ class EPLSeasonSimulator:
         # Matches file for this season
         matches_filename = f"epl_season_{self.season_number}_matches.csv"
         with open(matches_filename, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['Home_Team', 'Away_Team', 'Home_Goals', 'Away_Goals']
+            fieldnames = ['Matchday', 'Home_Team', 'Away_Team', 'Home_Goals', 'Away_Goals']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             
             for match in matches:
                 writer.writerow({
+                    'Matchday': match.get('matchday'),
                     'Home_Team': match['home_team'],
                     'Away_Team': match['away_team'],
                     'Home_Goals': match['home_goals'],
                     'Away_Goals': match['away_goals']
                 })
         
-        print(f"\n✅ Results exported to {csv_filename}")
-        print(f"✅ Matches exported to {matches_filename}")
+        self.reporter.message(f"\n✅ Results exported to {csv_filename}")
+        self.reporter.message(f"✅ Matches exported to {matches_filename}")
     
     def display_manager_info(self):
         """Display manager information"""
-        print(f"\n👔 EPL Manager Information:")
-        print("-" * 60)
+        self.reporter.message(f"\n👔 EPL Manager Information:")
+        self.reporter.message("-" * 60)
         
         manager_stats = []
         for club in self.clubs:
@@ -394,14 +354,22 @@ class EPLSeasonSimulator:
         manager_stats.sort(key=lambda x: x['ability'], reverse=True)
         
         for i, stats in enumerate(manager_stats, 1):
-            print(f"{i:2}. {stats['club'][:20]:<20} | {stats['manager'][:15]:<15} | "
+            self.reporter.message(f"{i:2}. {stats['club'][:20]:<20} | {stats['manager'][:15]:<15} | "
                   f"{stats['nationality']} | {stats['ability']:2} | {stats['formation']}")
 
 
 def main():
     """Main function to run the EPL simulation"""
     try:
-        simulator = EPLSeasonSimulator()
+        # --batch simulates the season in one batch through match_engine
+        import sys
+        # --quiet / --jsonl[=path] / --debug choose the reporter, --seed=N makes the season reproducible
+        seed = None
+        for arg in sys.argv[1:]:
+            if arg.startswith("--seed="):
+                seed = int(arg.split("=", 1)[1])
+        simulator = EPLSeasonSimulator(batch_engine="--batch" in sys.argv[1:], reporter=create_reporter(sys.argv[1:]),
+                                       seed=seed)
         
         print("🏴󠁧󠁢󠁥󠁮󠁧󠁿 English Premier League Simulator")
         print("=" * 50)
@@ -438,4 +406,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import sys
+    # --profile[=NAME] prints the hot spots and writes a Chrome trace (profiler.py)
+    with profiling(sys.argv[1:]):
+        main()
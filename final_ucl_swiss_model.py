@@ -1,14 +1,39 @@
 import os
 import json
 import random
+import time
 import math
+import bisect
 from datetime import datetime
 from collections import defaultdict, Counter
 import copy # Added for deep copying team data if necessary
 import logging # Added to resolve NameError
 
+from data_repository import get_repository
+from data_snapshot import load_json
+from reporter import ConsoleReporter, create_reporter
+from rng_context import make_rng, substream
+from standings import StandingsTable, tie_breakers_for, points_for
+from swiss_draw import LeaguePhaseDraw, DrawError
+from stats_arena import StatsArena
+from lineup_cache import LineupCache
+from alias_table import AliasTable
+from profiler import phase, profiling
+
 # --- Logging Configuration ---
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s')
+# DEBUG output is opt-in (--debug)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s')
+
+# --- Output ---
+# Everything this module prints goes through the reporter (console by
+# default); set_reporter(NullReporter()) runs it headless
+reporter = ConsoleReporter()
+
+
+def set_reporter(new_reporter):
+    """Send this module's output to another Reporter"""
+    global reporter
+    reporter = new_reporter
 
 # --- Constants ---
 BASE_DATA_PATH = os.path.join(os.path.dirname(__file__), 'data')
@@ -31,154 +56,169 @@ PLAYER_SKILL_STD_DEV = 7 # From typical player generation
 BASE_RATING = 6.0
 RATING_STD_DEV = 0.5
 FORM_INFLUENCE = 0.2
+FORM_FLOOR = 0.80 # Form stays within these bounds
+FORM_CEILING = 1.20
 MIN_PLAYERS_FOR_FULL_TEAM = 18 # For team setup checks
 
 # Helper function to load JSON data
 def load_json_data(file_path, schema_type="dict"): # Added schema_type for flexibility
-    print(f"DEBUG: Attempting to load JSON from: {file_path}")
+    reporter.debug(f"Attempting to load JSON from: {file_path}")
     if not os.path.exists(file_path):
-        print(f"CRITICAL: File not found: {file_path}")
+        reporter.message(f"CRITICAL: File not found: {file_path}")
         return None
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print(f"DEBUG: Successfully loaded JSON from: {file_path}")
+        data = load_json(file_path) # Served from the prebuilt dataset snapshot when available
+        reporter.debug(f"Successfully loaded JSON from: {file_path}")
         # Basic type check based on expected schema_type
         if schema_type == "list" and not isinstance(data, list):
-            print(f"Warning: Expected a list from {file_path}, but got {type(data)}.")
+            reporter.message(f"Warning: Expected a list from {file_path}, but got {type(data)}.")
             # return None # Or handle as per desired strictness
         elif schema_type == "dict" and not isinstance(data, dict):
-            print(f"Warning: Expected a dict from {file_path}, but got {type(data)}.")
+            reporter.message(f"Warning: Expected a dict from {file_path}, but got {type(data)}.")
             # return None
         return data
     except json.JSONDecodeError as e:
-        print(f"CRITICAL: JSONDecodeError in {file_path}: {e}")
+        reporter.message(f"CRITICAL: JSONDecodeError in {file_path}: {e}")
         return None
     except Exception as e:
-        print(f"CRITICAL: Unexpected error loading {file_path}: {e}")
+        reporter.message(f"CRITICAL: Unexpected error loading {file_path}: {e}")
         return None
 
 # --- Utility Functions (if any specific to this script, like print_stars) ---
 def print_stars(length=50):
-    print("*" * length)
+    reporter.message("*" * length)
 
 def print_header(title):
     print_stars(len(title) + 6)
-    print(f"** {title} **")
+    reporter.message(f"** {title} **")
     print_stars(len(title) + 6)
-    print("\\n")
+    reporter.message("\\n")
 
 def print_subheader(title):
-    print(f"\\n--- {title} ---")
+    reporter.message(f"\\n--- {title} ---")
 
 # --- Data Loading Functions ---
+# Specific positions found in the player files -> the GK/DEF/MID/FWD groups used here
+POSITION_GROUPS = {
+    "GK": "GK",
+    "CB": "DEF", "LB": "DEF", "RB": "DEF", "LWB": "DEF", "RWB": "DEF", "FB": "DEF", "DEF": "DEF",
+    "DM": "MID", "CDM": "MID", "CM": "MID", "MC": "MID", "LM": "MID", "RM": "MID", "ML": "MID", "MR": "MID",
+    "AM": "MID", "CAM": "MID", "AMC": "MID", "AML": "MID", "AMR": "MID", "MID": "MID",
+    "ST": "FWD", "CF": "FWD", "SS": "FWD", "LW": "FWD", "RW": "FWD", "W": "FWD", "FWD": "FWD",
+}
+
+def convert_player_record(player_data, club_id):
+    """Shape a raw player record (any of the data file schemas) into the fields this module uses."""
+    player_id = player_data.get('player_id') or player_data.get('id')
+    if not player_id:
+        return None
+    positions = player_data.get('positions_primary') or [player_data.get('position', 'CM')]
+    specific_position = positions[0] if positions else 'CM'
+    skill = player_data.get('current_ability') or player_data.get('overall_rating') or player_data.get('skill') or 60
+    return {
+        'player_id': player_id,
+        'name': player_data.get('known_as') or player_data.get('full_name') or player_data.get('name') or f"Player {player_id}",
+        'position': POSITION_GROUPS.get(specific_position, 'MID'),
+        'specific_position': specific_position,
+        'skill': skill,
+        'real_data': True,
+        'club_id_source': club_id,
+    }
+
 def load_player_data(base_data_path): # Changed signature
-    print(f"DEBUG: Starting to load player data from base path: {base_data_path}")
+    reporter.debug(f"Starting to load player data from base path: {base_data_path}")
     all_players_dict = {}
     player_team_links = defaultdict(list)
-    
-    league_player_dirs_found = 0
-    club_player_files_found = 0
     total_players_loaded = 0
 
-    for item in os.listdir(base_data_path):
-        item_path = os.path.join(base_data_path, item)
-        if os.path.isdir(item_path) and item.startswith("league_") and item.endswith("_clubs_players"):
-            league_player_dirs_found += 1
-            print(f"DEBUG: Scanning league player directory: {item_path}")
-            for player_file_name in os.listdir(item_path):
-                if player_file_name.startswith("club_") and player_file_name.endswith("_players.json"):
-                    club_player_files_found += 1
-                    club_id_part = player_file_name[:-len("_players.json")] # NEW: Keeps "club_" prefix. e.g. "club_juventus_players.json" -> "club_juventus"
-
-                    player_file_path = os.path.join(item_path, player_file_name)
-                    players_in_file = load_json_data(player_file_path, schema_type="list")
-                    
-                    if isinstance(players_in_file, list):
-                        for player_data in players_in_file:
-                            if isinstance(player_data, dict) and 'player_id' in player_data:
-                                player_id = player_data['player_id']
-                                if player_id in all_players_dict:
-                                    print(f"Warning: Duplicate player_id {player_id} found. Overwriting from {player_file_path}. Original: {all_players_dict[player_id].get('source_file', 'N/A')}")
-                                player_data['source_file'] = player_file_path # Keep track of origin
-                                player_data['club_id_source'] = club_id_part # Store the club_id derived from filename
-                                all_players_dict[player_id] = player_data
-                                player_team_links[club_id_part].append(player_id)
-                                total_players_loaded +=1
-                            else:
-                                print(f"Warning: Invalid player data format or missing 'player_id' in {player_file_path}: {player_data}")
-                    else:
-                        print(f"Warning: Expected a list of players in {player_file_path}, but got {type(players_in_file)}. Skipping.")
+    # Squads come pre-indexed by club from the shared data repository
+    repository = get_repository(base_data_path)
+    for club_id, club_players in repository.club_players.items():
+        for player_data in club_players:
+            player_record = convert_player_record(player_data, club_id)
+            if player_record is None:
+                continue
+            player_id = player_record['player_id']
+            if player_id in all_players_dict:
+                reporter.message(f"Warning: Duplicate player_id {player_id} found. Overwriting. Original club: {all_players_dict[player_id]['club_id_source']}")
+            all_players_dict[player_id] = player_record
+            player_team_links[club_id].append(player_id)
+            total_players_loaded += 1
     
-    print(f"DEBUG: Player data loading summary: Found {league_player_dirs_found} league player dirs, {club_player_files_found} club player files. Loaded {total_players_loaded} players into all_players_dict.")
+    reporter.debug(f"Player data loading summary: {len(player_team_links)} clubs with squads. Loaded {total_players_loaded} players into all_players_dict.")
     if not all_players_dict:
-        print("CRITICAL WARNING: No players were loaded into all_players_dict.")
+        reporter.message("CRITICAL WARNING: No players were loaded into all_players_dict.")
     if not player_team_links:
-        print("WARNING: No player-team links were established.")
+        reporter.message("WARNING: No player-team links were established.")
         
     return all_players_dict, player_team_links
 
 # --- Data Loading Functions (specific to this simulation) ---
 def load_all_club_data(clubs_dir_path, leagues_list_from_json_main, all_players_global_dict, player_team_links): # Added player data params
-    print(f"DEBUG: Attempting to load club data from {clubs_dir_path}, and integrate players.")
+    reporter.debug(f"Attempting to load club data from {clubs_dir_path}, and integrate players.")
     all_clubs_main = {}
-    club_files_to_load_main = set()
+    repository = get_repository(os.path.dirname(clubs_dir_path))
+
+    for club_id, club_source in repository.clubs.items():
+        # Shallow copy: the repository's club dicts are shared with other simulators
+        club_main_data = dict(club_source)
+        club_main_data['id'] = club_id
+        club_main_data['league_id'] = repository.club_league.get(club_id)
+        club_main_data.setdefault('country', club_main_data.get('country_code', 'Unknown'))
+        if 'reputation' not in club_main_data:
+            # Club files keep reputation on a 0-100 scale under 'attributes'; get_club_strength expects 0-10000
+            club_main_data['reputation'] = club_main_data.get('attributes', {}).get('reputation', 50) * 100
+        manager = repository.club_managers.get(club_id)
+        if manager:
+            club_main_data['manager_id'] = manager.get('manager_id') or manager.get('id')
+
+        # Embed the squad using player_team_links (keyed by repository club id)
+        club_main_data['players'] = []
+        for player_id in player_team_links.get(club_id, []):
+            if player_id in all_players_global_dict:
+                club_main_data['players'].append(copy.deepcopy(all_players_global_dict[player_id]))
+            else:
+                reporter.message(f"Warning: Player ID {player_id} linked to club {club_id} not found in all_players_global_dict.")
 
-    # First, gather all club metadata files (e.g., epl_clubs.json)
-    if os.path.exists(clubs_dir_path):
-        for filename_main in os.listdir(clubs_dir_path):
-            if filename_main.endswith('.json'): # Assuming these are league-wide club list files
-                club_files_to_load_main.add(os.path.join(clubs_dir_path, filename_main))
-    
-    # Load actual club data from these files
-    for file_path_main in club_files_to_load_main:
-        # These files are expected to contain a LIST of club objects for a league
-        league_club_data_list = load_json_data(file_path_main, schema_type="list") 
-        if isinstance(league_club_data_list, list):
-            for club_main_data in league_club_data_list: # club_main_data is a dict for one club
-                if isinstance(club_main_data, dict) and "id" in club_main_data:
-                    club_id = club_main_data["id"]
-                    
-                    # Initialize 'players' list for the club
-                    club_main_data['players'] = []
-                    
-                    # Use player_team_links to find player IDs for this club
-                    # The club_id from club_main_data["id"] must match the keys in player_team_links
-                    # (which were derived from club_XYZ_players.json filenames)
-                    if club_id in player_team_links:
-                        for player_id in player_team_links[club_id]:
-                            if player_id in all_players_global_dict:
-                                # Embed the full player object
-                                club_main_data['players'].append(copy.deepcopy(all_players_global_dict[player_id]))
-                            else:
-                                print(f"Warning: Player ID {player_id} linked to club {club_id} not found in all_players_global_dict.")
-                    # else:
-                        # print(f"Debug: No player links found for club ID {club_id} in player_team_links (this might be okay if club has no separate player file or no players).")
-
-                    if not club_main_data['players']:
-                        print(f"Debug: Club {club_id} ({club_main_data.get('name', 'N/A')}) has no players embedded after processing links.")
-
-                    all_clubs_main[club_id] = club_main_data
-                else:
-                    print(f"Warning: Club data in {file_path_main} missing 'id' or not a dict. Entry: {club_main_data}")
-        else:
-            print(f"Warning: Expected a list of clubs in {file_path_main}, got {type(league_club_data_list)}. Skipping.")
+        all_clubs_main[club_id] = club_main_data
 
-    if not all_clubs_main: print("DEBUG: load_all_club_data found no clubs.")
-    else: print(f"DEBUG: load_all_club_data loaded {len(all_clubs_main)} clubs and attempted to embed players.")
+    if not all_clubs_main: reporter.debug("load_all_club_data found no clubs.")
+    else: reporter.debug(f"load_all_club_data loaded {len(all_clubs_main)} clubs and attempted to embed players.")
     return all_clubs_main
 
+def build_leagues_data(leagues_list):
+    """Reshape leagues.json (a list) into the {'leagues': {...}, 'competition_ucl': {...}} layout used below."""
+    repository = get_repository()
+    leagues_by_id = {}
+    for league in leagues_list:
+        league_id = league.get('id') or league.get('league_id')
+        if league_id:
+            leagues_by_id[league_id] = league
+
+    ucl_league = repository.get_league('competition_ucl') or {}
+    automatic_spots = ucl_league.get('qualification_criteria', {}).get('automatic_spots', {})
+    domestic_spots = {}
+    for legacy_league_id, spots in automatic_spots.items():
+        league_id = repository.resolve_league_id(legacy_league_id)
+        if league_id:
+            domestic_spots[league_id] = spots
+
+    return {
+        'leagues': leagues_by_id,
+        'competition_ucl': dict(ucl_league, qualification_criteria={'domestic_leagues': domestic_spots}),
+    }
+
 def load_all_manager_data(managers_list_from_file): # Simplified signature
-    print("DEBUG: Processing managers list to create a dictionary.")
+    reporter.debug("Processing managers list to create a dictionary.")
     all_managers_dict = {}
     temp_id_counter = 0
     if not isinstance(managers_list_from_file, list):
-        print("CRITICAL: managers_list_from_file is not a list. Cannot load managers.")
+        reporter.message("CRITICAL: managers_list_from_file is not a list. Cannot load managers.")
         return {}
 
     for i, manager_data in enumerate(managers_list_from_file):
         if not isinstance(manager_data, dict):
-            print(f"Warning: Item {i} in managers list is not a dictionary: {manager_data}")
+            reporter.message(f"Warning: Item {i} in managers list is not a dictionary: {manager_data}")
             continue
 
         manager_id = manager_data.get("id")
@@ -189,22 +229,22 @@ def load_all_manager_data(managers_list_from_file): # Simplified signature
                  manager_id = f"temp_manager_{name_part}_{i}"
             else:
                  manager_id = f"temp_manager_id_{temp_id_counter}"
-            print(f"Warning: Manager data at index {i} missing 'id'. Assigning temporary ID: {manager_id}. Manager data: {manager_data}")
+            reporter.message(f"Warning: Manager data at index {i} missing 'id'. Assigning temporary ID: {manager_id}. Manager data: {manager_data}")
             manager_data["id"] = manager_id # Add temp ID to the dict
             temp_id_counter += 1
         
         if manager_id in all_managers_dict:
-            print(f"Warning: Duplicate manager ID '{manager_id}' found. Overwriting. Original: {all_managers_dict[manager_id]}, New: {manager_data}")
+            reporter.message(f"Warning: Duplicate manager ID '{manager_id}' found. Overwriting. Original: {all_managers_dict[manager_id]}, New: {manager_data}")
         all_managers_dict[manager_id] = manager_data
             
     if not all_managers_dict:
-        print("Warning: No manager data loaded into dictionary. Using defaults where necessary.")
+        reporter.message("Warning: No manager data loaded into dictionary. Using defaults where necessary.")
     else:
-        print(f"DEBUG: Loaded {len(all_managers_dict)} managers into dictionary.")
+        reporter.debug(f"Loaded {len(all_managers_dict)} managers into dictionary.")
     return all_managers_dict
 
 def initialize_all_leagues_and_clubs(leagues_data, managers_data, playing_styles_data, all_clubs_from_files, player_team_links):
-    print("DEBUG: Entered initialize_all_leagues_and_clubs")
+    reporter.debug("Entered initialize_all_leagues_and_clubs")
     
     sim_teams_by_id_lookup = {}
     league_stats_lookup = {} # For individual team stats if needed outside league table
@@ -212,13 +252,16 @@ def initialize_all_leagues_and_clubs(leagues_data, managers_data, playing_styles
     teams_by_league = {} # Initialize this
 
     if not isinstance(leagues_data, dict) or 'leagues' not in leagues_data:
-        print("CRITICAL: leagues_data is not a dictionary or 'leagues' key is missing.")
+        reporter.message("CRITICAL: leagues_data is not a dictionary or 'leagues' key is missing.")
         return {}, {}, {}, {}, {} # Match the 5 return values
 
-    for league_info in leagues_data.get('leagues', []):
-        league_id = league_info.get("id")
+    leagues_iter = leagues_data.get('leagues', [])
+    if isinstance(leagues_iter, dict): # build_leagues_data keys leagues by id
+        leagues_iter = leagues_iter.values()
+    for league_info in leagues_iter:
+        league_id = league_info.get("id") or league_info.get("league_id")
         if not league_id:
-            print(f"Warning: League data missing 'id': {league_info}")
+            reporter.message(f"Warning: League data missing 'id': {league_info}")
             continue
         
         league_details[league_id] = {
@@ -240,7 +283,7 @@ def initialize_all_leagues_and_clubs(leagues_data, managers_data, playing_styles
 
     sim_teams_by_id_lookup.update(all_clubs_from_files)
 
-    print("DEBUG: Exiting initialize_all_leagues_and_clubs")
+    reporter.debug("Exiting initialize_all_leagues_and_clubs")
     return all_clubs_from_files, teams_by_league, sim_teams_by_id_lookup, league_details, league_stats_lookup
 
 # --- Club Strength Calculation (5-factor model) ---
@@ -312,7 +355,7 @@ def get_ucl_qualified_teams(leagues_data, all_clubs, all_managers):
     qualified_teams_output = []
     ucl_config = leagues_data.get("competition_ucl", {})
     if not ucl_config:
-        print("Error: 'competition_ucl' not found in leagues.json.")
+        reporter.message("Error: 'competition_ucl' not found in leagues.json.")
         return []
         
     qualification_criteria = ucl_config.get("qualification_criteria", {})
@@ -382,7 +425,7 @@ def get_ucl_qualified_teams(leagues_data, all_clubs, all_managers):
 
     # Fill remaining spots if less than 36
     if len(qualified_teams_output) < 36:
-        print(f"Warning: Only {len(qualified_teams_output)} teams qualified. Attempting to fill with highest reputation clubs.")
+        reporter.message(f"Warning: Only {len(qualified_teams_output)} teams qualified. Attempting to fill with highest reputation clubs.")
         remaining_clubs_to_consider = []
         for club_id, club_detail in all_clubs.items():
             if club_id not in processed_club_ids:
@@ -410,7 +453,7 @@ def get_ucl_qualified_teams(leagues_data, all_clubs, all_managers):
     
     # Truncate if more than 36 (should ideally not happen with precise rules)
     if len(qualified_teams_output) > 36:
-        print(f"Warning: {len(qualified_teams_output)} teams qualified. Truncating to 36 based on strength.")
+        reporter.message(f"Warning: {len(qualified_teams_output)} teams qualified. Truncating to 36 based on strength.")
         qualified_teams_output.sort(key=lambda t: t['reputation'], reverse=True)
         qualified_teams_output = qualified_teams_output[:36]
     
@@ -423,12 +466,12 @@ def get_ucl_qualified_teams(leagues_data, all_clubs, all_managers):
         else: team['pot'] = 4
         
     if len(qualified_teams_output) < 36:
-         print(f"CRITICAL WARNING: Could not gather 36 teams. Only {len(qualified_teams_output)} found. Simulation may be unstable.")
+         reporter.message(f"CRITICAL WARNING: Could not gather 36 teams. Only {len(qualified_teams_output)} found. Simulation may be unstable.")
 
     return qualified_teams_output
 
 # --- Player and Team Setup for Simulation ---
-def setup_simulation_data(qualified_teams_from_qualification_step):
+def setup_simulation_data(qualified_teams_from_qualification_step, rng=random):
     """
     Prepares team and player data structures for the simulation.
     - `sim_teams_list`: List of team dicts for the simulation.
@@ -440,7 +483,7 @@ def setup_simulation_data(qualified_teams_from_qualification_step):
     for team_data_in in qualified_teams_from_qualification_step:
         current_team_player_ids_list = []
         if not isinstance(team_data_in.get('players'), list):
-            print(f"Warning: Players data for team {team_data_in.get('name')} is not a list or missing. Skipping players for this team.")
+            reporter.message(f"Warning: Players data for team {team_data_in.get('name')} is not a list or missing. Skipping players for this team.")
             team_data_in['players'] = [] # Ensure it's an empty list
 
         for player_raw_data in team_data_in.get('players', []):
@@ -460,7 +503,7 @@ def setup_simulation_data(qualified_teams_from_qualification_step):
                 "position": player_raw_data.get("position", "MID"), 
                 "specific_position": player_raw_data.get("specific_position", player_raw_data.get("position", "CM")),
                 "skill": player_raw_data.get("skill", 60),
-                "form": round(random.uniform(0.85, 1.15), 2), 
+                "form": round(rng.uniform(0.85, 1.15), 2), 
                 "avg_rating": 0.0,
                 "total_rating_points": 0.0,
                 "matches_played": 0,
@@ -486,9 +529,9 @@ def setup_simulation_data(qualified_teams_from_qualification_step):
         sim_teams_list.append(sim_team_entry)
 
     if not sim_teams_list:
-        print("CRITICAL ERROR: No teams prepared for simulation.")
+        reporter.message("CRITICAL ERROR: No teams prepared for simulation.")
     if not all_players_dict:
-        print("CRITICAL ERROR: No players prepared for simulation (all_players_dict is empty).")
+        reporter.message("CRITICAL ERROR: No players prepared for simulation (all_players_dict is empty).")
         
     return sim_teams_list, all_players_dict
 
@@ -505,6 +548,9 @@ FORMATIONS = { # Copied from simple_ucl_swiss_model_simulation.py
     '5-3-2': {'GK': 1, 'DEF': 5, 'MID': 3, 'FWD': 2}
 }
 
+# Starting XIs by (club, formation, ...): a club's XI only changes with its squad
+LINEUPS = LineupCache()
+
 def select_starting_xi(team_player_ids, all_players_data, formation_name=None):
     """Select starting XI based on formation, prioritizing skill.
        Uses all_players_data which is the central player registry.
@@ -565,7 +611,7 @@ def select_starting_xi(team_player_ids, all_players_data, formation_name=None):
             
     if len(lineup_ids) < 11:
         # This is a more critical issue, means not enough players overall for the team.
-        print(f"CRITICAL WARNING: Team could not form a full XI. Only {len(lineup_ids)} players. Padding with placeholders if possible.")
+        reporter.message(f"CRITICAL WARNING: Team could not form a full XI. Only {len(lineup_ids)} players. Padding with placeholders if possible.")
         # This scenario should ideally be handled by ensuring teams have enough players during setup.
         # For now, we'll proceed, but match simulation might be skewed.
         # If absolutely necessary, one could create dummy players here, but that's a deeper fix.
@@ -574,64 +620,71 @@ def select_starting_xi(team_player_ids, all_players_data, formation_name=None):
     return lineup_ids[:11] # Ensure exactly 11 if somehow overfilled, or less if critically short
 
 
-def assign_goals_and_assists(num_goals, team_lineup_ids, all_players_data):
+# Position multipliers of skill in the scorer / assister weights
+SCORER_POSITION_WEIGHTS = {'FWD': 3, 'MID': 2, 'DEF': 1}
+ASSISTER_POSITION_WEIGHTS = {'MID': 3, 'FWD': 2, 'DEF': 1}
+
+def build_scoring_tables(team_lineup_ids, all_players_data):
+    """Scorer and assister AliasTables over a lineup's outfield players (skill x position).
+       Form is left out so the tables can be cached with the lineup; see _draw_in_form.
+    """
+    lineup_players = [all_players_data[pid] for pid in team_lineup_ids if pid in all_players_data]
+    if not lineup_players: # Should not happen if team_lineup_ids is valid
+        reporter.message("Warning: No lineup players found for assigning goals/assists.")
+    outfield = [p for p in lineup_players if p['position'] != 'GK']
+    scorers = AliasTable(outfield, [p['skill'] * SCORER_POSITION_WEIGHTS.get(p['position'], 1) for p in outfield])
+    assisters = AliasTable(outfield, [p['skill'] * ASSISTER_POSITION_WEIGHTS.get(p['position'], 1) for p in outfield])
+    return scorers, assisters
+
+def _draw_in_form(table, stats, rng, excluded=None):
+    """Index drawn with weight x current form: a table draw is kept with probability
+       form / FORM_CEILING (exact thinning, as form never exceeds the ceiling).
+       None if nobody but `excluded` is left.
+    """
+    remaining = table.total - (table.weights[excluded] if excluded is not None else 0)
+    while True:
+        i = table.sample_index(rng) if excluded is None else table.sample_excluding(rng, excluded)
+        if i is None or remaining <= 0: # All skills zero: uniform, as before
+            return i
+        if rng.random() * FORM_CEILING < stats.form[stats.slot(table.items[i]['id'])]:
+            return i
+
+def assign_goals_and_assists(num_goals, team_lineup_ids, all_players_data, stats, rng=random, tables=None):
     """Assigns goals and assists to players in the lineup.
-       Modifies all_players_data directly.
+       Counts them in the run's StatsArena `stats` (player dicts are not modified).
+       tables: the lineup's build_scoring_tables(), e.g. cached with the lineup.
     """
     contributions = [] # list of {'player_id': ..., 'type': 'goal'/'assist'}
     if not team_lineup_ids or num_goals == 0:
         return contributions
 
-    lineup_players = [all_players_data[pid] for pid in team_lineup_ids if pid in all_players_data]
-    if not lineup_players: # Should not happen if team_lineup_ids is valid
-        print("Warning: No lineup players found for assigning goals/assists.")
+    if tables is None:
+        tables = build_scoring_tables(team_lineup_ids, all_players_data)
+    scorers, assisters = tables
+    if not len(scorers): # No outfield players
         return contributions
-    
+
     for _ in range(num_goals):
-        potential_scorers = [p for p in lineup_players if p['position'] != 'GK']
-        if not potential_scorers: continue
-
-        scorer_weights = []
-        for p in potential_scorers:
-            # Skill and form influence scoring propensity
-            effective_skill = p['skill'] * p.get('form', 1.0) 
-            if p['position'] == 'FWD': scorer_weights.append(effective_skill * 3)
-            elif p['position'] == 'MID': scorer_weights.append(effective_skill * 2)
-            else: scorer_weights.append(effective_skill * 1) # DEF
-        
-        if not scorer_weights or sum(scorer_weights) == 0: # Fallback if all weights are zero
-            scorer = random.choice(potential_scorers)
-        else:
-            scorer = random.choices(potential_scorers, weights=scorer_weights, k=1)[0]
-        
-        all_players_data[scorer['id']]['goals'] += 1
+        # Skill, position and form decide the scorer
+        scorer_index = _draw_in_form(scorers, stats, rng)
+        scorer = scorers.items[scorer_index]
+        stats.goals[stats.slot(scorer['id'])] += 1
         contributions.append({'player_id': scorer['id'], 'type': 'goal'})
 
-        if random.random() < 0.65: # Chance of assist
-            potential_assisters = [p for p in lineup_players if p['id'] != scorer['id'] and p['position'] != 'GK']
-            if not potential_assisters: continue
-
-            assister_weights = []
-            for p in potential_assisters:
-                # Skill and form influence assisting propensity
-                effective_skill = p['skill'] * p.get('form', 1.0)
-                if p['position'] == 'MID': assister_weights.append(effective_skill * 3)
-                elif p['position'] == 'FWD': assister_weights.append(effective_skill * 2)
-                else: assister_weights.append(effective_skill * 1) # DEF
-            
-            if not assister_weights or sum(assister_weights) == 0: # Fallback
-                assister = random.choice(potential_assisters)
-            else:
-                assister = random.choices(potential_assisters, weights=assister_weights, k=1)[0]
-            
-            all_players_data[assister['id']]['assists'] += 1
+        if rng.random() < 0.65: # Chance of assist
+            # Anyone else outfield: MIDs > FWDs > DEFs
+            assister_index = _draw_in_form(assisters, stats, rng, excluded=scorer_index)
+            if assister_index is None: continue
+            assister = assisters.items[assister_index]
+            stats.assists[stats.slot(assister['id'])] += 1
             contributions.append({'player_id': assister['id'], 'type': 'assist'})
-            
+
     return contributions
 
-def calculate_match_rating(player_id, all_players_data, team_result_char, goals_conceded_by_team, player_contributions_in_match):
-    """Calculates a player's match rating and updates their stats."""
+def calculate_match_rating(player_id, all_players_data, stats, team_result_char, goals_conceded_by_team, player_contributions_in_match, rng=random):
+    """Calculates a player's match rating and updates their stats in the StatsArena `stats`."""
     player = all_players_data[player_id]
+    slot = stats.slot(player_id)
     rating = BASE_RATING # from constants
 
     p_goals = sum(1 for c in player_contributions_in_match if c['player_id'] == player_id and c['type'] == 'goal')
@@ -646,7 +699,7 @@ def calculate_match_rating(player_id, all_players_data, team_result_char, goals_
     if player['position'] == 'GK':
         if goals_conceded_by_team == 0:
             rating += 1.0
-            player['clean_sheets'] += 1
+            stats.clean_sheets[slot] += 1
         rating -= goals_conceded_by_team * 0.25
     elif player['position'] == 'DEF':
         if goals_conceded_by_team == 0: rating += 0.4
@@ -654,35 +707,33 @@ def calculate_match_rating(player_id, all_players_data, team_result_char, goals_
     
     # Skill and Form influence
     skill_mod = (player['skill'] - 75) / 50.0 
-    form_mod = (player.get('form', 1.0) - 1.0) * FORM_INFLUENCE 
+    form = stats.form[slot]
+    form_mod = (form - 1.0) * FORM_INFLUENCE 
     rating += skill_mod + form_mod
     
     # Add small random variation
-    rating += random.normalvariate(0, RATING_STD_DEV)
+    rating += rng.normalvariate(0, RATING_STD_DEV)
 
     rating = max(4.0, min(10.0, round(rating, 1)))
 
-    player['matches_played'] += 1
-    player['total_rating_points'] += rating
-    if player['matches_played'] > 0:
-        player['avg_rating'] = round(player['total_rating_points'] / player['matches_played'], 2)
+    stats.record_rating(slot, rating)
         
     # Update player form slightly based on performance (simple model)
     # Good performance (rating > 7.0) might increase form, bad (<5.5) might decrease
     if rating > 7.2:
-        player['form'] = min(1.20, round(player.get('form', 1.0) + 0.03, 2))
+        stats.form[slot] = min(FORM_CEILING, round(form + 0.03, 2))
     elif rating < 5.8:
-        player['form'] = max(0.80, round(player.get('form', 1.0) - 0.03, 2))
+        stats.form[slot] = max(FORM_FLOOR, round(form - 0.03, 2))
     else: # Drift towards mean
-        player['form'] = round(player.get('form', 1.0) * 0.98 + 1.0 * 0.02, 2)
+        stats.form[slot] = round(form * 0.98 + 1.0 * 0.02, 2)
 
 
     return rating
 
 
-def apply_tournament_stage_bonus(team_ids_to_bonus, bonus_points, all_teams_flat_players, teams_by_id_lookup):
+def apply_tournament_stage_bonus(team_ids_to_bonus, bonus_points, stats, teams_by_id_lookup):
     """Applies a bonus to total_rating_points for all players of the given teams.
-       `all_teams_flat_players` is the global player dict.
+       `stats` is the run's StatsArena.
        `teams_by_id_lookup` is a dict mapping team_id to team object (from sim_teams_list).
     """
     if not isinstance(team_ids_to_bonus, list):
@@ -696,245 +747,163 @@ def apply_tournament_stage_bonus(team_ids_to_bonus, bonus_points, all_teams_flat
         
         # print(f"Applying {bonus_points} bonus to players of {team['name']}")
         for player_id in team['player_ids']: # Corrected syntax: removed colon from slice-like notation
-            player = all_teams_flat_players.get(player_id)
-            if player and player['matches_played'] > 0: # Only bonus players who participated
-                player['total_rating_points'] += bonus_points
+            if player_id not in stats:
+                continue
+            slot = stats.slot(player_id)
+            if stats.matches_played[slot] > 0: # Only bonus players who participated
+                stats.total_rating_points[slot] += bonus_points
                 # Recalculate average rating after bonus
-                player['avg_rating'] = round(player['total_rating_points'] / player['matches_played'], 2)
-                # print(f"  Bonus for {player['name']}. New total points: {player['total_rating_points']}, New Avg Rating: {player['avg_rating']}")
+                stats.avg_rating[slot] = round(stats.total_rating_points[slot] / stats.matches_played[slot], 2)
             # elif player and player['matches_played'] == 0:
                 # print(f"  Player {player['name']} did not play, no bonus.")
                 # pass
 
-def generate_league_phase_fixtures(teams_list_for_sim): # teams_list_for_sim is sim_teams_for_model
+@phase('generate_league_phase_fixtures', 'schedule')
+def generate_league_phase_fixtures(teams_list_for_sim, rng=random): # teams_list_for_sim is sim_teams_for_model
     """
-    Generates fixtures for the Swiss model league phase.
-    Each team plays 8 matches, 4 home and 4 away, against 8 different opponents.
-    Attempts to balance pots for opponents but primarily focuses on unique opponents and H/A balance.
+    Generates fixtures for the Swiss model league phase (swiss_draw).
+    Each team plays 8 different opponents, two from each pot (one home, one away),
+    so 4 home and 4 away, and no team from its own country.
     """
-    fixtures = []
-    num_teams = len(teams_list_for_sim)
-    if num_teams == 0: return fixtures
-
-    team_schedules = {
-        team['id']: {
-            'opponents': set(), 
-            'home_count': 0, 
-            'away_count': 0, 
-            'played_count': 0, 
-            'pot': team['pot']
-        } for team in teams_list_for_sim
-    }
-    team_ids = [t['id'] for t in teams_list_for_sim]
-    
-    # Pot-based opponent selection enhancement (simplified)
-    # For each team, try to play 2 teams from each pot (including their own, if necessary for scheduling)
-    # This is a guideline, main goal is 8 unique opponents with H/A balance.
-
-    for _round_num in range(1, 9): # 8 rounds of matches
-        # print(f"Generating fixtures for Round {_round_num}")
-        # Sort teams by points (or initial reputation/pot for early rounds) - dynamic pairing
-        # For simplicity here, we'll use a static list and try to pair
-        
-        teams_to_schedule_this_round = [tid for tid in team_ids if team_schedules[tid]['played_count'] < 8]
-        random.shuffle(teams_to_schedule_this_round)
-        
-        paired_in_this_round = set()
+    if not teams_list_for_sim: return []
+    try:
+        draw = LeaguePhaseDraw(teams_list_for_sim).draw(rng)
+    except DrawError as e:
+        reporter.message(f"WARNING: {e}. Drawing again without the same-country rule.")
+        try:
+            draw = LeaguePhaseDraw(teams_list_for_sim, avoid_same_country=False).draw(rng)
+        except DrawError as e:
+            reporter.message(f"CRITICAL: League phase draw failed: {e}")
+            return []
+    return [{'home': teams_list_for_sim[home]['id'], 'away': teams_list_for_sim[away]['id'], 'round': round_number}
+            for home, away, round_number in draw]
+
+# Outcome and scoreline model of simulate_match. Changing any value here
+# rebuilds the scoreline tables on the next match.
+MATCH_SCORE_MODEL = {
+    # Home win 40% / draw 28% at equal reputation; per point of reputation
+    # difference the home win chance moves 1.2% and the draw chance drops 0.6%
+    'home_win': 0.40,
+    'home_win_per_point': 0.012,
+    'draw': 0.28,
+    'draw_per_point': 0.006,
+    'win_bounds': (0.05, 0.90),
+    'draw_bounds': (0.05, 0.50),
+    # Winner scores uniform(1-4) goals, the loser uniform(0, winner - margin)
+    # with margin drawn from these; draws are uniform(0-2) all
+    'winner_goals': (1, 4),
+    'margins': (1, 1, 2),
+    'draw_goals': (0, 2),
+}
 
-        for i in range(len(teams_to_schedule_this_round)):
-            team1_id = teams_to_schedule_this_round[i]
-            if team1_id in paired_in_this_round or team_schedules[team1_id]['played_count'] >= 8:
-                continue
+# Reputation differences are rounded to this step before the table lookup
+SCORELINE_DIFF_STEP = 0.01
 
-            # Find a suitable opponent for team1_id
-            potential_opponents = []
-            for team2_id in teams_to_schedule_this_round:
-                if team1_id == team2_id or team2_id in paired_in_this_round:
-                    continue
-                if team_schedules[team2_id]['played_count'] >= 8:
-                    continue
-                if team2_id in team_schedules[team1_id]['opponents']: # Already played
-                    continue
-                
-                # Basic pot difference check (optional, can be complex)
-                # pot_diff = abs(team_schedules[team1_id]['pot'] - team_schedules[team2_id]['pot'])
-                
-                potential_opponents.append(team2_id)
-            
-            if not potential_opponents:
-                # print(f"Warning: Could not find opponent for {team1_id} in round {_round_num} among available.")
-                continue
+_scoreline_tables = {}        # quantized difference -> (cumulative probabilities, scorelines)
+_scoreline_model_used = None  # copy of MATCH_SCORE_MODEL the tables were built from
 
-            # Simple random choice for now, could be more sophisticated (e.g. based on current standings)
-            team2_id = random.choice(potential_opponents)
-
-            # Decide home/away to balance counts
-            home_id, away_id = None, None
-            team1_prefers_home = team_schedules[team1_id]['home_count'] < 4
-            team1_prefers_away = team_schedules[team1_id]['away_count'] < 4
-            team2_prefers_home = team_schedules[team2_id]['home_count'] < 4
-            team2_prefers_away = team_schedules[team2_id]['away_count'] < 4
-
-            if team1_prefers_home and team2_prefers_away:
-                home_id, away_id = team1_id, team2_id
-            elif team1_prefers_away and team2_prefers_home:
-                home_id, away_id = team2_id, team1_id
-            elif team1_prefers_home: # team2 cannot be away or doesn't prefer it
-                 home_id, away_id = team1_id, team2_id # Force if team1 can still host
-            elif team2_prefers_home: # team1 cannot be away or doesn't prefer it
-                 home_id, away_id = team2_id, team1_id # Force if team2 can still host
-            else: # If both have filled preferred slots, or one is full for both H/A
-                  # This indicates a potential issue or end of easy pairings.
-                  # For now, we'll skip if no clear H/A assignment to maintain balance.
-                  # A more robust scheduler would backtrack or use a cost function.
-                  # print(f"Skipping pair {team1_id} vs {team2_id} due to H/A conflict or full schedules.")
-                  continue 
-            
-            if home_id and away_id:
-                fixtures.append({'home': home_id, 'away': away_id, 'round': _round_num})
-                
-                team_schedules[home_id]['opponents'].add(away_id)
-                team_schedules[away_id]['opponents'].add(home_id)
-                
-                team_schedules[home_id]['home_count'] += 1
-                team_schedules[away_id]['away_count'] += 1
-                
-                team_schedules[home_id]['played_count'] += 1
-                team_schedules[away_id]['played_count'] += 1
-                
-                paired_in_this_round.add(home_id)
-                paired_in_this_round.add(away_id)
-
-    # Post-generation check and fill (if some teams don't have 8 games)
-    # This is a simplified filler, a real Swiss system pairs based on current standings dynamically.
-    for team_id in team_ids:
-        fill_round_num = 9 # Use a distinct round number for filled matches
-        while team_schedules[team_id]['played_count'] < 8:
-            # print(f"Team {team_id} needs {8 - team_schedules[team_id]['played_count']} more games. Attempting to fill.")
-            possible_fill_opponents = [
-                opp_id for opp_id in team_ids 
-                if opp_id != team_id and \
-                   opp_id not in team_schedules[team_id]['opponents'] and \
-                   team_schedules[opp_id]['played_count'] < 8
-            ]
-            if not possible_fill_opponents:
-                # print(f"Warning: Cannot find any more unique opponents for {team_id} to reach 8 games.")
-                break 
-            
-            opponent_id = random.choice(possible_fill_opponents)
-
-            home_id, away_id = None, None
-            if team_schedules[team_id]['home_count'] < 4 and team_schedules[opponent_id]['away_count'] < 4:
-                home_id, away_id = team_id, opponent_id
-            elif team_schedules[opponent_id]['home_count'] < 4 and team_schedules[team_id]['away_count'] < 4:
-                home_id, away_id = opponent_id, team_id
-            # If H/A counts are already at 4 for one side, try to assign the other way if possible
-            elif team_schedules[team_id]['home_count'] < 4: # team_id can host
-                home_id, away_id = team_id, opponent_id
-            elif team_schedules[opponent_id]['home_count'] < 4: # opponent_id can host
-                home_id, away_id = opponent_id, team_id
-            else: # Both have 4 home games, try to assign away games if possible
-                if team_schedules[team_id]['away_count'] < 4:
-                     home_id, away_id = opponent_id, team_id # team_id plays away
-                elif team_schedules[opponent_id]['away_count'] < 4:
-                     home_id, away_id = team_id, opponent_id # opponent_id plays away
-                else:
-                    # print(f"Warning: Could not assign H/A for fill match between {team_id} and {opponent_id} due to H/A limits.")
-                    # To prevent infinite loops if a perfect balance isn't found, break or pick one randomly.
-                    # Forcing one if counts are equal but less than 4.
-                    if team_schedules[team_id]['home_count'] < 4: home_id, away_id = team_id, opponent_id
-                    else: break # Truly stuck
-            
-            if home_id and away_id:
-                # print(f"  Filling match: {home_id} vs {away_id} (Round {fill_round_num})")
-                fixtures.append({'home': home_id, 'away': away_id, 'round': fill_round_num})
-                team_schedules[home_id]['opponents'].add(away_id)
-                team_schedules[away_id]['opponents'].add(home_id)
-                if home_id == team_id: team_schedules[home_id]['home_count'] +=1
-                else: team_schedules[home_id]['away_count'] +=1 # team_id was away
-                
-                if away_id == opponent_id : team_schedules[opponent_id]['away_count'] +=1
-                else: team_schedules[opponent_id]['home_count'] +=1 # opponent_id was away
-
-                team_schedules[home_id]['played_count'] += 1
-                team_schedules[away_id]['played_count'] += 1
-            else:
-                # print(f"Could not fill match for {team_id} against {opponent_id}. Stopping fill for this team.")
-                break # Cannot find a H/A assignment
-        
-    # Final verification
-    total_games_scheduled = len(fixtures) * 2 # Each fixture involves two teams playing
-    expected_total_games = num_teams * 8
-    # print(f"Total fixtures generated: {len(fixtures)} (Expected {expected_total_games / 2})")
-    # for team_id_val, sched_data in team_schedules.items():
-    #     if sched_data['played_count'] != 8:
-    #         print(f"  Warning: Team {team_id_val} has {sched_data['played_count']} games (H:{sched_data['home_count']}, A:{sched_data['away_count']})")
-
-    if total_games_scheduled != expected_total_games:
-         print(f"WARNING: Fixture generation mismatch. Expected {expected_total_games} total game participations, got {total_games_scheduled}.")
-         print("This might mean not all teams have 8 games, or H/A balance is off.")
-         for tid_check, s_data in team_schedules.items():
-             if s_data['played_count'] != 8 or s_data['home_count'] != 4 or s_data['away_count'] != 4:
-                 print(f"  - Team {tid_check}: Played={s_data['played_count']}, H={s_data['home_count']}, A={s_data['away_count']}")
-
-    return fixtures
-
-def simulate_match(home_team_sim_data, away_team_sim_data, all_players_global_dict, competition_phase="League"):
+def match_outcome_probabilities(rep_diff, model=None):
+    """(home win, draw, away win) for a home - away reputation difference (clamped, then normalized).
+       model defaults to the current MATCH_SCORE_MODEL.
+    """
+    if model is None:
+        model = MATCH_SCORE_MODEL
+    prob_home_win = model['home_win'] + rep_diff * model['home_win_per_point']
+    prob_draw = model['draw'] - abs(rep_diff) * model['draw_per_point'] # Draw chance decreases with larger skill gap
+
+    win_low, win_high = model['win_bounds']
+    draw_low, draw_high = model['draw_bounds']
+    prob_home_win = max(win_low, min(win_high, prob_home_win))
+    prob_draw = max(draw_low, min(draw_high, prob_draw))
+    prob_away_win = max(win_low, min(win_high, 1.0 - prob_home_win - prob_draw))
+
+    # Normalize probabilities if they don't sum to 1 (due to clamping)
+    total_prob = prob_home_win + prob_draw + prob_away_win
+    if total_prob == 0:
+        return 1/3, 1/3, 1/3
+    prob_home_win /= total_prob
+    prob_draw /= total_prob
+    return prob_home_win, prob_draw, 1.0 - prob_home_win - prob_draw
+
+def scoreline_distribution(rep_diff, model=None):
+    """{(home_goals, away_goals): probability} of simulate_match for a reputation difference.
+       model defaults to the current MATCH_SCORE_MODEL.
+    """
+    if model is None:
+        model = MATCH_SCORE_MODEL
+    prob_home_win, prob_draw, prob_away_win = match_outcome_probabilities(rep_diff, model)
+    distribution = defaultdict(float)
+
+    low, high = model['winner_goals']
+    margins = model['margins']
+    for winner_goals in range(low, high + 1):
+        for margin in margins:
+            top = max(0, winner_goals - margin)
+            share = 1.0 / ((high - low + 1) * len(margins) * (top + 1))
+            for loser_goals in range(top + 1):
+                distribution[(winner_goals, loser_goals)] += prob_home_win * share
+                distribution[(loser_goals, winner_goals)] += prob_away_win * share
+
+    low, high = model['draw_goals']
+    for goals in range(low, high + 1):
+        distribution[(goals, goals)] += prob_draw / (high - low + 1)
+    return dict(distribution)
+
+def scoreline_table(rep_diff):
+    """Inverse-CDF table (cumulative probabilities, scorelines) for a reputation difference.
+       Tables are built on first use and rebuilt after MATCH_SCORE_MODEL changes
+       (edited in place or rebound).
+    """
+    global _scoreline_model_used
+    if MATCH_SCORE_MODEL != _scoreline_model_used:
+        _scoreline_tables.clear()
+        _scoreline_model_used = copy.deepcopy(MATCH_SCORE_MODEL)
+    key = round(rep_diff / SCORELINE_DIFF_STEP)
+    table = _scoreline_tables.get(key)
+    if table is None:
+        distribution = scoreline_distribution(key * SCORELINE_DIFF_STEP, _scoreline_model_used)
+        scorelines = sorted(distribution)
+        cumulative = []
+        total = 0.0
+        for scoreline in scorelines:
+            total += distribution[scoreline]
+            cumulative.append(total)
+        cumulative[-1] = 1.0 # No gap at the top from rounding
+        table = _scoreline_tables[key] = (cumulative, scorelines)
+    return table
+
+def draw_scoreline(rep_diff, rng=random):
+    """(home_goals, away_goals): one uniform draw and a table lookup"""
+    cumulative, scorelines = scoreline_table(rep_diff)
+    return scorelines[bisect.bisect_right(cumulative, rng.random())]
+
+def simulate_match(home_team_sim_data, away_team_sim_data, all_players_global_dict, stats, competition_phase="League", rng=random):
     """
     Simulates a single match between two teams.
-    Uses team reputation (strength) and player data. Updates player stats.
+    Uses team reputation (strength) and player data. Updates player stats in the StatsArena `stats`.
     `home_team_sim_data`, `away_team_sim_data` are from `sim_teams_for_model`.
     `all_players_global_dict` is `all_players_for_model`.
     """
     # Team reputation is the 'reputation' field in sim_team_entry, which is calculated strength
     rep_diff = home_team_sim_data['reputation'] - away_team_sim_data['reputation']
-    
-    # Probabilities based on reputation difference (home advantage included)
-    # Base probabilities: Home Win 40%, Draw 28%, Away Win 32%
-    # Adjust based on rep_diff. A 10-point rep_diff might shift win prob by ~12%
-    prob_home_win = 0.40 + (rep_diff * 0.012) 
-    prob_draw = 0.28 - (abs(rep_diff) * 0.006) # Draw chance decreases with larger skill gap
-    
-    # Ensure probabilities are within reasonable bounds (e.g., 0.05 to 0.95)
-    prob_home_win = max(0.05, min(0.90, prob_home_win))
-    prob_draw = max(0.05, min(0.50, prob_draw))
-    
-    prob_away_win = 1.0 - prob_home_win - prob_draw
-    prob_away_win = max(0.05, min(0.90, prob_away_win))
 
-    # Normalize probabilities if they don't sum to 1 (due to clamping)
-    total_prob = prob_home_win + prob_draw + prob_away_win
-    if total_prob == 0: # Should not happen with current clamping
-        prob_home_win, prob_draw, prob_away_win = 1/3, 1/3, 1/3
-    else:
-        prob_home_win /= total_prob
-        prob_draw /= total_prob
-        prob_away_win = 1.0 - prob_home_win - prob_draw # Recalculate for precision
-
-    rand_val = random.random()
-    home_goals, away_goals = 0, 0
-
-    # Determine winner based on probabilities
-    if rand_val < prob_home_win: # Home win
-        home_goals = random.randint(1, 4) # More likely to score more
-        away_goals = random.randint(0, max(0, home_goals - random.choice([1, 1, 2]))) # Away scores less
-    elif rand_val < prob_home_win + prob_draw: # Draw
-        home_goals = random.randint(0, 2) # Draws often lower scoring
-        away_goals = home_goals
-    else: # Away win
-        away_goals = random.randint(1, 4)
-        home_goals = random.randint(0, max(0, away_goals - random.choice([1, 1, 2])))
+    # Result and scoreline in one draw from the precompiled table for this reputation gap
+    home_goals, away_goals = draw_scoreline(rep_diff, rng)
 
     # --- Player Stats Logic ---
     home_manager_formation = home_team_sim_data.get('manager', {}).get('preferred_formation', DEFAULT_FORMATION)
     away_manager_formation = away_team_sim_data.get('manager', {}).get('preferred_formation', DEFAULT_FORMATION)
 
-    home_lineup_ids = select_starting_xi(home_team_sim_data['player_ids'], all_players_global_dict, home_manager_formation)
-    away_lineup_ids = select_starting_xi(away_team_sim_data['player_ids'], all_players_global_dict, away_manager_formation)
+    home_lineup_ids = LINEUPS.lineup(all_players_global_dict, home_team_sim_data['id'], home_manager_formation,
+                                     lambda: select_starting_xi(home_team_sim_data['player_ids'], all_players_global_dict, home_manager_formation))
+    away_lineup_ids = LINEUPS.lineup(all_players_global_dict, away_team_sim_data['id'], away_manager_formation,
+                                     lambda: select_starting_xi(away_team_sim_data['player_ids'], all_players_global_dict, away_manager_formation))
 
-    # Assign goals and assists (modifies all_players_global_dict)
-    home_contributions = assign_goals_and_assists(home_goals, home_lineup_ids, all_players_global_dict)
-    away_contributions = assign_goals_and_assists(away_goals, away_lineup_ids, all_players_global_dict)
+    # Assign goals and assists (counted in stats) with the scorer tables cached alongside each lineup
+    home_tables = LINEUPS.attached(home_lineup_ids, lambda: build_scoring_tables(home_lineup_ids, all_players_global_dict))
+    away_tables = LINEUPS.attached(away_lineup_ids, lambda: build_scoring_tables(away_lineup_ids, all_players_global_dict))
+    home_contributions = assign_goals_and_assists(home_goals, home_lineup_ids, all_players_global_dict, stats, rng, home_tables)
+    away_contributions = assign_goals_and_assists(away_goals, away_lineup_ids, all_players_global_dict, stats, rng, away_tables)
 
     # Determine result character for rating calculation
     home_result_char = 'W' if home_goals > away_goals else ('D' if home_goals == away_goals else 'L')
@@ -942,25 +911,26 @@ def simulate_match(home_team_sim_data, away_team_sim_data, all_players_global_di
 
     # Calculate and update match ratings for all participating players
     for player_id in home_lineup_ids:
-        calculate_match_rating(player_id, all_players_global_dict, home_result_char, away_goals, home_contributions)
+        calculate_match_rating(player_id, all_players_global_dict, stats, home_result_char, away_goals, home_contributions, rng)
     
     for player_id in away_lineup_ids:
-        calculate_match_rating(player_id, all_players_global_dict, away_result_char, home_goals, away_contributions)
+        calculate_match_rating(player_id, all_players_global_dict, stats, away_result_char, home_goals, away_contributions, rng)
         
     # Removed random form update loop to allow performance-based form changes from calculate_match_rating to persist
 
     return home_goals, away_goals
 
-def run_league_phase(teams, fixtures, all_teams_flat_players): # MODIFIED
-    league_table = {
-        team['id']: {'P': 0, 'W': 0, 'D': 0, 'L': 0, 'GF': 0, 'GA': 0, 'GD': 0, 'Pts': 0, 'name': team['name'], 'country': team['country']}
-        for team in teams
-    }
+@phase('run_league_phase', 'match')
+def run_league_phase(teams, fixtures, all_teams_flat_players, stats, rng=random): # MODIFIED
+    # Integer-column table ranked with the UCL tie-breakers from leagues.json
+    competition = get_repository(BASE_DATA_PATH).get_league('competition_ucl')
+    standings = StandingsTable([team['id'] for team in teams], [team['name'] for team in teams],
+                               tie_breakers_for(competition), points_for(competition))
     teams_by_id = {team['id']: team for team in teams}
     if fixtures: # Ensure fixtures is not None
         fixtures.sort(key=lambda x: x.get('round', 0))
     else:
-        print("Warning: No fixtures provided for league phase.")
+        reporter.message("Warning: No fixtures provided for league phase.")
         fixtures = [] # Ensure it's an empty list if None
 
     for fixture_idx, fixture in enumerate(fixtures):
@@ -968,43 +938,42 @@ def run_league_phase(teams, fixtures, all_teams_flat_players): # MODIFIED
         home_team_id, away_team_id = fixture['home'], fixture['away']
         home_team, away_team = teams_by_id[home_team_id], teams_by_id[away_team_id]
         
-        hg, ag = simulate_match(home_team, away_team, all_teams_flat_players)
-
-        for tid, goals_for, goals_against, outcome_pts, outcome_char in [
-            (home_team_id, hg, ag, 3 if hg > ag else (1 if hg == ag else 0), 'W' if hg > ag else ('D' if hg == ag else 'L')),
-            (away_team_id, ag, hg, 3 if ag > hg else (1 if ag == hg else 0), 'W' if ag > hg else ('D' if ag == hg else 'L'))
-        ]:
-            league_table[tid]['P'] += 1
-            league_table[tid]['GF'] += goals_for
-            league_table[tid]['GA'] += goals_against
-            league_table[tid]['Pts'] += outcome_pts
-            league_table[tid][outcome_char] += 1
-            
-    for team_id in league_table:
-        league_table[team_id]['GD'] = league_table[team_id]['GF'] - league_table[team_id]['GA']
-        
-    sorted_table_items = sorted(league_table.items(), key=lambda item: (item[1]['Pts'], item[1]['GD'], item[1]['GF'], item[1]['name']), reverse=True)
+        # Every match draws from its own substream, so results do not depend on fixture order
+        hg, ag = simulate_match(home_team, away_team, all_teams_flat_players, stats,
+                                rng=substream(rng, 'match', home_team_id, away_team_id))
+        standings.record_result(home_team_id, away_team_id, hg, ag)
+
+    league_table = {}
+    for row in standings.rows():
+        team = teams_by_id[row['club_id']]
+        league_table[row['club_id']] = {'P': row['matches'], 'W': row['wins'], 'D': row['draws'], 'L': row['losses'],
+                                        'GF': row['goals_for'], 'GA': row['goals_against'], 'GD': row['goal_difference'],
+                                        'Pts': row['points'], 'name': team['name'], 'country': team['country']}
+    sorted_table_items = list(league_table.items()) # dict keeps the ranked order
     return sorted_table_items, league_table, fixtures # Return raw table and fixtures
 
 # --- Knockout Phase Logic ---
-def simulate_knockout_tie(team1_id, team2_id, teams_by_id_lookup, all_players_global_dict, neutral_venue=False, competition_phase="Knockout"):
-    print(f"DEBUG: Simulating knockout tie: {teams_by_id_lookup.get(team1_id, {}).get('name', 'Unknown')} vs {teams_by_id_lookup.get(team2_id, {}).get('name', 'Unknown')} ({competition_phase})")
+def simulate_knockout_tie(team1_id, team2_id, teams_by_id_lookup, all_players_global_dict, stats, neutral_venue=False, competition_phase="Knockout", rng=random):
+    reporter.debug("Simulating knockout tie: {} vs {} ({})",
+                   teams_by_id_lookup.get(team1_id, {}).get('name', 'Unknown'),
+                   teams_by_id_lookup.get(team2_id, {}).get('name', 'Unknown'), competition_phase)
     team1_data = teams_by_id_lookup[team1_id]
     team2_data = teams_by_id_lookup[team2_id]
+    rng = substream(rng, 'match', team1_id, team2_id, competition_phase)
 
     if neutral_venue:
-        t1_g, t2_g = simulate_match(team1_data, team2_data, all_players_global_dict, competition_phase=f"{competition_phase} Final")
+        t1_g, t2_g = simulate_match(team1_data, team2_data, all_players_global_dict, stats, competition_phase=f"{competition_phase} Final", rng=rng)
         
         if t1_g == t2_g:
             # Penalties
-            winner_id = random.choice([team1_id, team2_id])
+            winner_id = rng.choice([team1_id, team2_id])
         else:
             winner_id = team1_id if t1_g > t2_g else team2_id
         return winner_id
 
     # Two-legged tie
-    leg1_t1_g, leg1_t2_g = simulate_match(team1_data, team2_data, all_players_global_dict, competition_phase=f"{competition_phase} Leg 1")
-    leg2_t2_g, leg2_t1_g = simulate_match(team2_data, team1_data, all_players_global_dict, competition_phase=f"{competition_phase} Leg 2")
+    leg1_t1_g, leg1_t2_g = simulate_match(team1_data, team2_data, all_players_global_dict, stats, competition_phase=f"{competition_phase} Leg 1", rng=rng)
+    leg2_t2_g, leg2_t1_g = simulate_match(team2_data, team1_data, all_players_global_dict, stats, competition_phase=f"{competition_phase} Leg 2", rng=rng)
     
     total_t1_goals = leg1_t1_g + leg2_t1_g
     total_t2_goals = leg1_t2_g + leg2_t2_g
@@ -1013,15 +982,16 @@ def simulate_knockout_tie(team1_id, team2_id, teams_by_id_lookup, all_players_gl
         # Away goals rule (simplified: if still tied, random choice)
         # For a proper away goals rule, you'd compare leg1_t2_g (away goals for team2 in leg1) vs leg2_t1_g (away goals for team1 in leg2)
         # This is a simplification.
-        winner_id = random.choice([team1_id, team2_id]) # Placeholder for tie-breaking
+        winner_id = rng.choice([team1_id, team2_id]) # Placeholder for tie-breaking
     else:
         winner_id = team1_id if total_t1_goals > total_t2_goals else team2_id
     return winner_id
 
-def run_knockout_phase(league_table_sorted, sim_teams_by_id_lookup, league_phase_stats_dict, all_players_global_dict, competition_name="UCL"):
-    print(f"DEBUG: Entered run_knockout_phase for {competition_name}")
+@phase('run_knockout_phase', 'match')
+def run_knockout_phase(league_table_sorted, sim_teams_by_id_lookup, league_phase_stats_dict, all_players_global_dict, stats, competition_name="UCL", rng=random):
+    reporter.debug(f"Entered run_knockout_phase for {competition_name}")
     if not league_table_sorted:
-        print("CRITICAL: Knockout phase cannot start without a league table.")
+        reporter.message("CRITICAL: Knockout phase cannot start without a league table.")
         return None, [], [], [], [], [], [] # Match return tuple structure
 
     # Determine qualifiers based on league table positions (e.g., top 8 advance directly, 9-24 to playoffs)
@@ -1031,11 +1001,11 @@ def run_knockout_phase(league_table_sorted, sim_teams_by_id_lookup, league_phase
 
     # Teams ranked 1-8 go directly to Round of 16
     direct_to_round_of_16_ids = [team_id for team_id, stats in league_table_sorted[:8]]
-    print(f"DEBUG: Direct to R16: {len(direct_to_round_of_16_ids)} teams")
+    reporter.debug(f"Direct to R16: {len(direct_to_round_of_16_ids)} teams")
 
     # Teams ranked 9-24 go to Knockout Playoff Round
     playoff_round_contenders_ids = [team_id for team_id, stats in league_table_sorted[8:24]]
-    print(f"DEBUG: Playoff Round Contenders: {len(playoff_round_contenders_ids)} teams")
+    reporter.debug(f"Playoff Round Contenders: {len(playoff_round_contenders_ids)} teams")
 
     # Teams ranked 25-36 are eliminated (or go to UEL group stage - not handled here)
     # Teams ranked 17-24 from UEL group stage would also join UEL KO Playoff (not handled here)
@@ -1059,72 +1029,72 @@ def run_knockout_phase(league_table_sorted, sim_teams_by_id_lookup, league_phase
                  playoff_pairs.append((playoff_round_contenders_ids[i], playoff_round_contenders_ids[len(playoff_round_contenders_ids)-1-i]))
             else: break # Stop if middle is reached
 
-        print(f"DEBUG: Playoff Round Pairs ({len(playoff_pairs)}): {playoff_pairs}")
+        reporter.debug(f"Playoff Round Pairs ({len(playoff_pairs)}): {playoff_pairs}")
         for team1_id, team2_id in playoff_pairs:
-            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, competition_phase=f"{competition_name} Playoff Round")
+            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, stats, competition_phase=f"{competition_name} Playoff Round", rng=rng)
             playoff_round_winners.append(winner_id)
             # Losers of these playoffs might go to UEL (not implemented here)
     else:
-        print("DEBUG: Not enough contenders for playoff round.")
+        reporter.debug("Not enough contenders for playoff round.")
 
     # Round of 16: Direct qualifiers + Playoff winners
     round_of_16_participants_ids = direct_to_round_of_16_ids + playoff_round_winners
     if len(round_of_16_participants_ids) != 16:
-        print(f"WARNING: Number of R16 participants is {len(round_of_16_participants_ids)}, not 16. Knockout draw might be uneven.")
+        reporter.message(f"WARNING: Number of R16 participants is {len(round_of_16_participants_ids)}, not 16. Knockout draw might be uneven.")
         # Pad or truncate if necessary, or handle error. For now, proceed if possible.
     
-    random.shuffle(round_of_16_participants_ids) # Shuffle for R16 draw
+    substream(rng, 'draw', 'Round of 16').shuffle(round_of_16_participants_ids) # Shuffle for R16 draw
     round_of_16_winners = []
     if len(round_of_16_participants_ids) >= 2:
         num_r16_pairs = len(round_of_16_participants_ids) // 2
         for i in range(num_r16_pairs):
             team1_id = round_of_16_participants_ids[i*2]
             team2_id = round_of_16_participants_ids[i*2+1]
-            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, competition_phase=f"{competition_name} Round of 16")
+            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, stats, competition_phase=f"{competition_name} Round of 16", rng=rng)
             round_of_16_winners.append(winner_id)
     else:
-        print("DEBUG: Not enough participants for Round of 16.")
+        reporter.debug("Not enough participants for Round of 16.")
 
     # Quarter-Finals
     quarter_finalists_ids = round_of_16_winners
-    random.shuffle(quarter_finalists_ids)
+    substream(rng, 'draw', 'Quarter-Finals').shuffle(quarter_finalists_ids)
     quarter_final_winners = []
     if len(quarter_finalists_ids) >= 2:
         num_qf_pairs = len(quarter_finalists_ids) // 2
         for i in range(num_qf_pairs):
             team1_id = quarter_finalists_ids[i*2]
             team2_id = quarter_finalists_ids[i*2+1]
-            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, competition_phase=f"{competition_name} Quarter-Final")
+            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, stats, competition_phase=f"{competition_name} Quarter-Final", rng=rng)
             quarter_final_winners.append(winner_id)
     else:
-        print("DEBUG: Not enough participants for Quarter-Finals.")
+        reporter.debug("Not enough participants for Quarter-Finals.")
 
     # Semi-Finals
     semi_finalists_ids = quarter_final_winners
-    random.shuffle(semi_finalists_ids)
+    substream(rng, 'draw', 'Semi-Finals').shuffle(semi_finalists_ids)
     semi_final_winners = []
     if len(semi_finalists_ids) >= 2:
         num_sf_pairs = len(semi_finalists_ids) // 2
         for i in range(num_sf_pairs):
             team1_id = semi_finalists_ids[i*2]
             team2_id = semi_finalists_ids[i*2+1]
-            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, competition_phase=f"{competition_name} Semi-Final")
+            winner_id = simulate_knockout_tie(team1_id, team2_id, sim_teams_by_id_lookup, all_players_global_dict, stats, competition_phase=f"{competition_name} Semi-Final", rng=rng)
             semi_final_winners.append(winner_id)
     else:
-        print("DEBUG: Not enough participants for Semi-Finals.")
+        reporter.debug("Not enough participants for Semi-Finals.")
 
     # Final
     finalists_ids = semi_final_winners
     final_winner_id = None
     if len(finalists_ids) == 2:
-        final_winner_id = simulate_knockout_tie(finalists_ids[0], finalists_ids[1], sim_teams_by_id_lookup, all_players_global_dict, neutral_venue=True, competition_phase=f"{competition_name} Final")
+        final_winner_id = simulate_knockout_tie(finalists_ids[0], finalists_ids[1], sim_teams_by_id_lookup, all_players_global_dict, stats, neutral_venue=True, competition_phase=f"{competition_name} Final", rng=rng)
     elif len(finalists_ids) == 1: # Should not happen in a balanced bracket
-        print(f"WARNING: Only one finalist {finalists_ids[0]}. Declaring winner by default.")
+        reporter.message(f"WARNING: Only one finalist {finalists_ids[0]}. Declaring winner by default.")
         final_winner_id = finalists_ids[0]
     else:
-        print("CRITICAL: No finalists for the final match.")
+        reporter.message("CRITICAL: No finalists for the final match.")
 
-    print(f"DEBUG: Exiting run_knockout_phase for {competition_name}")
+    reporter.debug(f"Exiting run_knockout_phase for {competition_name}")
     return (
         final_winner_id, 
         finalists_ids, 
@@ -1137,12 +1107,14 @@ def run_knockout_phase(league_table_sorted, sim_teams_by_id_lookup, league_phase
 
 # --- Utility functions for printing results ---
 def print_league_table(sorted_league_table_items, teams_by_id_lookup, league_stats_raw_dict):
+    if not reporter.wants_text:  # nothing to format for headless reporters
+        return
     print_header("UCL League Phase Final Table")
     if not sorted_league_table_items:
-        print("No league table data to display.")
+        reporter.message("No league table data to display.")
         return
 
-    print("""
+    reporter.message("""
 ----------------------------------------------------------------------------------------------------
 | Pos | Team Name                     | Country   | P | W | D | L | GF | GA | GD | Pts |
 ----------------------------------------------------------------------------------------------------""")
@@ -1151,13 +1123,15 @@ def print_league_table(sorted_league_table_items, teams_by_id_lookup, league_sta
         team_name = stats.get('name', teams_by_id_lookup.get(team_id, {}).get('name', team_id))
         country = stats.get('country', teams_by_id_lookup.get(team_id, {}).get('country', 'N/A'))
 
-        print(f"| {i+1:<3} | {team_name:<29} | {country:<9} | {stats['P']:<1} | {stats['W']:<1} | {stats['D']:<1} | {stats['L']:<1} | {stats['GF']:<2} | {stats['GA']:<2} | {stats['GD']:<2} | {stats['Pts']:<3} |")
-    print("----------------------------------------------------------------------------------------------------\n") # Removed one backslash
+        reporter.message(f"| {i+1:<3} | {team_name:<29} | {country:<9} | {stats['P']:<1} | {stats['W']:<1} | {stats['D']:<1} | {stats['L']:<1} | {stats['GF']:<2} | {stats['GA']:<2} | {stats['GD']:<2} | {stats['Pts']:<3} |")
+    reporter.message("----------------------------------------------------------------------------------------------------\n") # Removed one backslash
 
 def print_knockout_results(
     winner_id, finalists, semi_finalists, quarter_finalists, 
     r16_participants, playoff_winners, uel_teams, 
     teams_by_id_lookup):
+    if not reporter.wants_text:  # nothing to format for headless reporters
+        return
     
     print_header("UCL Knockout Stage Results")
 
@@ -1166,102 +1140,104 @@ def print_knockout_results(
 
     if playoff_winners:
         print_subheader("Knockout Playoff Winners")
-        for team_id in playoff_winners: print(f"- {get_team_name(team_id)}")
-        print("\n") # Removed one backslash
+        for team_id in playoff_winners: reporter.message(f"- {get_team_name(team_id)}")
+        reporter.message("\n") # Removed one backslash
         
     if r16_participants:
         print_subheader("Round of 16 Participants")
-        print(f"({len(r16_participants)} teams reached the Round of 16)")
-        print("\n") # Removed one backslash
+        reporter.message(f"({len(r16_participants)} teams reached the Round of 16)")
+        reporter.message("\n") # Removed one backslash
 
     if quarter_finalists:
         print_subheader("Quarter-Finalists (R16 Winners)")
-        for team_id in quarter_finalists: print(f"- {get_team_name(team_id)}")
-        print("\n") # Removed one backslash
+        for team_id in quarter_finalists: reporter.message(f"- {get_team_name(team_id)}")
+        reporter.message("\n") # Removed one backslash
 
     if semi_finalists:
         print_subheader("Semi-Finalists (QF Winners)")
-        for team_id in semi_finalists: print(f"- {get_team_name(team_id)}")
-        print("\n") # Removed one backslash
+        for team_id in semi_finalists: reporter.message(f"- {get_team_name(team_id)}")
+        reporter.message("\n") # Removed one backslash
 
     if finalists:
         print_subheader("Finalists (SF Winners)")
         if len(finalists) == 2:
-            print(f"- {get_team_name(finalists[0])} vs {get_team_name(finalists[1])}")
+            reporter.message(f"- {get_team_name(finalists[0])} vs {get_team_name(finalists[1])}")
         elif finalists:
-            print(f"- {get_team_name(finalists[0])}")
-        print("\n") # Removed one backslash
+            reporter.message(f"- {get_team_name(finalists[0])}")
+        reporter.message("\n") # Removed one backslash
     
     if winner_id:
         print_subheader("UCL Winner")
-        print(f"*** {get_team_name(winner_id).upper()} ***")
+        reporter.message(f"*** {get_team_name(winner_id).upper()} ***")
     else:
         print_subheader("UCL Winner")
-        print("To be determined / No winner from simulation.")
-    print("\n") # Removed one backslash
+        reporter.message("To be determined / No winner from simulation.")
+    reporter.message("\n") # Removed one backslash
 # --- End Utility functions for printing results ---
 
 
-def run_final_ucl_simulation():
-    print("DEBUG: --- Starting run_final_ucl_simulation ---")
-
-    print("DEBUG: Loading LEAGUES_FILE...")
-    leagues_data_from_file = load_json_data(LEAGUES_FILE)
+@phase('prepare_tournament', 'load')
+def prepare_ucl_tournament(ucl_rng=random):
+    """
+    Loads every data file and sets up the qualified teams once.
+    Returns {'teams', 'teams_by_id', 'players', 'stats'} (None if the data is unusable);
+    play_ucl_tournament() can then run the competition on it as often as needed.
+    """
+    reporter.debug("Loading LEAGUES_FILE...")
+    leagues_data_from_file = load_json_data(LEAGUES_FILE, schema_type="list")
+    if isinstance(leagues_data_from_file, list):
+        leagues_data_from_file = build_leagues_data(leagues_data_from_file)
     if not isinstance(leagues_data_from_file, dict) or not leagues_data_from_file:
-        print(f"CRITICAL: {LEAGUES_FILE} issue. Aborting.")
+        reporter.message(f"CRITICAL: {LEAGUES_FILE} issue. Aborting.")
         return
-    print("DEBUG: LEAGUES_FILE loaded.")
-
-    print("DEBUG: Loading MANAGERS_FILE (as a list)...")
-    managers_list_input = load_json_data(MANAGERS_FILE, schema_type="list") # Load as list
-    if not managers_list_input: # Allow empty list if file is empty but valid JSON list
-        print(f"Warning: Could not load data from {MANAGERS_FILE} or it's an empty list.")
-        managers_list_input = [] 
-    # Process the list into a dictionary using the modified load_all_manager_data
-    all_managers_data_dict = load_all_manager_data(managers_list_input)
+    reporter.debug("LEAGUES_FILE loaded.")
+
+    reporter.debug("Loading managers from the data repository...")
+    # Every manager file (managers.json + managers/*.json), keyed by manager_id
+    all_managers_data_dict = dict(get_repository(BASE_DATA_PATH).managers)
     if not all_managers_data_dict:
-         print(f"CRITICAL: Processing managers from {MANAGERS_FILE} resulted in no manager data. Aborting.")
+         reporter.message("CRITICAL: No manager data found in the data repository. Aborting.")
          return
-    print(f"DEBUG: MANAGERS_FILE processed into dictionary with {len(all_managers_data_dict)} managers.")
+    reporter.debug(f"Manager data loaded into dictionary with {len(all_managers_data_dict)} managers.")
 
 
-    print("DEBUG: Loading PLAYING_STYLES_FILE (as a list)...")
+    reporter.debug("Loading PLAYING_STYLES_FILE (as a list)...")
     playing_styles_list = load_json_data(PLAYING_STYLES_FILE, schema_type="list")
     if not playing_styles_list:
-        print(f"CRITICAL: Could not load data from {PLAYING_STYLES_FILE}. Aborting.")
+        reporter.message(f"CRITICAL: Could not load data from {PLAYING_STYLES_FILE}. Aborting.")
         return
     playing_styles_data = {style['id']: style for style in playing_styles_list if isinstance(style, dict) and 'id' in style}
     if len(playing_styles_data) != len(playing_styles_list):
-        print(f"Warning: Some playing styles were filtered out during conversion to dict (missing 'id' or not a dict). Original count: {len(playing_styles_list)}, Dict count: {len(playing_styles_data)}")
+        reporter.message(f"Warning: Some playing styles were filtered out during conversion to dict (missing 'id' or not a dict). Original count: {len(playing_styles_list)}, Dict count: {len(playing_styles_data)}")
     if not playing_styles_data:
-        print(f"CRITICAL: No valid playing styles loaded into dictionary from {PLAYING_STYLES_FILE}. Aborting.")
+        reporter.message(f"CRITICAL: No valid playing styles loaded into dictionary from {PLAYING_STYLES_FILE}. Aborting.")
         return
-    print(f"DEBUG: PLAYING_STYLES_FILE loaded and converted to dict with {len(playing_styles_data)} entries.")
+    reporter.debug(f"PLAYING_STYLES_FILE loaded and converted to dict with {len(playing_styles_data)} entries.")
 
-    print("DEBUG: Loading TRAITS_FILE (as a list)...")
+    reporter.debug("Loading TRAITS_FILE (as a list)...")
     traits_list = load_json_data(TRAITS_FILE, schema_type="list")
     if not traits_list:
-        print(f"CRITICAL: Could not load data from {TRAITS_FILE}. Aborting.")
+        reporter.message(f"CRITICAL: Could not load data from {TRAITS_FILE}. Aborting.")
         return
     traits_data = {trait['id']: trait for trait in traits_list if isinstance(trait, dict) and 'id' in trait}
     if len(traits_data) != len(traits_list):
-        print(f"Warning: Some traits were filtered out during conversion to dict (missing 'id' or not a dict). Original count: {len(traits_list)}, Dict count: {len(traits_data)}")
+        reporter.message(f"Warning: Some traits were filtered out during conversion to dict (missing 'id' or not a dict). Original count: {len(traits_list)}, Dict count: {len(traits_data)}")
     if not traits_data:
-        print(f"CRITICAL: No valid traits loaded into dictionary from {TRAITS_FILE}. Aborting.")
+        reporter.message(f"CRITICAL: No valid traits loaded into dictionary from {TRAITS_FILE}. Aborting.")
         return
-    print(f"DEBUG: TRAITS_FILE loaded and converted to dict with {len(traits_data)} entries.")
+    reporter.debug(f"TRAITS_FILE loaded and converted to dict with {len(traits_data)} entries.")
 
-    print("DEBUG: Loading PLAYER_DATA (from league/club specific files)...")
+    reporter.debug("Loading PLAYER_DATA (from league/club specific files)...")
     # all_players_global_dict will be {player_id: player_data_dict}
     # player_team_links will be {club_id_from_filename: [player_id1, player_id2, ...]}
     all_players_global_dict, player_team_links = load_player_data(BASE_DATA_PATH) # Pass BASE_DATA_PATH
     if not all_players_global_dict:
-        print(f"CRITICAL: Could not load player data (all_players_global_dict is empty/None). Aborting.")
+        reporter.message(f"CRITICAL: Could not load player data (all_players_global_dict is empty/None). Aborting.")
         return
     # player_team_links might be empty if no files found, handle downstream.
-    print(f"DEBUG: PLAYER_DATA loaded. {len(all_players_global_dict)} unique players, {len(player_team_links)} clubs with player links found.")
+    reporter.debug(f"PLAYER_DATA loaded. {len(all_players_global_dict)} unique players, {len(player_team_links)} clubs with player links found.")
 
-    print("DEBUG: Loading all club files and embedding players...")
+    reporter.debug("Loading all club files and embedding players...")
     # load_all_club_data now takes all_players_global_dict and player_team_links
     # It will use CLUBS_DIR (e.g., data/leagues_clubs/) for base club metadata
     # and then embed players from all_players_global_dict using player_team_links.
@@ -1270,12 +1246,12 @@ def run_final_ucl_simulation():
                                               all_players_global_dict, 
                                               player_team_links)
     if not all_clubs_from_files:
-        print("CRITICAL: No club data loaded from files (all_clubs_from_files is empty). Aborting.")
+        reporter.message("CRITICAL: No club data loaded from files (all_clubs_from_files is empty). Aborting.")
         return
-    print(f"DEBUG: Loaded and processed data for {len(all_clubs_from_files)} clubs from files (players embedded).")
+    reporter.debug(f"Loaded and processed data for {len(all_clubs_from_files)} clubs from files (players embedded).")
 
 
-    print("DEBUG: Initializing base league/club structures (sim_teams_by_id_lookup from all clubs)...")
+    reporter.debug("Initializing base league/club structures (sim_teams_by_id_lookup from all clubs)...")
     # initialize_all_leagues_and_clubs now receives all_clubs_from_files (with players embedded)
     # and all_managers_data_dict (the processed dictionary of managers)
     player_team_links = None # No longer needed, players are embedded
@@ -1288,16 +1264,16 @@ def run_final_ucl_simulation():
                                 # or can be removed if players are fully self-contained in all_clubs_from_files
     )
     if not initial_sim_teams_by_id_lookup:
-        print("CRITICAL: Initialization of initial_sim_teams_by_id_lookup failed. Aborting.")
+        reporter.message("CRITICAL: Initialization of initial_sim_teams_by_id_lookup failed. Aborting.")
         return
-    print(f"DEBUG: initial_sim_teams_by_id_lookup initialized with {len(initial_sim_teams_by_id_lookup)} teams (raw club data with players).")
+    reporter.debug(f"initial_sim_teams_by_id_lookup initialized with {len(initial_sim_teams_by_id_lookup)} teams (raw club data with players).")
 
     # Select teams for UCL based on initial_sim_teams_by_id_lookup (raw club data)
     ucl_raw_team_data_list = []
     # ... (rest of the ucl team selection logic using initial_sim_teams_by_id_lookup)
     # This part should now use get_ucl_qualified_teams which expects all_clubs (like initial_sim_teams_by_id_lookup)
     # and all_managers (like all_managers_data_dict)
-    print("INFO: Qualifying UCL teams...")
+    reporter.message("INFO: Qualifying UCL teams...")
     ucl_raw_team_data_list = get_ucl_qualified_teams(
         leagues_data_from_file, 
         initial_sim_teams_by_id_lookup, # This is effectively all_clubs with players embedded
@@ -1306,79 +1282,233 @@ def run_final_ucl_simulation():
 
 
     if not ucl_raw_team_data_list:
-        print("CRITICAL: No teams selected/qualified for UCL league phase. Aborting.")
+        reporter.message("CRITICAL: No teams selected/qualified for UCL league phase. Aborting.")
         return
     if len(ucl_raw_team_data_list) < 2:
-        print(f"CRITICAL: Only {len(ucl_raw_team_data_list)} team(s) for league phase. Need at least 2. Aborting.")
+        reporter.message(f"CRITICAL: Only {len(ucl_raw_team_data_list)} team(s) for league phase. Need at least 2. Aborting.")
         return
-    print(f"DEBUG: {len(ucl_raw_team_data_list)} teams raw data prepared for UCL.")
+    reporter.debug(f"{len(ucl_raw_team_data_list)} teams raw data prepared for UCL.")
 
-    print("DEBUG: Setting up simulation-specific team and player data...")
+    reporter.debug("Setting up simulation-specific team and player data...")
     # ucl_raw_team_data_list is a list of team dicts, where each team has 'players' list (raw player dicts)
-    sim_teams_list_for_model, all_players_for_model = setup_simulation_data(ucl_raw_team_data_list)
+    sim_teams_list_for_model, all_players_for_model = setup_simulation_data(ucl_raw_team_data_list, substream(ucl_rng, 'setup'))
     
     if not sim_teams_list_for_model:
-        print("CRITICAL: setup_simulation_data resulted in no simulation-ready teams. Aborting.")
+        reporter.message("CRITICAL: setup_simulation_data resulted in no simulation-ready teams. Aborting.")
         return
     if not all_players_for_model:
-        print("CRITICAL: setup_simulation_data resulted in no simulation-ready players. Aborting.")
+        reporter.message("CRITICAL: setup_simulation_data resulted in no simulation-ready players. Aborting.")
         return
-    print(f"DEBUG: {len(sim_teams_list_for_model)} teams and {len(all_players_for_model)} players prepared for simulation.")
+    reporter.debug(f"{len(sim_teams_list_for_model)} teams and {len(all_players_for_model)} players prepared for simulation.")
+
+    return {
+        'teams': sim_teams_list_for_model,
+        'teams_by_id': {team['id']: team for team in sim_teams_list_for_model},
+        'players': all_players_for_model,
+        # Per-run goals/assists/ratings/form; the player dicts keep the starting values
+        'stats': StatsArena(all_players_for_model.keys(),
+                            form=[player['form'] for player in all_players_for_model.values()])
+    }
 
-    sim_teams_by_id_lookup_for_sim = {team['id']: team for team in sim_teams_list_for_model}
 
-    print("DEBUG: Generating league phase fixtures...")
-    league_phase_fixtures = generate_league_phase_fixtures(sim_teams_list_for_model)
+def play_ucl_tournament(prepared, ucl_rng=random, stats=None):
+    """
+    Runs the league phase draw, the league phase and the knockout phase on
+    prepared teams (prepare_ucl_tournament) without loading anything.
+    Player stats go into `stats` (default prepared['stats']), which is reset
+    first, so every run starts from the prepared players.
+    Returns {'fixtures', 'league_table', 'league_stats', 'knockout', 'stats'} or None.
+    """
+    teams = prepared['teams']
+    players = prepared['players']
+    if stats is None:
+        stats = prepared['stats']
+    stats.reset()
+
+    reporter.debug("Generating league phase fixtures...")
+    league_phase_fixtures = generate_league_phase_fixtures(teams, substream(ucl_rng, 'league_phase_draw'))
     if not league_phase_fixtures:
-        print("CRITICAL: No fixtures generated for league phase. Aborting.")
-        return
-    print(f"DEBUG: Generated {len(league_phase_fixtures)} fixtures.")
+        reporter.message("CRITICAL: No fixtures generated for league phase. Aborting.")
+        return None
+    reporter.debug(f"Generated {len(league_phase_fixtures)} fixtures.")
 
-    print("DEBUG: Running league phase simulation...")
+    reporter.debug("Running league phase simulation...")
     final_league_table_sorted_items, league_phase_raw_stats_dict, _used_fixtures = run_league_phase(
-        sim_teams_list_for_model, 
+        teams,
         league_phase_fixtures,
-        all_players_for_model
+        players,
+        stats,
+        rng=substream(ucl_rng, 'league_phase')
     )
-    print("DEBUG: League phase simulation completed.")
+    reporter.debug("League phase simulation completed.")
     if not final_league_table_sorted_items:
-        print("CRITICAL: League phase simulation did not produce a league table. Aborting.")
+        reporter.message("CRITICAL: League phase simulation did not produce a league table. Aborting.")
+        return None
+
+    reporter.debug("Running knockout phase...")
+    knockout = run_knockout_phase(
+        final_league_table_sorted_items,
+        prepared['teams_by_id'],
+        league_phase_raw_stats_dict,
+        players,
+        stats,
+        competition_name="UCL Final Stages",
+        rng=substream(ucl_rng, 'knockout')
+    )
+    reporter.debug("Knockout phase completed.")
+    return {
+        'fixtures': league_phase_fixtures,
+        'league_table': final_league_table_sorted_items,
+        'league_stats': league_phase_raw_stats_dict,
+        'knockout': knockout,
+        'stats': stats
+    }
+
+
+def run_final_ucl_simulation(seed=None):
+    """Full UCL run; seed makes it reproducible (per-phase and per-match substreams)"""
+    reporter.debug("--- Starting run_final_ucl_simulation ---")
+    ucl_rng = substream(make_rng(seed), 'competition', 'UCL')
+
+    prepared = prepare_ucl_tournament(ucl_rng)
+    if not prepared:
         return
+    sim_teams_by_id_lookup_for_sim = prepared['teams_by_id']
+
+    result = play_ucl_tournament(prepared, ucl_rng)
+    if not result:
+        return
+    result['stats'].export(prepared['players'])
+
+    print_league_table(result['league_table'], sim_teams_by_id_lookup_for_sim, result['league_stats'])
 
-    print_league_table(final_league_table_sorted_items, sim_teams_by_id_lookup_for_sim, league_phase_raw_stats_dict)
-    
-    print("DEBUG: Running knockout phase...")
     (
         final_winner_id, finalists_ids, semi_finalists_ids, quarter_finalists_ids,
         round_of_16_ids, playoff_winners_ids, uel_knockout_playoff_teams_ids
-    ) = run_knockout_phase(
-        final_league_table_sorted_items,
-        sim_teams_by_id_lookup_for_sim,
-        league_phase_raw_stats_dict, 
-        all_players_for_model,
-        competition_name="UCL Final Stages"
-    )
-    print("DEBUG: Knockout phase completed.")
-
+    ) = result['knockout']
     print_knockout_results(
         final_winner_id, finalists_ids, semi_finalists_ids, quarter_finalists_ids, 
         round_of_16_ids, playoff_winners_ids, uel_knockout_playoff_teams_ids, 
         sim_teams_by_id_lookup_for_sim
     )
-    print("DEBUG: --- run_final_ucl_simulation finished ---")
+    reporter.event('competition_winner', competition='UCL',
+                   winner=sim_teams_by_id_lookup_for_sim.get(final_winner_id, {}).get('name'))
+    reporter.debug("--- run_final_ucl_simulation finished ---")
+
+
+# Stages counted by forecast_ucl_tournament, in the order they are reached
+FORECAST_STAGES = ('top_8', 'playoff', 'round_of_16', 'quarter_final', 'semi_final', 'final', 'winner')
+
+
+def forecast_ucl_tournament(tournaments=1000, seed=None, prepared=None):
+    """
+    Monte Carlo forecast: plays the league phase draw, league phase and knockout
+    phase `tournaments` times on one set of prepared teams (loaded once).
+    Returns per-club probabilities of each FORECAST_STAGES stage, plus the
+    expected league-phase position and points; None if the data is unusable.
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    ucl_rng = substream(make_rng(seed), 'competition', 'UCL')
+    if prepared is None:
+        prepared = prepare_ucl_tournament(ucl_rng)
+        if not prepared:
+            return None
+
+    teams = prepared['teams']
+    counts = {team['id']: dict.fromkeys(FORECAST_STAGES, 0) for team in teams}
+    position_totals = dict.fromkeys(counts, 0)
+    points_totals = dict.fromkeys(counts, 0)
+    played = 0
+
+    start = time.perf_counter()
+    for number in range(tournaments):
+        # Every run resets the prepared StatsArena, so no player state carries over
+        result = play_ucl_tournament(prepared, substream(ucl_rng, 'tournament', number))
+        if not result:
+            continue
+        played += 1
+
+        for position, (team_id, stats) in enumerate(result['league_table'], 1):
+            position_totals[team_id] += position
+            points_totals[team_id] += stats['Pts']
+            if position <= 8:
+                counts[team_id]['top_8'] += 1
+            elif position <= 24:
+                counts[team_id]['playoff'] += 1
+
+        winner_id, finalists, semi_finalists, quarter_finalists, round_of_16, _playoff_winners, _uel = result['knockout']
+        for stage, team_ids in (('round_of_16', round_of_16), ('quarter_final', quarter_finalists),
+                                ('semi_final', semi_finalists), ('final', finalists), ('winner', [winner_id])):
+            for team_id in team_ids:
+                if team_id in counts:
+                    counts[team_id][stage] += 1
+    elapsed = time.perf_counter() - start
+
+    clubs = []
+    for team in teams:
+        row = {'club_id': team['id'], 'club_name': team['name'], 'country': team['country'], 'pot': team['pot']}
+        for stage in FORECAST_STAGES:
+            row[stage] = counts[team['id']][stage] / played if played else 0.0
+        row['expected_position'] = position_totals[team['id']] / played if played else 0.0
+        row['expected_points'] = points_totals[team['id']] / played if played else 0.0
+        clubs.append(row)
+    clubs.sort(key=lambda row: (-row['winner'], -row['final'], row['expected_position']))
+    return {
+        'competition': 'UCL',
+        'tournaments': played,
+        'seed': seed,
+        'elapsed': elapsed,
+        'tournaments_per_second': played / elapsed if elapsed else float('inf'),
+        'clubs': clubs
+    }
+
+
+def print_ucl_forecast(forecast):
+    """Display a forecast_ucl_tournament() probability table"""
+    print_header(f"UCL Forecast ({forecast['tournaments']:,} tournaments)")
+    reporter.message(f"{'Club':<25} {'xPos':>5} {'Top 8':>7} {'Playoff':>7} {'R16':>7} {'QF':>7} {'SF':>7} {'Final':>7} {'Win':>7}")
+    reporter.message("-" * 90)
+    for club in forecast['clubs']:
+        reporter.message(f"{club['club_name'][:24]:<25} {club['expected_position']:5.1f} "
+                         f"{club['top_8']:7.1%} {club['playoff']:7.1%} {club['round_of_16']:7.1%} "
+                         f"{club['quarter_final']:7.1%} {club['semi_final']:7.1%} {club['final']:7.1%} {club['winner']:7.1%}")
+    reporter.message("-" * 90)
+    reporter.message(f"⏱️  {forecast['elapsed']:.2f}s ({forecast['tournaments_per_second']:,.0f} tournaments/s, "
+                     f"{1000 / forecast['tournaments_per_second'] if forecast['tournaments_per_second'] else 0:.1f} ms each)")
 
 
 if __name__ == "__main__":
-    print("DEBUG: Script execution started.")
+    import sys
+    # --debug shows the DEBUG trace, --quiet / --jsonl[=path] run headless, --seed=N is reproducible,
+    # --forecast[=N] plays N tournaments (default 1000) on one data load and prints probabilities
+    set_reporter(create_reporter(sys.argv[1:]))
+    seed = None
+    forecast_runs = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--seed="):
+            seed = int(arg.split("=", 1)[1])
+        elif arg == "--forecast" or arg.startswith("--forecast="):
+            forecast_runs = int(arg.split("=", 1)[1]) if "=" in arg else 1000
+    if "--debug" in sys.argv[1:]:
+        logging.getLogger().setLevel(logging.DEBUG)
+    reporter.debug("Script execution started.")
     start_time = datetime.now()
-    print(f"UCL Swiss Model Simulation started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    reporter.message(f"UCL Swiss Model Simulation started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     
     # The global load_all_club_data is used. No need for a local definition here.
     # Calls to load data are inside run_final_ucl_simulation.
     
-    run_final_ucl_simulation()
+    # --profile[=NAME] prints the hot spots and writes a Chrome trace (profiler.py)
+    with profiling(sys.argv[1:]):
+        if forecast_runs:
+            ucl_forecast = forecast_ucl_tournament(forecast_runs, seed)
+            if ucl_forecast:
+                print_ucl_forecast(ucl_forecast)
+        else:
+            run_final_ucl_simulation(seed)
     
     end_time = datetime.now()
-    print(f"UCL Swiss Model Simulation finished at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Total execution time: {end_time - start_time}")
-    print("DEBUG: Script execution ended.")
+    reporter.message(f"UCL Swiss Model Simulation finished at: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    reporter.message(f"Total execution time: {end_time - start_time}")
+    reporter.debug("Script execution ended.")
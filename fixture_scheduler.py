@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Fixture Scheduler
+Matchday-structured double round-robin calendars (circle method)
+
+generate_fixtures() used to emit the n(n-1) home/away pairs in no
+particular order, so a season had no matchdays. schedule_for(clubs)
+builds a proper league calendar instead:
+
+    schedule = schedule_for(clubs)
+    schedule.matchdays[0]     # [(home_club, away_club), ...] for matchday 1
+    schedule.fixtures         # every fixture, matchday by matchday
+
+Each club plays once per matchday (an odd number of clubs gives one club
+a bye per matchday), home and away alternate as far as the circle method
+allows, and the second half of the season mirrors the first with venues
+swapped. The index pattern is cached per club count and the club-level
+schedule per club set, so a league's calendar is built once per process.
+
+Because every result carries its matchday, standings_after(matches, k)
+gives the table after matchday k from a finished season without
+simulating anything again. Any matchday can also be handed to
+match_engine.play_fixtures() on its own to play a season round by round.
+"""
+
+from functools import lru_cache
+
+from standings import StandingsTable
+
+# Club-level schedules, keyed by the tuple of club ids
+_SCHEDULES = {}
+
+
+@lru_cache(maxsize=None)
+def round_robin_rounds(n_clubs):
+    """Double round-robin as matchdays of (home_index, away_index) pairs
+
+    Circle method: the first slot stays fixed and the others rotate one
+    place per matchday. Venues alternate by round for the fixed slot and by
+    pair position for the rest. With an even number of clubs no club has
+    more than one pair of consecutive home (or away) games per half, the
+    minimum of n - 2 such breaks in total. With an odd number the bye is
+    a dummy club in the fixed slot, so every club's games alternate home
+    and away within each half.
+    """
+    if n_clubs < 2:
+        return ()
+
+    slots = list(range(n_clubs))
+    if n_clubs % 2:
+        slots.insert(0, None)  # bye, pinned at the centre of the circle
+    size = len(slots)
+
+    first_half = []
+    for round_number in range(size - 1):
+        pairs = []
+        for i in range(size // 2):
+            home, away = slots[i], slots[size - 1 - i]
+            if i == 0:
+                swap = round_number % 2 == 1
+            else:
+                swap = i % 2 == 1
+            if swap:
+                home, away = away, home
+            if home is not None and away is not None:
+                pairs.append((home, away))
+        first_half.append(tuple(pairs))
+        # Rotate everything except the fixed first slot
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+
+    second_half = [tuple((away, home) for home, away in pairs) for pairs in first_half]
+    return tuple(first_half + second_half)
+
+
+class Schedule:
+    """A league calendar: matchdays of (home_club, away_club) fixtures"""
+
+    def __init__(self, clubs):
+        self.clubs = list(clubs)
+        self.matchdays = [[(self.clubs[home], self.clubs[away]) for home, away in pairs]
+                          for pairs in round_robin_rounds(len(self.clubs))]
+        self.fixtures = [fixture for matchday in self.matchdays for fixture in matchday]
+        # 1-based matchday of each entry in self.fixtures
+        self.fixture_matchdays = [number for number, matchday in enumerate(self.matchdays, 1)
+                                  for _ in matchday]
+
+    def __len__(self):
+        return len(self.matchdays)
+
+
+def _club_id(club):
+    return club.get('id') or club.get('club_id')
+
+
+def schedule_for(clubs):
+    """Cached Schedule for a list of clubs (same clubs in the same order -> same calendar)"""
+    key = tuple(_club_id(club) for club in clubs)
+    schedule = _SCHEDULES.get(key)
+    if schedule is None:
+        schedule = _SCHEDULES[key] = Schedule(clubs)
+    return schedule
+
+
+def clear_schedules():
+    """Forget cached club-level schedules (e.g. after a promotion/relegation reshuffle)"""
+    _SCHEDULES.clear()
+
+
+def tag_matchdays(match_results, schedule):
+    """Record each result's matchday (results in schedule.fixtures order)"""
+    for result, matchday in zip(match_results, schedule.fixture_matchdays):
+        result['matchday'] = matchday
+    return match_results
+
+
+def standings_after(match_results, matchday, league=None, clubs=None):
+    """League table after `matchday` from a season's tagged match results
+
+    The table is a StandingsTable.for_league(league, clubs), so points and
+    tie-breakers are the league's own (leagues.json entry) and the table
+    after the last matchday is the season's result['table']. Without clubs
+    the clubs are taken in order of first appearance in the results.
+    """
+    if clubs is None:
+        seen = {}
+        for result in match_results:
+            seen.setdefault(result['home_club_id'], result['home_team'])
+            seen.setdefault(result['away_club_id'], result['away_team'])
+        clubs = [{'id': club_id, 'name': name} for club_id, name in seen.items()]
+
+    table = StandingsTable.for_league(league, clubs)
+    for result in match_results:
+        if result.get('matchday', 0) <= matchday:
+            table.record_result(result['home_club_id'], result['away_club_id'],
+                                result['home_goals'], result['away_goals'])
+    return table.rows()
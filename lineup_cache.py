@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Lineup Cache
+Starting XIs remembered until the squad they were picked from changes
+
+The tournament simulators pick both starting XIs again for every match,
+although a club's best XI only changes when its squad does. A LineupCache
+keeps every lineup under
+
+    (club, formation, unavailable players bitmask, form version)
+
+and builds it only on a miss:
+
+    lineup = LINEUPS.lineup(players, club_id, formation,
+                            lambda: select_starting_xi(squad, players, formation))
+    mask = unavailable_mask(squad, injured_or_suspended_ids)   # 0 = everyone fit
+    LINEUPS.invalidate(club_id)                                # after a transfer
+
+The form version is for selectors that rank players by form: they pass a
+number that changes whenever form does, and untouched versions stay
+cached. The cache belongs to one player registry (the dict or list the
+lineups are built from); handing it a different registry, such as newly
+loaded data, empties it first. Lineups are stored as tuples, so callers
+share them without copying.
+
+Data derived from a lineup, such as its scorer and assister tables, can
+be kept with it and is dropped when the lineup is:
+
+    tables = LINEUPS.attached(lineup, lambda: build_scoring_tables(lineup))
+
+Only lineups this cache returned get data attached; for any other lineup
+build() is called and its result handed back without being kept, so the
+cache never holds more than max_entries lineups and their data.
+"""
+
+from profiler import phase
+
+# Lineups kept before the oldest are dropped (a full UCL field with a few
+# formations and injury lists is far below this)
+MAX_ENTRIES = 4096
+
+
+def unavailable_mask(squad_ids, unavailable_ids):
+    """Bitmask with bit i set when squad_ids[i] is injured, suspended or otherwise out"""
+    if not unavailable_ids:
+        return 0
+    mask = 0
+    for i, player_id in enumerate(squad_ids):
+        if player_id in unavailable_ids:
+            mask |= 1 << i
+    return mask
+
+
+class LineupCache:
+    """Starting XIs per (club, formation, unavailable mask, form version)"""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lineups = {}
+        self._keys = {}         # id(cached lineup) -> its cache key
+        self._attached = {}     # cache key -> derived data
+        self._registry = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._lineups)
+
+    def lineup(self, registry, club, formation, build, unavailable=0, form_version=0):
+        """Cached XI of a club, or build() on a miss"""
+        if registry is not self._registry:
+            self.invalidate()
+            self._registry = registry
+        key = (club, formation, unavailable, form_version)
+        lineup = self._lineups.get(key)
+        if lineup is not None:
+            self.hits += 1
+            return lineup
+
+        self.misses += 1
+        with phase('lineup_selection', 'lineup'):
+            lineup = tuple(build())
+        if len(self._lineups) >= self.max_entries:
+            # Dicts keep insertion order: drop the oldest lineup
+            self._drop(next(iter(self._lineups)))
+        self._lineups[key] = lineup
+        self._keys[id(lineup)] = key
+        return lineup
+
+    def attached(self, lineup, build):
+        """Data derived from a cached lineup: build() once, kept until the lineup is dropped"""
+        key = self._keys.get(id(lineup))
+        if key is None or self._lineups.get(key) is not lineup:
+            return build()  # Not one of ours: nothing to keep it with
+        if key in self._attached:
+            return self._attached[key]
+        value = self._attached[key] = build()
+        return value
+
+    def _drop(self, key):
+        lineup = self._lineups.pop(key)
+        self._keys.pop(id(lineup), None)
+        self._attached.pop(key, None)
+
+    def invalidate(self, club=None):
+        """Forget one club's lineups (transfer, new squad) or every lineup"""
+        if club is None:
+            self._lineups.clear()
+            self._keys.clear()
+            self._attached.clear()
+            return
+        for key in [key for key in self._lineups if key[0] == club]:
+            self._drop(key)
+
+    def hit_rate(self):
+        """Share of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -4,260 +4,150 @@ Multi-League Season Simulator
 Simulate domestic football leagues with all available league data
 """
 
-import json
 import random
 import os
 import csv
 from datetime import datetime
 from collections import defaultdict
 
+from data_repository import get_repository
+from player_table import PlayerTable
+from strength_cache import StrengthCache
+from match_engine import play_fixtures, default_rng
+from fixture_scheduler import schedule_for, standings_after, tag_matchdays
+from standings import StandingsTable, tie_breakers_for
+from parallel_leagues import iter_leagues, default_workers
+from result_sink import TABLE_FIELDS, table_rows, match_rows, season_rows, open_sink
+from rng_context import RNGContext
+from reporter import ConsoleReporter, create_reporter
+from profiler import phase, count, profiling
+from season_forecast import qualification_spots, run_forecast, summarize
+
 
 class MultiLeagueSimulator:
-    def __init__(self, specific_leagues=None):
+    def __init__(self, specific_leagues=None, batch_engine=False, reporter=None):
         """Initialize the multi-league simulator
         
         Args:
             specific_leagues (list): Optional list of league IDs to simulate (defaults to all)
+            batch_engine (bool): Simulate each season in one batch (match_engine) instead of match by match
+            reporter (Reporter): Where output goes (defaults to the console)
         """
+        self.reporter = reporter or ConsoleReporter()
         self.leagues = {}
         self.clubs_by_league = {}
         self.all_clubs = {}
         self.players_by_club = {}
+        self.player_table = PlayerTable()
         self.managers = {}
         self.season_number = 1
+        self.strength_cache = StrengthCache(self.calculate_base_strength)
         
         # Filter for specific leagues if provided
         self.specific_leagues = specific_leagues
+        self.batch_engine = batch_engine
         
         self.load_data()
         self.determine_season_number()
     
+    @phase('load_data', 'load')
     def load_data(self):
         """Load all required data (leagues, clubs, players, managers)"""
-        print("📂 Loading simulation data...")
+        self.reporter.message("📂 Loading simulation data...")
+        
+        # Leagues, clubs, players and managers all come from the shared repository
+        self.repository = get_repository()
         
         # Load leagues configuration
-        print("  Loading leagues...")
-        try:
-            with open('data/leagues.json', 'r', encoding='utf-8') as f:
-                content = f.read()
-                if content.startswith('//'):
-                    lines = content.split('\n')
-                    content = '\n'.join(line for line in lines if not line.strip().startswith('//'))
-                leagues_data = json.loads(content)
-            
-            for league in leagues_data:
-                league_id = league.get('id') or league.get('league_id')
-                # Only include domestic leagues (not competitions) and filter if specific_leagues provided
-                if league_id and not league_id.startswith('competition_'):
-                    if not self.specific_leagues or league_id in self.specific_leagues:
-                        self.leagues[league_id] = league
-            
-            print(f"  ✅ Loaded {len(self.leagues)} leagues")
-            
-            # Show which leagues were loaded
-            for league_id, league in self.leagues.items():
-                print(f"    - {league.get('name', league_id)}")
-        except Exception as e:
-            print(f"  ❌ Error loading leagues: {e}")
+        self.reporter.message("  Loading leagues...")
+        # Legacy ids such as 'league_epl' are accepted as well
+        wanted = {self.repository.resolve_league_id(league_id) or league_id
+                  for league_id in (self.specific_leagues or [])}
+        for league_id, league in self.repository.domestic_leagues().items():
+            # Filter if specific_leagues provided
+            if not wanted or league_id in wanted:
+                self.leagues[league_id] = league
+        
+        if not self.leagues:
+            self.reporter.message("  ❌ Error loading leagues: no matching leagues found")
             return
         
+        self.reporter.message(f"  ✅ Loaded {len(self.leagues)} leagues")
+        
+        # Show which leagues were loaded
+        for league_id, league in self.leagues.items():
+            self.reporter.message(f"    - {league.get('name', league_id)}")
+        
         # Load clubs for each league
         self.load_clubs_data()
         
-        # Load managers data (comprehensive approach to find all manager files)
+        # Load managers data for the loaded clubs
         self.load_managers_data()
         
         # Load players for all clubs that have been loaded
         self.load_players_data()
         
-        print(f"\n✅ Loaded {len(self.leagues)} leagues")
+        self.reporter.message(f"\n✅ Loaded {len(self.leagues)} leagues")
         club_count = sum(len(clubs) for clubs in self.clubs_by_league.values())
-        print(f"✅ Loaded {club_count} clubs")
-        print(f"✅ Loaded {len(self.managers)} managers")
+        self.reporter.message(f"✅ Loaded {club_count} clubs")
+        self.reporter.message(f"✅ Loaded {len(self.managers)} managers")
         player_count = sum(len(players) for players in self.players_by_club.values())
-        print(f"✅ Loaded {player_count} players")
+        self.reporter.message(f"✅ Loaded {player_count} players")
     
     def load_clubs_data(self):
         """Load club data for all leagues"""
-        print("\n  Loading clubs...")
-        leagues_clubs_dir = 'data/leagues_clubs'
-        
-        if not os.path.exists(leagues_clubs_dir):
-            print(f"  ❌ Clubs directory not found: {leagues_clubs_dir}")
-            return
+        self.reporter.message("\n  Loading clubs...")
         
-        for filename in os.listdir(leagues_clubs_dir):
-            if filename.endswith('_clubs.json') or filename.endswith('clubs.json'):
-                file_path = os.path.join(leagues_clubs_dir, filename)
-                
-                league_id = None
-                # Extract league ID from filename
-                if filename.startswith('league_'):
-                    # Handle league_{name}_clubs.json format
-                    league_id = 'league_' + filename.replace('league_', '').replace('_clubs.json', '')
-                elif filename == 'epl_clubs.json':
-                    league_id = 'league_epl'
-                elif filename == 'laliga_clubs.json':
-                    league_id = 'league_laliga'
-                
-                # Skip if this league wasn't selected
-                if league_id not in self.leagues:
-                    continue
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        clubs = json.load(f)
-                    
-                    # Handle different file structures
-                    if isinstance(clubs, list):
-                        club_list = clubs
-                    else:
-                        club_list = clubs.get('clubs', [])
-                    
-                    # Store clubs by league
-                    self.clubs_by_league[league_id] = club_list
-                    
-                    # Add to overall club dictionary
-                    for club in club_list:
-                        club_id = club.get('id') or club.get('club_id')
-                        if club_id:
-                            self.all_clubs[club_id] = club
-                    
-                    print(f"    ✅ Loaded {len(club_list)} clubs for {self.leagues[league_id].get('name', league_id)}")
-                except Exception as e:
-                    print(f"    ⚠️  Error loading clubs from {filename}: {e}")
+        for league_id, league in self.leagues.items():
+            club_list = self.repository.get_clubs(league_id)
+            if not club_list:
+                continue
+            
+            # Store clubs by league
+            self.clubs_by_league[league_id] = club_list
+            
+            # Add to overall club dictionary
+            for club in club_list:
+                club_id = club.get('id') or club.get('club_id')
+                self.all_clubs[club_id] = club
+            
+            self.reporter.message(f"    ✅ Loaded {len(club_list)} clubs for {league.get('name', league_id)}")
     
     def load_managers_data(self):
-        """Load managers data from all available sources"""
-        print("\n  Loading managers...")
-          manager_sources = [
-            # First try consolidated managers file
-            'data/managers.json', 
-            
-            # Try simple integer manager files based on league mapping
-            'data/managers/1.json',  # EPL
-            'data/managers/2.json',  # LaLiga
-            'data/managers/3.json',  # Bundesliga
-            'data/managers/4.json',  # Serie A
-            'data/managers/5.json',  # Ligue 1
-            'data/managers/6.json',  # LaLiga2
-            'data/managers/7.json',  # Championship
-            'data/managers/8.json',  # Bundesliga 2
-            'data/managers/9.json',  # Serie B
-            'data/managers/10.json', # Ligue 2
-            'data/managers/11.json', # Primeira Liga
-            'data/managers/12.json', # Eredivisie
-            'data/managers/13.json', # Scottish Premiership
-            'data/managers/14.json', # Belgian Pro League
-            'data/managers/15.json', # Austrian Bundesliga
-            'data/managers/16.json', # Swiss Super League
-            'data/managers/17.json', # Turkish Super Lig
-            'data/managers/18.json', # Russian Premier League
-            'data/managers/19.json', # Ukrainian Premier League
-            'data/managers/20.json', # Polish Ekstraklasa
-            'data/managers/21.json', # Argentina Primera
-            'data/managers/22.json', # Argentina Primera Division
-            'data/managers/23.json', # Austrian League
-            'data/managers/24.json', # Brasileirao
-            'data/managers/25.json', # UCL
-            'data/managers/26.json', # UEL
-            'data/managers/27.json', # Serie A Brazil
-            'data/managers/28.json', # Danish
-            'data/managers/29.json', # Danish Superliga
-            'data/managers/30.json', # Greek
-            'data/managers/31.json', # Liga MX
-            'data/managers/32.json', # Liga MX (alt)
-            'data/managers/33.json', # MLS
-            'data/managers/34.json', # Norwegian Eliteserien
-            'data/managers/35.json', # Swedish Allsvenskan
-        ]
-        
-        managers_loaded = 0
-        
-        for source in manager_sources:
-            if os.path.exists(source):
-                try:
-                    with open(source, 'r', encoding='utf-8') as f:
-                        manager_data = json.load(f)
-                    
-                    # Handle different file structures
-                    if isinstance(manager_data, dict) and 'managers' in manager_data:
-                        manager_list = manager_data['managers']
-                    else:
-                        manager_list = manager_data
-                    
-                    # Add managers to dictionary
-                    for manager in manager_list:
-                        manager_id = manager.get('manager_id') or manager.get('id')
-                        club_id = manager.get('current_club_id') or manager.get('club_id')
-                        
-                        if manager_id and club_id:
-                            self.managers[club_id] = manager
-                            managers_loaded += 1
-                    
-                    print(f"    ✅ Loaded managers from {source}")
-                except Exception as e:
-                    print(f"    ⚠️  Error loading managers from {source}: {e}")
+        """Look up the manager of every loaded club"""
+        self.reporter.message("\n  Loading managers...")
+        
+        for club_id in self.all_clubs:
+            manager = self.repository.club_managers.get(club_id)
+            if manager:
+                self.managers[club_id] = manager
+        self.strength_cache.on_manager_changed()
         
-        print(f"    Total: {managers_loaded} managers loaded")
+        self.reporter.message(f"    Total: {len(self.managers)} managers loaded")
     
     def load_players_data(self):
         """Load players data for all clubs"""
-        print("\n  Loading players...")
+        self.reporter.message("\n  Loading players...")
         
-        for league_id in self.leagues.keys():
-            base_name = league_id.replace('league_', '')
+        for league_id, club_list in self.clubs_by_league.items():
+            league_name = self.leagues[league_id].get('name', league_id)
+            club_count = 0
+            player_count = 0
             
-            # Try different directory patterns for player data
-            player_dirs = [
-                f'data/league_{base_name}_clubs_players',
-                f'data/{league_id}_clubs_players'
-            ]
+            for club in club_list:
+                club_id = club.get('id') or club.get('club_id')
+                club_players = self.repository.club_players.get(club_id)
+                if club_players:
+                    self.players_by_club[club_id] = club_players
+                    club_count += 1
+                    player_count += len(club_players)
             
-            for player_dir in player_dirs:
-                if os.path.exists(player_dir):
-                    league_name = self.leagues[league_id].get('name', league_id)
-                    print(f"    Loading {league_name} players from {player_dir}...")
-                    
-                    club_count = 0
-                    player_count = 0
-                    
-                    # Handle direct club folders with players.json inside
-                    if any(os.path.isdir(os.path.join(player_dir, d)) for d in os.listdir(player_dir)):
-                        # Structure: player_dir/club_id/players.json
-                        for club_folder in os.listdir(player_dir):
-                            club_path = os.path.join(player_dir, club_folder)
-                            if os.path.isdir(club_path):
-                                players_file = os.path.join(club_path, 'players.json')
-                                if os.path.exists(players_file):
-                                    try:
-                                        with open(players_file, 'r', encoding='utf-8') as f:
-                                            club_players = json.load(f)
-                                        
-                                        self.players_by_club[club_folder] = club_players
-                                        club_count += 1
-                                        player_count += len(club_players)
-                                    except Exception as e:
-                                        print(f"      ⚠️  Error loading {players_file}: {e}")
-                    # Handle club_id_players.json files
-                    else:
-                        for filename in os.listdir(player_dir):
-                            if filename.endswith('_players.json'):
-                                club_id = filename.replace('_players.json', '')
-                                players_file = os.path.join(player_dir, filename)
-                                
-                                try:
-                                    with open(players_file, 'r', encoding='utf-8') as f:
-                                        club_players = json.load(f)
-                                    
-                                    self.players_by_club[club_id] = club_players
-                                    club_count += 1
-                                    player_count += len(club_players)
-                                except Exception as e:
-                                    print(f"      ⚠️  Error loading {players_file}: {e}")
-                    
-                    print(f"      ✅ Loaded {player_count} players for {club_count} {league_name} clubs")
+            if club_count:
+                self.reporter.message(f"      ✅ Loaded {player_count} players for {club_count} {league_name} clubs")
+        
+        # Columnar copy for squad-level aggregates (club strength)
+        self.player_table = PlayerTable.from_squads(self.players_by_club)
+        self.strength_cache.on_squad_changed()
     
     def determine_season_number(self):
         """Determine current season number based on existing CSV files"""
@@ -283,10 +173,14 @@ class MultiLeagueSimulator:
         else:
             self.season_number = 1
         
-        print(f"🏆 Starting Season {self.season_number}")
+        self.reporter.message(f"🏆 Starting Season {self.season_number}")
+    
+    def get_club_strength(self, club, rng=random):
+        """Club strength for one match (cached season strength plus match noise)"""
+        return self.strength_cache.match_strength(club, rng)
     
-    def get_club_strength(self, club):
-        """Calculate club strength based on available data"""
+    def calculate_base_strength(self, club):
+        """Calculate club strength based on available data (no per-match noise)"""
         # Base strength from club reputation or league reputation
         club_id = club.get('id') or club.get('club_id')
         club_rep = club.get('reputation')
@@ -302,24 +196,11 @@ class MultiLeagueSimulator:
             else:
                 strength = 70  # Default
         
-        # Add player strength if available
-        if club_id in self.players_by_club:
-            club_players = self.players_by_club[club_id]
-            if club_players:
-                # Use overall ratings if available, otherwise calculate from attributes
-                overalls = []
-                for player in club_players:
-                    if 'overall' in player:
-                        overalls.append(player['overall'])
-                    elif 'technical_attributes' in player:
-                        tech_attrs = player['technical_attributes']
-                        if tech_attrs:
-                            avg_tech = sum(tech_attrs.values()) / len(tech_attrs)
-                            overalls.append(min(avg_tech, 95))  # Cap at 95
-                
-                if overalls:
-                    avg_overall = sum(overalls) / len(overalls)
-                    strength = (strength + avg_overall) / 2
+        # Add player strength if available (overall ratings if present,
+        # otherwise technical attribute averages capped at 95)
+        avg_overall = self.player_table.mean_rating(club_id, cap=95)
+        if avg_overall is not None:
+            strength = (strength + avg_overall) / 2
         
         # Add manager strength if available
         manager = self.managers.get(club_id)
@@ -328,15 +209,13 @@ class MultiLeagueSimulator:
             if manager_ability:
                 strength = (strength * 0.8) + (manager_ability * 0.2)  # 80% club, 20% manager
         
-        # Apply some small randomness for season-to-season variation
-        strength += random.uniform(-3, 3)
-        
-        return min(max(strength, 50), 95)  # Clamp between 50-95
+        # Per-match randomness (+/- 3) and the 50-95 clamp are applied by the strength cache
+        return strength
     
-    def simulate_match(self, home_club, away_club):
-        """Simulate a match between two clubs"""
-        home_strength = self.get_club_strength(home_club)
-        away_strength = self.get_club_strength(away_club)
+    def simulate_match(self, home_club, away_club, rng=random):
+        """Simulate a match between two clubs (rng: random stream to draw from)"""
+        home_strength = self.get_club_strength(home_club, rng)
+        away_strength = self.get_club_strength(away_club, rng)
         
         # Home advantage
         home_strength += 3
@@ -347,9 +226,10 @@ class MultiLeagueSimulator:
         # Base goals with some randomness
         home_base_goals = 1.5 + (strength_diff / 30)
         away_base_goals = 1.5 - (strength_diff / 30)
-          # Add randomness using normal distribution (more reliable than Poisson for Python's random)
-        home_goals = max(0, int(random.normalvariate(max(0.5, home_base_goals), 1.0)))
-        away_goals = max(0, int(random.normalvariate(max(0.5, away_base_goals), 1.0)))
+        
+        # Add randomness using normal distribution (more reliable than Poisson for Python's random)
+        home_goals = max(0, int(rng.normalvariate(max(0.5, home_base_goals), 1.0)))
+        away_goals = max(0, int(rng.normalvariate(max(0.5, away_base_goals), 1.0)))
         
         return {
             'home_team': home_club.get('name', 'Unknown'),
@@ -361,106 +241,74 @@ class MultiLeagueSimulator:
         }
     
     def generate_fixtures(self, clubs):
-        """Generate round-robin fixtures (home and away)"""
-        fixtures = []
-        n = len(clubs)
-        
-        # Create fixtures where each team plays each other twice (home and away)
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    fixtures.append((clubs[i], clubs[j]))
-        
-        return fixtures
+        """Generate round-robin fixtures (home and away), matchday by matchday"""
+        return list(schedule_for(clubs).fixtures)
+    
+    def standings_after_matchday(self, season_result, matchday):
+        """League table after `matchday` of a season returned by simulate_league_season()"""
+        league_id = season_result['league_id']
+        return standings_after(season_result['matches'], matchday, self.leagues[league_id],
+                               self.clubs_by_league.get(league_id, []))
     
-    def simulate_league_season(self, league_id):
-        """Simulate a full season for a league"""
+    @phase('simulate_league_season', 'season')
+    def simulate_league_season(self, league_id, rng=None):
+        """Simulate a full season for a league
+        
+        rng: random stream for this league (defaults to the random module)
+        """
+        if rng is None:
+            rng = random
         league_name = self.leagues[league_id].get('name', league_id)
-        print(f"\n🏟️  Simulating {league_name} Season {self.season_number}")
-        print("-" * 60)
+        self.reporter.message(f"\n🏟️  Simulating {league_name} Season {self.season_number}")
+        self.reporter.message("-" * 60)
+        
+        self.strength_cache.start_season(self.season_number)
         
         clubs = self.clubs_by_league.get(league_id, [])
         if len(clubs) < 2:
-            print(f"⚠️  Not enough clubs in {league_name} (found {len(clubs)})")
+            self.reporter.message(f"⚠️  Not enough clubs in {league_name} (found {len(clubs)})")
             return None
         
-        # Generate fixtures
-        fixtures = self.generate_fixtures(clubs)
-        print(f"📅 Generated {len(fixtures)} fixtures ({len(clubs)} clubs)")
-        
-        # Initialize league table
-        table = {}
-        for club in clubs:
-            club_id = club.get('id') or club.get('club_id')
-            table[club_id] = {
-                'club_id': club_id,
-                'club_name': club.get('name', 'Unknown'),
-                'matches': 0,
-                'wins': 0,
-                'draws': 0,
-                'losses': 0,
-                'goals_for': 0,
-                'goals_against': 0,
-                'goal_difference': 0,
-                'points': 0
-            }
+        # Generate fixtures (cached matchday calendar for this club set)
+        with phase('fixtures', 'schedule', league=league_id):
+            schedule = schedule_for(clubs)
+        fixtures = schedule.fixtures
+        self.reporter.message(f"📅 Generated {len(fixtures)} fixtures over {len(schedule)} matchdays ({len(clubs)} clubs)")
+        
+        # League table (integer columns, the league's tie-breakers from leagues.json)
+        standings = StandingsTable.for_league(self.leagues[league_id], clubs)
         
         # Simulate all matches
-        print(f"⚽ Simulating {len(fixtures)} matches...")
-        match_results = []
-        for i, (home_club, away_club) in enumerate(fixtures):
-            if i % 100 == 0 and i > 0:  # Progress indicator
-                print(f"  Progress: {i}/{len(fixtures)} matches")
-            
-            result = self.simulate_match(home_club, away_club)
-            match_results.append(result)
-            
-            # Update table
-            home_id = result['home_club_id']
-            away_id = result['away_club_id']
-            
-            if home_id in table and away_id in table:
-                # Update matches played
-                table[home_id]['matches'] += 1
-                table[away_id]['matches'] += 1
-                
-                # Update goals
-                table[home_id]['goals_for'] += result['home_goals']
-                table[home_id]['goals_against'] += result['away_goals']
-                table[away_id]['goals_for'] += result['away_goals']
-                table[away_id]['goals_against'] += result['home_goals']
-                
-                # Determine winner and update points
-                if result['home_goals'] > result['away_goals']:
-                    table[home_id]['wins'] += 1
-                    table[home_id]['points'] += 3
-                    table[away_id]['losses'] += 1
-                elif result['home_goals'] < result['away_goals']:
-                    table[away_id]['wins'] += 1
-                    table[away_id]['points'] += 3
-                    table[home_id]['losses'] += 1
-                else:
-                    table[home_id]['draws'] += 1
-                    table[away_id]['draws'] += 1
-                    table[home_id]['points'] += 1
-                    table[away_id]['points'] += 1
-        
-        # Calculate goal difference
-        for club_id in table:
-            table[club_id]['goal_difference'] = table[club_id]['goals_for'] - table[club_id]['goals_against']
-        
-        # Sort table by points, then goal difference, then goals for
-        sorted_table = sorted(table.values(), 
-                            key=lambda x: (-x['points'], -x['goal_difference'], -x['goals_for']))
-        
-        # Add positions
-        for i, club in enumerate(sorted_table):
-            club['position'] = i + 1
+        self.reporter.message(f"⚽ Simulating {len(fixtures)} matches...")
+        with phase('matches', 'match', league=league_id, matches=len(fixtures)):
+            if self.batch_engine:
+                # Whole season in one batch (same model, noise and clamp as simulate_match)
+                match_results = play_fixtures(
+                    fixtures, self.strength_cache.base_strength, default_rng(rng.getrandbits(32)),
+                    noise=self.strength_cache.noise, clamp=(self.strength_cache.low, self.strength_cache.high))
+            else:
+                match_results = []
+                for i, (home_club, away_club) in enumerate(fixtures):
+                    self.reporter.progress(i, len(fixtures))
+                    match_results.append(self.simulate_match(home_club, away_club, rng))
+        count('matches', len(fixtures))
+        tag_matchdays(match_results, schedule)
+        
+        # Update table, re-ranking after every matchday
+        matchday = 1
+        for result in match_results:
+            if result['matchday'] != matchday:
+                standings.end_matchday()
+                matchday = result['matchday']
+            standings.record_result(result['home_club_id'], result['away_club_id'],
+                                    result['home_goals'], result['away_goals'])
+        sorted_table = standings.rows()
+        for club in sorted_table:
             club['league_id'] = league_id  # Add league_id for CSV export
             club['league_name'] = league_name  # Add league_name for CSV export
         
-        # Display table
-        self.display_league_table(sorted_table, league_id, league_name)
+        # Display table (rendered only by text reporters)
+        self.reporter.league_table(league_id, league_name, sorted_table, self.display_league_table)
         
         return {
             'league_id': league_id,
@@ -469,12 +317,72 @@ class MultiLeagueSimulator:
             'matches': match_results
         }
     
+    def forecast_league(self, league_id, seasons=10000, workers=None, seed=None):
+        """Monte Carlo forecast: play a league's season many times without output
+        
+        Args:
+            league_id (str): League to forecast
+            seasons (int): Number of simulated seasons
+            workers (int): Worker processes (defaults to all cores)
+            seed (int): Seed for reproducible forecasts
+        
+        Returns per-club finishing-position histograms, expected points and
+        title/UCL/UEL/relegation probabilities (see season_forecast).
+        """
+        clubs = self.clubs_by_league.get(league_id, [])
+        if len(clubs) < 2:
+            return None
+        
+        self.strength_cache.start_season(self.season_number)
+        
+        # Same fixtures and match model as simulate_league_season, as club indexes
+        index = {id(club): i for i, club in enumerate(clubs)}
+        fixtures = self.generate_fixtures(clubs)
+        home_index = [index[id(home_club)] for home_club, _ in fixtures]
+        away_index = [index[id(away_club)] for _, away_club in fixtures]
+        strengths = [self.strength_cache.base_strength(club) for club in clubs]
+        
+        position_counts, total_points, elapsed = run_forecast(
+            strengths, home_index, away_index, seasons, seed, workers,
+            noise=self.strength_cache.noise, clamp=(self.strength_cache.low, self.strength_cache.high),
+            tie_breakers=tie_breakers_for(self.leagues[league_id]))
+        
+        ucl_spots, uel_spots, relegation_spots = qualification_spots(self.repository, league_id)
+        return {
+            'league_id': league_id,
+            'league_name': self.leagues[league_id].get('name', league_id),
+            'seasons': seasons,
+            'elapsed': elapsed,
+            'seasons_per_second': seasons / elapsed if elapsed else float('inf'),
+            'ucl_spots': ucl_spots,
+            'uel_spots': uel_spots,
+            'relegation_spots': relegation_spots,
+            'clubs': summarize(clubs, position_counts, total_points, seasons,
+                               ucl_spots, uel_spots, relegation_spots)
+        }
+    
+    def display_forecast(self, forecast):
+        """Display a forecast_league() probability table"""
+        self.reporter.message(f"\n🔮 {forecast['league_name']} Forecast ({forecast['seasons']:,} seasons)")
+        self.reporter.message("=" * 80)
+        self.reporter.message(f"{'Club':<25} {'xPts':>6} {'xPos':>5} {'Title':>7} {'UCL':>7} {'UEL':>7} {'Releg.':>7}")
+        self.reporter.message("-" * 80)
+        
+        for club in forecast['clubs']:
+            self.reporter.message(f"{club['club_name'][:24]:<25} {club['expected_points']:6.1f} {club['expected_position']:5.1f} "
+                  f"{club['title']:7.1%} {club['ucl']:7.1%} {club['uel']:7.1%} {club['relegation']:7.1%}")
+        
+        self.reporter.message("-" * 80)
+        self.reporter.message(f"UCL spots: {forecast['ucl_spots']} | UEL spots: {forecast['uel_spots']} | "
+              f"Relegation spots: {forecast['relegation_spots']}")
+        self.reporter.message(f"⏱️  {forecast['elapsed']:.2f}s ({forecast['seasons_per_second']:,.0f} seasons/s)")
+    
     def display_league_table(self, table, league_id, league_name):
         """Display a formatted league table"""
-        print(f"\n📊 {league_name} Final Table:")
-        print("-" * 80)
-        print(f"{'Pos':<3} {'Club':<25} {'P':<3} {'W':<3} {'D':<3} {'L':<3} {'GF':<3} {'GA':<3} {'GD':<4} {'Pts':<3}")
-        print("-" * 80)
+        self.reporter.message(f"\n📊 {league_name} Final Table:")
+        self.reporter.message("-" * 80)
+        self.reporter.message(f"{'Pos':<3} {'Club':<25} {'P':<3} {'W':<3} {'D':<3} {'L':<3} {'GF':<3} {'GA':<3} {'GD':<4} {'Pts':<3}")
+        self.reporter.message("-" * 80)
         
         # Get the promotion/relegation spots from league configuration
         league_config = self.leagues.get(league_id, {})
@@ -493,29 +401,42 @@ class MultiLeagueSimulator:
             elif position > len(table) - relegation_spots:
                 qual = "⬇️ REL"
             
-            print(f"{club['position']:<3} {club['club_name'][:25]:<25} "
+            self.reporter.message(f"{club['position']:<3} {club['club_name'][:25]:<25} "
                   f"{club['matches']:<3} {club['wins']:<3} {club['draws']:<3} {club['losses']:<3} "
                   f"{club['goals_for']:<3} {club['goals_against']:<3} {club['goal_difference']:>+4} {club['points']:<3} {qual}")
         
-        print("-" * 80)
-        print("🏆 UCL = Champions League, 🥉 UEL = Europa League, ⬇️ REL = Relegation")
+        self.reporter.message("-" * 80)
+        self.reporter.message("🏆 UCL = Champions League, 🥉 UEL = Europa League, ⬇️ REL = Relegation")
     
-    def run_all_leagues(self):
-        """Run simulation for all loaded leagues"""
-        print(f"\n🌍 Starting Season {self.season_number} Simulation")
-        print("=" * 60)
+    def run_all_leagues(self, seed=None, workers=1, sink=None):
+        """Run simulation for all loaded leagues
+        
+        Args:
+            seed (int): Seed for per-league random streams (reproducible runs)
+            workers (int): Processes to spread the leagues over (1 = serial)
+            sink (ResultSink): Stream table, match, winner and manager rows here
+                instead of exporting CSV files. Each league is written as soon as
+                it is played and its 'matches' list is emptied afterwards.
+        """
+        self.reporter.message(f"\n🌍 Starting Season {self.season_number} Simulation")
+        self.reporter.message("=" * 60)
         
         all_results = []
         manager_stats = defaultdict(lambda: {'points': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'position': 0})
         winners = []
         
         # Simulate each league
-        for league_id in self.leagues.keys():
-            result = self.simulate_league_season(league_id)
-            
+        # Leagues are independent: with workers > 1 they run on a process pool,
+        # each with its own seeded stream, and come back in league order
+        for result in iter_leagues(self, self.leagues.keys(), seed, workers):
             if result:
                 all_results.append(result)
                 
+                if sink is not None:
+                    sink.write_rows('table', table_rows(self.season_number, result['league_name'], result['table']))
+                    sink.write_rows('match', match_rows(self.season_number, result['league_name'], result['matches']))
+                    result['matches'] = []
+                
                 # Track winner
                 if result['table']:
                     winner = result['table'][0]
@@ -543,13 +464,64 @@ class MultiLeagueSimulator:
                             manager_stats[manager_id]['position_points'] = (len(result['table']) - club['position'] + 1) * 2
         
         # Export results
-        self.export_to_csv(all_results, winners, manager_stats)
+        if sink is not None:
+            sink.write_rows('winner', season_rows(self.season_number, self.winner_rows(winners)))
+            sink.write_rows('manager', season_rows(self.season_number, self.manager_rows(manager_stats)))
+        else:
+            self.export_to_csv(all_results, winners, manager_stats)
         
-        print(f"\n🎉 Season {self.season_number} Complete!")
-        print(f"📊 Results exported to CSV files")
+        self.reporter.event('season_complete', season=self.season_number, winners=winners)
+        self.reporter.message(f"\n🎉 Season {self.season_number} Complete!")
+        if sink is not None:
+            self.reporter.message(f"📊 Results streamed to {sink.path}")
+        else:
+            self.reporter.message(f"📊 Results exported to CSV files")
         
         return all_results
     
+    def run_seasons(self, seasons, seed=None, workers=1, sink=None):
+        """Run consecutive seasons of every league
+        
+        Args:
+            seasons (int): Number of seasons to play
+            seed (int): Seed of the first season; later seasons get seeds split from it
+            workers (int): Processes to spread the leagues over (1 = serial)
+            sink (ResultSink): Stream every season's rows here instead of exporting CSV files
+        """
+        # Results are not kept between seasons, so memory stays flat however many are played
+        for n in range(seasons):
+            season_seed = seed
+            if seed is not None and n > 0:
+                season_seed = RNGContext(seed).spawn('season', n).getrandbits(64)
+            self.run_all_leagues(seed=season_seed, workers=workers, sink=sink)
+            self.season_number += 1
+    
+    def winner_rows(self, winners):
+        """One row per league champion (the winners file columns)"""
+        for winner in winners:
+            yield {
+                'League': winner['league'],
+                'Champion': winner['champion'],
+                'Points': winner['points'],
+                'Goal_Difference': winner['goal_difference']
+            }
+    
+    def manager_rows(self, manager_stats):
+        """One row per manager, by position points (higher is better)"""
+        for manager in sorted(manager_stats.values(), key=lambda x: x['position_points'], reverse=True):
+            yield {
+                'Name': manager['name'],
+                'Club': manager['club'],
+                'League': manager['league'],
+                'Position': manager['position'],
+                'Wins': manager['wins'],
+                'Draws': manager['draws'],
+                'Losses': manager['losses'],
+                'Points': manager['points'],
+                'Position_Points': manager['position_points']
+            }
+    
+    @phase('export_to_csv', 'io')
     def export_to_csv(self, all_results, winners, manager_stats):
         """Export results to CSV files"""
         # Main results file
@@ -560,29 +532,13 @@ class MultiLeagueSimulator:
         mode = 'a' if file_exists else 'w'
         
         with open(csv_filename, mode, newline='', encoding='utf-8') as f:
-            fieldnames = ['Season', 'League', 'Position', 'Club', 'Matches', 'Wins', 'Draws', 'Losses', 
-                         'Goals_For', 'Goals_Against', 'Goal_Difference', 'Points']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=TABLE_FIELDS)
             
             if not file_exists:
                 writer.writeheader()
             
             for result in all_results:
-                for club in result['table']:
-                    writer.writerow({
-                        'Season': self.season_number,
-                        'League': result['league_name'],
-                        'Position': club['position'],
-                        'Club': club['club_name'],
-                        'Matches': club['matches'],
-                        'Wins': club['wins'],
-                        'Draws': club['draws'],
-                        'Losses': club['losses'],
-                        'Goals_For': club['goals_for'],
-                        'Goals_Against': club['goals_against'],
-                        'Goal_Difference': club['goal_difference'],
-                        'Points': club['points']
-                    })
+                writer.writerows(table_rows(self.season_number, result['league_name'], result['table']))
         
         # Winners file for this season
         winners_filename = f"league_winners_season_{self.season_number}.csv"
@@ -590,9 +546,7 @@ class MultiLeagueSimulator:
             fieldnames = ['League', 'Champion', 'Points', 'Goal_Difference']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            
-            for winner in winners:
-                writer.writerow(winner)
+            writer.writerows(self.winner_rows(winners))
         
         # Manager rankings file
         manager_filename = f"manager_rankings_season_{self.season_number}.csv"
@@ -600,26 +554,11 @@ class MultiLeagueSimulator:
             fieldnames = ['Name', 'Club', 'League', 'Position', 'Wins', 'Draws', 'Losses', 'Points', 'Position_Points']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            
-            # Sort managers by position points (higher is better)
-            sorted_managers = sorted(manager_stats.values(), key=lambda x: x['position_points'], reverse=True)
-            
-            for manager in sorted_managers:
-                writer.writerow({
-                    'Name': manager['name'],
-                    'Club': manager['club'],
-                    'League': manager['league'],
-                    'Position': manager['position'],
-                    'Wins': manager['wins'],
-                    'Draws': manager['draws'],
-                    'Losses': manager['losses'],
-                    'Points': manager['points'],
-                    'Position_Points': manager['position_points']
-                })
-        
-        print(f"✅ Exported results to {csv_filename}")
-        print(f"✅ Exported winners to {winners_filename}")
-        print(f"✅ Exported manager rankings to {manager_filename}")
+            writer.writerows(self.manager_rows(manager_stats))
+        
+        self.reporter.message(f"✅ Exported results to {csv_filename}")
+        self.reporter.message(f"✅ Exported winners to {winners_filename}")
+        self.reporter.message(f"✅ Exported manager rankings to {manager_filename}")
     
     def display_league_selection(self):
         """Display available leagues for selection"""
@@ -684,26 +623,49 @@ class MultiLeagueSimulator:
         except (ValueError, IndexError):
             print("❌ Invalid selection")
     
+    def forecast_specific_league(self, seasons=10000):
+        """Forecast a league selected by the user"""
+        sorted_leagues = self.display_league_selection()
+        
+        try:
+            selection = input("\nEnter league number to forecast (or 0 to return): ")
+            if selection == "0":
+                return
+            
+            index = int(selection) - 1
+            if 0 <= index < len(sorted_leagues):
+                league_id, league = sorted_leagues[index]
+                print(f"\n🎲 Simulating {seasons:,} seasons of {league.get('name', league_id)}...")
+                forecast = self.forecast_league(league_id, seasons)
+                if forecast:
+                    self.display_forecast(forecast)
+                else:
+                    print(f"⚠️  Not enough clubs in {league.get('name', league_id)}")
+            else:
+                print("❌ Invalid selection")
+        except (ValueError, IndexError):
+            print("❌ Invalid selection")
+    
     def display_data_summary(self):
         """Display summary of loaded data"""
-        print("\n📊 Simulation Data Summary:")
-        print("-" * 60)
+        self.reporter.message("\n📊 Simulation Data Summary:")
+        self.reporter.message("-" * 60)
         
-        print(f"Leagues: {len(self.leagues)}")
+        self.reporter.message(f"Leagues: {len(self.leagues)}")
         for league_id, league in self.leagues.items():
             club_count = len(self.clubs_by_league.get(league_id, []))
-            print(f"  - {league.get('name', league_id):<25}: {club_count} clubs")
+            self.reporter.message(f"  - {league.get('name', league_id):<25}: {club_count} clubs")
         
         club_count = sum(len(clubs) for clubs in self.clubs_by_league.values())
-        print(f"\nTotal Clubs: {club_count}")
+        self.reporter.message(f"\nTotal Clubs: {club_count}")
         
-        print(f"Total Managers: {len(self.managers)}")
+        self.reporter.message(f"Total Managers: {len(self.managers)}")
         
         player_count = sum(len(players) for players in self.players_by_club.values())
-        print(f"Total Players: {player_count}")
+        self.reporter.message(f"Total Players: {player_count}")
         
-        print(f"\nCurrent Season: {self.season_number}")
-        print("-" * 60)
+        self.reporter.message(f"\nCurrent Season: {self.season_number}")
+        self.reporter.message("-" * 60)
 
 
 def main():
@@ -712,38 +674,71 @@ def main():
         # Default to all leagues
         specific_leagues = None
         
-        # Check for command-line arguments for specific leagues
+        # --quiet / --jsonl[=path] / --debug choose the reporter
         import sys
+        reporter = create_reporter(sys.argv[1:])
+        
+        # Check for command-line arguments for specific leagues
         if len(sys.argv) > 1:
             if sys.argv[1] == "--epl-only":
-                specific_leagues = ["league_epl"]
-                print("🏴󠁧󠁢󠁥󠁮󠁧󠁿 EPL Only Mode")
+                specific_leagues = ["00_1"]
+                reporter.message("🏴󠁧󠁢󠁥󠁮󠁧󠁿 EPL Only Mode")
             elif sys.argv[1] == "--top5":
-                specific_leagues = ["league_epl", "league_laliga", "league_ger_bundesliga", 
-                                  "league_ita_seriea", "league_fra_ligue1"]
-                print("🌟 Top 5 Leagues Mode")
-        
-        simulator = MultiLeagueSimulator(specific_leagues)
+                specific_leagues = ["00_1", "00_2", "00_3", "00_4", "00_5"]
+                reporter.message("🌟 Top 5 Leagues Mode")
+        
+        # --batch simulates each season in one batch through match_engine
+        batch_engine = "--batch" in sys.argv[1:]
+        
+        # --seed=N makes runs reproducible, --workers=N / --parallel run leagues in parallel,
+        # --seasons=N plays N seasons in a row
+        seed = None
+        workers = 1
+        seasons = 1
+        for arg in sys.argv[1:]:
+            if arg.startswith("--seed="):
+                seed = int(arg.split("=", 1)[1])
+            elif arg.startswith("--seasons="):
+                seasons = int(arg.split("=", 1)[1])
+            elif arg.startswith("--workers="):
+                workers = int(arg.split("=", 1)[1])
+            elif arg == "--parallel":
+                workers = default_workers()
+        
+        simulator = MultiLeagueSimulator(specific_leagues, batch_engine=batch_engine, reporter=reporter)
         
         print("\n🌍 Multi-League Football Simulator")
         print("=" * 50)
         print("1. Simulate all leagues")
         print("2. Simulate specific league")
         print("3. Show data summary")
-        print("4. Exit")
+        print("4. Forecast specific league (Monte Carlo)")
+        print("5. Exit")
         
-        choice = input("\nEnter your choice (1-4): ").strip()
+        choice = input("\nEnter your choice (1-5): ").strip()
         
         if choice == "1":
-            simulator.run_all_leagues()
+            # --results=PATH (.jsonl / .csv, optionally .gz) streams the rows to one sink,
+            # --writer-thread writes them in the background
+            sink = open_sink(sys.argv[1:])
+            try:
+                simulator.run_seasons(seasons, seed=seed, workers=workers, sink=sink)
+            finally:
+                if sink is not None:
+                    sink.close()
+                    reporter.message(f"💾 Results: {sink.describe()}")
         elif choice == "2":
             simulator.simulate_specific_league()
         elif choice == "3":
             simulator.display_data_summary()
         elif choice == "4":
+            simulator.forecast_specific_league()
+        elif choice == "5":
             print("👋 Goodbye!")
         else:
             print("❌ Invalid choice")
+        
+        simulator.reporter.close()
             
     except KeyboardInterrupt:
         print("\n\n👋 Simulation interrupted by user")
@@ -754,4 +749,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import sys
+    # --profile[=NAME] prints the hot spots and writes a Chrome trace (profiler.py)
+    with profiling(sys.argv[1:]):
+        main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Parallel Leagues
+Run independent league seasons on a process pool
+
+Leagues do not affect each other during a season, so run_all_leagues()
+can hand them to worker processes. Every league gets its own random
+stream derived from the run seed and the league id:
+
+    rng = league_rng(seed, league_id)
+
+so a league's season is the same whichever process plays it and in
+whatever order. Results are merged back in league order, which makes a
+parallel run's CSV files byte-for-byte identical to a serial run with the
+same seed. Workers report into a buffer (reporter.redirect()) that the
+parent replays in the same order through reporter.write(). Profiler spans
+recorded in a worker (--profile) come back with its result and are merged
+into the parent's timeline.
+
+Workers are forked from the loaded simulator, so data is not reloaded or
+pickled. Where fork is unavailable (Windows, macOS spawn) the leagues run
+serially with the same per-league streams.
+"""
+
+import io
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+import profiler
+from rng_context import RNGContext
+
+_simulator = None
+
+
+def league_rng(seed, league_id):
+    """Independent, reproducible random stream for one league"""
+    return RNGContext(seed).league(league_id)
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _fork_context():
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def _init_worker(simulator):
+    global _simulator
+    _simulator = simulator
+    # A forked worker starts with a copy of the parent's spans
+    profiler.reset()
+
+
+def _run_league(args):
+    league_id, seed = args
+    output = io.StringIO()
+    reporter = _simulator.reporter
+    _simulator.reporter = reporter.redirect(output)
+    try:
+        with redirect_stdout(output):
+            result = _simulator.simulate_league_season(league_id, rng=league_rng(seed, league_id))
+    finally:
+        _simulator.reporter = reporter
+    return output.getvalue(), result, profiler.drain()
+
+
+def run_leagues(simulator, league_ids, seed=None, workers=1):
+    """simulator.simulate_league_season() for every league, in league order
+
+    With a seed each league uses league_rng(seed, league_id); without one
+    the serial path keeps the shared random module stream. workers > 1
+    fans the leagues out to a process pool (a seed is drawn if none is
+    given).
+    """
+    return list(iter_leagues(simulator, league_ids, seed, workers))
+
+
+def iter_leagues(simulator, league_ids, seed=None, workers=1):
+    """Like run_leagues(), but yields each league's result as soon as it is available"""
+    league_ids = list(league_ids)
+    context = _fork_context()
+    if workers > 1 and len(league_ids) > 1 and context is None:
+        simulator.reporter.message("⚠️  Parallel mode needs the fork start method, running leagues serially")
+    if workers <= 1 or len(league_ids) <= 1 or context is None:
+        for league_id in league_ids:
+            yield simulator.simulate_league_season(
+                league_id, rng=league_rng(seed, league_id) if seed is not None else None)
+        return
+
+    if seed is None:
+        seed = random.getrandbits(64)
+    workers = min(workers, len(league_ids))
+    simulator.reporter.message(f"⚡ Simulating {len(league_ids)} leagues on {workers} processes (seed {seed})")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(simulator,)) as pool:
+        for output, result, spans in pool.map(_run_league, [(league_id, seed) for league_id in league_ids]):
+            simulator.reporter.write(output)
+            profiler.merge(spans)
+            yield result
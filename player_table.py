@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Player Table
+Columnar, typed storage for squads
+
+Player records are nested dicts with up to ~60 numeric attributes each, and
+squad-level numbers (club strength, average ability, ...) were computed by
+walking those dicts again on every call. PlayerTable copies the numbers
+into flat typed columns once:
+
+    every attribute              uint8 column  ('technical_attributes.finishing', ...)
+    attribute group sum / count  per row       ('technical_attributes.sum' / '.count')
+    current_ability, age         uint8
+    overall_rating               uint8         ('overall' or 'overall_rating')
+    market_value_eur             int64
+    positions_primary/secondary  bitmasks      (see position_mask())
+    club                         int index into table.clubs
+
+Rows are grouped by club, so a squad is a contiguous row range and
+column(name, club_id) is a zero-copy memoryview of it. Unrated values are
+stored as 0.
+
+Columns are standard-library arrays, so np.asarray(table.column(name))
+is a zero-copy NumPy view. The squad aggregates are computed on such
+views when NumPy is installed, and with plain loops otherwise.
+
+Usage:
+    table = PlayerTable.from_squads({club_id: [player, ...]})
+    table.mean_rating('01_65')
+    table.column('current_ability', '01_65')
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the aggregates fall back to loops
+    np = None
+
+ATTRIBUTE_GROUPS = ('technical_attributes', 'mental_attributes', 'physical_attributes',
+                    'goalkeeping_attributes', 'attributes')
+
+# row flags
+FLAG_OVERALL = 1  # record carries an explicit 'overall' value
+
+MAX_POSITIONS = 64
+
+
+def _uint8(value):
+    if not isinstance(value, (int, float)):
+        return 0
+    return min(max(int(value), 0), 255)
+
+
+class PlayerTable:
+    """Columnar player store built from {club_id: [player dict]}"""
+
+    def __init__(self):
+        self.clubs = []          # club index -> club_id
+        self.player_ids = []     # row -> player id (None if the record has none)
+        self.position_bits = {}  # position code -> bit
+        self._club_rows = {}     # club_id -> (start, stop)
+        self._rows = {}          # player id -> row
+        self._columns = {
+            'club': array('H'),
+            'flags': array('B'),
+            'current_ability': array('B'),
+            'overall_rating': array('B'),
+            'age': array('B'),
+            'market_value_eur': array('q'),
+            'positions_primary': array('Q'),
+            'positions_secondary': array('Q'),
+        }
+        for group in ATTRIBUTE_GROUPS:
+            self._columns[f'{group}.sum'] = array('I')
+            self._columns[f'{group}.count'] = array('B')
+
+    @classmethod
+    def from_squads(cls, squads):
+        """Build a table from a mapping of club_id -> list of player dicts"""
+        table = cls()
+        for club_id, players in squads.items():
+            table.add_squad(club_id, players or [])
+        return table
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def __contains__(self, club_id):
+        return club_id in self._club_rows
+
+    # --- Building --------------------------------------------------------
+
+    def add_squad(self, club_id, players):
+        """Append a club's players (a club can only be added once)"""
+        if club_id in self._club_rows:
+            raise ValueError(f"Club {club_id} is already in the table")
+
+        columns = self._columns
+        club_index = len(self.clubs)
+        self.clubs.append(club_id)
+        start = len(self.player_ids)
+        stop = start + len(players)
+
+        # Every attribute column grows by the squad size; values are filled in below
+        for name, column in columns.items():
+            if name.count('.') and not name.endswith(('.sum', '.count')):
+                column.frombytes(bytes(len(players)))
+
+        for row, player in enumerate(players, start):
+            player_id = player.get('id') or player.get('player_id')
+            self.player_ids.append(player_id)
+            if player_id is not None:
+                self._rows[player_id] = row
+
+            overall = player.get('overall', player.get('overall_rating'))
+            columns['club'].append(club_index)
+            columns['flags'].append(FLAG_OVERALL if 'overall' in player else 0)
+            columns['current_ability'].append(_uint8(player.get('current_ability')))
+            columns['overall_rating'].append(_uint8(overall))
+            columns['age'].append(_uint8(player.get('age')))
+            value = player.get('market_value_eur')
+            columns['market_value_eur'].append(int(value) if isinstance(value, (int, float)) else 0)
+
+            primary = player.get('positions_primary')
+            if primary is None and player.get('position'):
+                primary = [player['position']]
+            columns['positions_primary'].append(self.position_mask(primary or ()))
+            columns['positions_secondary'].append(self.position_mask(player.get('positions_secondary') or ()))
+
+            for group in ATTRIBUTE_GROUPS:
+                attributes = player.get(group)
+                if not isinstance(attributes, dict):
+                    attributes = {}
+                for name, value in attributes.items():
+                    column = columns.get(f'{group}.{name}')
+                    if column is None:
+                        column = columns[f'{group}.{name}'] = array('B', bytes(stop))
+                    column[row] = _uint8(value)
+                # Sums use the raw values so means match the source records exactly
+                columns[f'{group}.sum'].append(sum(attributes.values()) if attributes else 0)
+                columns[f'{group}.count'].append(len(attributes))
+
+        self._club_rows[club_id] = (start, stop)
+
+    def position_mask(self, codes):
+        """Bitmask for a collection of position codes ('ST', 'CB', ...)"""
+        mask = 0
+        for code in codes:
+            bit = self.position_bits.get(code)
+            if bit is None:
+                if len(self.position_bits) >= MAX_POSITIONS:
+                    continue
+                bit = self.position_bits[code] = 1 << len(self.position_bits)
+            mask |= bit
+        return mask
+
+    # --- Access ----------------------------------------------------------
+
+    def column_names(self):
+        return list(self._columns)
+
+    def rows(self, club_id):
+        """(start, stop) row range of a club's squad"""
+        return self._club_rows.get(club_id, (0, 0))
+
+    def row(self, player_id):
+        return self._rows.get(player_id)
+
+    def column(self, name, club_id=None):
+        """Zero-copy view of a column, optionally restricted to one club
+
+        Release views before calling add_squad(); arrays cannot grow while
+        a view is exported.
+        """
+        view = memoryview(self._columns[name])
+        if club_id is None:
+            return view
+        start, stop = self.rows(club_id)
+        return view[start:stop]
+
+    def value(self, name, player_id):
+        row = self._rows.get(player_id)
+        return None if row is None else self._columns[name][row]
+
+    def nbytes(self):
+        """Bytes held by the column buffers"""
+        return sum(column.itemsize * len(column) for column in self._columns.values())
+
+    # --- Squad aggregates ------------------------------------------------
+
+    def _view(self, name, club_id=None):
+        """NumPy view of a column (or one club's rows of it)"""
+        start, stop = (0, len(self.player_ids)) if club_id is None else self.rows(club_id)
+        return np.asarray(self._columns[name])[start:stop]
+
+    def group_means(self, group, club_id):
+        """Per-player mean of an attribute group, for players rated in it"""
+        if np is not None:
+            sums = self._view(f'{group}.sum', club_id)
+            counts = self._view(f'{group}.count', club_id)
+            rated = counts > 0
+            return (sums[rated] / counts[rated]).tolist()
+        sums = self.column(f'{group}.sum', club_id)
+        counts = self.column(f'{group}.count', club_id)
+        return [total / count for total, count in zip(sums, counts) if count]
+
+    def mean_rating(self, club_id, cap=None):
+        """Average player rating of a squad (None if nobody is rated)
+
+        Explicit 'overall' values are used as is; other players are rated by
+        their technical attribute average, capped at cap.
+        """
+        start, stop = self.rows(club_id)
+        if start == stop:
+            return None
+        if np is not None:
+            explicit = (self._view('flags', club_id) & FLAG_OVERALL) != 0
+            counts = self._view('technical_attributes.count', club_id)
+            derived = ~explicit & (counts > 0)
+            rated = int(explicit.sum()) + int(derived.sum())
+            if not rated:
+                return None
+            ratings = self._view('technical_attributes.sum', club_id)[derived] / counts[derived]
+            if cap is not None:
+                ratings = np.minimum(ratings, cap)
+            return (int(self._view('overall_rating', club_id)[explicit].sum()) + float(ratings.sum())) / rated
+
+        flags = self._columns['flags']
+        overall = self._columns['overall_rating']
+        sums = self._columns['technical_attributes.sum']
+        counts = self._columns['technical_attributes.count']
+        ratings = []
+        for row in range(start, stop):
+            if flags[row] & FLAG_OVERALL:
+                ratings.append(overall[row])
+            elif counts[row]:
+                rating = sums[row] / counts[row]
+                ratings.append(rating if cap is None else min(rating, cap))
+        if not ratings:
+            return None
+        return sum(ratings) / len(ratings)
+
+    def mean(self, name, club_id=None, skip_zero=True):
+        """Mean of a column over a squad (or the whole table); None if empty"""
+        if np is not None:
+            values = self._view(name, club_id)
+            if skip_zero:
+                values = values[values != 0]
+            return float(values.mean()) if len(values) else None
+        values = self.column(name, club_id)
+        if skip_zero:
+            values = [value for value in values if value]
+        if not len(values):
+            return None
+        return sum(values) / len(values)
+
+    def total(self, name, club_id=None):
+        if np is not None:
+            return int(self._view(name, club_id).sum(dtype=np.int64))
+        return sum(self.column(name, club_id))
+
+    def count_position(self, code, club_id=None, secondary=False):
+        """Players listing a position (primary, or primary + secondary)"""
+        bit = self.position_bits.get(code)
+        if bit is None:
+            return 0
+        if np is not None:
+            masks = self._view('positions_primary', club_id)
+            if secondary:
+                masks = masks | self._view('positions_secondary', club_id)
+            return int(np.count_nonzero(masks & np.uint64(bit)))
+        primary = self.column('positions_primary', club_id)
+        if not secondary:
+            return sum(1 for mask in primary if mask & bit)
+        other = self.column('positions_secondary', club_id)
+        return sum(1 for mask, extra in zip(primary, other) if (mask | extra) & bit)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Poisson Model
+Closed-form match odds: Poisson goals with the Dixon-Coles low-score correction
+
+The simulators draw goals as max(0, int(normal(expected, spread))). That
+truncation pulls the mean scoreline below the expected goals, and a
+result's probability can only be estimated by sampling. Here each side's
+goals are Poisson with the expected goals of the same match models
+(match_engine), so every probability is a sum of known terms:
+
+    home_rate, away_rate = goal_rates(home_strength, away_strength)
+    outcome_probabilities(home_rate, away_rate)       # (home win, draw, away win)
+    score_probability(1, 1, home_rate, away_rate)     # one correct score
+    scoreline_probabilities(home_rate, away_rate)     # [home goals][away goals]
+    expected_league_table(strengths)                  # expected points etc. per club
+
+Independent Poisson goals underrate 0-0 and 1-1. Dixon and Coles (1997)
+scale the four scores 0-0, 0-1, 1-0 and 1-1 by a factor tau(rho). The
+scaling moves probability between those scores and keeps the total at 1.
+rho < 0 makes low-scoring draws more likely. Distributions are cut once
+less than TAIL_MASS of probability is left, so the results are exact to
+about 1e-12.
+
+    python poisson_model.py    # odds by strength gap, against the sampled model
+"""
+
+import math
+import random
+
+from match_engine import DOMESTIC_MATCH_MODEL
+from standings import DEFAULT_POINTS
+
+# Dixon-Coles correlation; negative values favour 0-0 and 1-1
+DIXON_COLES_RHO = -0.1
+
+# Probability left out when a goal distribution is cut off
+TAIL_MASS = 1e-12
+
+
+def goal_rates(home_strength, away_strength, model=DOMESTIC_MATCH_MODEL):
+    """(home, away) expected goals of a match model (the mean of the old normal draws)"""
+    diff = (home_strength * model['home_factor'] + model['home_bonus'] - away_strength) / model['divisor']
+    return (max(model['min_expected'], model['home_base'] + diff),
+            max(model['min_expected'], model['away_base'] - diff))
+
+
+def goal_distribution(rate):
+    """Poisson probabilities of 0, 1, 2, ... goals, until less than TAIL_MASS is left"""
+    probability = math.exp(-rate)
+    pmf = [probability]
+    remaining = 1.0 - probability
+    goals = 0
+    while remaining > TAIL_MASS and (goals < rate or probability > 0):
+        goals += 1
+        probability *= rate / goals
+        pmf.append(probability)
+        remaining -= probability
+    return pmf
+
+
+def _valid_rho(home_rate, away_rate, rho):
+    """rho clamped to the range where every Dixon-Coles factor stays >= 0"""
+    low = max(-1.0 / home_rate, -1.0 / away_rate)
+    high = min(1.0 / (home_rate * away_rate), 1.0)
+    return min(max(rho, low), high)
+
+
+def dixon_coles_factor(home_goals, away_goals, home_rate, away_rate, rho=DIXON_COLES_RHO):
+    """tau: the Dixon-Coles multiplier of one score's independent-Poisson probability"""
+    rho = _valid_rho(home_rate, away_rate, rho)
+    if home_goals == 0 and away_goals == 0:
+        return 1.0 - home_rate * away_rate * rho
+    if home_goals == 0 and away_goals == 1:
+        return 1.0 + home_rate * rho
+    if home_goals == 1 and away_goals == 0:
+        return 1.0 + away_rate * rho
+    if home_goals == 1 and away_goals == 1:
+        return 1.0 - rho
+    return 1.0
+
+
+def score_probability(home_goals, away_goals, home_rate, away_rate, rho=DIXON_COLES_RHO):
+    """Probability of one exact score"""
+    if home_goals < 0 or away_goals < 0:
+        return 0.0
+    independent = (math.exp(-home_rate) * home_rate ** home_goals / math.factorial(home_goals)
+                   * math.exp(-away_rate) * away_rate ** away_goals / math.factorial(away_goals))
+    return independent * dixon_coles_factor(home_goals, away_goals, home_rate, away_rate, rho)
+
+
+def scoreline_probabilities(home_rate, away_rate, rho=DIXON_COLES_RHO):
+    """Matrix of score probabilities: [home goals][away goals]"""
+    home_pmf = goal_distribution(home_rate)
+    away_pmf = goal_distribution(away_rate)
+    matrix = [[home_p * away_p for away_p in away_pmf] for home_p in home_pmf]
+    for home_goals in (0, 1):
+        for away_goals in (0, 1):
+            if home_goals < len(home_pmf) and away_goals < len(away_pmf):
+                matrix[home_goals][away_goals] *= dixon_coles_factor(home_goals, away_goals, home_rate, away_rate, rho)
+    return matrix
+
+
+def outcome_probabilities(home_rate, away_rate, rho=DIXON_COLES_RHO):
+    """(home win, draw, away win) probabilities, without building the score matrix"""
+    home_pmf = goal_distribution(home_rate)
+    away_pmf = goal_distribution(away_rate)
+
+    draw = sum(home_p * away_p for home_p, away_p in zip(home_pmf, away_pmf))
+    home_win = 0.0
+    below = 0.0   # P(away goals < home goals)
+    for goals, home_p in enumerate(home_pmf):
+        if goals:
+            below += away_pmf[goals - 1] if goals - 1 < len(away_pmf) else 0.0
+        home_win += home_p * below
+    away_win = 1.0 - home_win - draw
+
+    # Dixon-Coles moves probability between 0-0/1-1 (draws), 1-0 and 0-1
+    rho = _valid_rho(home_rate, away_rate, rho)
+    p00 = math.exp(-home_rate - away_rate)
+    draw += p00 * (-home_rate * away_rate * rho) + p00 * home_rate * away_rate * (-rho)
+    home_win += p00 * home_rate * (away_rate * rho)
+    away_win += p00 * away_rate * (home_rate * rho)
+    return home_win, draw, away_win
+
+
+def expected_points(home_rate, away_rate, rho=DIXON_COLES_RHO, points=DEFAULT_POINTS):
+    """(home, away) expected points of a match; points = (win, draw, loss)"""
+    home_win, draw, away_win = outcome_probabilities(home_rate, away_rate, rho)
+    win_points, draw_points, loss_points = points
+    return (home_win * win_points + draw * draw_points + away_win * loss_points,
+            away_win * win_points + draw * draw_points + home_win * loss_points)
+
+
+def expected_league_table(strengths, fixtures=None, model=DOMESTIC_MATCH_MODEL, rho=DIXON_COLES_RHO,
+                          points=DEFAULT_POINTS):
+    """Expected totals per club over a fixture list, without any sampling
+
+    strengths: one strength per club; fixtures: (home_index, away_index)
+    pairs (default: double round-robin). Returns one dict per club, in club
+    order, with expected points, wins, draws, losses, goals_for and
+    goals_against.
+    """
+    n_clubs = len(strengths)
+    if fixtures is None:
+        fixtures = [(home, away) for home in range(n_clubs) for away in range(n_clubs) if home != away]
+    win_points, draw_points, loss_points = points
+    rows = [dict.fromkeys(('points', 'wins', 'draws', 'losses', 'goals_for', 'goals_against'), 0.0)
+            for _ in range(n_clubs)]
+
+    for home, away in fixtures:
+        home_rate, away_rate = goal_rates(strengths[home], strengths[away], model)
+        home_win, draw, away_win = outcome_probabilities(home_rate, away_rate, rho)
+        for club, won, lost, scored, conceded in ((home, home_win, away_win, home_rate, away_rate),
+                                                  (away, away_win, home_win, away_rate, home_rate)):
+            row = rows[club]
+            row['points'] += won * win_points + draw * draw_points + lost * loss_points
+            row['wins'] += won
+            row['draws'] += draw
+            row['losses'] += lost
+            # Dixon-Coles moves as much probability onto 1-1 as off 1-0 / 0-1: expected goals stay the rates
+            row['goals_for'] += scored
+            row['goals_against'] += conceded
+    return rows
+
+
+def main():
+    """Closed-form odds against 100,000 sampled matches of the truncated-normal model"""
+    rng = random.Random(1)
+    samples = 100000
+    model = DOMESTIC_MATCH_MODEL
+    print(f"⚽ Poisson / Dixon-Coles odds (rho={DIXON_COLES_RHO}) against the sampled normal model")
+    print(f"{'Gap':>5} {'xG':>11} | {'Home':>6} {'Draw':>6} {'Away':>6} | "
+          f"{'sampled':>7} {'goals':>11}")
+    for gap in (-20, -10, 0, 10, 20):
+        home_rate, away_rate = goal_rates(75 + gap, 75, model)
+        home_win, draw, away_win = outcome_probabilities(home_rate, away_rate)
+        sampled = [0, 0, 0]
+        home_total = away_total = 0
+        for _ in range(samples):
+            home_goals = max(0, int(rng.normalvariate(home_rate, model['spread'])))
+            away_goals = max(0, int(rng.normalvariate(away_rate, model['spread'])))
+            home_total += home_goals
+            away_total += away_goals
+            sampled[0 if home_goals > away_goals else 1 if home_goals == away_goals else 2] += 1
+        print(f"{gap:>+5} {home_rate:5.2f}-{away_rate:<5.2f} | {home_win:6.1%} {draw:6.1%} {away_win:6.1%} | "
+              f"{sampled[0] / samples:6.1%}/{sampled[1] / samples:.1%}/{sampled[2] / samples:.1%} "
+              f"{home_total / samples:5.2f}-{away_total / samples:<5.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Profiler
+Phase timers, counters and a --profile mode for every simulator
+
+A slow run used to give no hint of where the time went: loading,
+fixtures, matches, lineups or CSV export. The simulators now mark their
+phases with lightweight timers:
+
+    @phase('fixtures')
+    def generate_league_phase_fixtures(teams, rng=random): ...
+
+    with phase('export', 'io', file=csv_filename):
+        ...
+    count('matches', len(fixtures))
+
+Timers and counters cost one flag check until profiling is switched on.
+The --profile flag of each entry point switches them on and runs the
+entry point under cProfile:
+
+    with profiling(sys.argv[1:]):
+        main()
+
+When the run ends it prints the hot spots (cProfile, sorted by cumulative
+time, main process only) and the time spent per phase. It also writes
+profile.prof (for pstats / snakeviz) and profile_trace.json, a Chrome
+trace-event timeline that opens in chrome://tracing or
+https://ui.perfetto.dev. --profile=NAME changes the file prefix.
+
+Worker processes keep their own spans. parallel_leagues hands them back
+with each league's result (drain() in the worker, merge() in the parent),
+so the timeline shows one track per process.
+
+    python profiler.py [--profile=NAME] script.py [script args]    # profile any script
+"""
+
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Functions listed in the hot-spot report
+PROFILE_TOP = 25
+
+# File prefix of the .prof and _trace.json output
+DEFAULT_PROFILE_NAME = 'profile'
+
+_enabled = False
+_origin = time.perf_counter()
+_spans = []                      # (name, category, start, duration, pid, tid, args)
+_counters = defaultdict(int)
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    """Start recording phases and counters (from an empty record)"""
+    global _enabled, _origin
+    reset()
+    _origin = time.perf_counter()
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Forget everything recorded in this process (a forked worker starts with its parent's record)"""
+    _spans.clear()
+    _counters.clear()
+
+
+class phase:
+    """Timed span: a context manager, or a decorator that times every call"""
+
+    __slots__ = ('name', 'category', 'args', 'start')
+
+    def __init__(self, name, category='phase', **args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        if _enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.start is not None:
+            end = time.perf_counter()
+            _spans.append((self.name, self.category, self.start - _origin, end - self.start,
+                           os.getpid(), threading.get_native_id(), self.args))
+            self.start = None
+        return False
+
+    def __call__(self, func):
+        name, category, args = self.name, self.category, self.args
+
+        @functools.wraps(func)
+        def timed(*call_args, **call_kwargs):
+            if not _enabled:
+                return func(*call_args, **call_kwargs)
+            with phase(name, category, **args):
+                return func(*call_args, **call_kwargs)
+        return timed
+
+
+def count(name, value=1):
+    """Add to a named counter (matches played, lineups built, rows written, ...)"""
+    if _enabled:
+        _counters[name] += value
+
+
+def drain():
+    """This process's spans and counters, cleared afterwards (workers return this to the parent)"""
+    if not _enabled:
+        return None
+    record = (list(_spans), dict(_counters))
+    reset()
+    return record
+
+
+def merge(record):
+    """Add a worker's drain() to this process's record"""
+    if not record:
+        return
+    spans, counters = record
+    _spans.extend(spans)
+    for name, value in counters.items():
+        _counters[name] += value
+
+
+def phase_summary():
+    """[(name, calls, total seconds)] over every process, most time first"""
+    totals = defaultdict(lambda: [0, 0.0])
+    for name, _category, _start, duration, _pid, _tid, _args in _spans:
+        totals[name][0] += 1
+        totals[name][1] += duration
+    return sorted(((name, calls, total) for name, (calls, total) in totals.items()),
+                  key=lambda row: row[2], reverse=True)
+
+
+def trace_events():
+    """Chrome trace-event list: one complete ("X") event per span, plus process names"""
+    main_pid = os.getpid()
+    events = []
+    for pid in sorted({span[4] for span in _spans} | {main_pid}):
+        label = 'main' if pid == main_pid else f'worker {pid}'
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': label}})
+    for name, category, start, duration, pid, tid, args in _spans:
+        events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': round(start * 1e6, 3),
+                       'dur': round(duration * 1e6, 3), 'pid': pid, 'tid': tid,
+                       'args': {key: str(value) for key, value in args.items()}})
+    return events
+
+
+def write_trace(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events(), 'displayTimeUnit': 'ms',
+                   'otherData': {'counters': dict(_counters)}}, f)
+
+
+def report(profile, top=PROFILE_TOP, stream=None):
+    """Print the cProfile hot spots, the phase totals and the counters"""
+    stream = stream or sys.stdout
+    text = io.StringIO()
+    stats = pstats.Stats(profile, stream=text)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(top)
+    print(f"\n🔥 Hot spots (top {top} by cumulative time)", file=stream)
+    print(text.getvalue().strip('\n'), file=stream)
+
+    summary = phase_summary()
+    if summary:
+        print("\n⏱️  Phases (all processes)", file=stream)
+        print(f"  {'Phase':<32} {'Calls':>7} {'Total s':>10} {'Mean ms':>10}", file=stream)
+        for name, calls, total in summary:
+            print(f"  {name:<32} {calls:>7} {total:>10.3f} {total / calls * 1000:>10.2f}", file=stream)
+    if _counters:
+        print("\n🔢 Counters", file=stream)
+        for name, value in sorted(_counters.items()):
+            print(f"  {name:<32} {value:>10,}", file=stream)
+
+
+def profile_name(argv):
+    """File prefix from --profile[=NAME], or None when profiling is off"""
+    for arg in argv:
+        if arg == '--profile':
+            return DEFAULT_PROFILE_NAME
+        if arg.startswith('--profile='):
+            return arg.split('=', 1)[1] or DEFAULT_PROFILE_NAME
+    return None
+
+
+@contextmanager
+def profiling(argv):
+    """Run the block under cProfile and phase recording if argv has --profile[=NAME]"""
+    name = profile_name(argv)
+    if name is None:
+        yield
+        return
+
+    enable()
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        disable()
+        report(profile)
+        profile.dump_stats(f"{name}.prof")
+        write_trace(f"{name}_trace.json")
+        print(f"\n📁 Profile written to {name}.prof, timeline to {name}_trace.json "
+              f"(open in chrome://tracing or ui.perfetto.dev)")
+
+
+def main():
+    """Profile any script: python profiler.py [--profile=NAME] script.py [args]"""
+    import runpy
+
+    args = sys.argv[1:]
+    options = []
+    while args and args[0].startswith('--profile'):
+        options.append(args.pop(0))
+    if not args:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+
+    sys.argv = args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args[0])))
+    # Run as a script this module is __main__: use the copy the simulators import
+    import profiler
+    with profiler.profiling(options or ['--profile']):
+        runpy.run_path(args[0], run_name='__main__')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
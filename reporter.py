@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Reporter
+Pluggable output for the simulators
+
+Simulators no longer print directly; they hand their output to a reporter:
+
+    ConsoleReporter()        the usual emoji console output (default)
+    JsonLinesReporter(path)  one JSON object per event, no text formatting
+    NullReporter()           headless: drops everything
+
+Text is only built when the reporter wants it. message() takes print()'s
+arguments, debug() takes a format template and its arguments (formatted
+only when debug output is on), and league tables are handed over as rows
+with the simulator's display method as the renderer:
+
+    reporter.league_table(league_id, league_name, table, self.display_league_table)
+
+Hot loops check reporter.wants_text before building any strings.
+"""
+
+import copy
+import json
+import sys
+
+
+class Reporter:
+    """Reporter interface; every method is a no-op"""
+
+    # True if message()/league_table() output is rendered as text
+    wants_text = False
+
+    def message(self, *values, sep=' ', end='\n'):
+        """Free-form console text (print() arguments)"""
+
+    def debug(self, template, *args):
+        """Diagnostic text: template.format(*args), only built when shown"""
+
+    def progress(self, done, total, label='matches'):
+        """Progress through a long loop"""
+
+    def league_table(self, league_id, league_name, table, render=None):
+        """Final table of a league (list of row dicts); render(table, league_id, league_name) prints it"""
+
+    def event(self, kind, **data):
+        """Structured record (season finished, winner, ...)"""
+
+    def write(self, text):
+        """Raw output produced elsewhere (e.g. captured in a worker process)"""
+
+    def redirect(self, stream):
+        """Copy of this reporter that writes to stream"""
+        return self
+
+    def close(self):
+        pass
+
+
+class NullReporter(Reporter):
+    """Discards all output (headless runs, forecasts, benchmarks)"""
+
+
+class ConsoleReporter(Reporter):
+    """Prints to stdout (or stream) like the simulators always have"""
+
+    wants_text = True
+
+    def __init__(self, stream=None, debug=False, progress_every=100):
+        self.stream = stream
+        self.show_debug = debug
+        self.progress_every = progress_every
+
+    def _out(self):
+        # Looked up on every call so redirect_stdout() keeps working
+        return self.stream or sys.stdout
+
+    def message(self, *values, sep=' ', end='\n'):
+        print(*values, sep=sep, end=end, file=self._out())
+
+    def debug(self, template, *args):
+        if self.show_debug:
+            print("DEBUG: " + (template.format(*args) if args else template), file=self._out())
+
+    def progress(self, done, total, label='matches'):
+        if done and self.progress_every and done % self.progress_every == 0:
+            print(f"  Progress: {done}/{total} {label}", file=self._out())
+
+    def league_table(self, league_id, league_name, table, render=None):
+        if render is not None:
+            render(table, league_id, league_name)
+            return
+        print(f"\n📊 {league_name}", file=self._out())
+        for row in table:
+            print(f"{row.get('position', ''):<3} {row.get('club_name', '')[:25]:<25} {row.get('points', 0)}",
+                  file=self._out())
+
+    def write(self, text):
+        self._out().write(text)
+
+    def redirect(self, stream):
+        reporter = copy.copy(self)
+        reporter.stream = stream
+        return reporter
+
+
+class JsonLinesReporter(Reporter):
+    """Writes events and league tables as JSON lines, skips console text
+
+    Args:
+        target: file path or writable text stream (defaults to stdout)
+        debug (bool): also record debug() lines
+    """
+
+    def __init__(self, target=None, debug=False):
+        self._owns_stream = isinstance(target, str)
+        self.stream = open(target, 'a', encoding='utf-8') if self._owns_stream else target
+        self.show_debug = debug
+
+    def _out(self):
+        return self.stream or sys.stdout
+
+    def event(self, kind, **data):
+        record = {'event': kind}
+        record.update(data)
+        self._out().write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def debug(self, template, *args):
+        if self.show_debug:
+            self.event('debug', text=template.format(*args) if args else template)
+
+    def league_table(self, league_id, league_name, table, render=None):
+        self.event('league_table', league_id=league_id, league_name=league_name, table=table)
+
+    def write(self, text):
+        self._out().write(text)
+
+    def redirect(self, stream):
+        reporter = copy.copy(self)
+        reporter.stream = stream
+        reporter._owns_stream = False
+        return reporter
+
+    def close(self):
+        if self._owns_stream and self.stream:
+            self.stream.close()
+            self.stream = None
+
+
+def create_reporter(argv):
+    """Reporter chosen by command-line flags: --quiet, --jsonl[=path], --debug"""
+    debug = "--debug" in argv
+    for arg in argv:
+        if arg == "--quiet":
+            return NullReporter()
+        if arg == "--jsonl" or arg.startswith("--jsonl="):
+            return JsonLinesReporter(arg.split("=", 1)[1] if "=" in arg else None, debug=debug)
+    return ConsoleReporter(debug=debug)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Result Sink
+Streaming, optionally compressed output for table and match rows
+
+export_to_csv() writes a season's files only after every league is
+played. Until then every match is held in lists, and the files are
+reopened and their headers rewritten each season, so long runs grow
+without bound. A ResultSink stays open for the whole run and takes rows
+as they are produced:
+
+    with ResultSink('seasons.jsonl.gz', background=True) as sink:
+        simulator.run_seasons(100, seed=7, sink=sink)
+
+    sink.write('winner', row)                                    # one row
+    sink.write_rows('match', match_rows(season, league, matches))   # any iterable / generator
+
+The format follows the file name:
+    .jsonl  one JSON object per row, with its type in a "type" field
+    .csv    one file per row type, <stem>_<type>.csv, header written once
+A .gz suffix adds gzip compression to either.
+
+The league simulators take the sink from the command line:
+
+    python multi_league_simulator.py --results=seasons.csv.gz --seasons=50 --writer-thread
+
+With background=True the rows go through a bounded queue to a writer
+thread, so encoding, compression and disk writes overlap with simulating
+the next league or season. The producer waits when the queue is full, so
+memory stays flat however long the run.
+"""
+
+import csv
+import gzip
+import json
+import queue
+import threading
+
+# Rows per batch handed to the writer thread, and batches allowed in flight
+BATCH_ROWS = 512
+QUEUE_BATCHES = 4
+
+# zlib level for .gz output (9 is barely smaller and several times slower)
+GZIP_LEVEL = 6
+
+TABLE_FIELDS = ['Season', 'League', 'Position', 'Club', 'Matches', 'Wins', 'Draws', 'Losses',
+                'Goals_For', 'Goals_Against', 'Goal_Difference', 'Points']
+MATCH_FIELDS = ['Season', 'League', 'Matchday', 'Home_Team', 'Away_Team', 'Home_Goals', 'Away_Goals']
+
+
+def table_rows(season, league_name, table):
+    """One row per club of a final table (the multi_league_results.csv columns)"""
+    for club in table:
+        yield {
+            'Season': season,
+            'League': league_name,
+            'Position': club['position'],
+            'Club': club['club_name'],
+            'Matches': club['matches'],
+            'Wins': club['wins'],
+            'Draws': club['draws'],
+            'Losses': club['losses'],
+            'Goals_For': club['goals_for'],
+            'Goals_Against': club['goals_against'],
+            'Goal_Difference': club['goal_difference'],
+            'Points': club['points']
+        }
+
+
+def match_rows(season, league_name, matches):
+    """One row per played match"""
+    for match in matches:
+        yield {
+            'Season': season,
+            'League': league_name,
+            'Matchday': match.get('matchday'),
+            'Home_Team': match['home_team'],
+            'Away_Team': match['away_team'],
+            'Home_Goals': match['home_goals'],
+            'Away_Goals': match['away_goals']
+        }
+
+
+def season_rows(season, rows):
+    """rows with a leading Season column (for per-season files that lack one)"""
+    for row in rows:
+        yield {'Season': season, **row}
+
+
+def _open_text(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', compresslevel=GZIP_LEVEL, encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+class _JsonLinesWriter:
+    """Every row type in one file, tagged with "type\""""
+
+    def __init__(self, path, compress):
+        self.paths = [path]
+        self.file = _open_text(path, compress)
+
+    def write(self, rows):
+        write = self.file.write
+        dumps = json.dumps
+        for kind, row in rows:
+            write(dumps({'type': kind, **row}, ensure_ascii=False))
+            write('\n')
+
+    def close(self):
+        self.file.close()
+
+
+class _CsvWriter:
+    """One CSV file per row type, columns from its first row"""
+
+    def __init__(self, path, compress):
+        self.compress = compress
+        self.stem = path[:-len('.csv.gz')] if compress else path[:-len('.csv')]
+        self.paths = []
+        self.files = {}
+        self.writers = {}
+
+    def _writer(self, kind, row):
+        path = f"{self.stem}_{kind}.csv" + ('.gz' if self.compress else '')
+        f = self.files[kind] = _open_text(path, self.compress)
+        writer = self.writers[kind] = csv.DictWriter(f, fieldnames=list(row))
+        writer.writeheader()
+        self.paths.append(path)
+        return writer
+
+    def write(self, rows):
+        writers = self.writers
+        for kind, row in rows:
+            writer = writers.get(kind) or self._writer(kind, row)
+            writer.writerow(row)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+class ResultSink:
+    """Rows to a .jsonl / .csv file (optionally .gz), written as they arrive"""
+
+    def __init__(self, path, background=False):
+        name = path.lower()
+        compress = name.endswith('.gz')
+        if compress:
+            name = name[:-3]
+        if name.endswith('.jsonl'):
+            self._writer = _JsonLinesWriter(path, compress)
+        elif name.endswith('.csv'):
+            self._writer = _CsvWriter(path, compress)
+        else:
+            raise ValueError(f"Result file must end in .jsonl, .csv, .jsonl.gz or .csv.gz: {path}")
+        self.path = path
+        self.rows_written = 0
+        self._batch = []
+        self._error = None
+        self._queue = None
+        self._thread = None
+        if background:
+            self._queue = queue.Queue(maxsize=QUEUE_BATCHES)
+            self._thread = threading.Thread(target=self._drain, name='result-sink', daemon=True)
+            self._thread.start()
+
+    @property
+    def paths(self):
+        """Files written so far (a CSV sink opens one per row type)"""
+        return list(self._writer.paths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def _drain(self):
+        # Writer thread: keep taking batches (even after an error, so the producer never blocks forever)
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            if self._error is None:
+                try:
+                    self._writer.write(batch)
+                except Exception as error:
+                    self._error = error
+
+    def _check(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _flush(self):
+        batch, self._batch = self._batch, []
+        if self._queue is not None:
+            self._queue.put(batch)
+        else:
+            self._writer.write(batch)
+
+    def write(self, kind, row):
+        """One row of type kind ('table', 'match', 'winner', ...)"""
+        self._batch.append((kind, row))
+        self.rows_written += 1
+        if len(self._batch) >= BATCH_ROWS:
+            self._check()
+            self._flush()
+
+    def write_rows(self, kind, rows):
+        """Every row of an iterable, consumed lazily"""
+        for row in rows:
+            self.write(kind, row)
+
+    def close(self):
+        """Write what is left, stop the writer thread and close the files"""
+        try:
+            if self._batch:
+                self._flush()
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+        finally:
+            self._writer.close()
+        self._check()
+
+    def describe(self):
+        return f"{self.rows_written:,} rows to {', '.join(self.paths) or self.path}"
+
+
+def open_sink(argv):
+    """ResultSink for --results=PATH (--writer-thread writes in the background), or None"""
+    for arg in argv:
+        if arg.startswith('--results='):
+            return ResultSink(arg.split('=', 1)[1], background='--writer-thread' in argv)
+    return None
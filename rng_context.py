@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+RNG Context
+Seeded, splittable random streams
+
+Every simulator used to draw from the global random module, so a run
+could only be reproduced if everything happened in exactly the same
+order in one process. An RNGContext is a seeded stream that can be split
+into child streams by key, in the spirit of NumPy's SeedSequence.spawn():
+
+    rng = RNGContext(seed=2025)
+    league_rng = rng.league('00_1')          # per league
+    ucl_rng = rng.competition('UCL')         # per competition
+    match_rng = ucl_rng.match(home_id, away_id, 'league_phase')   # per match
+
+A child's seed is a hash of the root seed and its key path, so it does not
+depend on how many draws or other spawns happened before it. Workers can
+rebuild any substream from (seed, key) without sharing state or locks,
+and a parallel run draws the same numbers as a serial one.
+
+RNGContext has the random module's drawing methods (random, uniform,
+randint, choice, choices, sample, shuffle, gauss, normalvariate,
+getrandbits), so simulation code takes an `rng` argument that defaults to
+the random module itself. substream(rng, ...) spawns a child when rng is a
+context and returns rng unchanged otherwise, keeping unseeded runs on the
+global random stream exactly as before.
+"""
+
+import hashlib
+import random
+
+
+class RNGContext:
+    """Seeded random stream with keyed child streams"""
+
+    def __init__(self, seed=None, key=()):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.key = tuple(key)
+        self._random = random.Random(self._derive_seed())
+
+        # Drawing methods of the underlying stream (bound once, no per-call indirection)
+        stream = self._random
+        self.random = stream.random
+        self.uniform = stream.uniform
+        self.randint = stream.randint
+        self.randrange = stream.randrange
+        self.choice = stream.choice
+        self.choices = stream.choices
+        self.sample = stream.sample
+        self.shuffle = stream.shuffle
+        self.gauss = stream.gauss
+        self.normalvariate = stream.normalvariate
+        self.getrandbits = stream.getrandbits
+
+    def _derive_seed(self):
+        if not self.key:
+            return self.seed
+        path = repr((self.seed,) + self.key).encode('utf-8')
+        return int.from_bytes(hashlib.sha256(path).digest()[:16], 'big')
+
+    def __repr__(self):
+        return f"RNGContext(seed={self.seed!r}, key={self.key!r})"
+
+    # --- Splitting -------------------------------------------------------
+
+    def spawn(self, *key):
+        """Independent child stream identified by key (same key -> same stream)"""
+        return RNGContext(self.seed, self.key + key)
+
+    def league(self, league_id):
+        return self.spawn('league', league_id)
+
+    def competition(self, name):
+        return self.spawn('competition', name)
+
+    def match(self, *key):
+        """Stream for one match, e.g. match(home_id, away_id, phase)"""
+        return self.spawn('match', *key)
+
+
+def substream(rng, *key):
+    """rng.spawn(*key) for an RNGContext; other generators are returned as is"""
+    if isinstance(rng, RNGContext):
+        return rng.spawn(*key)
+    return rng
+
+
+def make_rng(seed=None):
+    """RNGContext for a seed, or the global random module when seed is None"""
+    return random if seed is None else RNGContext(seed)
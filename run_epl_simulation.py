@@ -7,10 +7,10 @@ from multi_league_simulator import MultiLeagueSimulator
 print("🏴󠁧󠁢󠁥󠁮󠁧󠁿 Running EPL Season Simulation")
 
 # Create EPL-only simulator
-simulator = MultiLeagueSimulator(['league_epl'])
+simulator = MultiLeagueSimulator(['00_1'])
 
 # Simulate EPL season
-league_id = 'league_epl'
+league_id = '00_1'
 result = simulator.simulate_league_season(league_id)
 
 if result:
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Season Forecast
+Monte Carlo finishing-position probabilities for a league
+
+Instead of one sampled table, a forecast plays the same season thousands
+of times (no printing, no CSV export) and counts where every club
+finishes:
+
+    forecast = simulator.forecast_league('00_1', seasons=10000)
+    forecast['clubs'][0]['title']          # probability of finishing 1st
+    forecast['clubs'][0]['histogram']      # finishes per position
+
+Seasons are split into fixed-size blocks, each with its own seed derived
+from the forecast seed, so the result only depends on the seed and the
+number of seasons, not on the number of workers. Consecutive blocks are
+grouped into one task per worker (never less than MIN_TASK_SEASONS), so
+each process is started and fed once and the throughput grows with the
+number of cores.
+With NumPy a whole block of seasons is simulated in a few array
+operations (match_engine); without it every season is played in Python.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from match_engine import simulate_matches_batch, aggregate_table, default_rng, np, DOMESTIC_MATCH_MODEL
+from standings import StandingsTable, DEFAULT_TIE_BREAKERS
+
+# Seasons per random stream (fixed, so seeded results do not depend on the workers)
+BLOCK_SEASONS = 500
+
+# Fewest seasons worth a task of their own (smaller runs use fewer workers)
+MIN_TASK_SEASONS = 2000
+
+# Tie-breakers the NumPy path ranks with lexsort (head-to-head is resolved
+# per season for the few seasons that need it)
+NUMPY_TIE_BREAKERS = ('goal_difference', 'goals_for', 'wins')
+
+# Used when leagues.json has neither <comp>_qualification_spots nor an
+# automatic_spots entry for the league in the competition's table
+DEFAULT_UCL_SPOTS = 0
+DEFAULT_UEL_SPOTS = 0
+
+
+def qualification_spots(repository, league_id):
+    """(ucl_spots, uel_spots, relegation_spots) for a league
+
+    Explicit ucl_qualification_spots / uel_qualification_spots on the league
+    win; otherwise the automatic spots of the UCL/UEL entries are used.
+    """
+    league = repository.get_league(league_id) or {}
+    spots = []
+    for competition, key, default in (('competition_ucl', 'ucl_qualification_spots', DEFAULT_UCL_SPOTS),
+                                      ('competition_uel', 'uel_qualification_spots', DEFAULT_UEL_SPOTS)):
+        value = league.get(key)
+        if value is None:
+            value = default
+            criteria = (repository.get_league(competition) or {}).get('qualification_criteria', {})
+            for spot_league, count in criteria.get('automatic_spots', {}).items():
+                if repository.resolve_league_id(spot_league) == league_id:
+                    value = count
+                    break
+        spots.append(value)
+    spots.append(league.get('relegation_spots', 0))
+    return tuple(spots)
+
+
+def simulate_seasons(strengths, home_index, away_index, seasons, seed,
+                     model=DOMESTIC_MATCH_MODEL, noise=0, clamp=None, tie_breakers=DEFAULT_TIE_BREAKERS):
+    """Play a fixture list `seasons` times -> (position_counts, total_points)
+
+    position_counts[club][position] counts finishes (position 0 = champion),
+    total_points[club] sums the club's points over all seasons. Tables are
+    ordered like the simulators' (points, then the league's tie-breakers,
+    then club order).
+    """
+    n_clubs = len(strengths)
+    home_strength = [strengths[index] for index in home_index]
+    away_strength = [strengths[index] for index in away_index]
+    rng = default_rng(seed)
+    tie_breakers = tuple(tie_breakers)
+
+    table = StandingsTable(range(n_clubs), tie_breakers=tie_breakers)
+    packed = tie_breakers[:tie_breakers.index('head_to_head')] if 'head_to_head' in tie_breakers else tie_breakers
+
+    if np is not None and all(name in NUMPY_TIE_BREAKERS for name in packed):
+        n_matches = len(home_index)
+        offsets = np.repeat(np.arange(seasons) * n_clubs, n_matches)
+        home_goals, away_goals = simulate_matches_batch(
+            np.tile(home_strength, seasons), np.tile(away_strength, seasons), rng, model, noise, clamp)
+        totals = aggregate_table(seasons * n_clubs, np.tile(home_index, seasons) + offsets,
+                                 np.tile(away_index, seasons) + offsets, home_goals, away_goals)
+        columns = {name: totals[name].reshape(seasons, n_clubs) for name in ('points', 'goals_for', 'wins')}
+        columns['goal_difference'] = columns['goals_for'] - totals['goals_against'].reshape(seasons, n_clubs)
+        keys = [columns['points']] + [columns[name] for name in packed]
+        clubs = np.broadcast_to(np.arange(n_clubs), (seasons, n_clubs))
+        order = np.lexsort([clubs] + [-key for key in reversed(keys)], axis=-1)
+
+        if len(packed) < len(tie_breakers):
+            # Only seasons with clubs still level on every packed criterion
+            # need the head-to-head step; those are re-ranked one by one
+            ranked = np.take_along_axis(np.stack(keys, axis=-1), order[..., None], axis=1)
+            level = (ranked[:, 1:] == ranked[:, :-1]).all(axis=-1).any(axis=1)
+            home_goals = home_goals.reshape(seasons, n_matches)
+            away_goals = away_goals.reshape(seasons, n_matches)
+            for season in np.flatnonzero(level).tolist():
+                table.reset()
+                table.record_many(home_index, away_index, home_goals[season].tolist(), away_goals[season].tolist())
+                order[season] = table.ranking()
+
+        counts = np.bincount((order * n_clubs + np.arange(n_clubs)).ravel(), minlength=n_clubs * n_clubs)
+        return counts.reshape(n_clubs, n_clubs).tolist(), columns['points'].sum(axis=0).tolist()
+
+    # Without NumPy (or for tie-breakers it cannot rank, such as away goals)
+    # every season goes through the StandingsTable
+    position_counts = [[0] * n_clubs for _ in range(n_clubs)]
+    total_points = [0] * n_clubs
+    for _ in range(seasons):
+        home_goals, away_goals = simulate_matches_batch(home_strength, away_strength, rng, model, noise, clamp)
+        table.reset()
+        table.record_many(home_index, away_index, home_goals, away_goals)
+        points = table.points
+        for position, club in enumerate(table.ranking()):
+            position_counts[club][position] += 1
+            total_points[club] += points[club]
+    return position_counts, total_points
+
+
+def _merge(parts, n_clubs):
+    """Sum (position_counts, total_points) pairs"""
+    position_counts = [[0] * n_clubs for _ in range(n_clubs)]
+    total_points = [0] * n_clubs
+    for counts, points in parts:
+        for club in range(n_clubs):
+            total_points[club] += points[club]
+            row = position_counts[club]
+            for position, count in enumerate(counts[club]):
+                row[position] += count
+    return position_counts, total_points
+
+
+def _simulate_task(args):
+    """One worker's share: its blocks one after another, each on its own seed"""
+    strengths, home_index, away_index, blocks, model, noise, clamp, tie_breakers = args
+    return _merge([simulate_seasons(strengths, home_index, away_index, size, seed, model, noise, clamp, tie_breakers)
+                   for size, seed in blocks], len(strengths))
+
+
+def run_forecast(strengths, home_index, away_index, seasons, seed=None, workers=None,
+                 model=DOMESTIC_MATCH_MODEL, noise=0, clamp=None, tie_breakers=DEFAULT_TIE_BREAKERS):
+    """Play `seasons` seasons over a process pool and merge the counts
+
+    Returns (position_counts, total_points, elapsed_seconds).
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    seeder = random.Random(seed)
+    blocks = []
+    remaining = seasons
+    while remaining > 0:
+        size = min(BLOCK_SEASONS, remaining)
+        blocks.append((size, seeder.getrandbits(64)))
+        remaining -= size
+
+    # About seasons / workers per task, in whole blocks
+    workers = max(1, min(workers or os.cpu_count() or 1, seasons // MIN_TASK_SEASONS, len(blocks)))
+    per_task, extra = divmod(len(blocks), workers)
+    tasks = []
+    first = 0
+    for task in range(workers):
+        last = first + per_task + (1 if task < extra else 0)
+        tasks.append((strengths, home_index, away_index, blocks[first:last], model, noise, clamp, tie_breakers))
+        first = last
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_task, tasks))
+    else:
+        parts = [_simulate_task(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    position_counts, total_points = _merge(parts, len(strengths))
+    return position_counts, total_points, elapsed
+
+
+def summarize(clubs, position_counts, total_points, seasons, ucl_spots, uel_spots, relegation_spots):
+    """Per-club forecast rows, best expected finish first"""
+    n_clubs = len(clubs)
+    rows = []
+    for club, counts, points in zip(clubs, position_counts, total_points):
+        rows.append({
+            'club_id': club.get('id') or club.get('club_id'),
+            'club_name': club.get('name', 'Unknown'),
+            'expected_points': points / seasons,
+            'expected_position': sum(position * count for position, count in enumerate(counts, 1)) / seasons,
+            'histogram': counts,
+            'title': counts[0] / seasons,
+            'ucl': sum(counts[:ucl_spots]) / seasons,
+            'uel': sum(counts[ucl_spots:ucl_spots + uel_spots]) / seasons,
+            'relegation': sum(counts[n_clubs - relegation_spots:]) / seasons if relegation_spots else 0.0
+        })
+    rows.sort(key=lambda row: (row['expected_position'], -row['expected_points']))
+    return rows
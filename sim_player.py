@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Sim Player
+Slotted player records for the UCL and UEL simulators
+
+The tournament simulators kept every player as a 13-key dict with its own
+hash table and a 43-character uuid4 id string. A SimPlayer keeps the same
+fields in __slots__ with a small integer id (unique within the process),
+and interns its name, team and position strings, so players share one
+copy of each:
+
+    player = SimPlayer('Bellingham', 'club_real_madrid', 'Real Madrid', 'MID', 88, source_id='11_7811')
+    player.skill, player.goals                  # attribute access in the hot paths
+    player['skill'], player.get('real_data')    # dict-style access still works
+
+The dict-style access is for shared code that handles players from every
+simulator, e.g. StatsArena.export() and the lineup caches. The id from
+the data files is kept as source_id.
+
+    python sim_player.py    # memory and access speed against dicts over every club
+"""
+
+import itertools
+import sys
+import time
+import tracemalloc
+import uuid
+
+_player_ids = itertools.count(1)
+
+
+def intern_text(value):
+    """Interned str (non-strings pass through unchanged)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class SimPlayer:
+    """One player of a tournament run: identity, skill and the exported stats"""
+
+    __slots__ = ('id', 'source_id', 'name', 'team_id', 'team_name', 'position', 'original_position', 'skill',
+                 'real_data', 'goals', 'assists', 'matches_played', 'total_rating_points', 'clean_sheets',
+                 'avg_rating')
+
+    def __init__(self, name, team_id, team_name, position, skill, source_id=None, original_position=None,
+                 real_data=False):
+        self.id = next(_player_ids)
+        self.source_id = source_id
+        self.name = intern_text(name)
+        self.team_id = intern_text(team_id)
+        self.team_name = intern_text(team_name)
+        self.position = intern_text(position)
+        self.original_position = intern_text(original_position)
+        self.skill = skill
+        self.real_data = real_data
+        self.goals = 0
+        self.assists = 0
+        self.matches_played = 0
+        self.total_rating_points = 0.0
+        self.clean_sheets = 0
+        self.avg_rating = 0.0
+
+    def __repr__(self):
+        return f"SimPlayer({self.id}, {self.name!r}, {self.team_name!r}, {self.position}, skill={self.skill})"
+
+    # Dict-style access (StatsArena.export, lineup caches, older callers)
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+
+def _as_dict(player):
+    """The per-player dict the simulators used to build (same strings, uuid-style id)"""
+    return {
+        'id': f"player_{uuid.UUID(int=player.id)}",
+        'name': player.name,
+        'team_id': player.team_id,
+        'team_name': player.team_name,
+        'position': player.position,
+        'skill': player.skill,
+        'goals': 0,
+        'assists': 0,
+        'matches_played': 0,
+        'total_rating_points': 0.0,
+        'clean_sheets': 0,
+        'avg_rating': 0.0,
+        'real_data': True,
+    }
+
+
+def main():
+    """Memory and attribute-access speed: SimPlayer against dicts for every club's squad"""
+    from data_repository import get_repository
+
+    club_players = get_repository().club_players
+    club_players.complete()
+    squads = [(club_id, club_players[club_id]) for club_id in club_players]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [SimPlayer(data.get('known_as', data.get('full_name', 'Unknown Player')), f"club_{club_id}",
+                         f"Team {club_id}", 'MID', data.get('current_ability', 70), source_id=data.get('id'),
+                         real_data=True)
+               for club_id, squad in squads for data in squad]
+    slotted = tracemalloc.get_traced_memory()[0] - before
+    before = tracemalloc.get_traced_memory()[0]
+    dicts = [_as_dict(player) for player in records]
+    as_dicts = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"🧮 SimPlayer against dict records ({len(squads)} clubs, {len(records):,} players)")
+    print(f"   dict records:      {as_dicts / 1024:9,.0f} KiB ({as_dicts / len(records):5.0f} B/player)")
+    print(f"   SimPlayer records: {slotted / 1024:9,.0f} KiB ({slotted / len(records):5.0f} B/player)")
+
+    rounds = 20
+    start = time.perf_counter()
+    for _ in range(rounds):
+        total = 0
+        for player in dicts:
+            total += player['skill'] + player['goals'] + player['matches_played']
+    dict_rate = rounds * len(dicts) * 3 / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        total = 0
+        for player in records:
+            total += player.skill + player.goals + player.matches_played
+    slot_rate = rounds * len(records) * 3 / (time.perf_counter() - start)
+    print(f"   dict lookups:      {dict_rate:12,.0f} reads/s")
+    print(f"   slot attributes:   {slot_rate:12,.0f} reads/s ({slot_rate / dict_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
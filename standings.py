@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Standings
+Array-backed league table with incremental ranking and configurable tie-breakers
+
+The simulators used to keep a dict of dicts per club and sort the whole
+table at the end of every season. StandingsTable keeps one integer list
+per column, indexed by club position in the club list, so applying a
+result is a handful of list increments:
+
+    table = StandingsTable.for_league(league, clubs)
+    table.record(home_index, away_index, home_goals, away_goals)
+    table.end_matchday()          # re-rank (cheap: last order is nearly sorted)
+    table.rows()                  # [{'club_id', 'points', ..., 'position'}, ...]
+
+Ranking is points first, then the league's tie-breakers from leagues.json
+("tie_breakers", e.g. ["head_to_head", "goal_difference", "goals_for"]),
+then club-list order. Head-to-head compares the tied clubs in a mini-league
+of their matches against each other (points, goal difference, goals
+scored). Criteria before the first head-to-head step are packed into one
+integer per club, so a table without head-to-head sorts on plain ints, and
+the previous ranking is re-sorted in place, which timsort does in close to
+linear time when only one matchday changed.
+
+reset() zeroes the columns, so one table can be reused for every season
+of a Monte Carlo run.
+"""
+
+# Used when a league has no "tie_breakers" entry in leagues.json
+DEFAULT_TIE_BREAKERS = ('goal_difference', 'goals_for')
+
+# (win, draw, loss) points when leagues.json has no points_for_* entries
+DEFAULT_POINTS = (3, 1, 0)
+
+TIE_BREAKERS = ('goal_difference', 'goals_for', 'wins', 'away_goals_for', 'away_wins', 'head_to_head')
+
+# Packed sort keys: every criterion gets 2**20 values, centred on zero
+_KEY_BITS = 20
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+
+
+def tie_breakers_for(league):
+    """Tie-breakers configured for a league (leagues.json entry), or the default"""
+    return tuple((league or {}).get('tie_breakers') or DEFAULT_TIE_BREAKERS)
+
+
+def points_for(league):
+    """(win, draw, loss) points for a league (leagues.json entry)"""
+    league = league or {}
+    return (league.get('points_for_win', DEFAULT_POINTS[0]),
+            league.get('points_for_draw', DEFAULT_POINTS[1]),
+            league.get('points_for_loss', DEFAULT_POINTS[2]))
+
+
+class StandingsTable:
+    """League table over clubs 0..n-1 with O(1) result updates"""
+
+    def __init__(self, club_ids, names=None, tie_breakers=DEFAULT_TIE_BREAKERS, points=DEFAULT_POINTS):
+        unknown = [name for name in tie_breakers if name not in TIE_BREAKERS]
+        if unknown:
+            raise ValueError(f"Unknown tie-breaker(s) {unknown}; expected some of {TIE_BREAKERS}")
+
+        self.club_ids = list(club_ids)
+        self.names = list(names) if names is not None else [str(club_id) for club_id in self.club_ids]
+        self.index = {club_id: i for i, club_id in enumerate(self.club_ids)}
+        self.n_clubs = len(self.club_ids)
+        self.tie_breakers = tuple(tie_breakers)
+        self.win_points, self.draw_points, self.loss_points = points
+
+        # Packed criteria, head-to-head step and what follows it
+        if 'head_to_head' in self.tie_breakers:
+            split = self.tie_breakers.index('head_to_head')
+            self._packed = self.tie_breakers[:split]
+            self._after_h2h = self.tie_breakers[split + 1:]
+        else:
+            self._packed = self.tie_breakers
+            self._after_h2h = None
+        self.matchday = 0
+        self.reset()
+
+    @classmethod
+    def for_league(cls, league, clubs):
+        """Table for a leagues.json entry and its club dicts"""
+        return cls([club.get('id') or club.get('club_id') for club in clubs],
+                   [club.get('name', 'Unknown') for club in clubs],
+                   tie_breakers_for(league), points_for(league))
+
+    def reset(self):
+        """Zero every column (cheap enough to call once per simulated season)"""
+        n = self.n_clubs
+        self.played = [0] * n
+        self.wins = [0] * n
+        self.draws = [0] * n
+        self.losses = [0] * n
+        self.goals_for = [0] * n
+        self.goals_against = [0] * n
+        self.points = [0] * n
+        self.away_goals_for = [0] * n
+        self.away_wins = [0] * n
+        # Flat n x n matrices: points / goals of club i against club j at [i * n + j]
+        if self._after_h2h is not None:
+            self.h2h_points = [0] * (n * n)
+            self.h2h_goals = [0] * (n * n)
+        else:
+            self.h2h_points = self.h2h_goals = None
+        self.matchday = 0
+        self._order = list(range(n))
+        self._dirty = False
+
+    # --- Results ---------------------------------------------------------
+
+    def record(self, home, away, home_goals, away_goals):
+        """Apply one result (club indexes)"""
+        self.played[home] += 1
+        self.played[away] += 1
+        self.goals_for[home] += home_goals
+        self.goals_against[home] += away_goals
+        self.goals_for[away] += away_goals
+        self.goals_against[away] += home_goals
+        self.away_goals_for[away] += away_goals
+
+        if home_goals > away_goals:
+            home_points, away_points = self.win_points, self.loss_points
+            self.wins[home] += 1
+            self.losses[away] += 1
+        elif home_goals < away_goals:
+            home_points, away_points = self.loss_points, self.win_points
+            self.wins[away] += 1
+            self.away_wins[away] += 1
+            self.losses[home] += 1
+        else:
+            home_points = away_points = self.draw_points
+            self.draws[home] += 1
+            self.draws[away] += 1
+        self.points[home] += home_points
+        self.points[away] += away_points
+
+        if self.h2h_points is not None:
+            n = self.n_clubs
+            self.h2h_points[home * n + away] += home_points
+            self.h2h_points[away * n + home] += away_points
+            self.h2h_goals[home * n + away] += home_goals
+            self.h2h_goals[away * n + home] += away_goals
+        self._dirty = True
+
+    def record_result(self, home_id, away_id, home_goals, away_goals):
+        """Apply one result by club id"""
+        self.record(self.index[home_id], self.index[away_id], home_goals, away_goals)
+
+    def record_many(self, home_index, away_index, home_goals, away_goals):
+        """Apply a batch of results (parallel sequences of club indexes and goals)"""
+        record = self.record
+        for home, away, scored, conceded in zip(home_index, away_index, home_goals, away_goals):
+            record(home, away, int(scored), int(conceded))
+
+    def end_matchday(self):
+        """Close a matchday: bring the ranking up to date"""
+        self.matchday += 1
+        return self.ranking()
+
+    # --- Ranking ---------------------------------------------------------
+
+    def _column(self, name):
+        if name == 'goal_difference':
+            return [gf - ga for gf, ga in zip(self.goals_for, self.goals_against)]
+        return getattr(self, name)
+
+    def _packed_keys(self, criteria):
+        keys = list(self.points)
+        for name in criteria:
+            column = self._column(name)
+            keys = [(key << _KEY_BITS) + value + _KEY_OFFSET for key, value in zip(keys, column)]
+        return keys
+
+    def ranking(self):
+        """Club indexes from first to last (the table's own list; copy it before changing it)"""
+        if not self._dirty:
+            return self._order
+        order = self._order
+        n = self.n_clubs
+
+        if self._after_h2h is None:
+            # Everything in one int, club-list order last
+            keys = self._packed_keys(self._packed)
+            keys = [(key << _KEY_BITS) + (n - i) for i, key in enumerate(keys)]
+            order.sort(key=keys.__getitem__, reverse=True)
+        else:
+            keys = self._packed_keys(self._packed)
+            order.sort(key=lambda club: (-keys[club], club))
+            start = 0
+            while start < n:
+                end = start + 1
+                while end < n and keys[order[end]] == keys[order[start]]:
+                    end += 1
+                if end - start > 1:
+                    order[start:end] = self._head_to_head(order[start:end])
+                start = end
+
+        self._dirty = False
+        return order
+
+    def _head_to_head(self, group):
+        """Order clubs tied on points (and earlier criteria) by their mutual results"""
+        n = self.n_clubs
+        h2h_points, h2h_goals = self.h2h_points, self.h2h_goals
+        mini = {}
+        for club in group:
+            points = scored = conceded = 0
+            for other in group:
+                if other != club:
+                    points += h2h_points[club * n + other]
+                    scored += h2h_goals[club * n + other]
+                    conceded += h2h_goals[other * n + club]
+            mini[club] = (points, scored - conceded, scored)
+        columns = [self._column(name) for name in self._after_h2h]
+        return sorted(group, key=lambda club: (tuple(-value for value in mini[club]),
+                                               tuple(-column[club] for column in columns),
+                                               club))
+
+    def positions(self):
+        """positions[club] = 1-based table position"""
+        positions = [0] * self.n_clubs
+        for position, club in enumerate(self.ranking(), 1):
+            positions[club] = position
+        return positions
+
+    # --- Output ----------------------------------------------------------
+
+    def row(self, club):
+        """One club's line in the simulators' table format"""
+        return {
+            'club_id': self.club_ids[club],
+            'club_name': self.names[club],
+            'matches': self.played[club],
+            'wins': self.wins[club],
+            'draws': self.draws[club],
+            'losses': self.losses[club],
+            'goals_for': self.goals_for[club],
+            'goals_against': self.goals_against[club],
+            'goal_difference': self.goals_for[club] - self.goals_against[club],
+            'points': self.points[club]
+        }
+
+    def rows(self):
+        """Table rows from first to last, with 'position'"""
+        rows = []
+        for position, club in enumerate(self.ranking(), 1):
+            row = self.row(club)
+            row['position'] = position
+            rows.append(row)
+        return rows
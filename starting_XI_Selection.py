@@ -1,4 +1,25 @@
+"""
+Starting XI Selection
+Best XI for a formation as an optimal assignment of players to slots
+
+Every player gets an effective ability in every slot of the formation
+(current ability scaled by how well they play that position) and the
+Hungarian algorithm picks the eleven players and positions with the
+highest total. The lineup is a list of SelectedPlayer views onto the
+squad's player dicts, so nothing is copied.
+
+    python starting_XI_Selection.py               # Barcelona example
+    python starting_XI_Selection.py --benchmark   # every club x every formation
+"""
+
 import json
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the matrix is then built in Python
+    np = None
 
 def load_players(file_path):
     """Load players from a JSON file."""
@@ -65,224 +86,224 @@ def _calculate_position_effectiveness(player, position):
         # For now, a general 'makeshift' factor
         return effectiveness_map['makeshift'], 'makeshift'
 
-def _get_player_candidate_info(player_id, target_position, all_position_candidates):
+# The twelve positions a formation slot can be, in display order
+POSITIONS = ('GK', 'RB', 'CB', 'LB', 'CDM', 'RM', 'CM', 'LM', 'CAM', 'RW', 'ST', 'LW')
+
+# Position types in EffectivenessMatrix.types, with their factors
+POSITION_TYPES = ('primary', 'secondary', 'makeshift', 'unsuitable')
+EFFECTIVENESS_FACTORS = (1.0, 0.75, 0.5, 0.25)
+
+class EffectivenessMatrix:
     """
-    Helper to find a player's pre-calculated candidate info for a specific position.
-    'all_position_candidates' is the map like: {'GK': [cand1, cand2], 'CB': [...]}
+    Effective ability of every squad player in every position, built once
+    per squad (e.g. right after loading it) and shared by every
+    select_starting_11 call on that squad:
+
+        effectiveness = EffectivenessMatrix(players)
+        select_starting_11(players, '4-3-3', effectiveness)
+
+    types[i][j] is the POSITION_TYPES index of player i in POSITIONS[j];
+    the effective abilities are current_ability times the factors, in one
+    NumPy multiply when NumPy is available.
     """
-    if target_position not in all_position_candidates:
-        return None
-    for candidate in all_position_candidates[target_position]:
-        if candidate['player']['id'] == player_id:
-            return candidate
-    return None
 
-def select_starting_11(players, formation):
+    def __init__(self, players, positions=POSITIONS):
+        self.positions = tuple(positions)
+        self.column_of = {pos: j for j, pos in enumerate(self.positions)}
+        type_code = {name: code for code, name in enumerate(POSITION_TYPES)}
+        self.types = [[type_code[_calculate_position_effectiveness(player, pos)[1]] for pos in self.positions]
+                      for player in players]
+        abilities = [player.get('current_ability') or 0 for player in players]
+
+        if np is not None and players:
+            factors = np.array(EFFECTIVENESS_FACTORS)[np.array(self.types, dtype=np.intp)]
+            # Truncating like int(ability * factor) (abilities are never negative)
+            self.effective = (np.array(abilities, dtype=float)[:, None] * factors).astype(np.int64)
+            self._columns = self.effective.T.tolist()
+        else:
+            self.effective = [[int(ability * EFFECTIVENESS_FACTORS[code]) for code in row]
+                              for ability, row in zip(abilities, self.types)]
+            self._columns = [list(column) for column in zip(*self.effective)] or [[] for _ in self.positions]
+
+    def __len__(self):
+        return len(self.types)
+
+    def column(self, position):
+        """Effective ability of every player in a position (list, squad order)"""
+        return self._columns[self.column_of[position]]
+
+    def entry(self, index, position):
+        """(effective_ability, position_type, factor) of one player in one position"""
+        j = self.column_of[position]
+        code = self.types[index][j]
+        return self._columns[j][index], POSITION_TYPES[code], EFFECTIVENESS_FACTORS[code]
+
+# Formations with positions in traditional order
+FORMATION_POSITIONS = {
+    # Traditional 4-3-3: GK, RB, CB, CB, LB, CDM, CM, CM, RW, ST, LW
+    '4-3-3': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'CM', 'CM', 'RW', 'ST', 'LW'],
+
+    # 4-4-2: GK, RB, CB, CB, LB, RM, CM, CM, LM, ST, ST
+    '4-4-2': ['GK', 'RB', 'CB', 'CB', 'LB', 'RM', 'CM', 'CM', 'LM', 'ST', 'ST'],
+
+    # 4-2-3-1: GK, RB, CB, CB, LB, CDM, CDM, CAM, RW, ST, LW
+    '4-2-3-1': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'CDM', 'CAM', 'RW', 'ST', 'LW'],
+
+    # 3-5-2: GK, CB, CB, CB, RM, CDM, CM, CM, LM, ST, ST
+    '3-5-2': ['GK', 'CB', 'CB', 'CB', 'RM', 'CDM', 'CM', 'CM', 'LM', 'ST', 'ST'],
+
+    # 3-4-3: GK, CB, CB, CB, RM, CM, CM, LM, RW, ST, LW
+    '3-4-3': ['GK', 'CB', 'CB', 'CB', 'RM', 'CM', 'CM', 'LM', 'RW', 'ST', 'LW'],
+
+    # 4-1-4-1: GK, RB, CB, CB, LB, CDM, RM, CM, CM, LM, ST
+    '4-1-4-1': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'RM', 'CM', 'CM', 'LM', 'ST'],
+
+    # 5-3-2: GK, RB, CB, CB, CB, LB, CM, CM, CM, ST, ST
+    '5-3-2': ['GK', 'RB', 'CB', 'CB', 'CB', 'LB', 'CM', 'CM', 'CM', 'ST', 'ST'],
+
+    # 4-3-2-1: GK, RB, CB, CB, LB, CDM, CM, CM, CAM, CAM, ST
+    '4-3-2-1': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'CM', 'CM', 'CAM', 'CAM', 'ST']
+}
+
+class SelectedPlayer:
+    """
+    A player's place in a starting XI: a view of the player dict (no copy)
+    plus the slot it fills. lineup_player['known_as'] reads the player,
+    lineup_player['selected_position'] the selection.
+    """
+    __slots__ = ('player', 'index', 'selected_position', 'position_type', 'effective_ability', 'effectiveness_factor')
+    SELECTION_FIELDS = frozenset(('index', 'selected_position', 'position_type', 'effective_ability', 'effectiveness_factor'))
+
+    def __init__(self, player, index, selected_position, position_type, effective_ability, effectiveness_factor):
+        self.player = player
+        self.index = index
+        self.selected_position = selected_position
+        self.position_type = position_type
+        self.effective_ability = effective_ability
+        self.effectiveness_factor = effectiveness_factor
+
+    def __getitem__(self, key):
+        if key in self.SELECTION_FIELDS:
+            return getattr(self, key)
+        return self.player[key]
+
+    def __contains__(self, key):
+        return key in self.SELECTION_FIELDS or key in self.player
+
+    def get(self, key, default=None):
+        if key in self.SELECTION_FIELDS:
+            return getattr(self, key)
+        return self.player.get(key, default)
+
+    def __repr__(self):
+        return f"SelectedPlayer({self.player.get('known_as', self.index)!r}, {self.selected_position!r})"
+
+def assign_max(weights):
+    """
+    Optimal assignment (Hungarian algorithm with potentials, O(rows^2 * cols)).
+    weights is a rows x cols matrix with rows <= cols; returns the column
+    chosen for every row so that the total weight is as large as possible.
+    """
+    n = len(weights)
+    if n == 0:
+        return []
+    m = len(weights[0])
+    infinity = float('inf')
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    owner = [0] * (m + 1)   # owner[j] = row (1-based) assigned to column j
+    way = [0] * (m + 1)
+    columns = range(1, m + 1)
+
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        min_slack = [infinity] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            row = weights[i0 - 1]
+            u_i0 = u[i0]
+            delta = infinity
+            j1 = 0
+            for j in columns:
+                if not used[j]:
+                    slack = -row[j - 1] - u_i0 - v[j]
+                    current = min_slack[j]
+                    if slack < current:
+                        min_slack[j] = current = slack
+                        way[j] = j0
+                    if current < delta:
+                        delta = current
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    assignment = [-1] * n
+    for j in range(1, m + 1):
+        if owner[j]:
+            assignment[owner[j] - 1] = j - 1
+    return assignment
+
+def select_starting_11(players, formation, effectiveness=None):
     """
     Select a starting 11 based on the given formation.
-    Chooses the best players for each position based on current_ability,
-    considering both primary and secondary positions.
-    Includes a refinement step to check for beneficial 2-player swaps within the XI.
+    Every (player, formation slot) pair is scored with the player's
+    current_ability scaled by their effectiveness in that position, and the
+    assignment solver picks the XI with the highest total: the best lineup
+    in one pass, with no swap refinement or duplicate repair needed.
+    effectiveness is the squad's EffectivenessMatrix (built here if not given).
+    Returns SelectedPlayer views in formation order (fewer than 11 if the
+    squad is smaller).
     """
-    # Define formations with positions in traditional order
-    positions_map = {
-        # Traditional 4-3-3: GK, RB, CB, CB, LB, CDM, CM, CM, RW, ST, LW
-        '4-3-3': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'CM', 'CM', 'RW', 'ST', 'LW'],
-        
-        # 4-4-2: GK, RB, CB, CB, LB, RM, CM, CM, LM, ST, ST  
-        '4-4-2': ['GK', 'RB', 'CB', 'CB', 'LB', 'RM', 'CM', 'CM', 'LM', 'ST', 'ST'],
-        
-        # 4-2-3-1: GK, RB, CB, CB, LB, CDM, CDM, CAM, RW, ST, LW
-        '4-2-3-1': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'CDM', 'CAM', 'RW', 'ST', 'LW'],
-        
-        # 3-5-2: GK, CB, CB, CB, RM, CDM, CM, CM, LM, ST, ST
-        '3-5-2': ['GK', 'CB', 'CB', 'CB', 'RM', 'CDM', 'CM', 'CM', 'LM', 'ST', 'ST'],
-        
-        # 3-4-3: GK, CB, CB, CB, RM, CM, CM, LM, RW, ST, LW
-        '3-4-3': ['GK', 'CB', 'CB', 'CB', 'RM', 'CM', 'CM', 'LM', 'RW', 'ST', 'LW'],
-        
-        # 4-1-4-1: GK, RB, CB, CB, LB, CDM, RM, CM, CM, LM, ST
-        '4-1-4-1': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'RM', 'CM', 'CM', 'LM', 'ST'],
-        
-        # 5-3-2: GK, RB, CB, CB, CB, LB, CM, CM, CM, ST, ST
-        '5-3-2': ['GK', 'RB', 'CB', 'CB', 'CB', 'LB', 'CM', 'CM', 'CM', 'ST', 'ST'],
-        
-        # 4-3-2-1: GK, RB, CB, CB, LB, CDM, CM, CM, CAM, CAM, ST
-        '4-3-2-1': ['GK', 'RB', 'CB', 'CB', 'LB', 'CDM', 'CM', 'CM', 'CAM', 'CAM', 'ST']
-    }
-    
-    available_positions = positions_map.get(formation, positions_map['4-3-3'])
-    
-    position_candidates = {pos: [] for pos in set(available_positions)}
-    
-    for player in players:
-        for pos_key in set(available_positions): # Use pos_key to avoid conflict with pos var later
-            factor, pos_type = _calculate_position_effectiveness(player, pos_key)
-            effective_ability = int(player['current_ability'] * factor)
-            
-            position_candidates[pos_key].append({
-                'player': player, # This is a reference to the original player dict
-                'effective_ability': effective_ability,
-                'position_type': pos_type,
-                'factor': factor
-            })
-    
-    for pos_key in position_candidates:
-        position_candidates[pos_key].sort(key=lambda x: x['effective_ability'], reverse=True)
-    
-    # Initial greedy selection
-    # selected_11_intermediate will store dicts with more details for refinement
-    selected_11_intermediate = []
-    used_players_ids_intermediate = set()
-
-    for pos in available_positions: # This is the positional slot in the formation
-        candidates_for_slot = [
-            c for c in position_candidates.get(pos, []) 
-            if c['player']['id'] not in used_players_ids_intermediate
-        ]
-        
-        current_player_selection_details = None
-        if candidates_for_slot:
-            selection = candidates_for_slot[0] # Best candidate for this slot
-            
-            current_player_selection_details = {
-                'player_original_data': selection['player'], 
-                'selected_position': pos,
-                'effective_ability': selection['effective_ability'],
-                'position_type': selection['position_type'],
-                'effectiveness_factor': selection['factor']
-            }
-            used_players_ids_intermediate.add(selection['player']['id'])
-        else:
-            # Fallback: if no dedicated player, pick best remaining player overall for this slot
-            remaining_players_for_fallback = [p for p in players if p['id'] not in used_players_ids_intermediate]
-            if remaining_players_for_fallback:
-                # Sort by base current_ability for fallback
-                remaining_players_for_fallback.sort(key=lambda p: p['current_ability'], reverse=True)
-                
-                # Find the original player object from the input 'players' list
-                # This is important because 'position_candidates' might have copies or modified versions.
-                # However, 'selection['player']' in the above block IS the original player object.
-                # For fallback, we need to ensure we get the original player object.
-                original_fallback_player_data = next(p_orig for p_orig in players if p_orig['id'] == remaining_players_for_fallback[0]['id'])
-
-                factor, pos_type = _calculate_position_effectiveness(original_fallback_player_data, pos)
-                
-                current_player_selection_details = {
-                    'player_original_data': original_fallback_player_data,
-                    'selected_position': pos,
-                    'effective_ability': int(original_fallback_player_data['current_ability'] * factor),
-                    'position_type': pos_type,
-                    'effectiveness_factor': factor
-                }
-                used_players_ids_intermediate.add(original_fallback_player_data['id'])
-        
-        if current_player_selection_details:
-            selected_11_intermediate.append(current_player_selection_details)
-
-    # Refinement Phase: 2-Player Swaps within the current XI
-    max_refinement_iterations = len(selected_11_intermediate) * (len(selected_11_intermediate) -1) // 2 + 1 # Max possible pairs + 1
-    for iteration in range(max_refinement_iterations):
-        made_swap_in_iteration = False
-        if len(selected_11_intermediate) < 2:
-            break
-
-        for i in range(len(selected_11_intermediate)):
-            p1_sel_details = selected_11_intermediate[i]
-            p1_original_data = p1_sel_details['player_original_data']
-            p1_id = p1_original_data['id']
-            pos1 = p1_sel_details['selected_position']
-            p1_ea_at_pos1 = p1_sel_details['effective_ability']
-
-            for j in range(i + 1, len(selected_11_intermediate)):
-                p2_sel_details = selected_11_intermediate[j]
-                p2_original_data = p2_sel_details['player_original_data']
-                p2_id = p2_original_data['id']
-                pos2 = p2_sel_details['selected_position']
-                p2_ea_at_pos2 = p2_sel_details['effective_ability']
-
-                current_combined_ea = p1_ea_at_pos1 + p2_ea_at_pos2
-
-                # Candidate info for P1 if they were to play Pos2
-                p1_cand_at_pos2_info = _get_player_candidate_info(p1_id, pos2, position_candidates)
-                # Candidate info for P2 if they were to play Pos1
-                p2_cand_at_pos1_info = _get_player_candidate_info(p2_id, pos1, position_candidates)
-
-                if p1_cand_at_pos2_info and p2_cand_at_pos1_info:
-                    p1_ea_at_pos2 = p1_cand_at_pos2_info['effective_ability']
-                    p2_ea_at_pos1 = p2_cand_at_pos1_info['effective_ability']
-                    swapped_combined_ea = p1_ea_at_pos2 + p2_ea_at_pos1
-
-                    if swapped_combined_ea > current_combined_ea:
-                        # Perform the swap by creating new selection details dicts
-                        
-                        new_sel_for_i = {
-                            'player_original_data': p2_original_data, # P2 is now at index i
-                            'selected_position': pos1, # Playing P1's original position
-                            'effective_ability': p2_ea_at_pos1,
-                            'position_type': p2_cand_at_pos1_info['position_type'],
-                            'effectiveness_factor': p2_cand_at_pos1_info['factor']
-                        }
-                        
-                        new_sel_for_j = {
-                            'player_original_data': p1_original_data, # P1 is now at index j
-                            'selected_position': pos2, # Playing P2's original position
-                            'effective_ability': p1_ea_at_pos2,
-                            'position_type': p1_cand_at_pos2_info['position_type'],
-                            'effectiveness_factor': p1_cand_at_pos2_info['factor']
-                        }
-                        
-                        selected_11_intermediate[i] = new_sel_for_i
-                        selected_11_intermediate[j] = new_sel_for_j
-                        
-                        made_swap_in_iteration = True
-                        break 
-            if made_swap_in_iteration:
-                break 
-
-        if not made_swap_in_iteration:
-            break            
-    # Final validation: ensure no player appears twice (fix for swap logic bug)
-    final_selected_xi = []
-    used_player_ids = set()
-    
-    for sel_details in selected_11_intermediate:
-        player_id = sel_details['player_original_data']['id']
-        
-        # Skip if player already used (duplicate from swap logic)
-        if player_id in used_player_ids:
-            # Find a replacement player for this position
-            position = sel_details['selected_position']
-            replacement_candidates = [
-                c for c in position_candidates.get(position, [])
-                if c['player']['id'] not in used_player_ids
-            ]
-            
-            if replacement_candidates:
-                # Use the best available replacement
-                replacement = replacement_candidates[0]
-                sel_details = {
-                    'player_original_data': replacement['player'],
-                    'selected_position': position,
-                    'effective_ability': replacement['effective_ability'],
-                    'position_type': replacement['position_type'],
-                    'effectiveness_factor': replacement['factor']
-                }
-                player_id = replacement['player']['id']
-            else:
-                continue  # Skip this position if no replacement available
-        
-        # Create a copy of the original player data to add selection-specific attributes
-        player_for_output = sel_details['player_original_data'].copy()
-        player_for_output['selected_position'] = sel_details['selected_position']
-        player_for_output['position_type'] = sel_details['position_type']
-        player_for_output['effective_ability'] = sel_details['effective_ability']
-        player_for_output['effectiveness_factor'] = sel_details['effectiveness_factor']
-        
-        final_selected_xi.append(player_for_output)
-        used_player_ids.add(player_id)
-        
-    return final_selected_xi
+    available_positions = FORMATION_POSITIONS.get(formation, FORMATION_POSITIONS['4-3-3'])
+    if not players:
+        return []
+    if effectiveness is None:
+        effectiveness = EffectivenessMatrix(players)
+    columns = {pos: effectiveness.column(pos) for pos in set(available_positions)}
+
+    # Only a position's best len(available_positions) players can be needed in
+    # an optimal XI (one of them is always free for that slot), so the rest of
+    # the squad never enters the matrix
+    slot_count = len(available_positions)
+    candidates = range(len(players))
+    if len(players) > slot_count:
+        shortlist = set()
+        for column in columns.values():
+            shortlist.update(sorted(candidates, key=column.__getitem__, reverse=True)[:slot_count])
+        candidates = sorted(shortlist)
+
+    # slots x candidates (or candidates x slots for a squad smaller than the formation)
+    weights = [[columns[pos][i] for i in candidates] for pos in available_positions]
+    if len(candidates) >= slot_count:
+        slot_players = [candidates[column] for column in assign_max(weights)]
+    else:
+        transposed = [list(column) for column in zip(*weights)]
+        slot_players = [-1] * slot_count
+        for column, slot in enumerate(assign_max(transposed)):
+            slot_players[slot] = candidates[column]
+
+    lineup = []
+    for pos, index in zip(available_positions, slot_players):
+        if index < 0:
+            continue
+        effective_ability, pos_type, factor = effectiveness.entry(index, pos)
+        lineup.append(SelectedPlayer(players[index], index, pos, pos_type, effective_ability, factor))
+    return lineup
 
 def calculate_ratings(players):
     """Calculate ratings for attack, midfield, defense, and overall squad."""
@@ -314,13 +335,43 @@ def calculate_ratings(players):
         'goalkeeper': gk,
         'total': total_rating // 11 if len(players) == 11 else (total_rating // len(players) if len(players) > 0 else 0)    }
 
-if __name__ == "__main__":
+def benchmark_lineups(squads, formations=None, matrices=None):
+    """Select every formation for every squad; returns (lineups, total effective ability, seconds)"""
+    formations = list(formations or FORMATION_POSITIONS)
+    matrices = matrices or [None] * len(squads)
+    lineups = total = 0
+    start = time.perf_counter()
+    for squad, effectiveness in zip(squads, matrices):
+        for formation in formations:
+            lineup = select_starting_11(squad, formation, effectiveness)
+            total += sum(player.effective_ability for player in lineup)
+            lineups += 1
+    return lineups, total, time.perf_counter() - start
+
+if __name__ == "__main__" and '--benchmark' in sys.argv:
+    from data_repository import get_repository
+
+    club_players = get_repository().club_players
+    club_players.complete()
+    squads = [club_players[club_id] for club_id in club_players]
+    print(f"⚽ Starting XI benchmark ({len(squads)} clubs x {len(FORMATION_POSITIONS)} formations)")
+    start = time.perf_counter()
+    matrices = [EffectivenessMatrix(squad) for squad in squads]
+    print(f"   Effectiveness matrices: {sum(map(len, matrices)):,} players x {len(POSITIONS)} positions "
+          f"in {time.perf_counter() - start:.2f}s")
+    lineups, total, elapsed = benchmark_lineups(squads, matrices=matrices)
+    print(f"   {lineups:,} lineups in {elapsed:.2f}s  ({lineups / elapsed:,.0f} lineups/s)")
+    print(f"   Total effective ability: {total:,}")
+
+elif __name__ == "__main__":
     # Example usage - only runs when script is executed directly
     barcelona_players = load_players('data/00_2_clubs_players/club_barcelona_players.json')
-    manager = load_manager('data/managers/2.json', 'club_barcelona')
+    manager = load_manager('data/managers/2.json', 'club_barcelona') or {}
+
+    effectiveness = EffectivenessMatrix(barcelona_players)
 
     formation = manager.get('preferred_formation', '4-3-3')
-    starting_11 = select_starting_11(barcelona_players, formation)
+    starting_11 = select_starting_11(barcelona_players, formation, effectiveness)
     ratings = calculate_ratings(starting_11)
 
     # Define a canonical sort order for football positions
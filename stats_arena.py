@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Stats Arena
+Resettable per-run player statistics in typed columns
+
+The tournament simulators used to add goals, assists, ratings and form
+straight onto the shared player dicts, so a second run needed a deep copy
+or a fresh data load. A StatsArena keeps those numbers in flat typed
+columns instead, indexed by an integer slot per player:
+
+    stats = StatsArena(players.keys(), form=[p['form'] for p in players.values()])
+    i = stats.slot(player_id)         # slot, cleared for this run on first use
+    stats.goals[i] += 1
+    stats.record_rating(i, 7.4)       # matches_played, total_rating_points, avg_rating
+    stats.reset()                     # next run, O(1)
+    stats.export(players)             # copy the numbers back into the dicts for display
+
+reset() only bumps a run counter; every slot remembers the run it was last
+cleared in and is zeroed (form back to its starting value) the first time
+the new run touches it. Many tournaments can run in sequence on one arena
+without allocating anything per run, and blank() gives another worker its
+own arena over the same players.
+"""
+
+from array import array
+
+# Integer and float columns, as exported to the player dicts
+COUNTER_COLUMNS = ('goals', 'assists', 'matches_played', 'clean_sheets')
+RATING_COLUMNS = ('total_rating_points', 'avg_rating')
+
+
+class StatsArena:
+    """Per-run goals/assists/ratings/form for a fixed set of players"""
+
+    def __init__(self, player_ids, form=None):
+        """form: starting form per player (same order); None if the model has no form"""
+        self.player_ids = list(player_ids)
+        self.index = {player_id: i for i, player_id in enumerate(self.player_ids)}
+        n = len(self.player_ids)
+        self.tracks_form = form is not None
+        self.base_form = array('d', form if form is not None else [1.0] * n)
+
+        for name in COUNTER_COLUMNS:
+            setattr(self, name, array('l', bytes(array('l').itemsize * n)))
+        for name in RATING_COLUMNS:
+            setattr(self, name, array('d', bytes(array('d').itemsize * n)))
+        self.form = array('d', self.base_form)
+
+        self.run = 0
+        self._run_of_slot = array('Q', bytes(array('Q').itemsize * n))
+
+    def blank(self):
+        """Empty arena over the same players and starting form (e.g. one per worker)"""
+        return StatsArena(self.player_ids, self.base_form if self.tracks_form else None)
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def __contains__(self, player_id):
+        return player_id in self.index
+
+    def reset(self):
+        """Start a new run: every slot reads as zero (and starting form) again"""
+        self.run += 1
+
+    def _clear(self, i):
+        self.goals[i] = self.assists[i] = self.matches_played[i] = self.clean_sheets[i] = 0
+        self.total_rating_points[i] = self.avg_rating[i] = 0.0
+        self.form[i] = self.base_form[i]
+        self._run_of_slot[i] = self.run
+
+    def slot(self, player_id):
+        """Column index of a player, cleared if this run has not touched it yet"""
+        i = self.index[player_id]
+        if self._run_of_slot[i] != self.run:
+            self._clear(i)
+        return i
+
+    def record_rating(self, i, rating):
+        """One match played with this rating (slot i from slot())"""
+        self.matches_played[i] += 1
+        self.total_rating_points[i] += rating
+        self.avg_rating[i] = round(self.total_rating_points[i] / self.matches_played[i], 2)
+
+    def value(self, name, player_id):
+        """One column value for a player in the current run"""
+        return getattr(self, name)[self.slot(player_id)]
+
+    def export(self, players):
+        """Write this run's numbers into player dicts ({id: dict} or a list of dicts with 'id')"""
+        records = players.values() if isinstance(players, dict) else players
+        for player in records:
+            player_id = player.get('id')
+            if player_id not in self.index:
+                continue
+            i = self.slot(player_id)
+            for name in COUNTER_COLUMNS + RATING_COLUMNS:
+                player[name] = getattr(self, name)[i]
+            if self.tracks_form:
+                player['form'] = self.form[i]
+        return players
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Strength Cache
+Season-scoped club strengths with explicit invalidation
+
+Club strength (reputation blended with squad ratings and manager ability)
+does not change during a season, but the simulators used to recompute it
+twice per fixture. StrengthCache computes each club's base strength once
+per season and applies the per-match randomness separately:
+
+    match strength = clamp(base strength + uniform(-noise, +noise))
+
+The noise is drawn on every call exactly like the old inline
+random.uniform(-3, 3), so results (and seeded runs) are unchanged.
+
+Call start_season() when a new season begins and the on_*_changed() hooks
+whenever a squad, manager or form changes mid-season.
+"""
+
+import random
+
+# Per-match strength swing (uniform, +/-)
+MATCH_NOISE = 3
+
+STRENGTH_MIN = 50
+STRENGTH_MAX = 95
+
+
+class StrengthCache:
+    """Caches compute(club) per club id until invalidated"""
+
+    def __init__(self, compute, noise=MATCH_NOISE, low=STRENGTH_MIN, high=STRENGTH_MAX):
+        self.compute = compute
+        self.noise = noise
+        self.low = low
+        self.high = high
+        self.season = None
+        self.hits = 0
+        self.misses = 0
+        self._strengths = {}
+
+    @staticmethod
+    def _club_id(club):
+        return club.get('id') or club.get('club_id')
+
+    def base_strength(self, club):
+        """Noise-free strength of a club for the current season"""
+        club_id = self._club_id(club)
+        strength = self._strengths.get(club_id)
+        if strength is None:
+            self.misses += 1
+            strength = self._strengths[club_id] = self.compute(club)
+        else:
+            self.hits += 1
+        return strength
+
+    def match_strength(self, club, rng=random):
+        """Strength for one match: cached base plus a fresh noise draw, clamped"""
+        strength = self.base_strength(club)
+        if self.noise:
+            strength += rng.uniform(-self.noise, self.noise)
+        return min(max(strength, self.low), self.high)
+
+    # --- Invalidation ----------------------------------------------------
+
+    def start_season(self, season):
+        """Drop every cached strength when the season changes"""
+        if season != self.season:
+            self.season = season
+            self.invalidate()
+
+    def invalidate(self, club_id=None):
+        """Forget one club's strength, or all of them"""
+        if club_id is None:
+            self._strengths.clear()
+        else:
+            self._strengths.pop(club_id, None)
+
+    def on_squad_changed(self, club_id=None):
+        self.invalidate(club_id)
+
+    def on_manager_changed(self, club_id=None):
+        self.invalidate(club_id)
+
+    def on_form_changed(self, club_id=None):
+        self.invalidate(club_id)
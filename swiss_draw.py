@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Swiss Draw
+League-phase fixture draws for the 36-team UEFA Swiss model
+
+Every team plays eight different opponents, two from each of the four
+pots, one of them at home and one away, and never a club from its own
+country. That splits a draw into ten independent pieces:
+
+    same pot P      a permutation p: team i hosts p[i] (no fixed points,
+                    no 2-cycles, so the two pot opponents differ)
+    pots P and Q    a permutation s (P[i] hosts Q[s[i]]) and t (Q[j] hosts
+                    P[t[j]]) that never pair the same two teams twice
+
+Each piece is drawn uniformly by rejection sampling from random
+permutations. Behind it is a backtracking search (over s and t jointly
+for a pot pair), so a valid draw is always found when one exists, and
+DrawError is raised when the country rule makes one impossible:
+
+    league_draw = LeaguePhaseDraw(teams)              # constraints built once
+    fixtures = league_draw.draw(rng)                  # [(home_index, away_index, round), ...]
+    home, away = league_draw.draw_many(10000, seed)   # NumPy: 10,000 draws in one call
+
+The 144 games are then split into 8 rounds in which every team plays
+once, a proper 8-edge-colouring of the draw. Pot-pair and same-pot games
+share rounds: each pot has an odd number of teams, so its same-pot games
+cannot fill whole rounds by themselves.
+
+    python swiss_draw.py [--draws=N]    # benchmark
+"""
+
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; draw() works without it
+    np = None
+
+POT_COUNT = 4
+
+# Uniform permutations tried before the backtracking search takes over
+REJECTION_TRIES = 64
+
+# Matchdays of a league phase (every team plays once per round)
+ROUNDS = 2 * POT_COUNT
+
+# The three ways to split the four pots into two pairs
+POT_MATCHINGS = (((0, 1), (2, 3)), ((0, 2), (1, 3)), ((0, 3), (1, 2)))
+
+# Placeholder countries that do not keep two clubs apart
+UNKNOWN_COUNTRIES = (None, '', 'Unknown')
+
+
+class DrawError(ValueError):
+    """No draw satisfies the constraints for these teams"""
+
+
+def assign_pots(teams, key='reputation'):
+    """Pot number (1-4) per team, strongest teams in pot 1"""
+    ranked = sorted(range(len(teams)), key=lambda i: teams[i].get(key, 0), reverse=True)
+    pot_size = max(1, len(teams) // POT_COUNT)
+    pots = [0] * len(teams)
+    for rank, i in enumerate(ranked):
+        pots[i] = min(rank // pot_size, POT_COUNT - 1) + 1
+    return pots
+
+
+def _search(allowed, rng, no_two_cycles, accept=None):
+    """Random backtracking search for a permutation with perm[i] in allowed[i]
+
+    accept(perm), if given, must also hold for the complete permutation.
+    """
+    n = len(allowed)
+    perm = [-1] * n
+    used = [False] * n
+
+    def place(i):
+        if i == n:
+            return accept is None or accept(perm)
+        options = [j for j in allowed[i] if not used[j] and not (no_two_cycles and perm[j] == i)]
+        rng.shuffle(options)
+        for j in options:
+            perm[i] = j
+            used[j] = True
+            if place(i + 1):
+                return True
+            used[j] = False
+            perm[i] = -1
+        return False
+
+    return perm if place(0) else None
+
+
+def _draw_permutation(allowed, rng, no_two_cycles=False):
+    """Uniformly random permutation with perm[i] in allowed[i] (sets), or None"""
+    n = len(allowed)
+    indexes = range(n)
+    for _ in range(REJECTION_TRIES):
+        perm = rng.sample(indexes, n)
+        if all(perm[i] in allowed[i] for i in indexes) and \
+                not (no_two_cycles and any(perm[perm[i]] == i for i in indexes)):
+            return perm
+    return _search(allowed, rng, no_two_cycles)
+
+
+def _return_options(visits, s):
+    """visits, minus the P position whose team Q[j] already visits under s"""
+    s_inverse = [0] * len(s)
+    for i, j in enumerate(s):
+        s_inverse[j] = i
+    return [options - {s_inverse[j]} for j, options in enumerate(visits)]
+
+
+def _draw_pot_pair(hosts, visits, rng):
+    """(s, t) for a pot pair, or None when no pair exists
+
+    An s is redrawn when it leaves no valid t; after REJECTION_TRIES of those
+    the search backtracks over s until some t fits.
+    """
+    for _ in range(REJECTION_TRIES):
+        s = _draw_permutation(hosts, rng)
+        if s is None:
+            return None
+        t = _draw_permutation(_return_options(visits, s), rng)
+        if t is not None:
+            return s, t
+
+    found = []
+
+    def has_return_games(s):
+        t = _search(_return_options(visits, s), rng, False)
+        if t is None:
+            return False
+        found.append(t)
+        return True
+
+    s = _search(hosts, rng, False, has_return_games)
+    return (s, found[0]) if s is not None else None
+
+
+def _colour_games(games, colours):
+    """Colour (0-based) per (home, away) game so no team has two games of one colour, or None
+
+    Exhaustive backtracking that always colours the game with the fewest
+    colours left. Colours are tried in order of first use, so no colouring
+    is searched twice under another numbering.
+    """
+    busy = {}
+    for home, away in games:
+        busy[home] = set()
+        busy[away] = set()
+    game_colours = [None] * len(games)
+    left = list(range(len(games)))
+
+    def place(colours_used):
+        if not left:
+            return True
+        best = best_options = None
+        for game in left:
+            home, away = games[game]
+            options = [c for c in range(min(colours_used + 1, colours))
+                       if c not in busy[home] and c not in busy[away]]
+            if best is None or len(options) < len(best_options):
+                best, best_options = game, options
+                if len(options) <= 1:
+                    break
+        if not best_options:
+            return False
+        home, away = games[best]
+        left.remove(best)
+        for c in best_options:
+            game_colours[best] = c
+            busy[home].add(c)
+            busy[away].add(c)
+            if place(max(colours_used, c + 1)):
+                return True
+            busy[home].discard(c)
+            busy[away].discard(c)
+        game_colours[best] = None
+        left.append(best)
+        return False
+
+    return game_colours if place(0) else None
+
+
+class LeaguePhaseDraw:
+    """Constraint tables for one set of teams; draw() and draw_many() reuse them"""
+
+    def __init__(self, teams, pots=None, avoid_same_country=True):
+        """teams: dicts with 'country' (and 'pot', unless pots is given)"""
+        if pots is None:
+            pots = [team['pot'] for team in teams]
+        self.n_teams = len(teams)
+        self.avoid_same_country = avoid_same_country
+
+        pot_numbers = sorted(set(pots))
+        self.pots = [[i for i, pot in enumerate(pots) if pot == number] for number in pot_numbers]
+        sizes = [len(pot) for pot in self.pots]
+        if len(self.pots) != POT_COUNT or len(set(sizes)) != 1 or sizes[0] < 3:
+            raise DrawError(f"Need {POT_COUNT} equal pots of at least 3 teams, got pot sizes {sizes}")
+        self.pot_size = sizes[0]
+
+        # Clubs with no known country get a country of their own
+        countries = [team.get('country') if team.get('country') not in UNKNOWN_COUNTRIES else ('unknown', i)
+                     for i, team in enumerate(teams)]
+
+        def allowed(rows, columns):
+            # allowed[i] = positions in `columns` that team rows[i] may host
+            return [{j for j, column in enumerate(columns)
+                     if row != column and not (avoid_same_country and countries[row] == countries[column])}
+                    for row in rows]
+
+        self.same_pot = [allowed(pot, pot) for pot in self.pots]
+        self.pot_pairs = [(p, q, allowed(self.pots[p], self.pots[q]), allowed(self.pots[q], self.pots[p]))
+                          for p in range(POT_COUNT) for q in range(p + 1, POT_COUNT)]
+
+    # --- One draw (pure Python) -----------------------------------------
+
+    def draw(self, rng=random):
+        """One draw -> [(home_index, away_index, round), ...] (indexes into teams)
+
+        The games are redrawn in the rare case they cannot be split into
+        ROUNDS rounds.
+        """
+        for _ in range(REJECTION_TRIES):
+            pair_games, same_pot_games = self._draw_games(rng)
+            fixtures = self._schedule(pair_games, same_pot_games, rng)
+            if fixtures is not None:
+                return fixtures
+        raise DrawError(f"No {ROUNDS}-round schedule found for the draw")
+
+    def _draw_games(self, rng):
+        """One draw's (home_index, away_index) games
+
+        -> ({(p, q): (games P hosts, games Q hosts)}, [same-pot games per pot])
+        """
+        pair_games = {}
+        for p, q, hosts, visits in self.pot_pairs:
+            pot_p, pot_q = self.pots[p], self.pots[q]
+            pair = _draw_pot_pair(hosts, visits, rng)
+            if pair is None:
+                raise DrawError(f"No valid games between pots {p + 1} and {q + 1}")
+            s, t = pair
+            pair_games[(p, q)] = ([(pot_p[i], pot_q[j]) for i, j in enumerate(s)],
+                                  [(pot_q[j], pot_p[i]) for j, i in enumerate(t)])
+
+        same_pot_games = []
+        for number, (pot, hosts) in enumerate(zip(self.pots, self.same_pot), 1):
+            perm = _draw_permutation(hosts, rng, no_two_cycles=True)
+            if perm is None:
+                raise DrawError(f"No valid same-pot games in pot {number}")
+            same_pot_games.append([(pot[i], pot[j]) for i, j in enumerate(perm)])
+        return pair_games, same_pot_games
+
+    def _schedule(self, pair_games, same_pot_games, rng):
+        """[(home, away, round), ...] with every team playing once per round, or None
+
+        The games P hosts against Q all fit one round (and Q's return games
+        the next), but a pot's same-pot games cannot: a pot has an odd
+        number of teams. So one pot matching {P, Q} {R, S} is mixed: the
+        games within P and Q and between them are coloured with 4 rounds,
+        likewise for R and S. The other two pot matchings fill two rounds
+        each. Round numbers are shuffled at the end.
+        """
+        matchings = list(POT_MATCHINGS)
+        rng.shuffle(matchings)
+        for mixed in matchings:
+            fixtures = []
+            for p, q in mixed:
+                games = pair_games[(p, q)][0] + pair_games[(p, q)][1] + same_pot_games[p] + same_pot_games[q]
+                colours = _colour_games(games, 4)
+                if colours is None:
+                    break
+                fixtures += [(home, away, colour) for (home, away), colour in zip(games, colours)]
+            else:
+                round_number = 4
+                for matching in matchings:
+                    if matching is mixed:
+                        continue
+                    for pair in matching:
+                        p_hosts, q_hosts = pair_games[pair]
+                        fixtures += [(home, away, round_number) for home, away in p_hosts]
+                        fixtures += [(home, away, round_number + 1) for home, away in q_hosts]
+                    round_number += 2
+                round_numbers = rng.sample(range(1, ROUNDS + 1), ROUNDS)
+                return [(home, away, round_numbers[r]) for home, away, r in fixtures]
+        return None
+
+    # --- Many draws (NumPy) ---------------------------------------------
+
+    def draw_many(self, count, seed=None):
+        """`count` draws -> (home, away) index arrays of shape (count, matches)
+
+        Match slots are in the same order for every draw (pot pairs, then
+        same-pot games); rounds are left out, since a Monte Carlo table does
+        not depend on them. Without NumPy the draws come from draw() and
+        are returned as lists.
+        """
+        if np is None:
+            rng = random.Random(seed)
+            draws = [self.draw(rng) for _ in range(count)]
+            return ([[home for home, _, _ in fixtures] for fixtures in draws],
+                    [[away for _, away, _ in fixtures] for fixtures in draws])
+
+        rng = np.random.default_rng(seed)
+        fallback = random.Random(int(rng.integers(2 ** 62)))
+        homes, aways = [], []
+        for p, q, hosts, visits in self.pot_pairs:
+            pot_p, pot_q = np.array(self.pots[p]), np.array(self.pots[q])
+            s = self._sample(self._mask(hosts), count, rng, fallback)
+            # t[:, j] must differ from the P position that hosts Q[j]
+            t = self._sample(self._mask(visits), count, rng, fallback, avoid=np.argsort(s, axis=1))
+            # Draws whose s leaves no t at all get a new (s, t) pair
+            for row in np.flatnonzero(t[:, 0] < 0).tolist():
+                pair = _draw_pot_pair(hosts, visits, fallback)
+                if pair is None:
+                    raise DrawError(f"No valid games between pots {p + 1} and {q + 1}")
+                s[row], t[row] = pair
+            homes += [np.broadcast_to(pot_p, (count, self.pot_size)), np.broadcast_to(pot_q, (count, self.pot_size))]
+            aways += [pot_q[s], pot_p[t]]
+        for pot, hosts in zip(self.pots, self.same_pot):
+            pot = np.array(pot)
+            perm = self._sample(self._mask(hosts), count, rng, fallback, no_two_cycles=True)
+            homes.append(np.broadcast_to(pot, (count, self.pot_size)))
+            aways.append(pot[perm])
+        return np.concatenate(homes, axis=1), np.concatenate(aways, axis=1)
+
+    def _mask(self, allowed):
+        mask = np.zeros((self.pot_size, self.pot_size), dtype=bool)
+        for i, options in enumerate(allowed):
+            mask[i, list(options)] = True
+        return mask
+
+    def _sample(self, mask, count, rng, fallback, avoid=None, no_two_cycles=False):
+        """`count` random permutations allowed by mask, by batched rejection sampling
+
+        Rows where `avoid` leaves no permutation are filled with -1.
+        """
+        n = self.pot_size
+        positions = np.arange(n)
+        result = np.empty((count, n), dtype=np.intp)
+        pending = np.arange(count)
+        for _ in range(REJECTION_TRIES):
+            if not len(pending):
+                return result
+            # Several candidates per pending draw, so most are filled in one pass
+            owner = np.tile(pending, 4)
+            candidates = rng.random((len(owner), n)).argsort(axis=1)
+            valid = mask[positions, candidates].all(axis=1)
+            if avoid is not None:
+                valid &= (candidates != avoid[owner]).all(axis=1)
+            if no_two_cycles:
+                valid &= (np.take_along_axis(candidates, candidates, axis=1) != positions).all(axis=1)
+            # First valid candidate of each pending draw
+            filled, first = np.unique(owner[valid], return_index=True)
+            result[filled] = candidates[valid][first]
+            pending = np.setdiff1d(pending, filled, assume_unique=True)
+
+        # Tight constraints: search the rest one by one
+        allowed = [set(np.flatnonzero(mask[i]).tolist()) for i in range(n)]
+        for row in pending.tolist():
+            row_allowed = allowed if avoid is None else \
+                [options - {int(avoid[row, i])} for i, options in enumerate(allowed)]
+            perm = _search(row_allowed, fallback, no_two_cycles)
+            if perm is None:
+                if avoid is None:
+                    raise DrawError("No valid draw for these pots")
+                perm = -1
+            result[row] = perm
+        return result
+
+
+def validate(fixtures, teams, pots, avoid_same_country=True):
+    """Problems with a draw ([] when it is valid); fixtures are (home, away, ...) index tuples"""
+    problems = []
+    opponents = [[] for _ in teams]
+    home_games = [0] * len(teams)
+    for home, away, *_ in fixtures:
+        opponents[home].append(away)
+        opponents[away].append(home)
+        home_games[home] += 1
+    for i, team_opponents in enumerate(opponents):
+        if len(team_opponents) != 2 * POT_COUNT or len(set(team_opponents)) != 2 * POT_COUNT:
+            problems.append(f"team {i}: opponents {team_opponents}")
+        if home_games[i] != POT_COUNT:
+            problems.append(f"team {i}: {home_games[i]} home games")
+        per_pot = {}
+        for opponent in team_opponents:
+            per_pot[pots[opponent]] = per_pot.get(pots[opponent], 0) + 1
+        if sorted(per_pot.values()) != [2] * POT_COUNT:
+            problems.append(f"team {i}: opponents per pot {per_pot}")
+        country = teams[i].get('country')
+        if avoid_same_country and country not in UNKNOWN_COUNTRIES and \
+                any(teams[o].get('country') == country for o in team_opponents):
+            problems.append(f"team {i}: same-country opponent")
+    return problems
+
+
+def main():
+    """Benchmark: draws per second for the Europa League teams"""
+    import sys
+    from enhanced_uel_swiss_model_simulation import UEL_TEAMS
+
+    count = 10000
+    for arg in sys.argv[1:]:
+        if arg.startswith('--draws='):
+            count = int(arg.split('=', 1)[1])
+
+    teams = UEL_TEAMS
+    pots = assign_pots(teams)
+    league_draw = LeaguePhaseDraw(teams, pots)
+
+    print(f"🎲 Swiss league-phase draw benchmark ({len(teams)} teams, {count:,} draws)")
+    rng = random.Random(1)
+
+    python_count = max(1, count // 10)
+    invalid = sum(1 for _ in range(python_count) if validate(league_draw.draw(rng), teams, pots))
+    start = time.perf_counter()
+    for _ in range(python_count):
+        league_draw.draw(rng)
+    elapsed = time.perf_counter() - start
+    print(f"   draw():      {python_count / elapsed:10,.0f} draws/s  ({invalid} invalid of {python_count:,})")
+
+    if np is not None:
+        start = time.perf_counter()
+        home, away = league_draw.draw_many(count, seed=1)
+        elapsed = time.perf_counter() - start
+        checked = min(count, 1000)
+        invalid = sum(1 for d in range(checked)
+                      if validate(list(zip(home[d].tolist(), away[d].tolist())), teams, pots))
+        print(f"   draw_many(): {count / elapsed:10,.0f} draws/s  ({invalid} invalid of the first {checked:,})")
+
+
+if __name__ == "__main__":
+    main()
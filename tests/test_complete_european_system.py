@@ -0,0 +1,52 @@
+"""UCL/UEL qualification from leagues.json and a full European season"""
+
+from complete_european_system import CompleteEuropeanSystem
+from reporter import NullReporter
+
+
+def make_system(seed=1, batch_engine=False):
+    return CompleteEuropeanSystem(batch_engine=batch_engine, reporter=NullReporter(), seed=seed)
+
+
+def test_competition_configs_resolve_through_legacy_ids():
+    system = make_system()
+    assert system.get_competition_config('Champions League')['id'] == '00_25'
+    assert system.get_competition_config('Europa League')['id'] == '00_26'
+
+
+def test_champions_league_fills_its_league_phase():
+    system = make_system()
+    ucl = system.get_ucl_qualified_teams()
+    assert len(ucl) == 36
+    assert len({team['club_id'] for team in ucl}) == 36
+    # The EPL's four automatic places go to the top of its projected table
+    top_four = [club['id'] for club in system.project_league_table('00_1')[:4]]
+    epl = [team['club_id'] for team in ucl if team['qualification_type'] == 'league_position'
+           and team['league_id'] == '00_1']
+    assert epl == top_four
+
+
+def test_europa_league_skips_champions_league_clubs():
+    system = make_system()
+    ucl = system.get_ucl_qualified_teams()
+    uel = system.get_uel_qualified_teams(ucl_teams=ucl)
+    assert len(uel) == 36
+    ucl_ids = {team['club_id'] for team in ucl}
+    assert not ucl_ids & {team['club_id'] for team in uel if team['qualification_type'] == 'league_position'}
+
+
+def test_projection_ranks_by_expected_points():
+    system = make_system()
+    projected = system.project_league_table('00_2')
+    assert len(projected) == len(system.clubs_by_league['00_2'])
+    strengths = [system.get_club_strength(club) for club in projected]
+    assert strengths == sorted(strengths, reverse=True)
+
+
+def test_full_season_runs_and_repeats_with_a_seed():
+    for batch_engine in (False, True):
+        first = make_system(seed=3, batch_engine=batch_engine).run_full_european_season()
+        again = make_system(seed=3, batch_engine=batch_engine).run_full_european_season()
+        assert first['success']
+        assert first['ucl']['winner']['name'] == again['ucl']['winner']['name']
+        assert first['uel']['final_result'] == again['uel']['final_result']
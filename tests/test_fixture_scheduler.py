@@ -0,0 +1,50 @@
+"""Circle-method calendars: every pairing twice, once per venue, one game per matchday"""
+
+from collections import Counter
+
+import pytest
+
+from fixture_scheduler import round_robin_rounds, schedule_for
+
+
+@pytest.mark.parametrize('n_clubs', range(2, 22))
+def test_double_round_robin(n_clubs):
+    matchdays = round_robin_rounds(n_clubs)
+    assert len(matchdays) == 2 * (n_clubs - 1 if n_clubs % 2 == 0 else n_clubs)
+
+    venues = Counter(fixture for matchday in matchdays for fixture in matchday)
+    expected = {(home, away) for home in range(n_clubs) for away in range(n_clubs) if home != away}
+    assert set(venues) == expected
+    assert set(venues.values()) == {1}
+
+    for matchday in matchdays:
+        clubs = [club for fixture in matchday for club in fixture]
+        assert len(clubs) == len(set(clubs))
+        assert len(matchday) == n_clubs // 2
+
+
+@pytest.mark.parametrize('n_clubs', [3, 5, 9, 17])
+def test_odd_club_counts_give_one_bye_per_half(n_clubs):
+    matchdays = round_robin_rounds(n_clubs)
+    half = len(matchdays) // 2
+    for season_half in (matchdays[:half], matchdays[half:]):
+        resting = Counter()
+        for matchday in season_half:
+            resting.update(set(range(n_clubs)) - {club for fixture in matchday for club in fixture})
+        assert resting == Counter(range(n_clubs))
+
+
+@pytest.mark.parametrize('n_clubs', [4, 6, 20])
+def test_second_half_mirrors_the_first(n_clubs):
+    matchdays = round_robin_rounds(n_clubs)
+    half = len(matchdays) // 2
+    for first, second in zip(matchdays[:half], matchdays[half:]):
+        assert sorted((away, home) for home, away in first) == sorted(second)
+
+
+def test_schedule_for_maps_indexes_to_clubs():
+    clubs = [{'id': f'club_{i}'} for i in range(6)]
+    schedule = schedule_for(clubs)
+    assert len(schedule) == 10
+    assert len(schedule.fixtures) == 30
+    assert all(home in clubs and away in clubs for home, away in schedule.fixtures)
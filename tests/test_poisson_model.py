@@ -0,0 +1,50 @@
+"""Closed-form Poisson / Dixon-Coles odds"""
+
+import pytest
+
+from match_engine import DOMESTIC_MATCH_MODEL, EUROPEAN_MATCH_MODEL
+from poisson_model import (expected_league_table, goal_rates, outcome_probabilities,
+                           scoreline_probabilities, score_probability)
+
+RATES = [(0.3, 0.3), (1.5, 1.5), (2.6, 0.5), (0.5, 3.2), (1.93, 1.07)]
+
+
+@pytest.mark.parametrize('rho', [0.0, -0.1, -0.3, 0.1])
+@pytest.mark.parametrize('home_rate,away_rate', RATES)
+def test_scorelines_sum_to_one(home_rate, away_rate, rho):
+    matrix = scoreline_probabilities(home_rate, away_rate, rho)
+    assert sum(map(sum, matrix)) == pytest.approx(1, abs=1e-9)
+    assert min(min(row) for row in matrix) >= 0
+
+
+@pytest.mark.parametrize('rho', [0.0, -0.1, 0.1])
+@pytest.mark.parametrize('home_rate,away_rate', RATES)
+def test_outcomes_sum_to_one_and_match_the_matrix(home_rate, away_rate, rho):
+    home_win, draw, away_win = outcome_probabilities(home_rate, away_rate, rho)
+    assert home_win + draw + away_win == pytest.approx(1, abs=1e-9)
+
+    matrix = scoreline_probabilities(home_rate, away_rate, rho)
+    cells = [(home, away, p) for home, row in enumerate(matrix) for away, p in enumerate(row)]
+    assert home_win == pytest.approx(sum(p for home, away, p in cells if home > away), abs=1e-12)
+    assert draw == pytest.approx(sum(p for home, away, p in cells if home == away), abs=1e-12)
+    assert score_probability(1, 1, home_rate, away_rate, rho) == pytest.approx(matrix[1][1], abs=1e-15)
+
+
+def test_dixon_coles_favours_low_draws():
+    independent = score_probability(0, 0, 1.2, 1.2, 0.0)
+    assert score_probability(0, 0, 1.2, 1.2, -0.1) > independent
+
+
+@pytest.mark.parametrize('model', [DOMESTIC_MATCH_MODEL, EUROPEAN_MATCH_MODEL])
+def test_expected_table_conserves_points_and_goals(model):
+    strengths = [45, 60, 75, 90]
+    table = expected_league_table(strengths, model=model)
+    games = len(strengths) * (len(strengths) - 1)
+    total_points = sum(row['points'] for row in table)
+    # A decisive game gives 3 points, a draw 2
+    draws = sum(row['draws'] for row in table) / 2
+    assert total_points == pytest.approx(3 * games - draws)
+    assert sum(row['goals_for'] for row in table) == pytest.approx(sum(row['goals_against'] for row in table))
+    assert [row['points'] for row in table] == sorted(row['points'] for row in table)
+    home_rate, away_rate = goal_rates(strengths[0], strengths[1], model)
+    assert home_rate > 0 and away_rate > 0
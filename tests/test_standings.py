@@ -0,0 +1,53 @@
+"""Tie-breakers, head-to-head mini-leagues in particular"""
+
+from standings import StandingsTable
+
+CLUBS = ['a', 'b', 'c', 'd']
+
+
+def table_after(results, tie_breakers):
+    table = StandingsTable(CLUBS, tie_breakers=tie_breakers)
+    for home, away, home_goals, away_goals in results:
+        table.record(CLUBS.index(home), CLUBS.index(away), home_goals, away_goals)
+    table.end_matchday()
+    return [row['club_id'] for row in table.rows()]
+
+
+# a and b finish level on points; a won their meeting, b has the better goal difference
+LEVEL_ON_POINTS = [('a', 'b', 1, 0), ('b', 'c', 5, 0)]
+
+
+def test_goal_difference_first():
+    assert table_after(LEVEL_ON_POINTS, ('goal_difference', 'goals_for')) == ['b', 'a', 'd', 'c']
+
+
+def test_head_to_head_first():
+    assert table_after(LEVEL_ON_POINTS, ('head_to_head', 'goal_difference', 'goals_for')) == ['a', 'b', 'd', 'c']
+
+
+def test_head_to_head_after_goal_difference_only_splits_remaining_ties():
+    assert table_after(LEVEL_ON_POINTS, ('goal_difference', 'goals_for', 'head_to_head')) == ['b', 'a', 'd', 'c']
+
+
+def test_three_way_mini_league_uses_mutual_goal_difference():
+    # a, b and c beat each other in a circle; d's results decide nothing
+    results = [('a', 'b', 1, 0), ('b', 'c', 3, 0), ('c', 'a', 2, 1), ('d', 'a', 0, 4), ('d', 'b', 0, 4), ('d', 'c', 0, 4)]
+    # Mini-league: 3 points each; goal difference b +2, a 0, c -2
+    assert table_after(results, ('head_to_head', 'goal_difference')) == ['b', 'a', 'c', 'd']
+
+
+def test_level_head_to_head_falls_through_to_the_next_criterion():
+    results = [('a', 'b', 1, 1), ('a', 'c', 3, 0), ('b', 'c', 1, 0)]
+    assert table_after(results, ('head_to_head', 'goal_difference')) == ['a', 'b', 'd', 'c']
+
+
+def test_remaining_ties_keep_club_order():
+    assert table_after([('a', 'b', 0, 0), ('c', 'd', 0, 0)], ('head_to_head', 'goal_difference')) == CLUBS
+
+
+def test_rows_carry_positions_and_points():
+    table = StandingsTable(CLUBS, points=(2, 1, 0))
+    table.record(0, 1, 2, 1)
+    table.end_matchday()
+    first = table.rows()[0]
+    assert (first['club_id'], first['points'], first['goal_difference'], first['position']) == ('a', 2, 1, 1)
@@ -0,0 +1,38 @@
+"""assign_max against brute force on small matrices"""
+
+import itertools
+import random
+
+import pytest
+
+from starting_XI_Selection import assign_max
+
+
+def best_total(weights):
+    rows, cols = len(weights), len(weights[0])
+    return max(sum(weights[row][col] for row, col in enumerate(columns))
+               for columns in itertools.permutations(range(cols), rows))
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    rows = rng.randint(1, 6)
+    cols = rng.randint(rows, 7)
+    weights = [[rng.choice([rng.randint(0, 100), rng.random() * 100]) for _ in range(cols)] for _ in range(rows)]
+
+    columns = assign_max(weights)
+    assert len(columns) == rows
+    assert len(set(columns)) == rows
+    assert all(0 <= col < cols for col in columns)
+    assert sum(weights[row][col] for row, col in enumerate(columns)) == pytest.approx(best_total(weights))
+
+
+def test_ties_and_negative_weights():
+    weights = [[5, 5, -1], [5, 5, -1], [-3, 0, -2]]
+    columns = assign_max(weights)
+    assert sum(weights[row][col] for row, col in enumerate(columns)) == best_total(weights)
+
+
+def test_empty():
+    assert assign_max([]) == []
@@ -0,0 +1,61 @@
+"""League-phase draws: the UEFA pot and country rules, and an 8-round schedule"""
+
+import random
+
+import pytest
+
+from swiss_draw import LeaguePhaseDraw, DrawError, ROUNDS, assign_pots, np, validate
+
+
+def make_teams(seed, countries=12):
+    rng = random.Random(seed)
+    return [{'country': f'country_{rng.randrange(countries)}', 'reputation': rng.random()} for _ in range(36)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_seeded_draws_are_valid(seed):
+    teams = make_teams(seed)
+    pots = assign_pots(teams)
+    fixtures = LeaguePhaseDraw(teams, pots).draw(random.Random(seed))
+    assert len(fixtures) == 144
+    assert validate(fixtures, teams, pots) == []
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_every_team_plays_once_per_round(seed):
+    teams = make_teams(seed)
+    fixtures = LeaguePhaseDraw(teams, assign_pots(teams)).draw(random.Random(seed))
+    rounds = {}
+    for home, away, round_number in fixtures:
+        rounds.setdefault(round_number, []).extend((home, away))
+    assert sorted(rounds) == list(range(1, ROUNDS + 1))
+    for teams_in_round in rounds.values():
+        assert sorted(teams_in_round) == list(range(36))
+
+
+def test_same_seed_same_draw():
+    teams = make_teams(1)
+    league_draw = LeaguePhaseDraw(teams, assign_pots(teams))
+    assert league_draw.draw(random.Random(7)) == league_draw.draw(random.Random(7))
+
+
+def test_validate_reports_broken_draws():
+    teams = make_teams(3)
+    pots = assign_pots(teams)
+    fixtures = LeaguePhaseDraw(teams, pots).draw(random.Random(3))
+    assert validate(fixtures[1:], teams, pots)
+
+
+def test_impossible_country_rule_raises():
+    teams = [{'country': 'same' if i < 20 else f'country_{i}', 'reputation': i} for i in range(36)]
+    with pytest.raises(DrawError):
+        LeaguePhaseDraw(teams, assign_pots(teams)).draw(random.Random(1))
+
+
+@pytest.mark.skipif(np is None, reason="draw_many() needs NumPy for array output")
+def test_draw_many_is_valid():
+    teams = make_teams(5)
+    pots = assign_pots(teams)
+    home, away = LeaguePhaseDraw(teams, pots).draw_many(200, seed=5)
+    for draw in range(200):
+        assert validate(list(zip(home[draw].tolist(), away[draw].tolist())), teams, pots) == []